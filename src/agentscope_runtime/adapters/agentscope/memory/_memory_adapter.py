@@ -3,6 +3,8 @@
 """AgentScope Memory implementation based on SessionHistoryService."""
 import functools
 
+from collections import OrderedDict
+
 from typing import Union
 
 from agentscope.memory import MemoryBase
@@ -50,11 +52,10 @@ class AgentScopeSessionHistoryMemory(MemoryBase):
         self.session_id = session_id
         self._session = None
 
-    async def _check_session(self) -> None:
+    async def _load_session(self) -> None:
         """
-        Check if the session exists in the backend.
+        Load the whole session from the backend, creating it if missing.
         """
-        # Always check for session to stay in sync with backend
         self._session = await self._service.get_session(
             self.user_id,
             self.session_id,
@@ -65,6 +66,61 @@ class AgentScopeSessionHistoryMemory(MemoryBase):
                 self.session_id,
             )
 
+    async def _check_session(self) -> None:
+        """
+        Sync the local copy of the session history with the backend.
+
+        The session is loaded once; afterwards only the message count is
+        compared and the messages appended since the last sync are fetched,
+        together with the last known one to detect a rewritten history.
+        """
+        if self._session is None:
+            await self._load_session()
+            return
+
+        messages = self._session.messages
+        count = await self._service.count_messages(
+            self.user_id,
+            self.session_id,
+        )
+        if count < len(messages):
+            await self._load_session()
+            return
+        if not messages:
+            if count:
+                messages.extend(
+                    await self._service.get_messages(
+                        self.user_id,
+                        self.session_id,
+                    ),
+                )
+            return
+
+        new = count - len(messages)
+        fetched = await self._service.get_messages(
+            self.user_id,
+            self.session_id,
+            start=-(new + 1),
+        )
+        if len(fetched) == new + 1 and fetched[0].id == messages[-1].id:
+            messages.extend(fetched[1:])
+        else:
+            await self._load_session()
+
+    def _groups(self) -> "OrderedDict[str, list[int]]":
+        """
+        Indices of the backend messages making up each AgentScope Msg,
+        grouped by original id the way ``message_to_agentscope_msg`` does.
+        """
+        groups = OrderedDict()
+        for idx, message in enumerate(self._session.messages):
+            if message.metadata:
+                key = message.metadata.get("original_id", message.id)
+            else:
+                key = message.id
+            groups.setdefault(key, []).append(idx)
+        return groups
+
     def state_dict(self):
         """
         Get current memory state as a dictionary.
@@ -83,9 +139,7 @@ class AgentScopeSessionHistoryMemory(MemoryBase):
     @ensure_session
     async def size(self) -> int:
         """The size of the memory."""
-        current_message = self._session.messages
-        agentscope_msg = message_to_agentscope_msg(current_message)
-        return len(agentscope_msg)
+        return len(self._groups())
 
     @ensure_session
     async def add(
@@ -112,27 +166,29 @@ class AgentScopeSessionHistoryMemory(MemoryBase):
         """
         Delete messages by index
         """
-        # TODO: add method to delete messages instead of replacement
         if isinstance(index, int):
             index = [index]
 
-        current_message = self._session.messages
-        agentscope_msg = message_to_agentscope_msg(current_message)
-
-        invalid_index = [_ for _ in index if _ < 0 or _ >= len(agentscope_msg)]
+        groups = list(self._groups().values())
+        invalid_index = [_ for _ in index if _ < 0 or _ >= len(groups)]
 
         if invalid_index:
             raise IndexError(
                 f"The index {invalid_index} does not exist.",
             )
 
-        agentscope_msg = [
-            _ for idx, _ in enumerate(agentscope_msg) if idx not in index
+        deleted = {idx for _ in set(index) for idx in groups[_]}
+        await self._service.delete_messages(
+            self.user_id,
+            self.session_id,
+            sorted(deleted),
+        )
+        self._session.messages[:] = [
+            message
+            for idx, message in enumerate(self._session.messages)
+            if idx not in deleted
         ]
 
-        await self.clear()
-        await self.add(agentscope_msg)
-
     @ensure_session
     async def clear(self) -> None:
         """Clear backend session memory."""
@@ -140,12 +196,13 @@ class AgentScopeSessionHistoryMemory(MemoryBase):
             user_id=self.user_id,
             session_id=self.session_id,
         )
+        self._session = None
 
     @ensure_session
     async def get_memory(self) -> list[Msg]:
         """
         Retrieve memory content.
-        For sync purposes, we reload from backend before returning.
+        The local copy is synced with the backend before returning.
         """
         current_message = self._session.messages
         agentscope_msg = message_to_agentscope_msg(current_message)
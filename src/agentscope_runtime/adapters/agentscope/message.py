@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 # pylint:disable=too-many-branches,too-many-statements,protected-access
 # TODO: support file block
+import copy
 import json
+import threading
 
 from collections import OrderedDict
 from typing import Union, List
@@ -30,6 +32,16 @@ from ...engine.schemas.agent_schemas import (
 )
 from ...engine.helpers.agent_api_builder import ResponseBuilder
 
+# Number of converted messages kept, keyed by the message JSON, so that
+# system prompts and history repeated across requests convert once.
+MESSAGE_CACHE_SIZE = 1024
+
+# Messages serializing larger than this (e.g. inline media) are not cached.
+MESSAGE_CACHE_MAX_KEY_SIZE = 64 * 1024
+
+_msg_cache: "OrderedDict[str, Msg]" = OrderedDict()
+_msg_cache_lock = threading.Lock()
+
 
 def matches_typed_dict_structure(obj, typed_dict_cls):
     if not isinstance(obj, dict):
@@ -565,11 +577,30 @@ def message_to_agentscope_msg(
         _msg.id = _id
         return _msg
 
+    def _convert_cached(message: Message) -> Msg:
+        # The cached Msg is only read below, never returned as is: its
+        # blocks and metadata are deep-copied into every returned Msg, so
+        # callers editing them in place cannot change later conversions.
+        key = message.model_dump_json()
+        if len(key) > MESSAGE_CACHE_MAX_KEY_SIZE:
+            return _convert_one(message)
+        with _msg_cache_lock:
+            msg = _msg_cache.get(key)
+            if msg is not None:
+                _msg_cache.move_to_end(key)
+                return msg
+        msg = _convert_one(message)
+        with _msg_cache_lock:
+            _msg_cache[key] = msg
+            if len(_msg_cache) > MESSAGE_CACHE_SIZE:
+                _msg_cache.popitem(last=False)
+        return msg
+
     # Handle single or list input
     if isinstance(messages, Message):
         return _convert_one(messages)
     elif isinstance(messages, list):
-        converted_list = [_convert_one(m) for m in messages]
+        converted_list = [_convert_cached(m) for m in messages]
 
         # Group by original_id
         grouped = OrderedDict()
@@ -588,13 +619,15 @@ def message_to_agentscope_msg(
                 agentscope_msg = Msg(
                     name=orig_msg.name,
                     role=orig_msg.role,
-                    metadata=orig_msg.metadata,
-                    content=list(orig_msg.content),
+                    metadata=copy.deepcopy(orig_msg.metadata),
+                    content=copy.deepcopy(orig_msg.content),
                 )
                 agentscope_msg.id = orig_id
                 grouped[orig_id] = agentscope_msg
             else:
-                grouped[orig_id].content.extend(orig_msg.content)
+                grouped[orig_id].content.extend(
+                    copy.deepcopy(orig_msg.content),
+                )
 
         return list(grouped.values())
     else:
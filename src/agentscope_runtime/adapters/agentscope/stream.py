@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 # pylint: disable=too-many-nested-blocks,too-many-branches,too-many-statements
-import copy
 import json
 
 from typing import AsyncIterator, Tuple, List, Union
@@ -33,6 +32,70 @@ def _update_obj_attrs(obj, **attrs):
     return obj
 
 
+class _TextCursor:
+    """
+    Turns the cumulative text of a streamed block into deltas.
+
+    AgentScope resends the whole text of a block with every chunk. The
+    cursor keeps the text already emitted, so a delta is a slice of the
+    new suffix.
+    """
+
+    def __init__(self) -> None:
+        self.text = ""
+        # Whether the content block holds exactly ``self.text``
+        self.in_sync = False
+
+    def advance(self, text: str) -> Tuple[str, bool]:
+        """Return the delta of ``text`` and whether it extends the last."""
+        offset = len(self.text)
+        # The whole prefix is compared, text may be rewritten anywhere
+        contiguous = text.startswith(self.text)
+        self.text = text
+        # Like ``str.removeprefix``, a text that does not extend the last
+        # one is emitted whole
+        return (text[offset:] if contiguous else text), contiguous
+
+
+def _add_text_delta(
+    message: Message,
+    index: Union[int, None],
+    cursor: _TextCursor,
+    text: str,
+) -> TextContent:
+    """
+    Add the new part of the cumulative ``text`` to a text block of
+    ``message`` and return the delta content to yield.
+
+    While the block holds the whole cumulative text, it is pointed at the
+    new text rather than grown by concatenation, so a streamed answer costs
+    time linear in its length.
+    """
+    delta, contiguous = cursor.advance(text)
+    if index is None:
+        content = message.add_delta_content(
+            new_content=TextContent(delta=True, index=None, text=delta),
+        )
+        cursor.in_sync = len(delta) == len(text)
+        return content
+
+    block = message.content[index] if message.content else None
+    if cursor.in_sync and contiguous and isinstance(block, TextContent):
+        block.text = text
+        content = TextContent(
+            delta=True,
+            index=index,
+            text=delta,
+            msg_id=message.id,
+        )
+        return content.in_progress()
+
+    cursor.in_sync = False
+    return message.add_delta_content(
+        new_content=TextContent(delta=True, index=index, text=delta),
+    )
+
+
 async def adapt_agentscope_message_stream(
     source_stream: AsyncIterator[Tuple[Msg, bool]],
 ) -> AsyncIterator[Union[Message, Content]]:
@@ -47,8 +110,8 @@ async def adapt_agentscope_message_stream(
         type=MessageType.REASONING,
         role="assistant",
     )
-    local_truncate_memory = ""
-    local_truncate_reasoning_memory = ""
+    text_cursor = _TextCursor()
+    reasoning_cursor = _TextCursor()
     should_start_message = True
     should_start_reasoning_message = True
     tool_use_messages_dict = {}
@@ -57,16 +120,12 @@ async def adapt_agentscope_message_stream(
 
     # Run agent
     async for msg, last in source_stream:
-        # deepcopy required to avoid modifying the original message object
-        # which may be used elsewhere in the streaming pipeline
-        msg = copy.deepcopy(msg)
-
         assert isinstance(msg, Msg), f"Expected Msg, got {type(msg)}"
 
         # If a new message, create new Message
         if msg.id != msg_id:
-            local_truncate_memory = ""
-            local_truncate_reasoning_memory = ""
+            text_cursor = _TextCursor()
+            reasoning_cursor = _TextCursor()
 
             # Yield new Msg instances as they are logged
             last_content = ""
@@ -88,30 +147,30 @@ async def adapt_agentscope_message_stream(
             # Cache msg id
             msg_id = msg.id
 
+        # msg content, filtered into a new list as the Msg itself may be
+        # used elsewhere in the streaming pipeline and must not be modified
+        content = msg.content
         new_blocks = []
         new_tool_blocks = []
-        if isinstance(msg.content, List):
-            for block in msg.content:
+        if isinstance(content, List):
+            for block in content:
                 if block.get("type", "") != "tool_use":
                     new_blocks.append(block)
                 else:
                     new_tool_blocks.append(block)
             if new_tool_blocks:
                 if tool_start:
-                    msg.content = new_tool_blocks
+                    content = new_tool_blocks
                 else:
-                    msg.content = new_blocks
+                    content = new_blocks
                     tool_start = True
 
             else:
-                msg.content = new_blocks
+                content = new_blocks
 
-        if not msg.content:
+        if not content:
             continue
 
-        # msg content
-        content = msg.content
-
         # msg usage
         usage = getattr(msg, "usage", None)
 
@@ -159,19 +218,11 @@ async def adapt_agentscope_message_stream(
                                 yield message.in_progress()
                                 should_start_message = False
 
-                            text_delta_content = TextContent(
-                                delta=True,
-                                index=index,
-                                text=text.removeprefix(
-                                    local_truncate_memory,
-                                ),
-                            )
-                            local_truncate_memory = element.get(
-                                "text",
-                                "",
-                            )
-                            text_delta_content = message.add_delta_content(
-                                new_content=text_delta_content,
+                            text_delta_content = _add_text_delta(
+                                message,
+                                index,
+                                text_cursor,
+                                text,
                             )
                             index = text_delta_content.index
 
@@ -212,21 +263,11 @@ async def adapt_agentscope_message_stream(
                                 )
                                 yield reasoning_message.in_progress()
                                 should_start_reasoning_message = False
-                            text_delta_content = TextContent(
-                                delta=True,
-                                index=index,
-                                text=reasoning.removeprefix(
-                                    local_truncate_reasoning_memory,
-                                ),
-                            )
-                            local_truncate_reasoning_memory = element.get(
-                                "thinking",
-                                "",
-                            )
-                            text_delta_content = (
-                                reasoning_message.add_delta_content(
-                                    new_content=text_delta_content,
-                                )
+                            text_delta_content = _add_text_delta(
+                                reasoning_message,
+                                index,
+                                reasoning_cursor,
+                                reasoning,
                             )
                             index = text_delta_content.index
 
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+import asyncio
+from abc import ABC, abstractmethod
+
+from .base_client import BaseClient
+
+
+class AsyncBaseClient(ABC):
+    @abstractmethod
+    async def create(
+        self,
+        image,
+        name=None,
+        ports=None,
+        volumes=None,
+        environment=None,
+        runtime_config=None,
+    ):
+        """
+        Create a new container with the specified image and environment
+        variables.
+        """
+
+    @abstractmethod
+    async def start(self, container_id):
+        """Start a specified container."""
+
+    @abstractmethod
+    async def stop(self, container_id, timeout=None):
+        """Stop a running container."""
+
+    @abstractmethod
+    async def remove(self, container_id, force=False):
+        """Remove a specified container, optionally forcing removal."""
+
+    @abstractmethod
+    async def inspect(self, container_id):
+        """Get detailed information about the specified container."""
+
+    @abstractmethod
+    async def get_status(self, container_id):
+        """Get the current status of the specified container."""
+
+    async def close(self):
+        """Release the resources held by the client."""
+
+
+class ThreadedAsyncClient(AsyncBaseClient):
+    """
+    Expose a synchronous container client through the async interface.
+
+    Used for backends whose SDKs have no native asyncio support
+    (Kubernetes, AgentRun, FC). Every call runs in a worker thread, bounded
+    by ``max_concurrency`` so a burst of lifecycle operations cannot
+    exhaust the default executor.
+    """
+
+    def __init__(self, client: BaseClient, max_concurrency: int = 32):
+        self.client = client
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _run(self, func, *args, **kwargs):
+        async with self._semaphore:
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+    async def create(
+        self,
+        image,
+        name=None,
+        ports=None,
+        volumes=None,
+        environment=None,
+        runtime_config=None,
+    ):
+        return await self._run(
+            self.client.create,
+            image,
+            name=name,
+            ports=ports,
+            volumes=volumes,
+            environment=environment,
+            runtime_config=runtime_config,
+        )
+
+    async def start(self, container_id):
+        return await self._run(self.client.start, container_id)
+
+    async def stop(self, container_id, timeout=None):
+        return await self._run(
+            self.client.stop,
+            container_id,
+            timeout=timeout,
+        )
+
+    async def remove(self, container_id, force=False):
+        return await self._run(
+            self.client.remove,
+            container_id,
+            force=force,
+        )
+
+    async def inspect(self, container_id):
+        return await self._run(self.client.inspect, container_id)
+
+    async def get_status(self, container_id):
+        return await self._run(self.client.get_status, container_id)
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import logging
+import os
+import ssl
+import traceback
+from urllib.parse import quote
+
+import httpx
+from docker.constants import DEFAULT_DOCKER_API_VERSION
+from docker.models.containers import _create_container_args
+from docker.types import ContainerConfig
+from docker.utils import parse_repository_tag, version_lt
+
+from .async_base_client import AsyncBaseClient
+from .docker_client import build_port_collections
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DOCKER_HOST = "unix:///var/run/docker.sock"
+
+
+def _build_transport():
+    """
+    Build an httpx transport and base URL for the Docker Engine API from
+    ``DOCKER_HOST`` (and ``DOCKER_TLS_VERIFY``/``DOCKER_CERT_PATH``).
+    """
+    host = os.environ.get("DOCKER_HOST") or DEFAULT_DOCKER_HOST
+
+    if host.startswith("unix://"):
+        socket_path = host[len("unix://") :]
+        return httpx.AsyncHTTPTransport(uds=socket_path), "http://docker"
+
+    if host.startswith("tcp://"):
+        address = host[len("tcp://") :]
+        if os.environ.get("DOCKER_TLS_VERIFY"):
+            cert_path = os.environ.get(
+                "DOCKER_CERT_PATH",
+                os.path.join(os.path.expanduser("~"), ".docker"),
+            )
+            context = ssl.create_default_context(
+                cafile=os.path.join(cert_path, "ca.pem"),
+            )
+            context.load_cert_chain(
+                os.path.join(cert_path, "cert.pem"),
+                os.path.join(cert_path, "key.pem"),
+            )
+            return (
+                httpx.AsyncHTTPTransport(verify=context),
+                f"https://{address}",
+            )
+        return httpx.AsyncHTTPTransport(), f"http://{address}"
+
+    raise RuntimeError(f"Unsupported DOCKER_HOST for async client: {host}")
+
+
+class AsyncDockerClient(AsyncBaseClient):
+    """
+    Docker client speaking the Docker Engine API directly over httpx, so
+    container lifecycle operations are awaited on the event loop instead of
+    occupying a worker thread each.
+
+    Container arguments (``runtime_config`` included) are translated with
+    the docker SDK, so the same sandbox configs work for both clients.
+    """
+
+    def __init__(self, config=None, transport=None, base_url=None):
+        self.config = config
+        self.port_range = range(*self.config.port_range)
+
+        self.port_allocator, self.ports_cache = build_port_collections(
+            config,
+        )
+
+        if transport is None:
+            transport, base_url = _build_transport()
+
+        self.client = httpx.AsyncClient(
+            transport=transport,
+            base_url=base_url,
+            timeout=httpx.Timeout(60, read=None),
+        )
+        self._api_version = None
+
+    async def close(self):
+        await self.client.aclose()
+
+    async def _get_api_version(self):
+        if self._api_version is None:
+            version = DEFAULT_DOCKER_API_VERSION
+            try:
+                response = await self.client.get("/version")
+                response.raise_for_status()
+                server_version = response.json().get("ApiVersion")
+                if server_version and version_lt(server_version, version):
+                    version = server_version
+            except httpx.HTTPError as e:
+                logger.debug(f"Failed to negotiate Docker API version: {e}")
+            self._api_version = version
+        return self._api_version
+
+    async def _request(self, method, path, **kwargs):
+        version = await self._get_api_version()
+        return await self.client.request(
+            method,
+            f"/v{version}{path}",
+            **kwargs,
+        )
+
+    async def _ensure_image(self, image):
+        response = await self._request(
+            "GET",
+            f"/images/{quote(image, safe='')}/json",
+        )
+        if response.status_code == 200:
+            logger.debug(f"Image '{image}' found locally.")
+            return True
+        if response.status_code != 404:
+            logger.error(
+                f"Error occurred while checking the image: {response.text}",
+            )
+            return False
+
+        logger.info(
+            f"Image '{image}' not found locally. Attempting to pull: "
+            f"{image}, it might take several minutes.",
+        )
+        repository, tag = parse_repository_tag(image)
+        version = await self._get_api_version()
+        async with self.client.stream(
+            "POST",
+            f"/v{version}/images/create",
+            params={"fromImage": repository, "tag": tag or "latest"},
+        ) as stream:
+            if stream.status_code != 200:
+                await stream.aread()
+                logger.error(
+                    f"Failed to pull image '{image}': {stream.text}",
+                )
+                return False
+            async for line in stream.aiter_lines():
+                if not line:
+                    continue
+                progress = json.loads(line)
+                if "error" in progress:
+                    logger.error(
+                        f"Failed to pull image '{image}': "
+                        f"{progress['error']}",
+                    )
+                    return False
+
+        logger.debug(f"Image '{image}' successfully pulled.")
+        return True
+
+    async def create(
+        self,
+        image,
+        name=None,
+        ports=None,
+        volumes=None,
+        environment=None,
+        runtime_config=None,
+    ):
+        """Create and start a new Docker container."""
+        if runtime_config is None:
+            runtime_config = {}
+
+        port_mapping = {}
+
+        if ports:
+            # Bind probes and, with Redis, sync round trips: keep them off
+            # the event loop.
+            free_port = await asyncio.to_thread(
+                self.port_allocator.allocate,
+                len(ports),
+            )
+            for container_port, host_port in zip(ports, free_port):
+                port_mapping[container_port] = host_port
+
+        try:
+            if not await self._ensure_image(image):
+                await self._release_ports(port_mapping.values())
+                return None, None, None
+
+            version = await self._get_api_version()
+            create_kwargs = _create_container_args(
+                {
+                    "image": image,
+                    "detach": True,
+                    "ports": port_mapping,
+                    "name": name,
+                    "volumes": volumes,
+                    "environment": environment,
+                    "version": version,
+                    **runtime_config,
+                },
+            )
+            params = {}
+            container_name = create_kwargs.pop("name", None)
+            if container_name:
+                params["name"] = container_name
+            platform = create_kwargs.pop("platform", None)
+            if platform:
+                params["platform"] = platform
+            create_kwargs.setdefault("command", None)
+            container_config = ContainerConfig(version, **create_kwargs)
+
+            response = await self._request(
+                "POST",
+                "/containers/create",
+                params=params,
+                json=container_config,
+            )
+            response.raise_for_status()
+            _id = response.json()["Id"]
+
+            response = await self._request("POST", f"/containers/{_id}/start")
+            response.raise_for_status()
+
+            await asyncio.to_thread(
+                self.ports_cache.set,
+                _id,
+                list(port_mapping.values()),
+            )
+
+            return _id, list(port_mapping.values()), "localhost"
+        except Exception as e:
+            logger.warning(f"An error occurred: {e}")
+            logger.debug(f"{traceback.format_exc()}")
+            await self._release_ports(port_mapping.values())
+            return None, None, None
+
+    async def start(self, container_id):
+        """Start a Docker container."""
+        try:
+            response = await self._request(
+                "POST",
+                f"/containers/{container_id}/start",
+            )
+            # 304: container already started
+            if response.status_code != 304:
+                response.raise_for_status()
+            return True
+        except Exception as e:
+            logger.warning(f"An error occurred: {e}")
+            logger.debug(f"{traceback.format_exc()}")
+            return False
+
+    async def stop(self, container_id, timeout=None):
+        """Stop a Docker container."""
+        try:
+            params = {}
+            if timeout is not None:
+                params["t"] = timeout
+            response = await self._request(
+                "POST",
+                f"/containers/{container_id}/stop",
+                params=params,
+            )
+            # 304: container already stopped
+            if response.status_code != 304:
+                response.raise_for_status()
+            return True
+        except Exception as e:
+            logger.warning(f"An error occurred: {e}")
+            logger.debug(f"{traceback.format_exc()}")
+            return False
+
+    async def remove(self, container_id, force=False):
+        """Remove a Docker container."""
+        try:
+            response = await self._request(
+                "DELETE",
+                f"/containers/{container_id}",
+                params={"force": str(force).lower()},
+            )
+            response.raise_for_status()
+
+            # Remove ports
+            ports = await asyncio.to_thread(self.ports_cache.get, container_id)
+            await asyncio.to_thread(self.ports_cache.delete, container_id)
+            if ports:
+                await self._release_ports(ports)
+
+            return True
+        except Exception as e:
+            logger.warning(f"An error occurred: {e}")
+            logger.debug(f"{traceback.format_exc()}")
+            return False
+
+    async def inspect(self, container_id):
+        """Inspect a Docker container."""
+        try:
+            response = await self._request(
+                "GET",
+                f"/containers/{container_id}/json",
+            )
+            if response.status_code != 200:
+                return None
+            return response.json()
+        except Exception:
+            return None
+
+    async def get_status(self, container_id):
+        """Get the current status of the specified container."""
+        container_attrs = await self.inspect(container_id=container_id)
+        if container_attrs:
+            return container_attrs["State"]["Status"]
+        return None
+
+    async def _release_ports(self, ports):
+        await asyncio.to_thread(self.port_allocator.release, list(ports))
@@ -1,14 +1,18 @@
 # -*- coding: utf-8 -*-
 import traceback
 import logging
-import socket
 
 import docker
 
 from .base_client import BaseClient
+# is_port_available is re-exported for code importing it from here
+# pylint: disable-next=unused-import
+from .port_allocator import (  # noqa: F401
+    InMemoryPortAllocator,
+    RedisPortAllocator,
+    is_port_available,
+)
 from ..collections import (
-    RedisSetCollection,
-    InMemorySetCollection,
     RedisMapping,
     InMemoryMapping,
 )
@@ -17,24 +21,43 @@ from ..collections import (
 logger = logging.getLogger(__name__)
 
 
-def is_port_available(port):
+def build_port_collections(config):
     """
-    Check if a given port is available (not in use) on the local system.
-
-    Args:
-        port (int): The port number to check.
-
-    Returns:
-        bool: True if the port is available, False if it is in use.
+    Build the host port allocator and the container -> ports cache, shared
+    through Redis when it is enabled.
     """
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+    port_range = range(*config.port_range)
+    if config.redis_enabled:
+        import redis
+
+        redis_client = redis.Redis(
+            host=config.redis_server,
+            port=config.redis_port,
+            db=config.redis_db,
+            username=config.redis_user,
+            password=config.redis_password,
+            decode_responses=True,
+        )
         try:
-            s.bind(("", port))
-            # Port is available
-            return True
-        except OSError:
-            # Port is in use
-            return False
+            redis_client.ping()
+        except ConnectionError as e:
+            raise RuntimeError(
+                "Unable to connect to the Redis server.",
+            ) from e
+
+        port_allocator = RedisPortAllocator(
+            redis_client,
+            key=config.redis_port_key,
+            port_range=port_range,
+        )
+        ports_cache = RedisMapping(
+            redis_client,
+            prefix=config.redis_port_key,
+        )
+    else:
+        port_allocator = InMemoryPortAllocator(port_range)
+        ports_cache = InMemoryMapping()
+    return port_allocator, ports_cache
 
 
 class DockerClient(BaseClient):
@@ -42,35 +65,9 @@ class DockerClient(BaseClient):
         self.config = config
         self.port_range = range(*self.config.port_range)
 
-        if self.config.redis_enabled:
-            import redis
-
-            redis_client = redis.Redis(
-                host=self.config.redis_server,
-                port=self.config.redis_port,
-                db=self.config.redis_db,
-                username=self.config.redis_user,
-                password=self.config.redis_password,
-                decode_responses=True,
-            )
-            try:
-                redis_client.ping()
-            except ConnectionError as e:
-                raise RuntimeError(
-                    "Unable to connect to the Redis server.",
-                ) from e
-
-            self.port_set = RedisSetCollection(
-                redis_client,
-                set_name=self.config.redis_port_key,
-            )
-            self.ports_cache = RedisMapping(
-                redis_client,
-                prefix=self.config.redis_port_key,
-            )
-        else:
-            self.port_set = InMemorySetCollection()
-            self.ports_cache = InMemoryMapping()
+        self.port_allocator, self.ports_cache = build_port_collections(
+            config,
+        )
 
         try:
             self.client = docker.from_env()
@@ -100,7 +97,7 @@ class DockerClient(BaseClient):
         port_mapping = {}
 
         if ports:
-            free_port = self._find_free_ports(len(ports))
+            free_port = self.port_allocator.allocate(len(ports))
             for container_port, host_port in zip(ports, free_port):
                 port_mapping[container_port] = host_port
 
@@ -127,10 +124,12 @@ class DockerClient(BaseClient):
                     logger.error(
                         f"Failed to pull image '{image}': {str(e)}",
                     )
+                    self.port_allocator.release(list(port_mapping.values()))
                     return None, None, None
 
             except docker.errors.APIError as e:
                 logger.error(f"Error occurred while checking the image: {e}")
+                self.port_allocator.release(list(port_mapping.values()))
                 return None, None, None
 
             # Create and run the container
@@ -152,6 +151,7 @@ class DockerClient(BaseClient):
         except Exception as e:
             logger.warning(f"An error occurred: {e}")
             logger.debug(f"{traceback.format_exc()}")
+            self.port_allocator.release(list(port_mapping.values()))
             return None, None, None
 
     def start(self, container_id):
@@ -195,8 +195,7 @@ class DockerClient(BaseClient):
 
             # Remove ports
             if ports:
-                for host_port in ports:
-                    self.port_set.remove(host_port)
+                self.port_allocator.release(ports)
 
             return True
         except Exception as e:
@@ -220,31 +219,3 @@ class DockerClient(BaseClient):
         if container_attrs:
             return container_attrs["State"]["Status"]
         return None
-
-    def _find_free_ports(self, n):
-        free_ports = []
-
-        for port in self.port_range:
-            if len(free_ports) >= n:
-                break  # We have found enough ports
-
-            if not self.port_set.add(port):
-                continue
-
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                try:
-                    s.bind(("", port))
-                    free_ports.append(port)  # Port is available
-
-                except OSError:
-                    # Bind failed, port is in use
-                    self.port_set.remove(port)
-                    # Try the next one
-                    continue
-
-        if len(free_ports) < n:
-            raise RuntimeError(
-                "Not enough free ports available in the specified range.",
-            )
-
-        return free_ports
@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+import logging
+import socket
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+
+
+logger = logging.getLogger(__name__)
+
+
+def is_port_available(port):
+    """
+    Check if a given port is available (not in use) on the local system.
+
+    Args:
+        port (int): The port number to check.
+
+    Returns:
+        bool: True if the port is available, False if it is in use.
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        try:
+            s.bind(("", port))
+            # Port is available
+            return True
+        except OSError:
+            # Port is in use
+            return False
+
+
+class PortAllocator(ABC):
+    """
+    Hands out host ports from ``port_range``.
+
+    Subclasses only track which ports are reserved; :meth:`allocate` also
+    probes each reserved port with a local bind and retries ports held by
+    other processes, so the cost of a create does not grow with the number
+    of live containers.
+    """
+
+    def __init__(self, port_range, probe=is_port_available):
+        self.port_range = port_range
+        self.probe = probe
+
+    @abstractmethod
+    def _reserve(self, n: int) -> list:
+        """Reserve ``n`` ports at once, or none if not enough are free."""
+
+    @abstractmethod
+    def release(self, ports):
+        """Return ports to the free pool, ignoring unknown ones."""
+
+    @abstractmethod
+    def contains(self, port) -> bool:
+        """Whether ``port`` is currently reserved."""
+
+    def allocate(self, n: int) -> list:
+        """
+        Reserve ``n`` free host ports.
+
+        Raises:
+            RuntimeError: If not enough ports are available in the range.
+        """
+        ports, busy = [], []
+        while len(ports) < n and len(busy) < len(self.port_range):
+            reserved = self._reserve(n - len(ports))
+            if not reserved:
+                break
+            for port in reserved:
+                if self.probe(port):
+                    ports.append(port)
+                else:
+                    # Bound by another process, keep it out of this round
+                    busy.append(port)
+
+        # Busy ports go back to the pool to be retried later
+        self.release(busy)
+
+        if len(ports) < n:
+            self.release(ports)
+            raise RuntimeError(
+                "Not enough free ports available in the specified range.",
+            )
+        return ports
+
+
+class InMemoryPortAllocator(PortAllocator):
+    """
+    Process-local allocator backed by a FIFO free list and a bitmap of
+    reserved ports. Released ports are reused last, which keeps recently
+    closed ports out of ``TIME_WAIT`` collisions.
+    """
+
+    def __init__(self, port_range, probe=is_port_available):
+        super().__init__(port_range, probe)
+        self._free = deque(port_range)
+        self._reserved = bytearray(len(port_range))
+        self._lock = threading.Lock()
+
+    def _offset(self, port):
+        offset = int(port) - self.port_range.start
+        if 0 <= offset < len(self._reserved):
+            return offset
+        return None
+
+    def _reserve(self, n):
+        with self._lock:
+            if len(self._free) < n:
+                return []
+            ports = [self._free.popleft() for _ in range(n)]
+            for port in ports:
+                self._reserved[port - self.port_range.start] = 1
+            return ports
+
+    def release(self, ports):
+        with self._lock:
+            for port in ports:
+                offset = self._offset(port)
+                if offset is not None and self._reserved[offset]:
+                    self._reserved[offset] = 0
+                    self._free.append(int(port))
+
+    def contains(self, port):
+        offset = self._offset(port)
+        return offset is not None and bool(self._reserved[offset])
+
+
+# Reserve ARGV[1] clear bits of the bitmap in KEYS[1] (ARGV[2] bits long),
+# scanning forward from the cursor in KEYS[2] and wrapping around once.
+# All-or-nothing: returns no offsets if the range is exhausted.
+_RESERVE_SCRIPT = """
+local n = tonumber(ARGV[1])
+local size = tonumber(ARGV[2])
+local cursor = tonumber(redis.call('GET', KEYS[2]) or '0')
+if cursor >= size then
+    cursor = 0
+end
+local taken = {}
+for i = 1, n do
+    local pos = redis.call('BITPOS', KEYS[1], 0, math.floor(cursor / 8))
+    if pos < 0 or pos >= size then
+        pos = redis.call('BITPOS', KEYS[1], 0)
+    end
+    if pos < 0 or pos >= size then
+        for _, offset in ipairs(taken) do
+            redis.call('SETBIT', KEYS[1], offset, 0)
+        end
+        return {}
+    end
+    redis.call('SETBIT', KEYS[1], pos, 1)
+    taken[#taken + 1] = pos
+    cursor = pos + 1
+end
+redis.call('SET', KEYS[2], cursor)
+return taken
+"""
+
+
+class RedisPortAllocator(PortAllocator):
+    """
+    Allocator shared by several managers through a Redis bitmap, one bit
+    per port of the range. Reserving ports is a single Lua script call and
+    releasing them a single pipeline.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        key: str,
+        port_range,
+        probe=is_port_available,
+    ):
+        super().__init__(port_range, probe)
+        self.client = redis_client
+        self.bitmap_key = f"{key}:bitmap"
+        self.cursor_key = f"{key}:cursor"
+        self._reserve_script = redis_client.register_script(_RESERVE_SCRIPT)
+        self._migrate_legacy_set(key)
+
+    def _migrate_legacy_set(self, key):
+        # Older versions tracked reserved ports in a Redis set under ``key``
+        if self.client.type(key) not in ("set", b"set"):
+            return
+        ports = self.client.smembers(key)
+        pipe = self.client.pipeline()
+        for port in ports:
+            offset = self._offset(port)
+            if offset is not None:
+                pipe.setbit(self.bitmap_key, offset, 1)
+        pipe.delete(key)
+        pipe.execute()
+        logger.info(f"Migrated {len(ports)} reserved ports from set '{key}'.")
+
+    def _offset(self, port):
+        offset = int(port) - self.port_range.start
+        if 0 <= offset < len(self.port_range):
+            return offset
+        return None
+
+    def _reserve(self, n):
+        offsets = self._reserve_script(
+            keys=[self.bitmap_key, self.cursor_key],
+            args=[n, len(self.port_range)],
+        )
+        return [self.port_range.start + int(offset) for offset in offsets]
+
+    def release(self, ports):
+        offsets = [self._offset(port) for port in ports]
+        offsets = [offset for offset in offsets if offset is not None]
+        if not offsets:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for offset in offsets:
+            pipe.setbit(self.bitmap_key, offset, 0)
+        pipe.execute()
+
+    def contains(self, port):
+        offset = self._offset(port)
+        if offset is None:
+            return False
+        return bool(self.client.getbit(self.bitmap_key, offset))
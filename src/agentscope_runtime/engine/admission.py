@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+from .schemas.exception import AgentOverloadedException
+
+
+class AdmissionController:
+    """Limit how many queries a runner executes at once.
+
+    Up to ``max_concurrency`` queries run at the same time. Further
+    queries wait in a queue of at most ``max_queue_size`` entries for up
+    to ``queue_timeout`` seconds; queries that find the queue full or
+    time out are rejected with :class:`AgentOverloadedException`.
+
+    Waiting queries are grouped by user and admitted round-robin across
+    users, so one user flooding the queue delays only their own queries.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue_size: int = 100,
+        queue_timeout: Optional[float] = 30.0,
+    ):
+        """Initialize the controller.
+
+        Args:
+            max_concurrency: Maximum number of queries running at once.
+            max_queue_size: Maximum number of queries waiting for a slot;
+                ``0`` rejects every query that cannot run immediately.
+            queue_timeout: Seconds a query may wait for a slot, or
+                ``None`` to wait indefinitely.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if max_queue_size < 0:
+            raise ValueError("max_queue_size must not be negative")
+
+        self.max_concurrency = max_concurrency
+        self.max_queue_size = max_queue_size
+        self.queue_timeout = queue_timeout
+
+        self._in_flight = 0
+        self._queued = 0
+        # User id -> that user's waiters, in round-robin order.
+        self._waiters: "OrderedDict[str, Deque[asyncio.Future]]" = (
+            OrderedDict()
+        )
+        self._admitted = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._total_wait = 0.0
+
+    @property
+    def in_flight(self) -> int:
+        """Number of queries currently running."""
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        """Number of queries waiting for a slot."""
+        return self._queued
+
+    def is_full(self) -> bool:
+        """Whether a query submitted now would be rejected right away."""
+        return (
+            self._in_flight >= self.max_concurrency
+            and self._queued >= self.max_queue_size
+        )
+
+    @asynccontextmanager
+    async def admit(self, user_id: Optional[str] = None) -> AsyncIterator:
+        """Hold a slot for the duration of the block.
+
+        Yields:
+            Seconds spent waiting for the slot.
+
+        Raises:
+            AgentOverloadedException: If the queue is full or the wait
+                times out.
+        """
+        waited = await self.acquire(user_id)
+        try:
+            yield waited
+        finally:
+            self.release()
+
+    async def acquire(self, user_id: Optional[str] = None) -> float:
+        """Wait for a slot and return the seconds spent waiting.
+
+        Every successful call must be paired with :meth:`release`.
+        """
+        if self._in_flight < self.max_concurrency and not self._queued:
+            self._in_flight += 1
+            self._admitted += 1
+            return 0.0
+
+        if self._queued >= self.max_queue_size:
+            self._rejected += 1
+            raise AgentOverloadedException(
+                details={
+                    "reason": "queue_full",
+                    "in_flight": self._in_flight,
+                    "queued": self._queued,
+                },
+            )
+
+        start = time.monotonic()
+        user = user_id or ""
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(user, deque()).append(waiter)
+        self._queued += 1
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we gave up.
+                self.release()
+            else:
+                self._remove_waiter(user, waiter)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self._timed_out += 1
+            raise AgentOverloadedException(
+                message=(
+                    f"No agent slot became available within "
+                    f"{self.queue_timeout} seconds, please retry later"
+                ),
+                details={
+                    "reason": "queue_timeout",
+                    "in_flight": self._in_flight,
+                    "queued": self._queued,
+                },
+            ) from None
+
+        waited = time.monotonic() - start
+        self._admitted += 1
+        self._total_wait += waited
+        return waited
+
+    def release(self) -> None:
+        """Free a slot, handing it to the next waiting user if any."""
+        while self._waiters:
+            user, waiters = next(iter(self._waiters.items()))
+            waiter = waiters.popleft()
+            if waiters:
+                self._waiters.move_to_end(user)
+            else:
+                del self._waiters[user]
+            self._queued -= 1
+            if not waiter.done():
+                # The slot passes to the waiter; in-flight count is kept.
+                waiter.set_result(None)
+                return
+        self._in_flight -= 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return current load and admission counters."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue_size": self.max_queue_size,
+            "in_flight": self._in_flight,
+            "queued": self._queued,
+            "queued_users": len(self._waiters),
+            "admitted": self._admitted,
+            "rejected": self._rejected,
+            "timed_out": self._timed_out,
+            "avg_queue_wait_seconds": (
+                self._total_wait / self._admitted if self._admitted else 0.0
+            ),
+        }
+
+    def _remove_waiter(self, user: str, waiter: asyncio.Future) -> None:
+        waiters = self._waiters.get(user)
+        if waiters is None or waiter not in waiters:
+            return
+        waiters.remove(waiter)
+        self._queued -= 1
+        if not waiters:
+            del self._waiters[user]
@@ -7,7 +7,6 @@ import subprocess
 import shlex
 from typing import Optional, Callable, List
 
-import uvicorn
 from pydantic import BaseModel
 
 from .base_app import BaseApp
@@ -22,6 +21,9 @@ from ..deployers.adapter.responses.response_api_protocol_adapter import (
 )
 from ..deployers.utils.deployment_modes import DeploymentMode
 from ..deployers.utils.service_utils.fastapi_factory import FastAPIAppFactory
+from ..deployers.utils.service_utils.workers import serve_workers
+from ..admission import AdmissionController
+from ..framework_adapters import registered_framework_types
 from ..runner import Runner
 from ..schemas.agent_schemas import AgentRequest
 from ...version import __version__
@@ -52,6 +54,7 @@ class AgentApp(BaseApp):
         runner: Optional[Runner] = None,
         enable_embedded_worker: bool = False,
         a2a_config: Optional["AgentCardWithRuntimeConfig"] = None,
+        admission_controller: Optional[AdmissionController] = None,
         **kwargs,
     ):
         """
@@ -93,6 +96,10 @@ class AgentApp(BaseApp):
                         registry=[nacos_registry],
                         task_timeout=120,
                     )
+            admission_controller: Optional limit on concurrently running
+                queries, with a bounded fair wait queue. Rejected queries
+                get HTTP 429 or a failed response with an
+                ``AGENT_OVERLOADED`` error.
             **kwargs: Additional keyword arguments passed to FastAPI app
         """
 
@@ -107,6 +114,7 @@ class AgentApp(BaseApp):
         self.enable_embedded_worker = enable_embedded_worker
 
         self._runner = runner
+        self.admission_controller = admission_controller
         self.custom_endpoints = []  # Store custom endpoints
 
         # Custom Handlers
@@ -150,10 +158,11 @@ class AgentApp(BaseApp):
     def query(self, framework: Optional[str] = "agentscope"):
         """
         Register run hook and optionally specify agent framework.
-        Allowed framework values: 'agentscope', 'autogen', 'agno', 'langgraph'.
+        Allowed framework values: 'agentscope', 'autogen', 'agno', 'langgraph',
+        'text', plus any type added with ``register_framework_adapter``.
         """
 
-        allowed_frameworks = {"agentscope", "autogen", "agno", "langgraph"}
+        allowed_frameworks = set(registered_framework_types())
         if framework not in allowed_frameworks:
             raise ValueError(f"framework must be one of {allowed_frameworks}")
 
@@ -176,6 +185,9 @@ class AgentApp(BaseApp):
         if self._framework_type is not None:
             self._runner.framework_type = self._framework_type
 
+        if self.admission_controller is not None:
+            self._runner.admission_controller = self.admission_controller
+
         if self._query_handler is not None:
             self._runner.query_handler = types.MethodType(
                 self._query_handler,
@@ -199,6 +211,8 @@ class AgentApp(BaseApp):
         host=HOST,
         port=PORT,
         web_ui=False,
+        workers: int = 1,
+        allow_in_memory_services: bool = True,
         **kwargs,
     ):
         """
@@ -221,6 +235,14 @@ class AgentApp(BaseApp):
             web_ui (bool): If True, launches the Agentscope Web UI in a
                 separate process, pointing it to the API endpoint. This
                 allows interactive use via browser. Default False.
+            workers (int): Number of pre-forked worker processes sharing
+                the port. Each worker runs the ``init`` and ``shutdown``
+                handlers on its own runner. Default 1.
+            allow_in_memory_services (bool): With several workers, only
+                warn instead of failing startup when the runner holds
+                in-memory services, or task endpoints run without a Celery
+                broker, whose state each worker keeps separately.
+                Default True.
             **kwargs: Additional keyword arguments passed to FastAPIAppFactory
                 when creating the FastAPI application.
 
@@ -257,18 +279,22 @@ class AgentApp(BaseApp):
                 else:
                     cmd = shlex.split(cmd)
                 with subprocess.Popen(cmd, **cmd_kwarg):
-                    uvicorn.run(
+                    serve_workers(
                         fastapi_app,
                         host=host,
                         port=port,
+                        workers=workers,
+                        allow_in_memory_services=allow_in_memory_services,
                         log_level="info",
                         access_log=True,
                     )
             else:
-                uvicorn.run(
+                serve_workers(
                     fastapi_app,
                     host=host,
                     port=port,
+                    workers=workers,
+                    allow_in_memory_services=allow_in_memory_services,
                     log_level="info",
                     access_log=True,
                 )
@@ -3,19 +3,51 @@
 
 import json
 import os
-import shutil
+import sqlite3
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
 
 from agentscope_runtime.engine.deployers.state.schema import (
     Deployment,
     StateFileSchema,
 )
 
+# Seconds to wait for another process holding the database lock
+_LOCK_TIMEOUT = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS deployments (
+    id TEXT PRIMARY KEY,
+    platform TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_deployments_status
+    ON deployments (status, created_at);
+CREATE INDEX IF NOT EXISTS idx_deployments_platform
+    ON deployments (platform, created_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
 
 class DeploymentStateManager:
-    """Manages deployment state persistence."""
+    """Manages deployment state persistence.
+
+    Deployments are stored one row per deployment in a SQLite database,
+    indexed by id, status and platform, so a lookup or status update does
+    not read or rewrite the other deployments. SQLite's file locking makes
+    concurrent CLI processes safe; read-modify-write operations run in
+    ``BEGIN IMMEDIATE`` transactions.
+
+    A ``deployments.json`` state file written by earlier versions is
+    imported once into the database and left in place.
+    """
 
     def __init__(self, state_dir: Optional[str] = None):
         """
@@ -29,29 +61,131 @@ class DeploymentStateManager:
             state_dir = os.path.expanduser("~/.agentscope-runtime")
 
         self.state_dir = Path(state_dir)
+        # Legacy JSON state file, imported into the database on first use
         self.state_file = self.state_dir / "deployments.json"
+        self.db_file = self.state_dir / "deployments.db"
+        self._initialized = False
         self._ensure_state_dir()
 
     def _ensure_state_dir(self) -> None:
         """Ensure state directory exists."""
         self.state_dir.mkdir(parents=True, exist_ok=True)
 
-    def _backup_state_file(self) -> None:
-        """Create backup of state file before modifications.
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection in autocommit mode, creating the schema and
+        importing the legacy state file on first use."""
+        conn = sqlite3.connect(
+            str(self.db_file),
+            timeout=_LOCK_TIMEOUT,
+            isolation_level=None,
+        )
+        try:
+            if not self._initialized:
+                self._init_db(conn)
+                self._initialized = True
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run a read-modify-write under the database write lock."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _init_db(self, conn: sqlite3.Connection) -> None:
+        """Create the schema and import the legacy JSON state once."""
+        conn.executescript(_SCHEMA)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            imported = conn.execute(
+                "SELECT 1 FROM meta WHERE key = 'legacy_imported'",
+            ).fetchone()
+            if not imported:
+                legacy = self._read_legacy_state()
+                for deploy_data in legacy["deployments"].values():
+                    self._upsert(conn, deploy_data, replace=False)
+                conn.execute(
+                    "INSERT INTO meta (key, value) VALUES (?, ?)",
+                    ("legacy_imported", datetime.now().isoformat()),
+                )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @staticmethod
+    def _upsert(
+        conn: sqlite3.Connection,
+        deploy_data: Dict[str, Any],
+        replace: bool = True,
+    ) -> None:
+        """Insert a deployment row, keeping its position on update."""
+        # Fill in defaults of fields missing from older records
+        deploy_data = Deployment.from_dict(deploy_data).to_dict()
+        conflict = (
+            "DO UPDATE SET platform = excluded.platform, "
+            "status = excluded.status, created_at = excluded.created_at, "
+            "data = excluded.data"
+            if replace
+            else "DO NOTHING"
+        )
+        conn.execute(
+            "INSERT INTO deployments (id, platform, status, created_at, data) "
+            f"VALUES (?, ?, ?, ?, ?) ON CONFLICT (id) {conflict}",
+            (
+                deploy_data["id"],
+                deploy_data["platform"],
+                deploy_data["status"],
+                deploy_data["created_at"],
+                json.dumps(deploy_data),
+            ),
+        )
+
+    @staticmethod
+    def _load_row(deploy_id: str, data: str) -> Optional[Dict[str, Any]]:
+        """Parse and validate a stored deployment, None if corrupted."""
+        try:
+            deploy_data = json.loads(data)
+            Deployment.from_dict(deploy_data)
+            return deploy_data
+        except (json.JSONDecodeError, TypeError, KeyError) as e:
+            print(
+                f"Warning: Skipping invalid deployment "
+                f"{deploy_id} in state database: {e}",
+            )
+            return None
 
-        Maintains one backup per day. If a backup for today already exists,
-        it will be overwritten. Old backups (older than 30 days) are cleaned up
-        """
-        if self.state_file.exists():
-            # Use date-based filename: deployments.backup.YYYYMMDD.json
-            today = datetime.now().strftime("%Y%m%d")
-            backup_file = self.state_dir / f"deployments.backup.{today}.json"
+    def _backup_state_file(self, conn: sqlite3.Connection) -> None:
+        """Create backup of the state before modifications.
 
-            # Overwrite today's backup if it exists (one backup per day)
-            shutil.copy2(self.state_file, backup_file)
+        Maintains one backup per day, taken before the first change of the
+        day, so updates do not pay for exporting the whole state. Old
+        backups (older than 30 days) are cleaned up
+        """
+        # Use date-based filename: deployments.backup.YYYYMMDD.json
+        today = datetime.now().strftime("%Y%m%d")
+        backup_file = self.state_dir / f"deployments.backup.{today}.json"
+        if backup_file.exists():
+            return
+
+        state = self._read_state(conn)
+        if not state["deployments"]:
+            return
+        temp_file = backup_file.with_suffix(".tmp")
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        temp_file.replace(backup_file)
 
-            # Clean up old backups (older than 30 days)
-            self._cleanup_old_backups(days_to_keep=30)
+        # Clean up old backups (older than 30 days)
+        self._cleanup_old_backups(days_to_keep=30)
 
     def _cleanup_old_backups(self, days_to_keep: int = 30) -> None:
         """Clean up backup files older than specified days.
@@ -86,8 +220,8 @@ class DeploymentStateManager:
                 # (might be old format backups)
                 continue
 
-    def _read_state(self) -> Dict[str, Any]:
-        """Read state file with validation."""
+    def _read_legacy_state(self) -> Dict[str, Any]:
+        """Read the legacy JSON state file with validation."""
         if not self.state_file.exists():
             return StateFileSchema.create_empty()
 
@@ -143,91 +277,74 @@ class DeploymentStateManager:
             )
             return StateFileSchema.create_empty()
 
+    def _read_state(
+        self,
+        conn: Optional[sqlite3.Connection] = None,
+    ) -> Dict[str, Any]:
+        """Read the whole state, skipping corrupted deployments."""
+        if conn is None:
+            with self._connect() as new_conn:
+                return self._read_state(new_conn)
+
+        deployments = {}
+        for deploy_id, data in conn.execute(
+            "SELECT id, data FROM deployments ORDER BY rowid",
+        ):
+            deploy_data = self._load_row(deploy_id, data)
+            if deploy_data is not None:
+                deployments[deploy_id] = deploy_data
+        return {
+            "version": StateFileSchema.VERSION,
+            "deployments": deployments,
+        }
+
     def _write_state(
         self,
         data: Dict[str, Any],
         allow_empty: bool = False,
     ) -> None:
         """
-        Write state file atomically.
+        Replace the whole state in one transaction.
+
+        Only used for bulk operations (clear, import); single deployments
+        are written row by row.
 
         Args:
             data: State data to write
-            allow_empty: If True, allow writing empty state even when file
-                        has data.
-                        Used for explicit operations like clear() or remove().
+            allow_empty: If True, allow writing empty state even when the
+                        store has data.
+                        Used for explicit operations like clear().
         """
-        # Safety check: prevent writing empty state if file already exists
-        # with data. This prevents accidental data loss, unless explicitly
-        # allowed
-        if not allow_empty and self.state_file.exists():
-            try:
-                existing_state = self._read_state()
-                existing_count = len(existing_state.get("deployments", {}))
-                new_count = len(data.get("deployments", {}))
-
-                # If we're writing empty state but file had data, this is
-                # suspicious unless explicitly allowed  (e.g., from clear()
-                # or remove())
-                if existing_count > 0 and new_count == 0:
-                    raise ValueError(
-                        f"Attempted to write empty state when {existing_count}"
-                        f" deployments exist. This may indicate data loss. "
-                        f"Aborting write to prevent data loss.",
-                    )
-            except ValueError as e:
-                # Re-raise ValueError from safety check (data loss prevention)
-                raise ValueError(
-                    f"Attempted to write empty state when {existing_count}",
-                ) from e
-            except Exception:
-                # If we can't read existing state due to file errors,
-                # proceed with caution but still validate the new data
-                pass
-
         # Validate before writing
         if not StateFileSchema.validate(data):
             raise ValueError("Invalid state data")
 
-        # Serialize new data to compare with existing file
-        new_content = json.dumps(data, indent=2, sort_keys=True)
-
-        # Check if content actually changed before backing up
-        # Use the same read logic as _read_state to ensure consistency
-        if self.state_file.exists():
-            try:
-                # Read existing file using the same method as _read_state
-                # to ensure we're comparing apples to apples
-                with open(self.state_file, "r", encoding="utf-8") as f:
-                    existing_data = json.load(f)
-
-                # Normalize the existing data the same way _read_state does
-                existing_data = StateFileSchema.migrate_if_needed(
-                    existing_data,
-                )
-
-                # Serialize for comparison
-                existing_content = json.dumps(
-                    existing_data,
-                    indent=2,
-                    sort_keys=True,
+        with self._transaction() as conn:
+            (existing_count,) = conn.execute(
+                "SELECT COUNT(*) FROM deployments",
+            ).fetchone()
+
+            # Safety check: writing empty state over existing data is
+            # suspicious unless explicitly allowed (e.g., from clear())
+            if (
+                not allow_empty
+                and existing_count > 0
+                and not data["deployments"]
+            ):
+                raise ValueError(
+                    f"Attempted to write empty state when {existing_count}"
+                    f" deployments exist. This may indicate data loss. "
+                    f"Aborting write to prevent data loss.",
                 )
 
-                # Only backup if content changed
-                if existing_content != new_content:
-                    self._backup_state_file()
-            except (json.JSONDecodeError, IOError, ValueError):
-                # If file is corrupted or unreadable, backup anyway
-                # This ensures we don't lose data if file is corrupted
-                self._backup_state_file()
+            # Only backup and write if content changed
+            if self._read_state(conn)["deployments"] == data["deployments"]:
+                return
+            self._backup_state_file(conn)
 
-        # Write to temporary file first
-        temp_file = self.state_file.with_suffix(".tmp")
-        with open(temp_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
-
-        # Atomic rename
-        temp_file.replace(self.state_file)
+            conn.execute("DELETE FROM deployments")
+            for deploy_data in data["deployments"].values():
+                self._upsert(conn, deploy_data)
 
     def save(self, deployment: Deployment) -> None:
         """
@@ -236,9 +353,20 @@ class DeploymentStateManager:
         Args:
             deployment: Deployment instance to save
         """
-        state = self._read_state()
-        state["deployments"][deployment.id] = deployment.to_dict()
-        self._write_state(state)
+        deploy_data = deployment.to_dict()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT data FROM deployments WHERE id = ?",
+                (deployment.id,),
+            ).fetchone()
+            if (
+                row is not None
+                and self._load_row(deployment.id, row[0]) == deploy_data
+            ):
+                return
+
+            self._backup_state_file(conn)
+            self._upsert(conn, deploy_data)
 
     def get(self, deploy_id: str) -> Optional[Deployment]:
         """
@@ -250,9 +378,16 @@ class DeploymentStateManager:
         Returns:
             Deployment instance or None if not found
         """
-        state = self._read_state()
-        deploy_data = state["deployments"].get(deploy_id)
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT data FROM deployments WHERE id = ?",
+                (deploy_id,),
+            ).fetchone()
+
+        if row is None:
+            return None
 
+        deploy_data = self._load_row(deploy_id, row[0])
         if deploy_data is None:
             return None
 
@@ -273,21 +408,31 @@ class DeploymentStateManager:
         Returns:
             List of Deployment instances
         """
-        state = self._read_state()
-        deployments = [
-            Deployment.from_dict(data)
-            for data in state["deployments"].values()
-        ]
-
-        # Apply filters
+        # Apply filters through the indexes
+        conditions, params = [], []
         if status:
-            deployments = [d for d in deployments if d.status == status]
+            conditions.append("status = ?")
+            params.append(status)
 
         if platform:
-            deployments = [d for d in deployments if d.platform == platform]
+            conditions.append("platform = ?")
+            params.append(platform)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
 
         # Sort by created_at (newest first)
-        deployments.sort(key=lambda d: d.created_at, reverse=True)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT id, data FROM deployments {where} "
+                "ORDER BY created_at DESC, rowid",
+                params,
+            ).fetchall()
+
+        deployments = []
+        for deploy_id, data in rows:
+            deploy_data = self._load_row(deploy_id, data)
+            if deploy_data is not None:
+                deployments.append(Deployment.from_dict(deploy_data))
 
         return deployments
 
@@ -302,26 +447,39 @@ class DeploymentStateManager:
         Raises:
             KeyError: If deployment not found
         """
-        state = self._read_state()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT data FROM deployments WHERE id = ?",
+                (deploy_id,),
+            ).fetchone()
+
+            if row is None:
+                # Tell an empty store apart from a missing deployment
+                if not conn.execute(
+                    "SELECT 1 FROM deployments LIMIT 1",
+                ).fetchone():
+                    raise KeyError(
+                        f"Deployment not found: {deploy_id} "
+                        f"(state file is empty or corrupted)",
+                    )
+                raise KeyError(f"Deployment not found: {deploy_id}")
 
-        # Safety check: if state is empty, don't proceed
-        # This prevents accidentally writing empty state
-        if not state.get("deployments"):
-            raise KeyError(
-                f"Deployment not found: {deploy_id} "
-                f"(state file is empty or corrupted)",
+            deploy_data = self._load_row(deploy_id, row[0])
+            if deploy_data is None:
+                raise KeyError(
+                    f"Deployment not found: {deploy_id} "
+                    f"(state entry is corrupted)",
+                )
+            if deploy_data.get("status") == status:
+                return
+            deploy_data["status"] = status
+
+            self._backup_state_file(conn)
+            conn.execute(
+                "UPDATE deployments SET status = ?, data = ? WHERE id = ?",
+                (status, json.dumps(deploy_data), deploy_id),
             )
 
-        if deploy_id not in state["deployments"]:
-            raise KeyError(f"Deployment not found: {deploy_id}")
-
-        # Make a copy to avoid modifying the original dict in place
-        # This ensures we don't accidentally lose data
-        state["deployments"][deploy_id] = dict(state["deployments"][deploy_id])
-        state["deployments"][deploy_id]["status"] = status
-
-        self._write_state(state)
-
     def remove(self, deploy_id: str) -> None:
         """
         Delete deployment record.
@@ -332,22 +490,26 @@ class DeploymentStateManager:
         Raises:
             KeyError: If deployment not found
         """
-        state = self._read_state()
-
-        if deploy_id not in state["deployments"]:
-            raise KeyError(f"Deployment not found: {deploy_id}")
-
-        del state["deployments"][deploy_id]
+        with self._transaction() as conn:
+            if not conn.execute(
+                "SELECT 1 FROM deployments WHERE id = ?",
+                (deploy_id,),
+            ).fetchone():
+                raise KeyError(f"Deployment not found: {deploy_id}")
 
-        # Allow empty state if this was the last deployment (legitimate
-        # removal)
-        allow_empty = len(state["deployments"]) == 0
-        self._write_state(state, allow_empty=allow_empty)
+            self._backup_state_file(conn)
+            conn.execute("DELETE FROM deployments WHERE id = ?", (deploy_id,))
 
     def exists(self, deploy_id: str) -> bool:
         """Check if deployment exists."""
-        state = self._read_state()
-        return deploy_id in state["deployments"]
+        with self._connect() as conn:
+            return (
+                conn.execute(
+                    "SELECT 1 FROM deployments WHERE id = ?",
+                    (deploy_id,),
+                ).fetchone()
+                is not None
+            )
 
     def clear(self) -> None:
         """Clear all deployments (use with caution)."""
@@ -378,11 +540,11 @@ class DeploymentStateManager:
             raise ValueError("Invalid import file format")
 
         if merge:
-            # Merge with existing state
-            state = self._read_state()
-            state["deployments"].update(import_data["deployments"])
+            # Merge with existing state, row by row
+            with self._transaction() as conn:
+                self._backup_state_file(conn)
+                for deploy_data in import_data["deployments"].values():
+                    self._upsert(conn, deploy_data)
         else:
             # Replace entire state
-            state = import_data
-
-        self._write_state(state)
+            self._write_state(import_data)
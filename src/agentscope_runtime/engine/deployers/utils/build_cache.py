@@ -12,12 +12,19 @@ import json
 import logging
 import os
 import shutil
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Read size when hashing file content
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Files modified more recently than this are rehashed on the next lookup
+RACY_WINDOW_NS = 2 * 10**9
+
 
 class BuildCache:
     """
@@ -64,6 +71,14 @@ class BuildCache:
             self.workspace / ".agentscope_runtime" / "deployments.json"
         )
 
+        # Per-file content digests keyed by path, checked against
+        # (size, mtime_ns, inode) so unchanged files are not read again
+        self.manifest_file = (
+            self.workspace / ".agentscope_runtime" / "file_hashes.json"
+        )
+        self._manifest: Optional[Dict[str, list]] = None
+        self._manifest_dirty = False
+
         logger.debug(f"BuildCache initialized at: {self.cache_root}")
 
     def _generate_build_name(self, platform: str, content_hash: str) -> str:
@@ -349,6 +364,67 @@ class BuildCache:
 
         return final_hash
 
+    def _load_manifest(self) -> Dict[str, list]:
+        """Load the file digest manifest, once per cache instance."""
+        if self._manifest is None:
+            self._manifest = {}
+            if self.manifest_file.exists():
+                try:
+                    with open(self.manifest_file, "r", encoding="utf-8") as f:
+                        self._manifest = json.load(f)
+                except Exception as e:
+                    logger.warning(f"Failed to load hash manifest: {e}")
+        return self._manifest
+
+    def _save_manifest(self) -> None:
+        """Save the file digest manifest to JSON file."""
+        try:
+            self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.manifest_file.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(self._manifest, f)
+            os.replace(tmp_file, self.manifest_file)
+        except Exception as e:
+            logger.warning(f"Failed to save hash manifest: {e}")
+
+    @staticmethod
+    def _hash_file(filepath: Path) -> str:
+        """Hash the content of a file in chunks with BLAKE2b."""
+        hasher = hashlib.blake2b(digest_size=16)
+        with open(filepath, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def _file_digest(
+        self,
+        filepath: Path,
+        manifest: Dict[str, list],
+        now_ns: int,
+    ) -> Optional[str]:
+        """
+        Return the content digest of a file, reading it only when its
+        (size, mtime_ns, inode) differs from the manifest entry.
+
+        Files modified within the last ``RACY_WINDOW_NS`` are not recorded,
+        as a rewrite with the same size could keep the same mtime.
+        """
+        key = str(filepath)
+        stat = filepath.stat()
+        signature = [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+        entry = manifest.get(key)
+        if entry is not None and entry[:3] == signature:
+            return entry[3]
+
+        digest = self._hash_file(filepath)
+        if now_ns - stat.st_mtime_ns > RACY_WINDOW_NS:
+            manifest[key] = signature + [digest]
+            self._manifest_dirty = True
+        else:
+            manifest.pop(key, None)
+        return digest
+
     def _hash_directory(
         self,
         path: Path,
@@ -359,12 +435,16 @@ class BuildCache:
 
         Includes:
         - File paths (relative to directory)
-        - File contents
-        - File mtimes (for quick detection)
+        - File content digests
 
         Excludes:
         - Files matching ignore patterns
         - Empty directories
+        - File mtimes, so touching or checking out unchanged files keeps
+          the hash
+
+        Content digests are looked up in the manifest by (path, size,
+        mtime_ns, inode), so unchanged files are not read again.
 
         Args:
             path: Directory path to hash
@@ -379,9 +459,15 @@ class BuildCache:
             logger.warning(f"Directory not found for hashing: {path}")
             return "notfound"
 
+        manifest = self._load_manifest()
+        now_ns = time.time_ns()
+        root_prefix = str(path.resolve()) + os.sep
+        seen = set()
+
         try:
-            for root, dirs, files in sorted(os.walk(path)):
-                # Filter ignored directories (in-place)
+            for root, dirs, files in os.walk(path.resolve()):
+                # Filter ignored directories (in-place) so they are not
+                # walked at all
                 dirs[:] = [
                     d
                     for d in sorted(dirs)
@@ -390,25 +476,13 @@ class BuildCache:
 
                 for filename in sorted(files):
                     filepath = Path(root) / filename
+                    rel_path = str(filepath)[len(root_prefix) :]
 
-                    try:
-                        rel_path = filepath.relative_to(path)
-                    except ValueError:
-                        # Skip files outside the base path
-                        continue
-
-                    if self._should_ignore(str(rel_path), ignore_patterns):
+                    if self._should_ignore(rel_path, ignore_patterns):
                         continue
 
-                    # Hash: relative path + mtime + content
-                    hasher.update(str(rel_path).encode())
-
                     try:
-                        stat = filepath.stat()
-                        hasher.update(str(stat.st_mtime).encode())
-
-                        with open(filepath, "rb") as f:
-                            hasher.update(f.read())
+                        digest = self._file_digest(filepath, manifest, now_ns)
                     except (OSError, IOError) as e:
                         # Skip files that can't be read
                         logger.debug(
@@ -416,10 +490,26 @@ class BuildCache:
                         )
                         continue
 
+                    # Hash: relative path + content digest
+                    seen.add(str(filepath))
+                    hasher.update(rel_path.encode())
+                    hasher.update(b"\0")
+                    hasher.update(digest.encode())
+
         except Exception as e:
             logger.error(f"Error hashing directory {path}: {e}")
             return "error"
 
+        # Forget files removed from this directory
+        for key in list(manifest):
+            if key.startswith(root_prefix) and key not in seen:
+                del manifest[key]
+                self._manifest_dirty = True
+
+        if self._manifest_dirty:
+            self._save_manifest()
+            self._manifest_dirty = False
+
         return hasher.hexdigest()[:16]
 
     def _should_ignore(self, path: str, patterns: List[str]) -> bool:
@@ -12,13 +12,18 @@ This module provides packaging utilities that support:
 - CLI-style and object-style deployment patterns
 """
 
+import copy
 import inspect
 import logging
 import os
 import shutil
+import struct
 import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Tuple, Union
+from typing import Iterable, Iterator, Optional, List, Tuple, Union
 
 from jinja2 import Environment, FileSystemLoader, TemplateNotFound
 from pydantic import BaseModel
@@ -29,6 +34,15 @@ DEPLOYMENT_ZIP = "deployment.zip"
 TEMPLATES_DIR = Path(__file__).parent / "templates"
 DEFAULT_ENTRYPOINT_FILE = "runtime_main.py"
 
+# Read size when copying or compressing zip members
+ZIP_CHUNK_SIZE = 1024 * 1024
+# Larger files are compressed by ZipFile in the writer thread, streaming
+PARALLEL_COMPRESS_MAX_SIZE = 16 * 1024 * 1024
+# General purpose flag bit marking a trailing data descriptor
+_ZIP_DATA_DESCRIPTOR = 0x08
+# Header id of the zip64 extended information extra field
+_ZIP64_EXTRA_ID = 0x0001
+
 # Default workspace for build artifacts
 DEFAULT_BUILD_WORKSPACE = Path(os.getcwd()) / ".agentscope_runtime" / "builds"
 
@@ -501,25 +515,140 @@ def _should_ignore(path: str, patterns: List[str]) -> bool:
     return False
 
 
+def _strip_zip64_extra(extra: bytes) -> bytes:
+    """
+    Remove the zip64 extra fields from ``extra``.
+
+    ``ZipInfo.FileHeader`` appends its own zip64 field for large members,
+    so one copied from the source archive would be written twice, the way
+    ``ZipFile._write_end_record`` strips it from the central directory.
+    """
+    kept, pos = [], 0
+    while pos + 4 <= len(extra):
+        xid, size = struct.unpack("<HH", extra[pos : pos + 4])
+        end = pos + 4 + size
+        if xid != _ZIP64_EXTRA_ID:
+            kept.append(extra[pos:end])
+        pos = end
+    kept.append(extra[pos:])
+    return b"".join(kept)
+
+
+def _write_raw_member(
+    out: zipfile.ZipFile,
+    zinfo: zipfile.ZipInfo,
+    chunks: Iterable[bytes],
+) -> None:
+    """
+    Write an already compressed member to ``out``.
+
+    ``zinfo`` must carry the final CRC, sizes and compression method of the
+    data yielded by ``chunks``, which is written after the local header
+    without being decompressed or recompressed.
+
+    This relies on undocumented ZipFile internals, the ``filelist``,
+    ``NameToInfo``, ``start_dir`` and ``_didModify`` attributes that
+    ``ZipFile.write`` updates, which ``tests/deploy/test_package.py``
+    checks on every Python version the deploy tests run on.
+    """
+    zinfo.header_offset = out.fp.tell()
+    # Sizes are known up front, no data descriptor follows the data
+    zinfo.flag_bits &= ~_ZIP_DATA_DESCRIPTOR
+    zinfo.extra = _strip_zip64_extra(zinfo.extra)
+    out.fp.write(zinfo.FileHeader())
+    for chunk in chunks:
+        out.fp.write(chunk)
+
+    out.filelist.append(zinfo)
+    out.NameToInfo[zinfo.filename] = zinfo
+    out.start_dir = out.fp.tell()
+    out._didModify = True  # pylint: disable=protected-access
+
+
+def _read_raw_member(
+    src: zipfile.ZipFile,
+    info: zipfile.ZipInfo,
+) -> Iterator[bytes]:
+    """
+    Yield the compressed data of a member of ``src`` in chunks.
+
+    The local header is parsed with the undocumented ``structFileHeader``
+    and ``_FH_*`` constants of ``zipfile``, see ``_write_raw_member``.
+    """
+    src.fp.seek(info.header_offset)
+    header = struct.unpack(
+        zipfile.structFileHeader,
+        src.fp.read(zipfile.sizeFileHeader),
+    )
+    # pylint: disable=protected-access
+    src.fp.seek(
+        header[zipfile._FH_FILENAME_LENGTH]
+        + header[zipfile._FH_EXTRA_FIELD_LENGTH],
+        os.SEEK_CUR,
+    )
+    remaining = info.compress_size
+    while remaining > 0:
+        chunk = src.fp.read(min(ZIP_CHUNK_SIZE, remaining))
+        if not chunk:
+            raise zipfile.BadZipFile(f"Truncated member: {info.filename}")
+        remaining -= len(chunk)
+        yield chunk
+
+
+def _deflate_file(
+    file_path: str,
+    arcname: str,
+) -> Tuple[zipfile.ZipInfo, List[bytes]]:
+    """Compress a file the way ZipFile.write does, returning its entry."""
+    zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    # Raw deflate stream, as written by zipfile
+    compressor = zlib.compressobj(
+        zlib.Z_DEFAULT_COMPRESSION,
+        zlib.DEFLATED,
+        -15,
+    )
+    crc, file_size, data = 0, 0, []
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(ZIP_CHUNK_SIZE), b""):
+            crc = zlib.crc32(chunk, crc)
+            file_size += len(chunk)
+            data.append(compressor.compress(chunk))
+    data.append(compressor.flush())
+
+    zinfo.CRC = crc
+    zinfo.file_size = file_size
+    zinfo.compress_size = sum(len(chunk) for chunk in data)
+    return zinfo, data
+
+
 def package_code(
     source_dir: Path,
     output_zip: Path,
     ignore_patterns: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
 ) -> None:
     """
     Package project source code into a zip file.
 
+    Files are compressed across a thread pool (zlib releases the GIL) and
+    written in walk order as they complete; files larger than
+    ``PARALLEL_COMPRESS_MAX_SIZE`` are streamed by ZipFile directly, so at
+    most a bounded window of small compressed files is held in memory.
+
     Args:
         source_dir: Source directory to package
         output_zip: Output zip file path
         ignore_patterns: Optional ignore patterns (uses defaults if None)
+        max_workers: Compression threads (defaults to the CPU count)
     """
     if ignore_patterns is None:
         ignore_patterns = _get_default_ignore_patterns()
+    max_workers = max_workers or os.cpu_count() or 1
 
     logger.info(f"Packaging source code from {source_dir}")
 
-    with zipfile.ZipFile(output_zip, "w", zipfile.ZIP_DEFLATED) as zipf:
+    def _iter_files():
         for root, dirs, files in os.walk(source_dir):
             # Filter directories
             dirs[:] = [
@@ -539,7 +668,35 @@ def package_code(
                 if _should_ignore(arcname, ignore_patterns):
                     continue
 
-                zipf.write(file_path, arcname)
+                yield file_path, arcname
+
+    with zipfile.ZipFile(
+        output_zip,
+        "w",
+        zipfile.ZIP_DEFLATED,
+    ) as zipf, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+
+        def _write_next():
+            item = pending.popleft()
+            if isinstance(item, tuple):
+                zipf.write(*item)
+            else:
+                _write_raw_member(zipf, *item.result())
+
+        for file_path, arcname in _iter_files():
+            if os.path.getsize(file_path) > PARALLEL_COMPRESS_MAX_SIZE:
+                pending.append((file_path, arcname))
+            else:
+                pending.append(
+                    executor.submit(_deflate_file, file_path, arcname),
+                )
+            # Bound the compressed data waiting to be written
+            while len(pending) > max_workers * 4:
+                _write_next()
+
+        while pending:
+            _write_next()
 
     logger.info(f"Source code packaged: {output_zip}")
 
@@ -552,6 +709,11 @@ def _merge_zips(
     """
     Merge dependencies and code zips into a deployment package.
 
+    Members are copied raw, without decompressing and recompressing them,
+    in chunks of ``ZIP_CHUNK_SIZE``. Dependency entries shadowed by a code
+    entry of the same name are skipped by name, so memory use does not
+    depend on the size of the packages.
+
     Args:
         dependencies_zip: Path to dependencies.zip (optional)
         code_zip: Path to code.zip
@@ -560,16 +722,29 @@ def _merge_zips(
     logger.info("Merging packages into deployment.zip...")
 
     with zipfile.ZipFile(output_zip, "w", zipfile.ZIP_DEFLATED) as out:
-        # Layer 1: Dependencies
-        if dependencies_zip and dependencies_zip.exists():
-            with zipfile.ZipFile(dependencies_zip, "r") as dep:
-                for item in dep.namelist():
-                    out.writestr(item, dep.read(item))
-
-        # Layer 2: Code (overwrites conflicts)
         with zipfile.ZipFile(code_zip, "r") as code:
-            for item in code.namelist():
-                out.writestr(item, code.read(item))
+            code_names = set(code.namelist())
+
+            # Layer 1: Dependencies
+            if dependencies_zip and dependencies_zip.exists():
+                with zipfile.ZipFile(dependencies_zip, "r") as dep:
+                    for info in dep.infolist():
+                        # Code overwrites conflicts
+                        if info.filename in code_names:
+                            continue
+                        _write_raw_member(
+                            out,
+                            copy.copy(info),
+                            _read_raw_member(dep, info),
+                        )
+
+            # Layer 2: Code
+            for info in code.infolist():
+                _write_raw_member(
+                    out,
+                    copy.copy(info),
+                    _read_raw_member(code, info),
+                )
 
     logger.info(f"Deployment package created: {output_zip}")
 
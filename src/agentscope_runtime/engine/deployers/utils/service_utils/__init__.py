@@ -2,3 +2,4 @@
 from .fastapi_factory import FastAPIAppFactory
 from .fastapi_templates import FastAPITemplateManager
 from .process_manager import ProcessManager
+from .task_registry import BackgroundTaskRegistry, TaskQueueFullError
@@ -25,9 +25,19 @@ from ...adapter.protocol_adapter import ProtocolAdapter
 from ...adapter.responses.response_api_protocol_adapter import (
     ResponseAPIDefaultAdapter,
 )
+from .sse import SSEEventEncoder, coalesce_sse_frames
+from .task_registry import BackgroundTaskRegistry, TaskQueueFullError
+from .workers import (
+    check_worker_services,
+    start_worker,
+    stop_worker,
+    worker_health,
+)
 
 logger = logging.getLogger(__name__)
 
+_sse_encoder = SSEEventEncoder()
+
 
 class _WrappedFastAPI(FastAPI):
     """FastAPI subclass that can dynamically augment OpenAPI schemas."""
@@ -121,6 +131,8 @@ class FastAPIAppFactory:
         broker_url: Optional[str] = None,
         backend_url: Optional[str] = None,
         enable_embedded_worker: bool = False,
+        task_registry: Optional[BackgroundTaskRegistry] = None,
+        sse_flush_interval: Optional[float] = 0.0,
         app_kwargs: Optional[Dict] = None,
         **kwargs: Any,
     ) -> FastAPI:
@@ -141,6 +153,13 @@ class FastAPIAppFactory:
             broker_url: Celery broker URL
             backend_url: Celery backend URL
             enable_embedded_worker: Whether to run embedded Celery worker
+            task_registry: Registry used for task endpoints when Celery
+                is not configured; a default bounded one is created if
+                omitted
+            sse_flush_interval: Seconds to hold a streamed event so that
+                following events share its write; ``0`` only merges
+                events queued behind a slow client and ``None`` writes
+                every event separately
             app_kwargs: Additional keyword arguments for the FastAPI app
             **kwargs: Additional keyword arguments
 
@@ -205,6 +224,12 @@ class FastAPIAppFactory:
         app.state.backend_url = backend_url
         app.state.enable_embedded_worker = enable_embedded_worker
 
+        # In-memory task registry used when Celery is not configured
+        if task_registry is None:
+            task_registry = BackgroundTaskRegistry()
+        app.state.task_registry = task_registry
+        app.state.sse_flush_interval = sse_flush_interval
+
         # Add middleware
         FastAPIAppFactory._add_middleware(app, mode)
 
@@ -241,6 +266,10 @@ class FastAPIAppFactory:
                 f"Warning: Error during runner setup: {e}",
             )
 
+        # Refuse or warn about state that multiple workers cannot share
+        check_worker_services(app)
+        start_worker(app)
+
         # Call custom startup callback
         if before_start:
             if asyncio.iscoroutinefunction(before_start):
@@ -319,6 +348,8 @@ class FastAPIAppFactory:
         **kwargs,
     ):
         """Handle application shutdown."""
+        await stop_worker(app)
+
         # Call custom shutdown callback
         if after_finish:
             if asyncio.iscoroutinefunction(after_finish):
@@ -335,6 +366,11 @@ class FastAPIAppFactory:
             except Exception as e:
                 logger.error(f"Warning: Error during runner cleanup: {e}")
 
+        # Stop in-memory background tasks and their thread pool
+        task_registry = getattr(app.state, "task_registry", None)
+        if task_registry is not None:
+            await task_registry.shutdown()
+
     @staticmethod
     async def _create_internal_runner():
         """Create internal runner with configured services."""
@@ -404,8 +440,26 @@ class FastAPIAppFactory:
             else:
                 status["runner"] = "not_ready"
 
+            admission = getattr(
+                app.state.runner,
+                "admission_controller",
+                None,
+            )
+            if admission is not None:
+                status["admission"] = admission.metrics()
+
+            workers = worker_health(app)
+            if workers is not None:
+                status["workers"] = workers
+
             return status
 
+        # Background task metrics endpoint
+        @app.get("/metrics/tasks")
+        async def task_metrics():
+            """Queue depth and latency of in-memory background tasks."""
+            return FastAPIAppFactory._get_task_registry(app).metrics()
+
         # Agent API endpoint
         @app.post(
             endpoint_path,
@@ -431,11 +485,29 @@ class FastAPIAppFactory:
             Agent API endpoint, see
             <https://runtime.agentscope.io/en/protocol.html> for more details.
             """
+            admission = getattr(
+                app.state.runner,
+                "admission_controller",
+                None,
+            )
+            if admission is not None and admission.is_full():
+                return JSONResponse(
+                    status_code=429,
+                    content={
+                        "error": "Agent is overloaded, please retry later",
+                        "code": "AGENT_OVERLOADED",
+                        **admission.metrics(),
+                    },
+                )
+            frames = FastAPIAppFactory._create_stream_generator(
+                app,
+                request=request,
+            )
+            flush_interval = getattr(app.state, "sse_flush_interval", None)
+            if flush_interval is not None:
+                frames = coalesce_sse_frames(frames, flush_interval)
             return StreamingResponse(
-                FastAPIAppFactory._create_stream_generator(
-                    app,
-                    request=request,
-                ),
+                frames,
                 media_type="text/event-stream",
                 headers={
                     "Cache-Control": "no-cache",
@@ -571,13 +643,11 @@ class FastAPIAppFactory:
     @staticmethod
     async def _create_stream_generator(app: FastAPI, request: dict):
         """Create streaming response generator."""
+        encode = _sse_encoder.encode
         try:
             runner = FastAPIAppFactory._get_runner_instance(app)
             if not runner:
-                yield (
-                    f"data: {json.dumps({'error': 'Runner not initialized'})}"
-                    f"\n\n"
-                )
+                yield encode({"error": "Runner not initialized"})
                 return
 
             if app.state.custom_func:
@@ -586,19 +656,14 @@ class FastAPIAppFactory:
                     app.state.custom_func,
                     request,
                 )
-                yield f"data: {json.dumps({'text': str(result)})}\n\n"
+                yield encode({"text": str(result)})
             else:
                 # Use runner streaming
                 async for chunk in runner.stream_query(request):
-                    if hasattr(chunk, "model_dump_json"):
-                        yield f"data: {chunk.model_dump_json()}\n\n"
-                    elif hasattr(chunk, "json"):
-                        yield f"data: {chunk.json()}\n\n"
-                    else:
-                        yield f"data: {json.dumps({'text': str(chunk)})}\n\n"
+                    yield encode(chunk)
 
         except Exception as e:
-            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+            yield encode({"error": str(e)})
 
     @staticmethod
     async def _collect_stream_response(runner, request: dict) -> str:
@@ -669,8 +734,10 @@ class FastAPIAppFactory:
             return wrapped_handler
 
     @staticmethod
-    def _to_sse_event(item: Any) -> str:
+    def _to_sse_event(item: Any) -> bytes:
         """Normalize streaming items into JSON-serializable structures."""
+        if isinstance(item, BaseModel):
+            return _sse_encoder.encode(item)
 
         def _serialize(value: Any, depth: int = 0):
             if depth > 20:
@@ -697,7 +764,8 @@ class FastAPIAppFactory:
 
         serialized = _serialize(item, depth=0)
 
-        return f"data: {json.dumps(serialized, ensure_ascii=False)}\n\n"
+        payload = json.dumps(serialized, ensure_ascii=False)
+        return f"data: {payload}\n\n".encode("utf-8")
 
     @staticmethod
     def _create_streaming_parameter_wrapper(
@@ -942,33 +1010,20 @@ class FastAPIAppFactory:
                     }
 
                 else:
-                    # Fallback to in-memory task processing
-                    import time
-
-                    # Initialize task storage if not exists
-                    if not hasattr(app.state, "active_tasks"):
-                        app.state.active_tasks = {}
-
-                    # Create task info for tracking
-                    task_info = {
-                        "task_id": task_id,
-                        "status": "submitted",
-                        "queue": queue,
-                        "submitted_at": time.time(),
-                        "request": request,
-                    }
-                    app.state.active_tasks[task_id] = task_info
-
-                    # Execute task asynchronously in background
-                    asyncio.create_task(
-                        FastAPIAppFactory._execute_background_task(
-                            app,
-                            task_id,
-                            task_func,
-                            request,
-                            queue,
-                        ),
-                    )
+                    # Fallback to the in-memory task registry
+                    registry = FastAPIAppFactory._get_task_registry(app)
+                    try:
+                        registry.submit(task_id, task_func, request, queue)
+                    except TaskQueueFullError as e:
+                        return JSONResponse(
+                            status_code=429,
+                            content={
+                                "error": str(e),
+                                "type": "task",
+                                "queue": queue,
+                                "status": "rejected",
+                            },
+                        )
 
                     return {
                         "task_id": task_id,
@@ -989,68 +1044,14 @@ class FastAPIAppFactory:
         return task_endpoint
 
     @staticmethod
-    async def _execute_background_task(
-        app: FastAPI,
-        task_id: str,
-        func: Callable,
-        request: dict,
-        queue: str,
-    ):
-        """Execute task in background and update status."""
-        try:
-            import time
-            import concurrent.futures
-
-            # Update status to running
-            if (
-                hasattr(app.state, "active_tasks")
-                and task_id in app.state.active_tasks
-            ):
-                app.state.active_tasks[task_id].update(
-                    {
-                        "status": "running",
-                        "started_at": time.time(),
-                    },
-                )
-
-            # Execute the actual task function
-            if asyncio.iscoroutinefunction(func):
-                result = await func(request)
-            else:
-                # Run sync function in thread pool to avoid blocking
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    result = await asyncio.get_event_loop().run_in_executor(
-                        executor,
-                        func,
-                        request,
-                    )
-
-            # Update status to completed
-            if (
-                hasattr(app.state, "active_tasks")
-                and task_id in app.state.active_tasks
-            ):
-                app.state.active_tasks[task_id].update(
-                    {
-                        "status": "completed",
-                        "result": result,
-                        "completed_at": time.time(),
-                    },
-                )
-
-        except Exception as e:
-            # Update status to failed
-            if (
-                hasattr(app.state, "active_tasks")
-                and task_id in app.state.active_tasks
-            ):
-                app.state.active_tasks[task_id].update(
-                    {
-                        "status": "failed",
-                        "error": str(e),
-                        "failed_at": time.time(),
-                    },
-                )
+    def _get_task_registry(app: FastAPI) -> BackgroundTaskRegistry:
+        """Return the in-memory task registry, creating a default one if
+        the app was built without it."""
+        registry = getattr(app.state, "task_registry", None)
+        if registry is None:
+            registry = BackgroundTaskRegistry()
+            app.state.task_registry = registry
+        return registry
 
     @staticmethod
     def _create_task_status_handler(app: FastAPI):
@@ -1068,13 +1069,11 @@ class FastAPIAppFactory:
 
             else:
                 # Fallback to in-memory task status checking
-                if (
-                    not hasattr(app.state, "active_tasks")
-                    or task_id not in app.state.active_tasks
-                ):
+                registry = FastAPIAppFactory._get_task_registry(app)
+                task_info = registry.get(task_id)
+                if task_info is None:
                     return {"error": f"Task {task_id} not found"}
 
-                task_info = app.state.active_tasks[task_id]
                 task_status = task_info.get("status", "unknown")
 
                 # Align with BaseApp.get_task logic - map internal status to
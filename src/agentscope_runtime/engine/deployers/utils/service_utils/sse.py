@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""Server-Sent Events encoding for the agent streaming endpoint."""
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Type
+
+from pydantic import BaseModel
+
+# Upper bound of a single coalesced write.
+MAX_COALESCED_BYTES = 64 * 1024
+
+# Number of encoded events buffered ahead of a slow client.
+MAX_BUFFERED_EVENTS = 256
+
+_END = object()
+
+
+class SSEEventEncoder:
+    """Encode streamed events into ``data: ...`` SSE frames.
+
+    Serializers are resolved once per event class and cached, so pydantic
+    events go straight to their compiled core serializer instead of
+    through ``model_dump_json()``. Delta events (events with a truthy
+    ``delta`` field, such as streamed content chunks) are serialized
+    without their ``None`` fields, which keeps token-level frames small.
+    Plain dicts and lists are dumped as JSON, objects with a ``json()``
+    method use it, and anything else is sent as ``{"text": str(event)}``.
+    """
+
+    def __init__(self, skip_none_on_delta: bool = True):
+        self.skip_none_on_delta = skip_none_on_delta
+        self._serializers: Dict[Type, Callable[[Any], bytes]] = {}
+
+    def encode(self, event: Any) -> bytes:
+        """Return the SSE frame of ``event``."""
+        return b"data: " + self.to_json(event) + b"\n\n"
+
+    def to_json(self, event: Any) -> bytes:
+        """Return the JSON payload of ``event``."""
+        cls = type(event)
+        serializer = self._serializers.get(cls)
+        if serializer is None:
+            serializer = self._build_serializer(cls)
+            self._serializers[cls] = serializer
+        return serializer(event)
+
+    def _build_serializer(self, cls: Type) -> Callable[[Any], bytes]:
+        if issubclass(cls, BaseModel):
+            to_json = cls.__pydantic_serializer__.to_json
+            if self.skip_none_on_delta and "delta" in cls.model_fields:
+
+                def serialize_model(event: BaseModel) -> bytes:
+                    return to_json(event, exclude_none=bool(event.delta))
+
+                return serialize_model
+            return to_json
+
+        if issubclass(cls, (dict, list)):
+
+            def serialize_plain(event: Any) -> bytes:
+                return json.dumps(event).encode("utf-8")
+
+            return serialize_plain
+
+        if callable(getattr(cls, "json", None)):
+
+            def serialize_json(event: Any) -> bytes:
+                payload = event.json()
+                if isinstance(payload, str):
+                    payload = payload.encode("utf-8")
+                return payload
+
+            return serialize_json
+
+        def serialize_text(event: Any) -> bytes:
+            return json.dumps({"text": str(event)}).encode("utf-8")
+
+        return serialize_text
+
+
+async def coalesce_sse_frames(
+    frames: AsyncIterator[bytes],
+    flush_interval: float = 0.0,
+    max_bytes: int = MAX_COALESCED_BYTES,
+    max_buffered: int = MAX_BUFFERED_EVENTS,
+) -> AsyncIterator[bytes]:
+    """Merge SSE frames that pile up behind a slow client into one write.
+
+    ``frames`` is consumed in a background task that runs up to
+    ``max_buffered`` frames ahead of the client. Each time the client is
+    ready for more data, every frame that arrived in the meantime is sent
+    as a single chunk of at most ``max_bytes``, so a fast client still
+    gets one write per event while a slow one gets fewer, larger writes.
+    With a positive ``flush_interval`` the first frame of a write is held
+    for that many seconds to collect more frames.
+
+    Frames must be fully encoded before they are yielded by ``frames``,
+    since the source may mutate its events once it moves on.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_buffered)
+
+    async def produce():
+        try:
+            async for frame in frames:
+                await queue.put(frame)
+        except Exception as e:
+            await queue.put(e)
+            return
+        await queue.put(_END)
+
+    producer = asyncio.create_task(produce())
+    pending: Optional[Any] = None
+    try:
+        while True:
+            item = pending if pending is not None else await queue.get()
+            pending = None
+            if item is _END:
+                return
+            if isinstance(item, Exception):
+                raise item
+
+            if flush_interval > 0:
+                await asyncio.sleep(flush_interval)
+
+            parts = [item]
+            size = len(item)
+            while size < max_bytes and not queue.empty():
+                item = queue.get_nowait()
+                if not isinstance(item, bytes):
+                    # End of stream or an error; flush what we have first.
+                    pending = item
+                    break
+                parts.append(item)
+                size += len(item)
+
+            yield parts[0] if len(parts) == 1 else b"".join(parts)
+    finally:
+        if not producer.done():
+            producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+"""In-memory registry for background tasks submitted to ``@task``
+endpoints when no Celery broker is configured."""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Statuses after which a task will never change again.
+FINISHED_STATUSES = ("completed", "failed")
+
+
+class TaskQueueFullError(RuntimeError):
+    """Raised when a queue has reached its pending task limit."""
+
+    def __init__(self, queue: str, limit: int):
+        super().__init__(
+            f"Task queue {queue} is full ({limit} pending tasks)",
+        )
+        self.queue = queue
+        self.limit = limit
+
+
+class _QueueState:
+    """Concurrency limit and counters of a single task queue."""
+
+    def __init__(self, concurrency: int):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.concurrency = concurrency
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.total_run = 0.0
+        self.max_wait = 0.0
+        self.max_run = 0.0
+
+    def metrics(self) -> Dict[str, Any]:
+        finished = self.completed + self.failed
+        return {
+            "concurrency": self.concurrency,
+            "waiting": self.waiting,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_wait_seconds": (
+                self.total_wait / finished if finished else 0.0
+            ),
+            "max_wait_seconds": self.max_wait,
+            "avg_run_seconds": self.total_run / finished if finished else 0.0,
+            "max_run_seconds": self.max_run,
+        }
+
+
+class BackgroundTaskRegistry:
+    """Bounded registry and executor for in-process background tasks.
+
+    Tasks are tracked as plain dicts keyed by task id. Finished tasks are
+    evicted once they are older than ``ttl_seconds`` or when more than
+    ``max_tasks`` tasks are tracked, oldest first; tasks that are still
+    waiting or running are never evicted. Each queue runs at most
+    ``queue_concurrency`` tasks at a time and rejects new submissions with
+    :class:`TaskQueueFullError` once ``max_pending`` tasks are waiting or
+    running. Sync task functions share one bounded thread pool.
+    """
+
+    def __init__(
+        self,
+        max_tasks: int = 1000,
+        ttl_seconds: Optional[float] = 3600.0,
+        max_workers: Optional[int] = None,
+        queue_concurrency: int = 4,
+        max_pending: int = 100,
+        queue_limits: Optional[Dict[str, int]] = None,
+    ):
+        """Initialize the registry.
+
+        Args:
+            max_tasks: Maximum number of tasks kept for status lookups.
+            ttl_seconds: How long a finished task stays available, or
+                ``None`` to keep finished tasks until ``max_tasks`` is hit.
+            max_workers: Size of the thread pool shared by sync tasks.
+                Defaults to the ``ThreadPoolExecutor`` default.
+            queue_concurrency: Default number of tasks a queue runs at once.
+            max_pending: Maximum number of waiting plus running tasks per
+                queue before submissions are rejected.
+            queue_limits: Per-queue overrides of ``queue_concurrency``.
+        """
+        if max_tasks < 1:
+            raise ValueError("max_tasks must be at least 1")
+        if queue_concurrency < 1:
+            raise ValueError("queue_concurrency must be at least 1")
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+
+        self.max_tasks = max_tasks
+        self.ttl_seconds = ttl_seconds
+        self.max_workers = max_workers
+        self.queue_concurrency = queue_concurrency
+        self.max_pending = max_pending
+        self.queue_limits = dict(queue_limits or {})
+
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        # Finished task ids mapped to their monotonic finish time, in
+        # finishing order so that expired tasks are always at the front.
+        self._finished: "OrderedDict[str, float]" = OrderedDict()
+        self._queues: Dict[str, _QueueState] = {}
+        self._running_tasks: set = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __contains__(self, task_id: str) -> bool:
+        return self.get(task_id) is not None
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Return the tracked info of a task, or ``None`` if unknown or
+        evicted."""
+        self._evict()
+        return self._tasks.get(task_id)
+
+    def submit(
+        self,
+        task_id: str,
+        func: Callable,
+        request: Any,
+        queue: str = "default",
+    ) -> Dict[str, Any]:
+        """Register a task and schedule it on the running event loop.
+
+        Raises:
+            TaskQueueFullError: If ``queue`` already has ``max_pending``
+                waiting or running tasks.
+        """
+        state = self._queue_state(queue)
+        if state.waiting + state.running >= self.max_pending:
+            state.rejected += 1
+            raise TaskQueueFullError(queue, self.max_pending)
+
+        task_info = {
+            "task_id": task_id,
+            "status": "submitted",
+            "queue": queue,
+            "submitted_at": time.time(),
+            "request": request,
+        }
+        self._tasks[task_id] = task_info
+        state.waiting += 1
+        self._evict()
+
+        task = asyncio.create_task(
+            self._run(task_info, func, request, state),
+        )
+        # The event loop only keeps weak references to tasks.
+        self._running_tasks.add(task)
+        task.add_done_callback(self._running_tasks.discard)
+        return task_info
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return task counts plus depth and latency of every queue."""
+        self._evict()
+        return {
+            "tasks": len(self._tasks),
+            "max_tasks": self.max_tasks,
+            "finished": len(self._finished),
+            "queues": {
+                name: state.metrics() for name, state in self._queues.items()
+            },
+        }
+
+    async def shutdown(self, cancel: bool = True) -> None:
+        """Cancel unfinished tasks and release the shared thread pool."""
+        tasks = list(self._running_tasks)
+        if cancel:
+            for task in tasks:
+                task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _queue_state(self, queue: str) -> _QueueState:
+        state = self._queues.get(queue)
+        if state is None:
+            state = _QueueState(
+                self.queue_limits.get(queue, self.queue_concurrency),
+            )
+            self._queues[queue] = state
+        return state
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="agentscope-task",
+            )
+        return self._executor
+
+    async def _run(
+        self,
+        task_info: Dict[str, Any],
+        func: Callable,
+        request: Any,
+        state: _QueueState,
+    ) -> None:
+        enqueued = time.monotonic()
+        started = None
+        try:
+            async with state.semaphore:
+                started = time.monotonic()
+                state.waiting -= 1
+                state.running += 1
+                task_info.update(
+                    {
+                        "status": "running",
+                        "started_at": time.time(),
+                    },
+                )
+                try:
+                    if asyncio.iscoroutinefunction(func):
+                        result = await func(request)
+                    else:
+                        loop = asyncio.get_running_loop()
+                        result = await loop.run_in_executor(
+                            self._get_executor(),
+                            func,
+                            request,
+                        )
+                finally:
+                    state.running -= 1
+            task_info.update(
+                {
+                    "status": "completed",
+                    "result": result,
+                    "completed_at": time.time(),
+                },
+            )
+            state.completed += 1
+        except asyncio.CancelledError:
+            if started is None:
+                state.waiting -= 1
+            task_info.update(
+                {
+                    "status": "failed",
+                    "error": "Task cancelled",
+                    "failed_at": time.time(),
+                },
+            )
+            state.failed += 1
+            raise
+        except Exception as e:
+            logger.error(f"Background task {task_info['task_id']} failed: {e}")
+            task_info.update(
+                {
+                    "status": "failed",
+                    "error": str(e),
+                    "failed_at": time.time(),
+                },
+            )
+            state.failed += 1
+        finally:
+            self._finish(task_info, state, enqueued, started)
+
+    def _finish(
+        self,
+        task_info: Dict[str, Any],
+        state: _QueueState,
+        enqueued: float,
+        started: Optional[float],
+    ) -> None:
+        now = time.monotonic()
+        if started is not None:
+            wait = started - enqueued
+            run = now - started
+            state.total_wait += wait
+            state.total_run += run
+            state.max_wait = max(state.max_wait, wait)
+            state.max_run = max(state.max_run, run)
+
+        # The request payload is only needed while the task runs.
+        task_info.pop("request", None)
+        task_id = task_info["task_id"]
+        if self._tasks.get(task_id) is task_info:
+            self._finished[task_id] = now
+        self._evict()
+
+    def _evict(self) -> None:
+        if self.ttl_seconds is not None:
+            deadline = time.monotonic() - self.ttl_seconds
+            while self._finished:
+                task_id, finished_at = next(iter(self._finished.items()))
+                if finished_at > deadline:
+                    break
+                self._drop(task_id)
+
+        while len(self._tasks) > self.max_tasks and self._finished:
+            self._drop(next(iter(self._finished)))
+
+    def _drop(self, task_id: str) -> None:
+        self._finished.pop(task_id, None)
+        self._tasks.pop(task_id, None)
@@ -0,0 +1,417 @@
+# -*- coding: utf-8 -*-
+# pylint:disable=protected-access
+"""Pre-fork multi-worker serving for FastAPI apps built by
+:class:`FastAPIAppFactory`."""
+
+import asyncio
+import logging
+import os
+import signal
+import time
+from multiprocessing.sharedctypes import RawArray
+from typing import Any, Dict, List, Optional, Tuple
+
+import uvicorn
+
+logger = logging.getLogger(__name__)
+
+# Seconds between two heartbeats of a worker.
+WORKER_HEARTBEAT_INTERVAL = 5.0
+
+# Exit code of a worker whose application failed to start.
+STARTUP_FAILURE_EXIT_CODE = 3
+
+WORKER_STATES = ("starting", "ready", "stopping", "stopped")
+
+# Seconds a worker must run for its exit not to count as a crash loop.
+WORKER_RESTART_RESET = 60.0
+
+# Delay before restarting a worker that crashed within
+# WORKER_RESTART_RESET, doubled on each further crash.
+WORKER_RESTART_BACKOFF = 1.0
+WORKER_RESTART_MAX_BACKOFF = 30.0
+
+# Crashes in a row, each within WORKER_RESTART_RESET, that stop the pool.
+WORKER_MAX_RESTARTS = 5
+
+# Seconds between two checks for exited workers while a restart waits.
+_RESTART_POLL_INTERVAL = 0.1
+
+
+class WorkerStatusBoard:
+    """Status of every worker, shared between processes.
+
+    The board lives in shared memory created before the workers are
+    forked. Each worker only writes its own slot, so no locking is
+    needed; readers may see a slot mid-update at worst.
+    """
+
+    _FIELDS = 4  # pid, state, started_at, heartbeat
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._values = RawArray("d", workers * self._FIELDS)
+
+    def update(
+        self,
+        index: int,
+        state: str,
+        pid: Optional[int] = None,
+    ) -> None:
+        """Record the state of worker ``index`` and refresh its
+        heartbeat."""
+        base = index * self._FIELDS
+        now = time.time()
+        if pid is not None:
+            self._values[base] = pid
+            self._values[base + 2] = now
+        self._values[base + 1] = WORKER_STATES.index(state)
+        self._values[base + 3] = now
+
+    def heartbeat(self, index: int) -> None:
+        """Refresh the heartbeat of worker ``index``."""
+        self._values[index * self._FIELDS + 3] = time.time()
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Return the status of all workers.
+
+        A ready worker whose heartbeat is older than three heartbeat
+        intervals is reported as ``unresponsive``.
+        """
+        now = time.time()
+        workers = []
+        for index in range(self.workers):
+            base = index * self._FIELDS
+            pid, state, started_at, heartbeat = self._values[
+                base : base + self._FIELDS
+            ]
+            status = WORKER_STATES[int(state)]
+            if (
+                status == "ready"
+                and now - heartbeat > 3 * WORKER_HEARTBEAT_INTERVAL
+            ):
+                status = "unresponsive"
+            workers.append(
+                {
+                    "index": index,
+                    "pid": int(pid) or None,
+                    "status": status,
+                    "uptime": now - started_at if started_at else None,
+                    "last_heartbeat": now - heartbeat if heartbeat else None,
+                },
+            )
+        return workers
+
+
+def find_in_memory_services(runner: Any) -> List[str]:
+    """Return ``attribute: ClassName`` of in-memory services held by
+    ``runner``, whose state cannot be shared between worker processes."""
+    from ....services.agent_state.state_service import InMemoryStateService
+    from ....services.memory.memory_service import InMemoryMemoryService
+    from ....services.session_history.session_history_service import (
+        InMemorySessionHistoryService,
+    )
+
+    in_memory_types = (
+        InMemoryStateService,
+        InMemoryMemoryService,
+        InMemorySessionHistoryService,
+    )
+    found = []
+    for name, value in vars(runner).items():
+        if isinstance(value, in_memory_types):
+            found.append(f"{name}: {type(value).__name__}")
+    return found
+
+
+def find_in_memory_task_registry(app: Any) -> List[str]:
+    """Return ``task_registry: ClassName`` if the app's task endpoints
+    run on its in-process task registry, i.e. without a Celery broker.
+
+    A task submitted to one worker is then unknown to the others, so a
+    status poll served by another worker reports it as not found.
+    """
+    if getattr(app.state, "celery_mixin", None):
+        return []
+    endpoints = getattr(app.state, "custom_endpoints", None) or []
+    if not any(endpoint.get("task_type") for endpoint in endpoints):
+        return []
+    registry = getattr(app.state, "task_registry", None)
+    name = type(registry).__name__ if registry else "BackgroundTaskRegistry"
+    return [f"task_registry: {name}"]
+
+
+def check_worker_services(app: Any) -> None:
+    """Warn, or fail when in-memory services are not allowed, if this
+    worker's runner holds in-memory services, or its task endpoints use
+    the in-process task registry, while sharing the app with other
+    workers."""
+    workers = getattr(app.state, "workers", 1)
+    if workers <= 1:
+        return
+
+    runner = getattr(app.state, "runner", None)
+    found = find_in_memory_services(runner) if runner is not None else []
+    found += find_in_memory_task_registry(app)
+    if not found:
+        return
+
+    message = (
+        f"In-memory services are not shared across the {workers} "
+        f"workers, each worker keeps its own copy: {', '.join(found)}. "
+        f"Use Redis or Tablestore backed services, and a Celery broker "
+        f"for task endpoints, instead."
+    )
+    if getattr(app.state, "allow_in_memory_services", True):
+        logger.warning(message)
+    else:
+        raise RuntimeError(message)
+
+
+async def _heartbeat_loop(board: WorkerStatusBoard, index: int) -> None:
+    while True:
+        board.heartbeat(index)
+        await asyncio.sleep(WORKER_HEARTBEAT_INTERVAL)
+
+
+def start_worker(app: Any) -> None:
+    """Mark the current worker as ready and start its heartbeat.
+
+    Must be called from the app's startup hook; does nothing when the
+    app is not served by :func:`serve_workers`.
+    """
+    board = getattr(app.state, "worker_board", None)
+    index = getattr(app.state, "worker_index", None)
+    if board is None or index is None:
+        return
+    board.update(index, "ready", pid=os.getpid())
+    app.state.worker_heartbeat = asyncio.create_task(
+        _heartbeat_loop(board, index),
+    )
+
+
+async def stop_worker(app: Any) -> None:
+    """Stop the heartbeat started by :func:`start_worker`."""
+    heartbeat = getattr(app.state, "worker_heartbeat", None)
+    if heartbeat is not None:
+        heartbeat.cancel()
+        await asyncio.gather(heartbeat, return_exceptions=True)
+        app.state.worker_heartbeat = None
+
+    board = getattr(app.state, "worker_board", None)
+    index = getattr(app.state, "worker_index", None)
+    if board is not None and index is not None:
+        board.update(index, "stopping")
+
+
+def worker_health(app: Any) -> Optional[Dict[str, Any]]:
+    """Return the ``/health`` section describing the workers, or ``None``
+    when the app runs in a single process."""
+    board = getattr(app.state, "worker_board", None)
+    if board is None:
+        return None
+    workers = board.snapshot()
+    return {
+        "worker": getattr(app.state, "worker_index", None),
+        "total": board.workers,
+        "ready": sum(w["status"] == "ready" for w in workers),
+        "workers": workers,
+    }
+
+
+def serve_workers(
+    app: Any,
+    host: str,
+    port: int,
+    workers: int = 1,
+    allow_in_memory_services: bool = True,
+    **uvicorn_kwargs: Any,
+) -> None:
+    """Serve ``app`` with uvicorn from ``workers`` pre-forked processes.
+
+    The listening socket is bound once in the parent and inherited by
+    every worker, and each worker runs the app's lifespan, so ``init`` and
+    ``shutdown`` handlers run once per worker. Workers that exit
+    unexpectedly are restarted, with a growing delay when they keep
+    crashing shortly after starting; a worker that fails to start, or
+    crashes ``WORKER_MAX_RESTARTS`` times in a row, stops the whole pool.
+    On platforms without ``fork`` a single worker is used.
+
+    Args:
+        app: FastAPI app created by ``FastAPIAppFactory.create_app``.
+        host: Host to bind to.
+        port: Port to bind to.
+        workers: Number of worker processes.
+        allow_in_memory_services: Only warn, instead of failing worker
+            startup, when a worker's runner holds in-memory services or
+            its task endpoints run without a Celery broker.
+        **uvicorn_kwargs: Extra ``uvicorn.Config`` arguments.
+    """
+    if workers > 1 and not hasattr(os, "fork"):
+        logger.warning(
+            "Multiple workers need os.fork, which is unavailable on this "
+            "platform; serving with a single worker.",
+        )
+        workers = 1
+
+    if workers <= 1:
+        uvicorn.run(app, host=host, port=port, **uvicorn_kwargs)
+        return
+
+    app.state.workers = workers
+    app.state.allow_in_memory_services = allow_in_memory_services
+    app.state.worker_board = WorkerStatusBoard(workers)
+
+    config = uvicorn.Config(app, host=host, port=port, **uvicorn_kwargs)
+    sock = config.bind_socket()
+    pool = _WorkerPool(app, config, sock, workers)
+    try:
+        pool.run()
+    finally:
+        sock.close()
+    if pool.failed:
+        raise SystemExit(STARTUP_FAILURE_EXIT_CODE)
+
+
+class _WorkerPool:
+    """Fork, supervise and stop uvicorn worker processes."""
+
+    def __init__(self, app: Any, config: Any, sock: Any, workers: int):
+        self.app = app
+        self.config = config
+        self.sock = sock
+        self.workers = workers
+        self.children: Dict[int, int] = {}
+        # Start time and crashes in a row of each worker index
+        self.started: Dict[int, float] = {}
+        self.crashes: Dict[int, int] = {}
+        # Worker indexes waiting to be restarted, with their due time
+        self.restarts: Dict[int, float] = {}
+        self.stopping = False
+        self.failed = False
+
+    def run(self) -> None:
+        previous = {
+            sig: signal.signal(sig, self._handle_signal)
+            for sig in (signal.SIGINT, signal.SIGTERM)
+        }
+        try:
+            logger.info(
+                f"Starting {self.workers} workers on "
+                f"{self.config.host}:{self.config.port} "
+                f"(parent pid {os.getpid()})",
+            )
+            for index in range(self.workers):
+                self._spawn(index)
+            self._supervise()
+        finally:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+
+    def _spawn(self, index: int) -> None:
+        board = self.app.state.worker_board
+        pid = os.fork()
+        if pid:
+            board.update(index, "starting", pid=pid)
+            self.children[pid] = index
+            self.started[index] = time.monotonic()
+            return
+
+        # Worker process: let uvicorn install its own signal handlers.
+        code = 0
+        try:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            self.app.state.worker_index = index
+            server = uvicorn.Server(self.config)
+            server.run(sockets=[self.sock])
+            if not server.started:
+                code = STARTUP_FAILURE_EXIT_CODE
+        except BaseException:  # pylint: disable=broad-except
+            logger.exception(f"Worker {index} crashed")
+            code = 1
+        finally:
+            board.update(index, "stopped")
+            os._exit(code)
+
+    def _supervise(self) -> None:
+        while self.children or self.restarts:
+            self._restart_due()
+            try:
+                pid, status = self._wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+
+            index = self.children.pop(pid, None)
+            if index is None:
+                continue
+            self.app.state.worker_board.update(index, "stopped")
+            code = os.waitstatus_to_exitcode(status)
+            if self.stopping:
+                continue
+            if code == STARTUP_FAILURE_EXIT_CODE:
+                logger.error(f"Worker {index} failed to start, stopping")
+                self.failed = True
+                self._stop()
+                continue
+            self._schedule_restart(index, pid, code)
+
+    def _wait(self) -> Tuple[int, int]:
+        """Wait for a worker to exit, or poll while a restart is due."""
+        if not self.restarts:
+            return os.wait()
+        delay = min(self.restarts.values()) - time.monotonic()
+        if delay > 0:
+            time.sleep(min(delay, _RESTART_POLL_INTERVAL))
+        if not self.children:
+            return 0, 0
+        return os.waitpid(-1, os.WNOHANG)
+
+    def _restart_due(self) -> None:
+        now = time.monotonic()
+        for index, due in list(self.restarts.items()):
+            if due <= now:
+                del self.restarts[index]
+                self._spawn(index)
+
+    def _schedule_restart(self, index: int, pid: int, code: int) -> None:
+        if time.monotonic() - self.started[index] >= WORKER_RESTART_RESET:
+            crashes = 0
+        else:
+            crashes = self.crashes.get(index, 0) + 1
+        self.crashes[index] = crashes
+        if crashes > WORKER_MAX_RESTARTS:
+            logger.error(
+                f"Worker {index} (pid {pid}) exited with code {code} "
+                f"after {WORKER_MAX_RESTARTS} quick restarts, stopping",
+            )
+            self.failed = True
+            self._stop()
+            return
+
+        delay = 0.0
+        if crashes:
+            delay = min(
+                WORKER_RESTART_BACKOFF * 2 ** (crashes - 1),
+                WORKER_RESTART_MAX_BACKOFF,
+            )
+        logger.warning(
+            f"Worker {index} (pid {pid}) exited with code {code}, "
+            f"restarting in {delay:.1f}s",
+        )
+        self.restarts[index] = time.monotonic() + delay
+
+    def _handle_signal(self, signum, _frame) -> None:
+        logger.info(f"Received signal {signum}, stopping workers")
+        self._stop()
+
+    def _stop(self) -> None:
+        self.stopping = True
+        self.restarts.clear()
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
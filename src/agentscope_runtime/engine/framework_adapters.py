@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+import inspect
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from .constant import ALLOWED_FRAMEWORK_TYPES
+from .schemas.agent_schemas import Event, Message
+
+
+@dataclass(frozen=True)
+class FrameworkAdapter:
+    """How :class:`Runner` talks to one agent framework.
+
+    Attributes:
+        stream_adapter: Called with ``source_stream=`` the query handler's
+            output and returns an async iterator of runtime events.
+        message_converter: Optional sync or async callable converting the
+            request's ``input`` messages into framework messages, passed
+            to the query handler as ``msgs``.
+    """
+
+    stream_adapter: Callable[..., AsyncIterator[Event]]
+    message_converter: Optional[Callable[[List[Message]], Any]] = None
+
+    async def convert_messages(self, messages: List[Message]) -> Any:
+        """Convert request messages with ``message_converter``."""
+        result = self.message_converter(messages)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+
+def _identity_stream_adapter(
+    source_stream: AsyncIterator[Any],
+) -> AsyncIterator[Any]:
+    return source_stream
+
+
+def _load_text() -> FrameworkAdapter:
+    from ..adapters.text.stream import adapt_text_stream
+
+    return FrameworkAdapter(stream_adapter=adapt_text_stream)
+
+
+def _load_agentscope() -> FrameworkAdapter:
+    from ..adapters.agentscope.stream import adapt_agentscope_message_stream
+    from ..adapters.agentscope.message import message_to_agentscope_msg
+
+    return FrameworkAdapter(
+        stream_adapter=adapt_agentscope_message_stream,
+        message_converter=message_to_agentscope_msg,
+    )
+
+
+def _load_langgraph() -> FrameworkAdapter:
+    from ..adapters.langgraph.stream import adapt_langgraph_message_stream
+    from ..adapters.langgraph.message import message_to_langgraph_msg
+
+    return FrameworkAdapter(
+        stream_adapter=adapt_langgraph_message_stream,
+        message_converter=message_to_langgraph_msg,
+    )
+
+
+def _load_agno() -> FrameworkAdapter:
+    from ..adapters.agno.stream import adapt_agno_message_stream
+    from ..adapters.agno.message import message_to_agno_message
+
+    return FrameworkAdapter(
+        stream_adapter=adapt_agno_message_stream,
+        message_converter=message_to_agno_message,
+    )
+
+
+def _load_identity() -> FrameworkAdapter:
+    return FrameworkAdapter(stream_adapter=_identity_stream_adapter)
+
+
+# Framework type -> adapter, or a loader importing it on first use
+_registry: Dict[str, Any] = {
+    "text": _load_text,
+    "agentscope": _load_agentscope,
+    "langgraph": _load_langgraph,
+    "agno": _load_agno,
+}
+for _framework_type in ALLOWED_FRAMEWORK_TYPES:
+    _registry.setdefault(_framework_type, _load_identity)
+
+
+def register_framework_adapter(
+    framework_type: str,
+    adapter: Optional[FrameworkAdapter] = None,
+    *,
+    loader: Optional[Callable[[], FrameworkAdapter]] = None,
+) -> None:
+    """Register the adapter used for ``framework_type``.
+
+    Pass either a ready ``adapter`` or a zero-argument ``loader``, which
+    is called once on first use so that the framework is only imported
+    when needed. Registering an existing type replaces it.
+
+    Example:
+        >>> register_framework_adapter(
+        ...     "my_framework",
+        ...     FrameworkAdapter(
+        ...         stream_adapter=adapt_my_stream,
+        ...         message_converter=message_to_my_msg,
+        ...     ),
+        ... )
+    """
+    if (adapter is None) == (loader is None):
+        raise ValueError("Pass exactly one of adapter or loader")
+    _registry[framework_type] = adapter if adapter is not None else loader
+
+
+def get_framework_adapter(framework_type: str) -> FrameworkAdapter:
+    """Return the adapter of ``framework_type``, resolving it once.
+
+    Raises:
+        KeyError: If no adapter is registered for ``framework_type``.
+    """
+    entry = _registry[framework_type]
+    if not isinstance(entry, FrameworkAdapter):
+        entry = entry()
+        _registry[framework_type] = entry
+    return entry
+
+
+def registered_framework_types() -> List[str]:
+    """Return every framework type with a registered adapter."""
+    return list(_registry)
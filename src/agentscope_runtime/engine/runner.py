@@ -13,9 +13,11 @@ from typing import (
     Any,
     Union,
     Dict,
-    AsyncIterator,
 )
 
+from opentelemetry import trace as ot_trace
+
+from .admission import AdmissionController
 from .deployers import (
     DeployManager,
     LocalDeployManager,
@@ -29,25 +31,42 @@ from .schemas.agent_schemas import (
     SequenceNumberGenerator,
     Error,
 )
-from .schemas.exception import AppBaseException, UnknownAgentException
+from .schemas.exception import (
+    AgentOverloadedException,
+    AppBaseException,
+    UnknownAgentException,
+)
 from .tracing import TraceType
 from .tracing.wrapper import trace
 from .tracing.message_util import (
     merge_agent_response,
     get_agent_response_finish_reason,
 )
-from .constant import ALLOWED_FRAMEWORK_TYPES
+from .framework_adapters import (
+    FrameworkAdapter,
+    get_framework_adapter,
+    registered_framework_types,
+)
 
 
 logger = logging.getLogger(__name__)
 
 
 class Runner:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        admission_controller: Optional[AdmissionController] = None,
+    ) -> None:
         """
         Initializes a runner as core instance.
+
+        Args:
+            admission_controller: Optional limit on concurrently running
+                queries; queries beyond it wait in a fair per-user queue
+                and are rejected when the queue is full.
         """
         self.framework_type = None
+        self.admission_controller = admission_controller
 
         self._deploy_managers = {}
         self._health = False
@@ -69,7 +88,21 @@ class Runner:
         Shutdown handler.
         """
 
+    def _get_framework_adapter(self) -> FrameworkAdapter:
+        try:
+            return get_framework_adapter(self.framework_type)
+        except KeyError:
+            raise RuntimeError(
+                f"Framework type '{self.framework_type}' is invalid or not "
+                f"set. Please set `self.framework_type` to one of:"
+                f" {', '.join(registered_framework_types())}.",
+            ) from None
+
     async def start(self):
+        # Import the framework adapter now rather than on the first query
+        if self.framework_type in registered_framework_types():
+            get_framework_adapter(self.framework_type)
+
         init_fn = getattr(self, "init_handler", None)
         if callable(init_fn):
             if inspect.iscoroutinefunction(init_fn):
@@ -200,12 +233,7 @@ class Runner:
         """
         Streams the agent.
         """
-        if self.framework_type not in ALLOWED_FRAMEWORK_TYPES:
-            raise RuntimeError(
-                f"Framework type '{self.framework_type}' is invalid or not "
-                f"set. Please set `self.framework_type` to one of:"
-                f" {', '.join(ALLOWED_FRAMEWORK_TYPES)}.",
-            )
+        adapter = self._get_framework_adapter()
 
         if not self._health:
             raise RuntimeError(
@@ -230,6 +258,45 @@ class Runner:
         response.session_id = request.session_id
         yield seq_gen.yield_with_sequence(response)
 
+        # Wait for a free slot before doing any work
+        admission = self.admission_controller
+        if admission is not None:
+            try:
+                waited = await admission.acquire(request.user_id)
+            except AgentOverloadedException as e:
+                error = Error(code=e.code, message=e.message)
+                logger.warning(f"[Runner] Query rejected: {e}")
+                yield seq_gen.yield_with_sequence(response.failed(error))
+                return
+            ot_trace.get_current_span().set_attribute(
+                "gen_ai.request.queue_delay",
+                int(waited * 1000),
+            )
+
+        try:
+            async for event in self._stream_admitted(
+                adapter,
+                request,
+                response,
+                seq_gen,
+                **kwargs,
+            ):
+                yield event
+        finally:
+            if admission is not None:
+                admission.release()
+
+    async def _stream_admitted(
+        self,
+        adapter: FrameworkAdapter,
+        request: AgentRequest,
+        response: AgentResponse,
+        seq_gen: SequenceNumberGenerator,
+        **kwargs: Any,
+    ) -> AsyncGenerator[Event, None]:
+        """
+        Runs an admitted query and streams its events.
+        """
         # Set to in-progress status
         response.in_progress()
         yield seq_gen.yield_with_sequence(response)
@@ -238,53 +305,14 @@ class Runner:
             "request": request,
         }
 
-        if self.framework_type == "text":
-            from ..adapters.text.stream import adapt_text_stream
-
-            stream_adapter = adapt_text_stream
-        elif self.framework_type == "agentscope":
-            from ..adapters.agentscope.stream import (
-                adapt_agentscope_message_stream,
-            )
-            from ..adapters.agentscope.message import message_to_agentscope_msg
-
-            stream_adapter = adapt_agentscope_message_stream
-            kwargs.update(
-                {"msgs": message_to_agentscope_msg(request.input)},
-            )
-        elif self.framework_type == "langgraph":
-            from ..adapters.langgraph.stream import (
-                adapt_langgraph_message_stream,
-            )
-            from ..adapters.langgraph.message import message_to_langgraph_msg
-
-            stream_adapter = adapt_langgraph_message_stream
-            kwargs.update(
-                {"msgs": message_to_langgraph_msg(request.input)},
-            )
-        elif self.framework_type == "agno":
-            from ..adapters.agno.stream import (
-                adapt_agno_message_stream,
-            )
-            from ..adapters.agno.message import message_to_agno_message
-
-            stream_adapter = adapt_agno_message_stream
+        if adapter.message_converter is not None:
             kwargs.update(
-                {"msgs": await message_to_agno_message(request.input)},
+                {"msgs": await adapter.convert_messages(request.input)},
             )
-        # TODO: support other frameworks
-        else:
-
-            def identity_stream_adapter(
-                source_stream: AsyncIterator[Any],
-            ) -> AsyncIterator[Any]:
-                return source_stream
-
-            stream_adapter = identity_stream_adapter
 
         error = None
         try:
-            async for event in stream_adapter(
+            async for event in adapter.stream_adapter(
                 source_stream=self._call_handler_streaming(
                     self.query_handler,
                     **query_kwargs,
@@ -358,6 +358,17 @@ class RateLimitExceededException(TooManyRequestsException):
         super().__init__("RATE_LIMIT_EXCEEDED", message, details)
 
 
+class AgentOverloadedException(TooManyRequestsException):
+    """Too many concurrent queries to admit another one"""
+
+    def __init__(
+        self,
+        message: str = "Agent is overloaded, please retry later",
+        details: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__("AGENT_OVERLOADED", message, details)
+
+
 # Business logic exceptions
 class BusinessLogicException(UnprocessableEntityException):
     """Business logic exception"""
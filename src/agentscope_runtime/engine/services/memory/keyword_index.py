@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+Token-level keyword index shared by the memory services.
+
+Words are lower-cased runs of word characters. CJK text has no spaces, so
+runs of CJK characters are indexed as unigrams and bigrams, and queried as
+bigrams (or a single unigram), which keeps "苹果" from matching every text
+that merely contains "果".
+"""
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ...schemas.agent_schemas import Message, MessageType
+
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+_CJK_RE = re.compile(f"[{_CJK}]")
+_TOKEN_RE = re.compile(f"[{_CJK}]+|[^\\W{_CJK}]+")
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def message_text(message: Optional[Message]) -> str:
+    """Text of the first text content of a message, as searched."""
+    if message and message.type == MessageType.MESSAGE:
+        for content in message.content or []:
+            if content.type == "text":
+                return content.text or ""
+    return ""
+
+
+def tokenize(text: str, query: bool = False) -> List[str]:
+    """
+    Split ``text`` into index tokens.
+
+    Args:
+        text: The text to tokenize.
+        query: Tokenize a search query rather than a document.
+    """
+    tokens = []
+    for match in _TOKEN_RE.finditer(text.lower()):
+        run = match.group()
+        if not _CJK_RE.match(run):
+            tokens.append(run)
+            continue
+        bigrams = [run[i : i + 2] for i in range(len(run) - 1)]
+        if query:
+            tokens.extend(bigrams or [run])
+        else:
+            tokens.extend(run)
+            tokens.extend(bigrams)
+    return tokens
+
+
+def bm25(
+    tf: int,
+    df: int,
+    doc_len: int,
+    n_docs: int,
+    avg_len: float,
+) -> float:
+    """BM25 weight of one query token for one document."""
+    idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+    norm = 1 - BM25_B + BM25_B * doc_len / (avg_len or 1)
+    return idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+
+
+def rank(
+    postings: Dict[str, Dict[int, int]],
+    doc_lens: Dict[int, int],
+    n_docs: int,
+    total_len: int,
+    top_k: Optional[int] = None,
+    scoring: Optional[str] = None,
+) -> List[int]:
+    """
+    Pick matching doc ids from the postings of the query tokens.
+
+    Without ``scoring`` matches are returned oldest first, and ``top_k``
+    keeps the most recent ones. With ``scoring="bm25"`` they are ordered by
+    descending score. Either way only ``top_k`` ids are kept on a heap.
+    """
+    if scoring == "bm25":
+        avg_len = total_len / n_docs if n_docs else 0.0
+        scores: Dict[int, float] = {}
+        for docs in postings.values():
+            for doc_id, tf in docs.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + bm25(
+                    tf,
+                    len(docs),
+                    doc_lens.get(doc_id, 0),
+                    n_docs,
+                    avg_len,
+                )
+        ranked = heapq.nlargest(
+            len(scores) if top_k is None else top_k,
+            scores.items(),
+            key=lambda item: (item[1], item[0]),
+        )
+        return [doc_id for doc_id, _ in ranked]
+
+    matched = set()
+    for docs in postings.values():
+        matched.update(docs)
+    if top_k is None:
+        return sorted(matched)
+    return sorted(heapq.nlargest(top_k, matched))
+
+
+class KeywordIndex:
+    """
+    In-process inverted index: a dict of posting lists mapping each token
+    to ``{doc_id: term frequency}``, maintained incrementally.
+    """
+
+    def __init__(self) -> None:
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.doc_tokens: Dict[int, Counter] = {}
+        self.doc_lens: Dict[int, int] = {}
+        self.total_len = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_tokens)
+
+    def add(self, doc_id: int, text: str) -> None:
+        tokens = Counter(tokenize(text))
+        if not tokens:
+            return
+        self.doc_tokens[doc_id] = tokens
+        self.doc_lens[doc_id] = sum(tokens.values())
+        self.total_len += self.doc_lens[doc_id]
+        for token, tf in tokens.items():
+            self.postings.setdefault(token, {})[doc_id] = tf
+
+    def remove(self, doc_ids: Iterable[int]) -> None:
+        for doc_id in doc_ids:
+            tokens = self.doc_tokens.pop(doc_id, None)
+            if not tokens:
+                continue
+            self.total_len -= self.doc_lens.pop(doc_id)
+            for token in tokens:
+                docs = self.postings[token]
+                docs.pop(doc_id, None)
+                if not docs:
+                    del self.postings[token]
+
+    def search(
+        self,
+        query: str,
+        top_k: Optional[int] = None,
+        scoring: Optional[str] = None,
+    ) -> List[int]:
+        postings = {
+            token: self.postings[token]
+            for token in set(tokenize(query, query=True))
+            if token in self.postings
+        }
+        return rank(
+            postings,
+            self.doc_lens,
+            len(self.doc_tokens),
+            self.total_len,
+            top_k=top_k,
+            scoring=scoring,
+        )
+
+
+def search_filters(
+    filters: Optional[Dict],
+) -> Tuple[Optional[int], Optional[str]]:
+    """Extract ``top_k`` and ``scoring`` from search filters."""
+    top_k = None
+    scoring = None
+    if filters:
+        if isinstance(filters.get("top_k"), int):
+            top_k = filters["top_k"]
+        scoring = filters.get("scoring")
+    return top_k, scoring
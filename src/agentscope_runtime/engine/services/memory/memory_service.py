@@ -1,12 +1,14 @@
 # -*- coding: utf-8 -*-
+import itertools
 from abc import abstractmethod
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 
 from pydantic import Field
 
+from .keyword_index import KeywordIndex, message_text, search_filters
 from ..base import ServiceWithLifecycleManager
-from ...schemas.agent_schemas import MessageType, Message
+from ...schemas.agent_schemas import Message
 
 
 class MemoryService(ServiceWithLifecycleManager):
@@ -104,6 +106,12 @@ class InMemoryMemoryService(MemoryService):
     def __init__(self) -> None:
         """Initializes the InMemorySessionHistoryService."""
         self._store: Optional[Dict[str, Dict[str, list]]] = None
+        # Per user keyword index over the stored messages; the doc ids of
+        # each session run parallel to its message list in ``_store``
+        self._indexes: Dict[str, KeywordIndex] = {}
+        self._docs: Dict[str, Dict[int, Message]] = {}
+        self._doc_ids: Dict[str, Dict[str, List[int]]] = {}
+        self._next_doc_id = itertools.count()
         self._health = False
 
     async def start(self) -> None:
@@ -117,6 +125,9 @@ class InMemoryMemoryService(MemoryService):
         if self._store is not None:
             self._store.clear()
         self._store = None
+        self._indexes.clear()
+        self._docs.clear()
+        self._doc_ids.clear()
         self._health = False
 
     async def health(self) -> bool:
@@ -152,6 +163,18 @@ class InMemoryMemoryService(MemoryService):
         if messages:
             self._store[user_id][storage_key].extend(messages)
 
+            index = self._indexes.setdefault(user_id, KeywordIndex())
+            docs = self._docs.setdefault(user_id, {})
+            doc_ids = self._doc_ids.setdefault(user_id, {}).setdefault(
+                storage_key,
+                [],
+            )
+            for msg in messages:
+                doc_id = next(self._next_doc_id)
+                doc_ids.append(doc_id)
+                docs[doc_id] = msg
+                index.add(doc_id, message_text(msg))
+
     async def search_memory(
         self,
         user_id: str,
@@ -160,14 +183,15 @@ class InMemoryMemoryService(MemoryService):
     ) -> list:
         """
         Searches messages from the in-memory store for a specific user
-            based on keywords.
+            based on keywords, using the user's inverted index.
 
         Args:
             user_id: The user's unique identifier.
             messages: A list of messages, where the last message's content
                 is used as the search query.
             filters: Optional filters to apply, such as 'top_k' to limit the
-                number of returned messages.
+                number of returned messages, and 'scoring' ("bm25") to rank
+                them by relevance instead of returning them oldest first.
 
         Returns:
             A list of matching messages from the store.
@@ -190,28 +214,13 @@ class InMemoryMemoryService(MemoryService):
         if not query:
             return []
 
-        keywords = set(query.lower().split())
-
-        all_messages = []
-        for session_messages in self._store[user_id].values():
-            all_messages.extend(session_messages)
-
-        matched_messages = []
-        for msg in all_messages:
-            candidate_content = await self.get_query_text(msg)
-            if candidate_content:
-                msg_content_lower = candidate_content.lower()
-                if any(keyword in msg_content_lower for keyword in keywords):
-                    matched_messages.append(msg)
-
-        if (
-            filters
-            and "top_k" in filters
-            and isinstance(filters["top_k"], int)
-        ):
-            return matched_messages[-filters["top_k"] :]
+        if user_id not in self._indexes:
+            return []
 
-        return matched_messages
+        top_k, scoring = search_filters(filters)
+        doc_ids = self._indexes[user_id].search(query, top_k, scoring)
+        docs = self._docs[user_id]
+        return [docs[doc_id] for doc_id in doc_ids]
 
     async def get_query_text(self, message: Message) -> str:
         """
@@ -223,12 +232,7 @@ class InMemoryMemoryService(MemoryService):
         Returns:
             The query text.
         """
-        if message:
-            if message.type == MessageType.MESSAGE:
-                for content in message.content:
-                    if content.type == "text":
-                        return content.text
-        return ""
+        return message_text(message)
 
     async def list_memory(
         self,
@@ -287,6 +291,14 @@ class InMemoryMemoryService(MemoryService):
         if session_id:
             if session_id in self._store[user_id]:
                 del self._store[user_id][session_id]
+                doc_ids = self._doc_ids.get(user_id, {}).pop(session_id, [])
+                if doc_ids:
+                    self._indexes[user_id].remove(doc_ids)
+                    for doc_id in doc_ids:
+                        del self._docs[user_id][doc_id]
         else:
             if user_id in self._store:
                 del self._store[user_id]
+            self._indexes.pop(user_id, None)
+            self._docs.pop(user_id, None)
+            self._doc_ids.pop(user_id, None)
@@ -1,12 +1,14 @@
 # -*- coding: utf-8 -*-
 import json
 import logging
-from typing import Optional, Dict, Any
+from collections import Counter
+from typing import Optional, Dict, Any, List
 
 import redis.asyncio as aioredis
 
+from .keyword_index import message_text, rank, search_filters, tokenize
 from .memory_service import MemoryService
-from ...schemas.agent_schemas import Message, MessageType
+from ...schemas.agent_schemas import Message
 
 logger = logging.getLogger(__name__)
 
@@ -101,6 +103,86 @@ class RedisMemoryService(MemoryService):
         # Each user is a Redis hash
         return f"user_memory:{user_id}"
 
+    # The keyword index of a user lives next to its hash:
+    # - seqs: session -> JSON list of doc ids, parallel to its messages
+    # - docs: doc id -> message JSON, for the indexed messages
+    # - postings: sorted set of "token\0doc_id\0tf\0doc_len" members, all
+    #   with score 0, so the posting list of a token is one ZRANGEBYLEX
+    # - stats: n_docs, total_len and the next doc id
+    _INDEX_PREFIXES = (
+        "user_memory_seqs",
+        "user_memory_docs",
+        "user_memory_postings",
+        "user_memory_stats",
+    )
+
+    def _index_keys(self, user_id):
+        return [f"{prefix}:{user_id}" for prefix in self._INDEX_PREFIXES]
+
+    def _expire(self, pipe, *keys):
+        if self._ttl_seconds is not None:
+            for key in keys:
+                pipe.expire(key, self._ttl_seconds)
+
+    @staticmethod
+    def _postings(doc_id: int, msg: Message) -> List[str]:
+        tokens = Counter(tokenize(message_text(msg)))
+        doc_len = sum(tokens.values())
+        return [
+            f"{token}\0{doc_id}\0{tf}\0{doc_len}"
+            for token, tf in tokens.items()
+        ]
+
+    def _index_docs(self, pipe, user_id, doc_ids, msgs, sign=1):
+        """Queue the index updates adding (or, with ``sign=-1``, removing)
+        the given docs."""
+        _, docs_key, postings_key, stats_key = self._index_keys(user_id)
+        n_docs = total_len = 0
+        for doc_id, msg in zip(doc_ids, msgs):
+            members = self._postings(doc_id, msg)
+            if not members:
+                continue
+            n_docs += 1
+            total_len += int(members[0].rsplit("\0", 1)[1])
+            if sign > 0:
+                pipe.hset(docs_key, doc_id, msg.model_dump_json())
+                pipe.zadd(postings_key, dict.fromkeys(members, 0))
+            else:
+                pipe.hdel(docs_key, doc_id)
+                pipe.zrem(postings_key, *members)
+        if n_docs:
+            pipe.hincrby(stats_key, "n_docs", sign * n_docs)
+            pipe.hincrby(stats_key, "total_len", sign * total_len)
+
+    async def _rebuild_index(self, user_id):
+        """Index every message of a user, for data stored before the
+        keyword index existed."""
+        key = self._user_key(user_id)
+        seqs_key, *_, stats_key = self._index_keys(user_id)
+        sessions = await self._redis.hgetall(key)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.delete(*self._index_keys(user_id))
+            pipe.hset(stats_key, mapping={"n_docs": 0, "total_len": 0})
+            next_id = 0
+            for field, msgs_json in sessions.items():
+                msgs = self._deserialize(msgs_json)
+                doc_ids = list(range(next_id, next_id + len(msgs)))
+                next_id += len(msgs)
+                pipe.hset(seqs_key, field, json.dumps(doc_ids))
+                self._index_docs(pipe, user_id, doc_ids, msgs)
+            pipe.hset(stats_key, "next_id", next_id)
+            self._expire(pipe, key, *self._index_keys(user_id))
+            await pipe.execute()
+
+    async def _load_sessions(self, key) -> Dict[str, str]:
+        """Fetch every session field of a user hash in one round trip,
+        refreshing the TTL of actively used data in the same pipeline."""
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.hgetall(key)
+            self._expire(pipe, key)
+            sessions, *_ = await pipe.execute()
+        return sessions
+
     def _serialize(self, messages):
         return json.dumps([msg.dict() for msg in messages])
 
@@ -129,21 +211,59 @@ class RedisMemoryService(MemoryService):
         key = self._user_key(user_id)
         field = session_id if session_id else self._DEFAULT_SESSION_ID
 
-        existing_json = await self._redis.hget(key, field)
+        seqs_key, *_, stats_key = self._index_keys(user_id)
+
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.exists(key)
+            pipe.exists(stats_key)
+            pipe.hget(key, field)
+            pipe.hget(seqs_key, field)
+            pipe.hincrby(stats_key, "next_id", len(messages))
+            (
+                user_exists,
+                indexed,
+                existing_json,
+                seqs_json,
+                next_id,
+            ) = await pipe.execute()
+
         existing_msgs = self._deserialize(existing_json)
+        existing_ids = json.loads(seqs_json) if seqs_json else []
+        new_ids = list(range(next_id - len(messages), next_id))
         all_msgs = existing_msgs + messages
+        all_ids = existing_ids + new_ids
+        removed = 0
+        # Data stored before the keyword index existed
+        stale = (user_exists and not indexed) or len(existing_ids) != len(
+            existing_msgs,
+        )
 
         # Limit the number of messages per session to prevent memory issues
         if self._max_messages_per_session is not None:
             if len(all_msgs) > self._max_messages_per_session:
                 # Keep only the most recent messages
+                removed = len(all_msgs) - self._max_messages_per_session
                 all_msgs = all_msgs[-self._max_messages_per_session :]
-
-        await self._redis.hset(key, field, self._serialize(all_msgs))
-
-        # Set TTL for the key if configured
-        if self._ttl_seconds is not None:
-            await self._redis.expire(key, self._ttl_seconds)
+                all_ids = all_ids[-self._max_messages_per_session :]
+
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, field, self._serialize(all_msgs))
+            if stale:
+                # Index the whole user again on the next search
+                pipe.delete(stats_key)
+            else:
+                pipe.hset(seqs_key, field, json.dumps(all_ids))
+                self._index_docs(
+                    pipe,
+                    user_id,
+                    existing_ids[:removed],
+                    existing_msgs[:removed],
+                    sign=-1,
+                )
+                self._index_docs(pipe, user_id, new_ids, messages)
+            # Set TTL for the key if configured
+            self._expire(pipe, key, *self._index_keys(user_id))
+            await pipe.execute()
 
     async def search_memory(  # pylint: disable=too-many-branches
         self,
@@ -166,61 +286,63 @@ class RedisMemoryService(MemoryService):
         if not query:
             return []
 
-        keywords = set(query.lower().split())
-
-        # Process messages in batches to avoid loading all into memory at once
-        matched_messages = []
-        hash_keys = await self._redis.hkeys(key)
-
-        # Get top_k limit early to optimize memory usage
-        top_k = None
-        if (
-            filters
-            and "top_k" in filters
-            and isinstance(filters["top_k"], int)
-        ):
-            top_k = filters["top_k"]
-
-        # Process each session separately to reduce memory footprint
-        for session_id in hash_keys:
-            msgs_json = await self._redis.hget(key, session_id)
-            if not msgs_json:
-                continue
-            # _deserialize handles exceptions internally and returns empty list
-            msgs = self._deserialize(msgs_json)
-            if not msgs:
-                continue
+        top_k, scoring = search_filters(filters)
+        tokens = sorted(set(tokenize(query, query=True)))
+        _, docs_key, postings_key, stats_key = self._index_keys(user_id)
+
+        for _ in range(2):
+            # One round trip for the stats and every posting list
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.hmget(stats_key, "n_docs", "total_len", "next_id")
+                pipe.exists(key)
+                for token in tokens:
+                    pipe.zrangebylex(
+                        postings_key,
+                        f"[{token}\0",
+                        f"({token}\1",
+                    )
+                # Refresh TTL on read to extend lifetime of actively used
+                # data, if a TTL is configured
+                self._expire(pipe, key, *self._index_keys(user_id))
+                stats, exists, *results = await pipe.execute()
+            n_docs, total_len, indexed = stats
+            if indexed is not None or not exists:
+                break
+            await self._rebuild_index(user_id)
+
+        if not exists:
+            return []
 
-            # Match messages in this session
-            for msg in msgs:
-                candidate_content = await self.get_query_text(msg)
-                if candidate_content:
-                    msg_content_lower = candidate_content.lower()
-                    if any(
-                        keyword in msg_content_lower for keyword in keywords
-                    ):
-                        matched_messages.append(msg)
-
-        # Apply top_k filter if specified
-        if top_k is not None:
-            result = matched_messages[-top_k:]
-        else:
-            result = matched_messages
-
-        # Refresh TTL on read to extend lifetime of actively used data,
-        # if a TTL is configured and there is existing data for this key.
-        if self._ttl_seconds is not None and hash_keys:
-            await self._redis.expire(key, self._ttl_seconds)
+        postings: Dict[str, Dict[int, int]] = {}
+        doc_lens: Dict[int, int] = {}
+        for token, members in zip(tokens, results):
+            for member in members:
+                _, doc_id, tf, doc_len = member.split("\0")
+                postings.setdefault(token, {})[int(doc_id)] = int(tf)
+                doc_lens[int(doc_id)] = int(doc_len)
+
+        doc_ids = rank(
+            postings,
+            doc_lens,
+            int(n_docs or 0),
+            int(total_len or 0),
+            top_k=top_k,
+            scoring=scoring,
+        )
+        if not doc_ids:
+            return []
 
+        result = []
+        for msg_json in await self._redis.hmget(docs_key, doc_ids):
+            if msg_json:
+                try:
+                    result.append(Message.model_validate_json(msg_json))
+                except Exception as e:
+                    logger.warning("Failed to deserialize message: %s", e)
         return result
 
     async def get_query_text(self, message: Message) -> str:
-        if message:
-            if message.type == MessageType.MESSAGE:
-                for content in message.content:
-                    if content.type == "text":
-                        return content.text
-        return ""
+        return message_text(message)
 
     async def list_memory(
         self,
@@ -236,30 +358,28 @@ class RedisMemoryService(MemoryService):
         start_index = (page_num - 1) * page_size
         end_index = start_index + page_size
 
-        # Optimize: Calculate which sessions we need to load
-        # For simplicity, we still load all but could be optimized further
-        # to only load sessions that contain the requested page range
-        all_msgs = []
-        hash_keys = await self._redis.hkeys(key)
-        for session_id in sorted(hash_keys):
-            msgs_json = await self._redis.hget(key, session_id)
-            if msgs_json:
-                # _deserialize handles exceptions internally
-                # and returns empty list
-                msgs = self._deserialize(msgs_json)
-                if msgs:
-                    all_msgs.extend(msgs)
-
-                # Early exit optimization: if we've loaded enough messages
-                # to cover the requested page, we can stop (but this assumes
-                # we need all previous messages for proper ordering)
-                # For now, we keep loading all for correctness
-
-        # Refresh TTL on active use to keep memory alive,
-        # mirroring get_session behavior
-        if self._ttl_seconds is not None and hash_keys:
-            await self._redis.expire(key, self._ttl_seconds)
-        return all_msgs[start_index:end_index]
+        # Fetch all sessions at once, then only validate the messages of
+        # the requested page; the others are just counted
+        sessions = await self._load_sessions(key)
+        page = []
+        offset = 0
+        for session_id in sorted(sessions):
+            if offset >= end_index:
+                break
+            try:
+                raw_msgs = json.loads(sessions[session_id] or "[]")
+            except Exception as e:
+                logger.warning("Failed to deserialize message data: %s", e)
+                continue
+            lo = max(start_index - offset, 0)
+            hi = min(end_index - offset, len(raw_msgs))
+            for m in raw_msgs[lo:hi]:
+                try:
+                    page.append(Message.parse_obj(m))
+                except Exception as e:
+                    logger.warning("Failed to deserialize message: %s", e)
+            offset += len(raw_msgs)
+        return page
 
     async def delete_memory(
         self,
@@ -269,10 +389,28 @@ class RedisMemoryService(MemoryService):
         if not self._redis:
             raise RuntimeError("Redis connection is not available")
         key = self._user_key(user_id)
-        if session_id:
-            await self._redis.hdel(key, session_id)
-        else:
-            await self._redis.delete(key)
+        if not session_id:
+            await self._redis.delete(key, *self._index_keys(user_id))
+            return
+
+        seqs_key = self._index_keys(user_id)[0]
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.hget(key, session_id)
+            pipe.hget(seqs_key, session_id)
+            msgs_json, seqs_json = await pipe.execute()
+
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hdel(key, session_id)
+            pipe.hdel(seqs_key, session_id)
+            if seqs_json:
+                self._index_docs(
+                    pipe,
+                    user_id,
+                    json.loads(seqs_json),
+                    self._deserialize(msgs_json),
+                    sign=-1,
+                )
+            await pipe.execute()
 
     async def clear_all_memory(self) -> None:
         """
@@ -282,9 +420,18 @@ class RedisMemoryService(MemoryService):
         if not self._redis:
             raise RuntimeError("Redis connection is not available")
 
-        keys = await self._redis.keys(self._user_key("*"))
-        if keys:
-            await self._redis.delete(*keys)
+        for prefix in ("user_memory", *self._INDEX_PREFIXES):
+            keys = []
+            async for key in self._redis.scan_iter(
+                match=f"{prefix}:*",
+                count=1000,
+            ):
+                keys.append(key)
+                if len(keys) >= 1000:
+                    await self._redis.unlink(*keys)
+                    keys = []
+            if keys:
+                await self._redis.unlink(*keys)
 
     async def delete_user_memory(self, user_id: str) -> None:
         """
@@ -298,4 +445,4 @@ class RedisMemoryService(MemoryService):
             raise RuntimeError("Redis connection is not available")
 
         key = self._user_key(user_id)
-        await self._redis.delete(key)
+        await self._redis.delete(key, *self._index_keys(user_id))
@@ -6,7 +6,7 @@ from typing import Optional, Dict, Any, List, Union
 
 import redis.asyncio as aioredis
 
-from .session_history_service import SessionHistoryService
+from .session_history_service import SessionHistoryService, _check_indices
 from ...schemas.session import Session
 from ...schemas.agent_schemas import Message
 
@@ -94,16 +94,85 @@ class RedisSessionHistoryService(SessionHistoryService):
     def _session_key(self, user_id: str, session_id: str):
         return f"session:{user_id}:{session_id}"
 
+    def _messages_key(self, user_id: str, session_id: str):
+        return f"session_messages:{user_id}:{session_id}"
+
+    def _index_key(self, user_id: str):
+        # Set of the user's session ids, so listing does not SCAN
+        return f"session_index:{user_id}"
+
     def _session_pattern(self, user_id: str):
         """Generate the pattern for scanning session keys for a user."""
         return f"session:{user_id}:*"
 
-    def _session_to_json(self, session: Session) -> str:
-        return session.model_dump_json()
-
     def _session_from_json(self, s: str) -> Session:
         return Session.model_validate_json(s)
 
+    def _messages_from_json(self, items: List[str]) -> List[Message]:
+        messages = []
+        for item in items:
+            try:
+                messages.append(Message.model_validate_json(item))
+            except Exception as e:
+                # Skip corrupted messages instead of losing the session
+                logger.warning("Failed to deserialize message: %s", e)
+        return messages
+
+    def _expire(self, pipe, *keys):
+        if self._ttl_seconds is not None:
+            for key in keys:
+                pipe.expire(key, self._ttl_seconds)
+
+    def _trim(self, pipe, messages_key):
+        if self._max_messages_per_session is not None:
+            pipe.ltrim(messages_key, -self._max_messages_per_session, -1)
+
+    async def _migrate_legacy_session(self, user_id: str, session_id: str):
+        """Convert a session stored as a single JSON string into the
+        metadata hash + message list layout.
+
+        Messages already pushed to the list (by an append racing with the
+        migration) are kept after the legacy ones.
+        """
+        key = self._session_key(user_id, session_id)
+        messages_key = self._messages_key(user_id, session_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(key)
+                key_type = await pipe.type(key)
+                if key_type != "string":
+                    return
+                session_json = await pipe.get(key)
+                try:
+                    legacy = self._session_from_json(session_json).messages
+                except Exception as e:
+                    logger.warning(
+                        "Failed to deserialize legacy session data for "
+                        "user_id=%s, session_id=%s, dropping history: %s",
+                        user_id,
+                        session_id,
+                        e,
+                    )
+                    legacy = []
+                pipe.multi()
+                pipe.delete(key)
+                pipe.hset(key, mapping={"id": session_id, "user_id": user_id})
+                pipe.sadd(self._index_key(user_id), session_id)
+                if legacy:
+                    pipe.lpush(
+                        messages_key,
+                        *[
+                            Message.model_validate(msg).model_dump_json()
+                            for msg in reversed(legacy)
+                        ],
+                    )
+                self._trim(pipe, messages_key)
+                self._expire(pipe, key, messages_key, self._index_key(user_id))
+                await pipe.execute()
+            except aioredis.WatchError:
+                # Another replica migrated the session concurrently
+                pass
+
     async def create_session(
         self,
         user_id: str,
@@ -118,12 +187,15 @@ class RedisSessionHistoryService(SessionHistoryService):
 
         session = Session(id=sid, user_id=user_id, messages=[])
         key = self._session_key(user_id, sid)
+        messages_key = self._messages_key(user_id, sid)
 
-        await self._redis.set(key, self._session_to_json(session))
-
-        # Set TTL for the session key if configured
-        if self._ttl_seconds is not None:
-            await self._redis.expire(key, self._ttl_seconds)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.delete(key, messages_key)
+            pipe.hset(key, mapping={"id": sid, "user_id": user_id})
+            pipe.sadd(self._index_key(user_id), sid)
+            # Set TTL for the session key if configured
+            self._expire(pipe, key, self._index_key(user_id))
+            await pipe.execute()
 
         return session
 
@@ -131,78 +203,182 @@ class RedisSessionHistoryService(SessionHistoryService):
         self,
         user_id: str,
         session_id: str,
+        start: int = 0,
+        stop: Optional[int] = None,
     ) -> Optional[Session]:
+        """Retrieves a session with the messages in ``[start:stop]``.
+
+        ``start`` and ``stop`` follow Python slice semantics, so e.g.
+        ``start=-10`` returns only the ten most recent messages; they are
+        resolved by Redis without transferring the rest of the history.
+        """
         if not self._redis:
             raise RuntimeError("Redis connection is not available")
         key = self._session_key(user_id, session_id)
-        session_json = await self._redis.get(key)
-        if session_json is None:
-            return None
+        messages_key = self._messages_key(user_id, session_id)
+
+        for _ in range(2):
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.type(key)
+                if stop is None:
+                    pipe.lrange(messages_key, start, -1)
+                elif stop == 0 or (start >= 0 and 0 < stop <= start):
+                    pipe.lrange(messages_key, 1, 0)
+                else:
+                    pipe.lrange(messages_key, start, stop - 1)
+                # Refresh TTL when accessing the session
+                self._expire(pipe, key, messages_key, self._index_key(user_id))
+                key_type, items, *_ = await pipe.execute()
+
+            if key_type != "string":
+                break
+            await self._migrate_legacy_session(user_id, session_id)
 
-        try:
-            session = self._session_from_json(session_json)
-        except Exception as e:
-            # Return None for corrupted session data
-            logger.warning(
-                "Failed to deserialize session data for user_id=%s, "
-                "session_id=%s: %s",
-                user_id,
-                session_id,
-                e,
-            )
+        if key_type != "hash":
             return None
 
-        # Refresh TTL when accessing the session
-        if self._ttl_seconds is not None:
-            await self._redis.expire(key, self._ttl_seconds)
+        return Session(
+            id=session_id,
+            user_id=user_id,
+            messages=self._messages_from_json(items),
+        )
 
-        return session
+    async def count_messages(self, user_id: str, session_id: str) -> int:
+        """Returns the length of the session's message list with LLEN."""
+        if not self._redis:
+            raise RuntimeError("Redis connection is not available")
+        key = self._session_key(user_id, session_id)
+        messages_key = self._messages_key(user_id, session_id)
 
-    async def delete_session(self, user_id: str, session_id: str):
+        for _ in range(2):
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.type(key)
+                pipe.llen(messages_key)
+                self._expire(pipe, key, messages_key, self._index_key(user_id))
+                key_type, length, *_ = await pipe.execute()
+
+            if key_type != "string":
+                break
+            await self._migrate_legacy_session(user_id, session_id)
+
+        return length if key_type == "hash" else 0
+
+    async def get_messages(
+        self,
+        user_id: str,
+        session_id: str,
+        start: int = 0,
+        stop: Optional[int] = None,
+    ) -> List[Message]:
+        """Returns the messages in ``[start:stop]`` with a single LRANGE."""
+        session = await self.get_session(user_id, session_id, start, stop)
+        return session.messages if session else []
+
+    async def delete_messages(
+        self,
+        user_id: str,
+        session_id: str,
+        indices: List[int],
+    ) -> None:
+        """Deletes messages by index without rewriting the history.
+
+        The deleted entries are overwritten with a unique tombstone by LSET
+        and removed with one LREM, in a transaction watching the list so
+        the indices cannot shift under a concurrent trim.
+        """
         if not self._redis:
             raise RuntimeError("Redis connection is not available")
         key = self._session_key(user_id, session_id)
-        await self._redis.delete(key)
+        messages_key = self._messages_key(user_id, session_id)
+        key_type = await self._redis.type(key)
+        if key_type == "string":
+            await self._migrate_legacy_session(user_id, session_id)
+
+        tombstone = f"__deleted__:{uuid.uuid4()}"
+        async with self._redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(messages_key)
+                    _check_indices(indices, await pipe.llen(messages_key))
+                    if not indices:
+                        return
+                    pipe.multi()
+                    for index in set(indices):
+                        pipe.lset(messages_key, index, tombstone)
+                    pipe.lrem(messages_key, 0, tombstone)
+                    self._expire(pipe, key, messages_key)
+                    await pipe.execute()
+                    return
+                except aioredis.WatchError:
+                    continue
+
+    async def delete_session(self, user_id: str, session_id: str):
+        if not self._redis:
+            raise RuntimeError("Redis connection is not available")
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.delete(
+                self._session_key(user_id, session_id),
+                self._messages_key(user_id, session_id),
+            )
+            pipe.srem(self._index_key(user_id), session_id)
+            await pipe.execute()
 
     async def list_sessions(self, user_id: str) -> list[Session]:
-        """List all sessions for a user by scanning session keys.
+        """List all sessions for a user from the per-user session index.
 
-        Uses SCAN to find all session:{user_id}:* keys. Expired sessions
-        naturally disappear as their keys expire, avoiding stale entries.
+        The index is read with SMEMBERS and the metadata records are
+        checked with one pipelined EXISTS round trip, so listing does not
+        depend on the size of the keyspace and no history is read.
+        Expired sessions are pruned from the index as they are found.
         """
         if not self._redis:
             raise RuntimeError("Redis connection is not available")
+        index_key = self._index_key(user_id)
+        session_ids = sorted(await self._redis.smembers(index_key))
+        if not session_ids:
+            session_ids = await self._rebuild_index(user_id)
+            return [Session(id=sid, user_id=user_id) for sid in session_ids]
+
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for sid in session_ids:
+                pipe.exists(self._session_key(user_id, sid))
+            exists = await pipe.execute()
+
+        live = [sid for sid, found in zip(session_ids, exists) if found]
+        stale = [sid for sid, found in zip(session_ids, exists) if not found]
+        if stale:
+            await self._redis.srem(index_key, *stale)
+        return [Session(id=sid, user_id=user_id) for sid in live]
+
+    async def _rebuild_index(self, user_id: str) -> List[str]:
+        """Populate the session index by scanning session keys.
+
+        Used for sessions written before the index existed. Uses SCAN to
+        find all session:{user_id}:* keys; session ids are taken from the
+        key names.
+        """
         pattern = self._session_pattern(user_id)
-        sessions = []
+        prefix = self._session_key(user_id, "")
+        session_ids = []
         cursor = 0
 
         while True:
             cursor, keys = await self._redis.scan(
                 cursor,
                 match=pattern,
-                count=100,
+                count=1000,
             )
-            for key in keys:
-                session_json = await self._redis.get(key)
-                if session_json:
-                    try:
-                        session = self._session_from_json(session_json)
-                        session.messages = []
-                        sessions.append(session)
-                    except Exception as e:
-                        # Skip corrupted session data
-                        logger.warning(
-                            "Failed to deserialize session data for "
-                            "key=%s: %s",
-                            key,
-                            e,
-                        )
-                        continue
+            session_ids.extend(key[len(prefix) :] for key in keys)
 
             if cursor == 0:
                 break
 
-        return sessions
+        if session_ids:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.sadd(self._index_key(user_id), *session_ids)
+                self._expire(pipe, self._index_key(user_id))
+                await pipe.execute()
+        return sorted(session_ids)
 
     async def append_message(
         self,
@@ -214,6 +390,8 @@ class RedisSessionHistoryService(SessionHistoryService):
             List[Dict[str, Any]],
         ],
     ):
+        """Appends messages with a single RPUSH, so the cost of a turn does
+        not depend on the length of the history."""
         if not self._redis:
             raise RuntimeError("Redis connection is not available")
         if not isinstance(message, list):
@@ -226,64 +404,62 @@ class RedisSessionHistoryService(SessionHistoryService):
                 norm_message.append(msg)
 
         session.messages.extend(norm_message)
+        if not norm_message:
+            return
 
         user_id = session.user_id
         session_id = session.id
         key = self._session_key(user_id, session_id)
-
-        session_json = await self._redis.get(key)
-        if session_json is None:
-            # Session expired or not found, treat as a new session
-            # Create a new session with all messages from the in-memory session
-            # (which already includes the newly appended messages)
-            stored_session = Session(
-                id=session_id,
-                user_id=user_id,
-                messages=session.messages.copy(),
+        messages_key = self._messages_key(user_id, session_id)
+
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hsetnx(key, "id", session_id)
+            pipe.hsetnx(key, "user_id", user_id)
+            pipe.sadd(self._index_key(user_id), session_id)
+            pipe.rpush(
+                messages_key,
+                *[msg.model_dump_json() for msg in norm_message],
+            )
+            # Limit the number of messages per session to prevent memory
+            # issues, keeping only the most recent messages
+            self._trim(pipe, messages_key)
+            # Set TTL for the session key if configured
+            self._expire(pipe, key, messages_key, self._index_key(user_id))
+            created, _, _, length, *_ = await pipe.execute(
+                raise_on_error=False,
             )
-        else:
-            try:
-                stored_session = self._session_from_json(session_json)
-                stored_session.messages.extend(norm_message)
-            except Exception as e:
-                # Session data corrupted, treat as a new session
-                # Use all messages from the in-memory session
-                logger.warning(
-                    "Failed to deserialize session data for user_id=%s, "
-                    "session_id=%s, treating as new session: %s",
-                    user_id,
-                    session_id,
-                    e,
-                )
-                stored_session = Session(
-                    id=session_id,
-                    user_id=user_id,
-                    messages=session.messages.copy(),
-                )
-
-        # Limit the number of messages per session to prevent memory issues
-        if self._max_messages_per_session is not None:
-            if len(stored_session.messages) > self._max_messages_per_session:
-                # Keep only the most recent messages
-                stored_session.messages = stored_session.messages[
-                    -self._max_messages_per_session :
-                ]
-                # Keep the in-memory session in sync with the stored session
-                session.messages = session.messages[
-                    -self._max_messages_per_session :
-                ]
 
-        await self._redis.set(key, self._session_to_json(stored_session))
+        if isinstance(created, aioredis.ResponseError):
+            # The session is still stored in the legacy single-key format
+            await self._migrate_legacy_session(user_id, session_id)
+        elif created and length == len(norm_message):
+            # Session expired or not found, treat as a new session with all
+            # messages from the in-memory session (which already includes
+            # the newly appended messages)
+            stored = [
+                Message.model_validate(msg).model_dump_json()
+                for msg in session.messages
+            ]
+            if len(stored) > len(norm_message):
+                async with self._redis.pipeline(transaction=True) as pipe:
+                    pipe.delete(messages_key)
+                    pipe.rpush(messages_key, *stored)
+                    self._trim(pipe, messages_key)
+                    self._expire(pipe, messages_key)
+                    await pipe.execute()
 
-        # Set TTL for the session key if configured
-        if self._ttl_seconds is not None:
-            await self._redis.expire(key, self._ttl_seconds)
+        if self._max_messages_per_session is not None:
+            # Keep the in-memory session in sync with the stored session
+            session.messages = session.messages[
+                -self._max_messages_per_session :
+            ]
 
     async def delete_user_sessions(self, user_id: str) -> None:
         """
         Deletes all session history data for a specific user.
 
-        Uses SCAN to find all session keys for the user and deletes them.
+        Uses SCAN to find all session keys for the user and deletes them
+        together with their message lists.
 
         Args:
             user_id (str): The ID of the user whose session history data should
@@ -293,16 +469,22 @@ class RedisSessionHistoryService(SessionHistoryService):
             raise RuntimeError("Redis connection is not available")
 
         pattern = self._session_pattern(user_id)
+        prefix = self._session_key(user_id, "")
         cursor = 0
 
+        await self._redis.delete(self._index_key(user_id))
         while True:
             cursor, keys = await self._redis.scan(
                 cursor,
                 match=pattern,
-                count=100,
+                count=1000,
             )
             if keys:
-                await self._redis.delete(*keys)
+                messages_keys = [
+                    self._messages_key(user_id, key[len(prefix) :])
+                    for key in keys
+                ]
+                await self._redis.delete(*keys, *messages_keys)
 
             if cursor == 0:
                 break
@@ -94,6 +94,86 @@ class SessionHistoryService(ServiceWithLifecycleManager):
                 dictionary format and Message objects.
         """
 
+    async def count_messages(self, user_id: str, session_id: str) -> int:
+        """Returns the number of messages in a session's history.
+
+        The default implementation loads the whole session; backends
+        override it to count without transferring the history.
+
+        Args:
+            user_id: The identifier for the user.
+            session_id: The identifier for the session.
+
+        Returns:
+            The number of messages, 0 if the session does not exist.
+        """
+        session = await self.get_session(user_id, session_id)
+        return len(session.messages) if session else 0
+
+    async def get_messages(
+        self,
+        user_id: str,
+        session_id: str,
+        start: int = 0,
+        stop: Optional[int] = None,
+    ) -> List[Message]:
+        """Returns the messages in ``[start:stop]`` of a session's history.
+
+        ``start`` and ``stop`` follow Python slice semantics, so e.g.
+        ``start=-10`` returns the ten most recent messages.
+
+        Args:
+            user_id: The identifier for the user.
+            session_id: The identifier for the session.
+            start: Index of the first message to return.
+            stop: Index after the last message to return, None for the end.
+
+        Returns:
+            The messages in the range, empty if the session does not exist.
+        """
+        session = await self.get_session(user_id, session_id)
+        return session.messages[start:stop] if session else []
+
+    async def delete_messages(
+        self,
+        user_id: str,
+        session_id: str,
+        indices: List[int],
+    ) -> None:
+        """Deletes the messages at the given indices from a session.
+
+        The default implementation rewrites the session without the
+        deleted messages; backends override it to delete in place.
+
+        Args:
+            user_id: The identifier for the user.
+            session_id: The identifier for the session.
+            indices: Indices of the messages to delete.
+
+        Raises:
+            IndexError: If an index is out of range.
+        """
+        session = await self.get_session(user_id, session_id)
+        messages = session.messages if session else []
+        _check_indices(indices, len(messages))
+        kept = _without_indices(messages, indices)
+
+        await self.delete_session(user_id, session_id)
+        session = await self.create_session(user_id, session_id)
+        if kept:
+            await self.append_message(session, kept)
+
+
+def _check_indices(indices: List[int], size: int) -> None:
+    invalid = [i for i in indices if i < 0 or i >= size]
+    if invalid:
+        raise IndexError(f"The index {invalid} does not exist.")
+
+
+def _without_indices(messages: List[Message], indices: List[int]) -> list:
+    deleted = set(indices)
+    return [msg for i, msg in enumerate(messages) if i not in deleted]
+
 
 class InMemorySessionHistoryService(SessionHistoryService):
     """An in-memory implementation of the SessionHistoryService.
@@ -265,3 +345,50 @@ class InMemorySessionHistoryService(SessionHistoryService):
                 f"Warning: Session {session.id} not found in storage for "
                 f"append_message.",
             )
+
+    async def count_messages(self, user_id: str, session_id: str) -> int:
+        """Returns the number of messages in a session without copying
+        them."""
+        if self._store is None:
+            raise RuntimeError("Service not started")
+
+        session = self._store.get(user_id, {}).get(session_id)
+        return len(session.messages) if session else 0
+
+    async def get_messages(
+        self,
+        user_id: str,
+        session_id: str,
+        start: int = 0,
+        stop: Optional[int] = None,
+    ) -> List[Message]:
+        """Returns deep copies of the messages in ``[start:stop]``, leaving
+        the rest of the history uncopied."""
+        if self._store is None:
+            raise RuntimeError("Service not started")
+
+        session = self._store.get(user_id, {}).get(session_id)
+        if not session:
+            return []
+        return [
+            copy.deepcopy(msg)
+            if isinstance(msg, Message)
+            else Message.model_validate(msg)
+            for msg in session.messages[start:stop]
+        ]
+
+    async def delete_messages(
+        self,
+        user_id: str,
+        session_id: str,
+        indices: List[int],
+    ) -> None:
+        """Deletes the messages at the given indices in place."""
+        if self._store is None:
+            raise RuntimeError("Service not started")
+
+        session = self._store.get(user_id, {}).get(session_id)
+        messages = session.messages if session else []
+        _check_indices(indices, len(messages))
+        if indices:
+            session.messages = _without_indices(messages, indices)
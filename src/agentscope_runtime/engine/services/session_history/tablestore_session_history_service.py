@@ -14,11 +14,12 @@ from tablestore_for_agent_memory.memory.async_memory_store import (
     AsyncMemoryStore,
 )
 
-from .session_history_service import SessionHistoryService
+from .session_history_service import SessionHistoryService, _check_indices
 from ...schemas.agent_schemas import Message
 from ...schemas.session import Session
 from ..utils.tablestore_service_utils import (
     convert_message_to_tablestore_message,
+    convert_tablestore_message_to_message,
     convert_tablestore_session_to_session,
     tablestore_log,
 )
@@ -185,6 +186,113 @@ class TablestoreSessionHistoryService(SessionHistoryService):
             tablestore_messages,
         )
 
+    async def _list_tablestore_messages(
+        self,
+        session_id: str,
+        order: Order = Order.ASC,
+        max_count: Optional[int] = None,
+    ) -> list:
+        messages_iterator = await self._memory_store.list_messages(
+            session_id=session_id,
+            order=order,
+            max_count=max_count,
+        )
+        return [message async for message in messages_iterator]
+
+    async def count_messages(self, user_id: str, session_id: str) -> int:
+        """Counts the messages of a session without converting them.
+
+        Tablestore has no row count, so this still lists every message of
+        the session. ``AgentScopeSessionHistoryMemory`` calls it on every
+        read to detect new messages, which costs a full scan per read on
+        this backend, though without the conversion of ``get_session``.
+
+        Args:
+            user_id: The identifier for the user.
+            session_id: The identifier for the session.
+
+        Returns:
+            The number of messages, 0 if the session does not exist.
+        """
+        return len(await self._list_tablestore_messages(session_id))
+
+    async def get_messages(
+        self,
+        user_id: str,
+        session_id: str,
+        start: int = 0,
+        stop: Optional[int] = None,
+    ) -> List[Message]:
+        """Returns the messages in ``[start:stop]`` of a session.
+
+        A negative ``start`` without ``stop`` reads only the most recent
+        messages in descending order, and a non-negative range stops
+        reading at ``stop``; other ranges read the whole history.
+
+        Args:
+            user_id: The identifier for the user.
+            session_id: The identifier for the session.
+            start: Index of the first message to return.
+            stop: Index after the last message to return, None for the end.
+
+        Returns:
+            The messages in the range.
+        """
+        if start < 0 and stop is None:
+            tablestore_messages = await self._list_tablestore_messages(
+                session_id,
+                order=Order.DESC,
+                max_count=-start,
+            )
+            tablestore_messages.reverse()
+        elif start >= 0 and stop is not None and stop >= 0:
+            if stop <= start:
+                return []
+            tablestore_messages = (
+                await self._list_tablestore_messages(
+                    session_id,
+                    max_count=stop,
+                )
+            )[start:]
+        else:
+            tablestore_messages = (
+                await self._list_tablestore_messages(session_id)
+            )[start:stop]
+
+        return [
+            convert_tablestore_message_to_message(message)
+            for message in tablestore_messages
+        ]
+
+    async def delete_messages(
+        self,
+        user_id: str,
+        session_id: str,
+        indices: List[int],
+    ) -> None:
+        """Deletes the messages at the given indices row by row.
+
+        Args:
+            user_id: The identifier for the user.
+            session_id: The identifier for the session.
+            indices: Indices of the messages to delete.
+
+        Raises:
+            IndexError: If an index is out of range.
+        """
+        tablestore_messages = await self._list_tablestore_messages(session_id)
+        _check_indices(indices, len(tablestore_messages))
+
+        delete_tasks = [
+            self._memory_store.delete_message(
+                session_id=session_id,
+                message_id=tablestore_messages[index].message_id,
+                create_time=tablestore_messages[index].create_time,
+            )
+            for index in set(indices)
+        ]
+        await asyncio.gather(*delete_tasks)
+
     async def delete_session(self, user_id: str, session_id: str) -> None:
         """Deletes a specific session from memory.
 
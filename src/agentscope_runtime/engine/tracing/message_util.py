@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
-from typing import List, Optional, Union
+from copy import deepcopy
+from typing import Any, Callable, Dict, List, Optional, Type, Union
 
 from openai.types.chat import ChatCompletionChunk
 from openai.types.chat.chat_completion_chunk import ChoiceDeltaToolCall
@@ -526,3 +527,319 @@ def get_agent_message_finish_reason(
         return "stop" if message.status == RunStatus.Completed else None
 
     return None
+
+
+class StreamMerger:
+    """
+    Folds a stream of chunks into one merged output as they arrive.
+
+    The traced generators feed every yielded chunk to :meth:`add` and
+    call :meth:`result` once the stream is exhausted. Mergers must not
+    mutate the chunks, which have already been handed to the caller.
+    """
+
+    def add(self, chunk: Any) -> None:
+        raise NotImplementedError
+
+    def result(self) -> Any:
+        raise NotImplementedError
+
+
+class ListMerger(StreamMerger):
+    """
+    Adapter for merge functions taking the whole list of chunks. Those
+    may mutate what they are given, so the chunks are deep-copied first.
+    """
+
+    def __init__(self, merge_func: Callable[[List[Any]], Any]) -> None:
+        self.merge_func = merge_func
+        self.chunks: List[Any] = []
+
+    def add(self, chunk: Any) -> None:
+        self.chunks.append(chunk)
+
+    def result(self) -> Any:
+        return self.merge_func(deepcopy(self.chunks))
+
+
+class IncrementalChunkMerger(StreamMerger):
+    """
+    Streaming counterpart of :func:`merge_incremental_chunk`. Only the
+    last two chunks, the concatenated content per choice and the tool
+    call fragments are kept.
+    """
+
+    def __init__(self) -> None:
+        self.valid: Optional[bool] = None
+        self.last: Optional[ChatCompletionChunk] = None
+        self.prev: Optional[ChatCompletionChunk] = None
+        self.contents: Dict[int, List[str]] = {}
+        self.tool_calls: Dict[int, Dict[str, Any]] = {}
+        self.usage: Optional[List[int]] = None
+
+    def add(self, chunk: ChatCompletionChunk) -> None:
+        if self.valid is None:
+            self.valid = isinstance(chunk, ChatCompletionChunk)
+        if not self.valid:
+            return
+        self.prev, self.last = self.last, chunk
+
+        for pos, choice in enumerate(chunk.choices):
+            delta = choice.delta
+            if delta.role == Role.TOOL:
+                continue
+            if isinstance(delta.content, str):
+                self.contents.setdefault(pos, []).append(delta.content)
+            elif isinstance(delta.tool_calls, list):
+                for tool_call in delta.tool_calls:
+                    self._add_tool_call(tool_call)
+
+        if chunk.usage:
+            usage = (
+                chunk.usage.prompt_tokens,
+                chunk.usage.completion_tokens,
+                chunk.usage.total_tokens,
+            )
+            if self.usage is None:
+                self.usage = list(usage)
+            else:
+                self.usage = [a + b for a, b in zip(self.usage, usage)]
+
+    def _add_tool_call(self, tool_call: ChoiceDeltaToolCall) -> None:
+        function = tool_call.function
+        name = function.name if function else None
+        arguments = (function.arguments if function else None) or ""
+        entry = self.tool_calls.get(tool_call.index)
+        if entry is None:
+            self.tool_calls[tool_call.index] = {
+                "id": tool_call.id,
+                "type": tool_call.type,
+                "name": name,
+                "arguments": arguments,
+            }
+            return
+
+        # The earliest id and name win, later fragments usually omit them
+        if entry["id"] == "" and tool_call.id != "":
+            entry["id"] = tool_call.id
+        if not entry["name"] and name:
+            entry["name"] = name
+        if not entry["type"] and tool_call.type:
+            entry["type"] = tool_call.type
+        # A fragment opening a JSON object restarts the arguments
+        if arguments.startswith("{"):
+            entry["arguments"] = arguments
+        else:
+            entry["arguments"] += arguments
+
+    def result(self) -> Optional[ChatCompletionChunk]:
+        if not self.valid or self.last is None:
+            return None
+
+        choices = self.last.choices
+        # A trailing usage chunk carries no choices, keep the previous ones
+        if not choices and self.prev is not None:
+            choices = self.prev.choices
+
+        merged_choices = []
+        for pos, choice in enumerate(choices):
+            update = {}
+            if pos in self.contents:
+                update["content"] = "".join(self.contents[pos])
+            if pos == 0 and self.tool_calls:
+                update["tool_calls"] = [
+                    ToolCall(
+                        index=index,
+                        id=entry["id"],
+                        type=entry["type"],
+                        function={
+                            "name": entry["name"],
+                            "arguments": entry["arguments"],
+                        },
+                    )
+                    for index, entry in self.tool_calls.items()
+                ]
+            merged_choices.append(
+                choice.model_copy(
+                    update={"delta": choice.delta.model_copy(update=update)},
+                ),
+            )
+
+        update = {"choices": merged_choices}
+        if self.last.usage and self.usage is not None:
+            prompt, completion, total = self.usage
+            update["usage"] = self.last.usage.model_copy(
+                update={
+                    "prompt_tokens": prompt,
+                    "completion_tokens": completion,
+                    "total_tokens": total,
+                },
+            )
+        return self.last.model_copy(update=update)
+
+
+class AgentResponseMerger(StreamMerger):
+    """
+    Streaming counterpart of :func:`merge_agent_response`. Text deltas
+    are folded into one string per message id as they arrive, and only
+    the last chunk of each object type is kept.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.object_types = set()
+        self.last: Any = None
+        self.last_message: Optional[Message] = None
+        self.last_response: Optional[AgentResponse] = None
+        # "content" streams
+        self.last_content: Optional[TextContent] = None
+        self.text = ""
+        # "response" streams, by msg_id
+        self.texts: Dict[str, str] = {}
+
+    def add(
+        self,
+        chunk: Union[AgentResponse, Message, TextContent],
+    ) -> None:
+        self.count += 1
+        self.last = chunk
+        self.object_types.add(getattr(chunk, "object", "response"))
+
+        if hasattr(chunk, "text") and chunk.text:
+            self.text = self.text + chunk.text if chunk.delta else chunk.text
+            self.last_content = chunk
+        if isinstance(chunk, Message):
+            self.last_message = chunk
+        if isinstance(chunk, AgentResponse):
+            self.last_response = chunk
+            for message in chunk.output or []:
+                for content in message.content or []:
+                    if not (
+                        content.type == "text"
+                        and hasattr(content, "text")
+                        and content.text
+                    ):
+                        continue
+                    if content.delta and content.msg_id in self.texts:
+                        self.texts[content.msg_id] += content.text
+                    else:
+                        self.texts[content.msg_id] = content.text
+
+    def _merged_message(self, message: Message) -> Message:
+        if not message.content:
+            return message
+        contents = [
+            content.model_copy(
+                update={"text": self.texts[content.msg_id], "delta": False},
+            )
+            if (
+                content.type == "text"
+                and hasattr(content, "msg_id")
+                and content.msg_id in self.texts
+            )
+            else content
+            for content in message.content
+        ]
+        return message.model_copy(update={"content": contents})
+
+    def _from_last(self) -> AgentResponse:
+        last = self.last
+        if isinstance(last, TextContent):
+            message = Message(
+                role=Role.ASSISTANT,
+                content=[last],
+                status=last.status or RunStatus.Completed,
+            )
+            return AgentResponse(
+                output=[message],
+                status=message.status,
+                session_id=None,
+            )
+        if isinstance(last, Message):
+            return AgentResponse(
+                output=[last],
+                status=last.status,
+                session_id=None,
+            )
+        return AgentResponse(**last.__dict__)
+
+    def result(  # pylint: disable=too-many-return-statements
+        self,
+    ) -> AgentResponse:
+        if not self.count:
+            raise ValueError("Cannot merge empty response list")
+
+        if len(self.object_types) > 1:
+            return self._from_last()
+
+        object_type = next(iter(self.object_types))
+        if object_type == "content":
+            if self.last_content is None:
+                return AgentResponse(
+                    status=RunStatus.Completed,
+                    session_id=None,
+                )
+            final_content = TextContent(
+                text=self.text,
+                delta=False,
+                index=0,
+                msg_id=self.last_content.msg_id,
+                status=RunStatus.Completed,
+            )
+            message = Message(
+                role=Role.ASSISTANT,
+                content=[final_content],
+                status=RunStatus.Completed,
+            )
+            return AgentResponse(
+                output=[message],
+                status=RunStatus.Completed,
+                session_id=None,
+            )
+
+        if object_type == "message":
+            if self.last_message is None:
+                return AgentResponse(
+                    status=RunStatus.Completed,
+                    session_id=None,
+                )
+            return AgentResponse(
+                output=[self.last_message],
+                status=self.last_message.status,
+                session_id=None,
+            )
+
+        if self.last_response is None:
+            return self._from_last()
+        merged = AgentResponse(**self.last_response.__dict__)
+        if merged.output and self.texts:
+            merged.output = [
+                self._merged_message(message) for message in merged.output
+            ]
+        return merged
+
+
+_STREAM_MERGERS: Dict[Callable, Type[StreamMerger]] = {
+    merge_incremental_chunk: IncrementalChunkMerger,
+    merge_agent_response: AgentResponseMerger,
+}
+
+
+def get_stream_merger(
+    merge_func: Union[Callable[[List[Any]], Any], Type[StreamMerger]],
+) -> StreamMerger:
+    """
+    Return a fresh merger for one traced stream.
+
+    Args:
+        merge_func: A :class:`StreamMerger` subclass, or a function merging
+            a list of chunks. The built-in merge functions are swapped for
+            their streaming counterparts, other functions get the whole
+            (copied) list once the stream ends.
+    """
+    if isinstance(merge_func, type) and issubclass(merge_func, StreamMerger):
+        return merge_func()
+    merger_cls = _STREAM_MERGERS.get(merge_func)
+    if merger_cls is not None:
+        return merger_cls()
+    return ListMerger(merge_func)
@@ -10,7 +10,6 @@ import time
 import threading
 import uuid
 from collections.abc import Callable
-from copy import deepcopy
 from enum import Enum
 from functools import wraps
 from typing import (
@@ -26,7 +25,11 @@ from typing import (
 from pydantic import BaseModel
 from opentelemetry.propagate import extract
 from opentelemetry.context import attach
-from opentelemetry.trace import StatusCode, NoOpTracerProvider
+from opentelemetry.trace import (
+    NoOpTracerProvider,
+    ProxyTracerProvider,
+    StatusCode,
+)
 from opentelemetry import trace as ot_trace
 from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import (
     OTLPSpanExporter as OTLPSpanGrpcExporter,
@@ -40,8 +43,10 @@ from opentelemetry.sdk.trace.export import (
 
 from .asyncio_util import aenumerate
 from .message_util import (
-    merge_incremental_chunk,
+    StreamMerger,
     get_finish_reason,
+    get_stream_merger,
+    merge_incremental_chunk,
 )
 
 from .base import Tracer, TracerHandler, EventContext
@@ -95,8 +100,10 @@ def trace(  # pylint: disable=too-many-statements
     get_finish_reason_func: Optional[
         Callable[[Any], Optional[str]]
     ] = get_finish_reason,
-    merge_output_func: Optional[
-        Callable[[Any], Union[BaseModel, dict, str, None]]
+    merge_output_func: Union[
+        Callable[[Any], Union[BaseModel, dict, str, None]],
+        type[StreamMerger],
+        None,
     ] = merge_incremental_chunk,
 ) -> Any:
     """Decorator for tracing function execution.
@@ -108,6 +115,9 @@ def trace(  # pylint: disable=too-many-statements
         get_finish_reason_func(Optional[Callable]): The function to judge
             if stopped
         merge_output_func(Optional[Callable]): The function to merge outputs
+            of streaming functions, or a ``StreamMerger`` subclass folding
+            them chunk by chunk. The built-in merge functions are folded
+            incrementally rather than over a list of all chunks.
 
     Returns:
         Any: The decorated function with tracing capabilities.
@@ -122,6 +132,9 @@ def trace(  # pylint: disable=too-many-statements
         Returns:
             Any: The wrapped function with appropriate tracing logic.
         """
+        # Introspect the signature once rather than on every call
+        param_names = _get_param_names(func)
+        accepts_kwargs = _function_accepts_kwargs(func)
 
         @wraps(func)
         async def async_exec(*args: Any, **kwargs: Any) -> Any:
@@ -137,7 +150,12 @@ def trace(  # pylint: disable=too-many-statements
 
             _init_trace_context()
 
-            start_payload = _get_start_payload(args, kwargs, func)
+            record_payload = _payloads_enabled()
+            start_payload = (
+                _get_start_payload(args, kwargs, func, param_names)
+                if record_payload
+                else {}
+            )
 
             trace_context = kwargs.get("trace_context") if kwargs else None
 
@@ -165,18 +183,11 @@ def trace(  # pylint: disable=too-many-statements
             # Auto generate request_id for root span if needed
             _set_request_id(parent_ctx)
 
-            common_attrs = TracingUtil.get_common_attributes() or {}
-
-            span_attributes = {
-                "gen_ai.span.kind": final_trace_type,
-                "gen_ai.user.query_root_flag": 1 if final_is_root_span else 0,
-                "input.mine_type": MineType.JSON,
-                "input.value": json.dumps(
-                    start_payload,
-                    ensure_ascii=False,
-                ),
-                **common_attrs,
-            }
+            span_attributes = _get_span_attributes(
+                final_trace_type,
+                final_is_root_span,
+                start_payload if record_payload else None,
+            )
 
             with _get_ot_tracer().start_as_current_span(
                 final_trace_name,
@@ -192,7 +203,7 @@ def trace(  # pylint: disable=too-many-statements
                     _parent_span_context.set(
                         ot_trace.set_span_in_context(span),
                     )
-                    if _function_accepts_kwargs(func):
+                    if accepts_kwargs:
                         func_kwargs = kwargs.copy() if kwargs else {}
                         func_kwargs["trace_event"] = event
                     else:
@@ -200,20 +211,8 @@ def trace(  # pylint: disable=too-many-statements
 
                     try:
                         result = await func(*args, **func_kwargs)
-                        end_payload = _obj_to_dict(result)
-                        (
-                            output_mine_type,
-                            output_value,
-                        ) = _get_ot_type_and_value(end_payload)
-                        span.set_attribute(
-                            "output.mine_type",
-                            output_mine_type,
-                        )
-                        span.set_attribute(
-                            "output.value",
-                            output_value,
-                        )
-                        event.on_end(payload=end_payload)
+                        if record_payload:
+                            _trace_output(result, event, span)
                         return result
                     except Exception as e:
                         span.set_status(
@@ -240,7 +239,12 @@ def trace(  # pylint: disable=too-many-statements
 
             _init_trace_context()
 
-            start_payload = _get_start_payload(args, kwargs, func)
+            record_payload = _payloads_enabled()
+            start_payload = (
+                _get_start_payload(args, kwargs, func, param_names)
+                if record_payload
+                else {}
+            )
 
             trace_context = kwargs.get("trace_context") if kwargs else None
 
@@ -268,18 +272,11 @@ def trace(  # pylint: disable=too-many-statements
             # Auto generate request_id for root span if needed
             _set_request_id(parent_ctx)
 
-            common_attrs = TracingUtil.get_common_attributes() or {}
-
-            span_attributes = {
-                "gen_ai.span.kind": final_trace_type,
-                "gen_ai.user.query_root_flag": 1 if final_is_root_span else 0,
-                "input.mine_type": MineType.JSON,
-                "input.value": json.dumps(
-                    start_payload,
-                    ensure_ascii=False,
-                ),
-                **common_attrs,
-            }
+            span_attributes = _get_span_attributes(
+                final_trace_type,
+                final_is_root_span,
+                start_payload if record_payload else None,
+            )
 
             with _get_ot_tracer().start_as_current_span(
                 final_trace_name,
@@ -295,7 +292,7 @@ def trace(  # pylint: disable=too-many-statements
                     _parent_span_context.set(
                         ot_trace.set_span_in_context(span),
                     )
-                    if _function_accepts_kwargs(func):
+                    if accepts_kwargs:
                         func_kwargs = kwargs.copy() if kwargs else {}
                         func_kwargs["trace_event"] = event
                     else:
@@ -303,20 +300,8 @@ def trace(  # pylint: disable=too-many-statements
 
                     try:
                         result = func(*args, **func_kwargs)
-                        end_payload = _obj_to_dict(result)
-                        (
-                            output_mine_type,
-                            output_value,
-                        ) = _get_ot_type_and_value(end_payload)
-                        span.set_attribute(
-                            "output.mine_type",
-                            output_mine_type,
-                        )
-                        span.set_attribute(
-                            "output.value",
-                            output_value,
-                        )
-                        event.on_end(payload=end_payload)
+                        if record_payload:
+                            _trace_output(result, event, span)
                         return result
                     except Exception as e:
                         span.set_status(
@@ -345,7 +330,12 @@ def trace(  # pylint: disable=too-many-statements
             """
             _init_trace_context()
 
-            start_payload = _get_start_payload(args, kwargs, func)
+            record_payload = _payloads_enabled()
+            start_payload = (
+                _get_start_payload(args, kwargs, func, param_names)
+                if record_payload
+                else {}
+            )
 
             trace_context = kwargs.get("trace_context") if kwargs else None
 
@@ -373,18 +363,11 @@ def trace(  # pylint: disable=too-many-statements
             # Auto generate request_id for root span if needed
             _set_request_id(parent_ctx)
 
-            common_attrs = TracingUtil.get_common_attributes() or {}
-
-            span_attributes = {
-                "gen_ai.span.kind": final_trace_type,
-                "gen_ai.user.query_root_flag": 1 if final_is_root_span else 0,
-                "input.mine_type": MineType.JSON,
-                "input.value": json.dumps(
-                    start_payload,
-                    ensure_ascii=False,
-                ),
-                **common_attrs,
-            }
+            span_attributes = _get_span_attributes(
+                final_trace_type,
+                final_is_root_span,
+                start_payload if record_payload else None,
+            )
 
             with _get_ot_tracer().start_as_current_span(
                 final_trace_name,
@@ -400,13 +383,17 @@ def trace(  # pylint: disable=too-many-statements
                     _parent_span_context.set(
                         ot_trace.set_span_in_context(span),
                     )
-                    if _function_accepts_kwargs(func):
+                    if accepts_kwargs:
                         func_kwargs = kwargs.copy() if kwargs else {}
                         func_kwargs["trace_event"] = event
                     else:
                         func_kwargs = kwargs.copy() if kwargs else {}
 
-                    cumulated = []
+                    merger = (
+                        get_stream_merger(merge_output_func)
+                        if merge_output_func is not None and record_payload
+                        else None
+                    )
 
                     async def iter_entry() -> AsyncGenerator[T_co, None]:
                         """Internal async generator for processing items.
@@ -417,11 +404,14 @@ def trace(  # pylint: disable=too-many-statements
                         """
                         try:
                             start_time = int(time.time() * 1000)
+                            received = False
                             async for i, resp in aenumerate(
                                 func(*args, **func_kwargs),
                             ):  # type: ignore
                                 yield resp
-                                cumulated.append(resp)
+                                received = True
+                                if merger is not None:
+                                    merger.add(resp)
 
                                 if i == 0:
                                     _trace_first_resp(
@@ -429,9 +419,13 @@ def trace(  # pylint: disable=too-many-statements
                                         event,
                                         span,
                                         start_time,
+                                        record_payload,
                                     )
 
-                                if get_finish_reason_func is not None:
+                                if (
+                                    get_finish_reason_func is not None
+                                    and record_payload
+                                ):
                                     _trace_last_resp(
                                         resp,
                                         get_finish_reason_func,
@@ -439,10 +433,9 @@ def trace(  # pylint: disable=too-many-statements
                                         span,
                                     )
 
-                            if cumulated and merge_output_func is not None:
-                                _trace_merged_resp(
-                                    cumulated,
-                                    merge_output_func,
+                            if received and merger is not None:
+                                _trace_output(
+                                    merger.result(),
                                     event,
                                     span,
                                 )
@@ -478,7 +471,12 @@ def trace(  # pylint: disable=too-many-statements
             """
             _init_trace_context()
 
-            start_payload = _get_start_payload(args, kwargs, func)
+            record_payload = _payloads_enabled()
+            start_payload = (
+                _get_start_payload(args, kwargs, func, param_names)
+                if record_payload
+                else {}
+            )
 
             trace_context = kwargs.get("trace_context") if kwargs else None
 
@@ -506,18 +504,11 @@ def trace(  # pylint: disable=too-many-statements
             # Auto generate request_id for root span if needed
             _set_request_id(parent_ctx)
 
-            common_attrs = TracingUtil.get_common_attributes() or {}
-
-            span_attributes = {
-                "gen_ai.span.kind": final_trace_type,
-                "gen_ai.user.query_root_flag": 1 if final_is_root_span else 0,
-                "input.mine_type": MineType.JSON,
-                "input.value": json.dumps(
-                    start_payload,
-                    ensure_ascii=False,
-                ),
-                **common_attrs,
-            }
+            span_attributes = _get_span_attributes(
+                final_trace_type,
+                final_is_root_span,
+                start_payload if record_payload else None,
+            )
 
             with _get_ot_tracer().start_as_current_span(
                 final_trace_name,
@@ -534,17 +525,24 @@ def trace(  # pylint: disable=too-many-statements
                         ot_trace.set_span_in_context(span),
                     )
                     try:
-                        if _function_accepts_kwargs(func):
+                        if accepts_kwargs:
                             func_kwargs = kwargs.copy() if kwargs else {}
                             func_kwargs["trace_event"] = event
                         else:
                             func_kwargs = kwargs.copy() if kwargs else {}
 
-                        cumulated = []
+                        merger = (
+                            get_stream_merger(merge_output_func)
+                            if merge_output_func is not None and record_payload
+                            else None
+                        )
+                        received = False
                         start_time = int(time.time() * 1000)
                         for i, resp in enumerate(func(*args, **func_kwargs)):
                             yield resp
-                            cumulated.append(resp)
+                            received = True
+                            if merger is not None:
+                                merger.add(resp)
 
                             if i == 0:
                                 _trace_first_resp(
@@ -552,9 +550,13 @@ def trace(  # pylint: disable=too-many-statements
                                     event,
                                     span,
                                     start_time,
+                                    record_payload,
                                 )
 
-                            if get_finish_reason_func is not None:
+                            if (
+                                get_finish_reason_func is not None
+                                and record_payload
+                            ):
                                 _trace_last_resp(
                                     resp,
                                     get_finish_reason_func,
@@ -562,10 +564,9 @@ def trace(  # pylint: disable=too-many-statements
                                     span,
                                 )
 
-                        if cumulated and merge_output_func is not None:
-                            _trace_merged_resp(
-                                cumulated,
-                                merge_output_func,
+                        if received and merger is not None:
+                            _trace_output(
+                                merger.result(),
                                 event,
                                 span,
                             )
@@ -602,43 +603,65 @@ def trace(  # pylint: disable=too-many-statements
     return wrapper
 
 
-def _get_start_payload(args: Any, kwargs: Any, func: Any = None) -> Dict:
+def _get_param_names(func: Any) -> Optional[list]:
+    """Map parameter positions of a function to names for tracing.
+
+    Args:
+        func (Any): The function being traced.
+
+    Returns:
+        Optional[list]: The name of each parameter that can be passed
+            positionally, None for ``*args`` and keyword-only ones, or None
+            if the signature cannot be read.
+    """
+    try:
+        params = inspect.signature(func).parameters.values()
+    except (ValueError, TypeError):
+        return None
+    return [
+        param.name
+        if param.kind
+        in (
+            inspect.Parameter.POSITIONAL_ONLY,
+            inspect.Parameter.POSITIONAL_OR_KEYWORD,
+        )
+        else None
+        for param in params
+    ]
+
+
+def _get_start_payload(
+    args: Any,
+    kwargs: Any,
+    func: Any = None,
+    param_names: Optional[list] = None,
+) -> Dict:
     """Extract and format the start payload from function arguments.
 
     Args:
         args (Any): Positional arguments from the function call.
         kwargs (Any): Keyword arguments from the function call.
         func (Any): The function being traced (optional).
+        param_names (Optional[list]): Precomputed ``_get_param_names(func)``
+            (optional).
 
     Returns:
         Dict: The formatted start payload for tracing.
     """
     merged = {}
 
-    # 处理位置参数：尝试将位置参数与函数签名中的参数名对应
-    if func is not None and isinstance(args, tuple) and len(args) > 0:
-        try:
-            sig = inspect.signature(func)
-            params = list(sig.parameters.values())
-
-            # 跳过self参数（如果是实例方法）
-            start_idx = 0
-            if params and params[0].name == "self":
-                start_idx = 1
-
-            # 将位置参数与参数名对应
-            for i, arg in enumerate(args[start_idx:], start=start_idx):
-                if i < len(params):
-                    param = params[i]
-                    # 只处理位置参数和位置或关键字参数，跳过*args和**kwargs
-                    if param.kind in (
-                        inspect.Parameter.POSITIONAL_ONLY,
-                        inspect.Parameter.POSITIONAL_OR_KEYWORD,
-                    ):
-                        merged[param.name] = _obj_to_dict(arg)
-        except (ValueError, TypeError, IndexError):
-            # 如果无法获取函数签名，回退到原来的逻辑
-            pass
+    if param_names is None and func is not None:
+        param_names = _get_param_names(func)
+
+    # 处理位置参数：将位置参数与函数签名中的参数名对应
+    if param_names and isinstance(args, tuple) and len(args) > 0:
+        # 跳过self参数（如果是实例方法）
+        start_idx = 1 if param_names[0] == "self" else 0
+
+        # 只处理位置参数和位置或关键字参数，跳过*args和**kwargs
+        for i, arg in enumerate(args[start_idx:], start=start_idx):
+            if i < len(param_names) and param_names[i]:
+                merged[param_names[i]] = _obj_to_dict(arg)
 
     # 如果没有函数信息或无法解析，使用原来的逻辑
     if not merged and isinstance(args, tuple) and len(args) > 0:
@@ -710,7 +733,15 @@ def _trace_first_resp(
     event: EventContext,
     span: Any,
     start_time: int,
+    record_payload: bool = True,
 ) -> None:
+    span.set_attribute(
+        "gen_ai.response.first_delay",
+        int(time.time() * 1000) - start_time,
+    )
+    if not record_payload:
+        return
+
     payload = _obj_to_dict(resp)
     event.on_log(
         "",
@@ -719,10 +750,6 @@ def _trace_first_resp(
             "payload": payload,
         },
     )
-    span.set_attribute(
-        "gen_ai.response.first_delay",
-        int(time.time() * 1000) - start_time,
-    )
     _, output_value = _get_ot_type_and_value(payload)
     span.set_attribute(
         "gen_ai.response.first_pkg",
@@ -736,12 +763,12 @@ def _trace_last_resp(
     event: EventContext,
     span: Any,
 ) -> None:
-    resp_copy = deepcopy(resp)
-
-    finish_reason = func(resp_copy)
+    # Finish reason functions only read the chunk and the payload is a
+    # fresh dict, so the chunk handed to the caller needs no copy
+    finish_reason = func(resp)
     if finish_reason:
         step_suffix = "last_resp" if finish_reason == "stop" else finish_reason
-        payload = _obj_to_dict(resp_copy)
+        payload = _obj_to_dict(resp)
         event.on_log(
             "",
             **{
@@ -756,16 +783,12 @@ def _trace_last_resp(
         )
 
 
-def _trace_merged_resp(
-    cumulated: Any,
-    func: Callable,
+def _trace_output(
+    output: Any,
     event: EventContext,
     span: Any,
 ) -> None:
-    cumulated_copy = deepcopy(cumulated)
-
-    merged_output = func(cumulated_copy)
-    end_payload = _obj_to_dict(merged_output)
+    end_payload = _obj_to_dict(output)
     output_mine_type, output_value = _get_ot_type_and_value(end_payload)
     span.set_attribute(
         "output.mine_type",
@@ -783,16 +806,53 @@ def _trace_merged_resp(
 def _get_ot_type_and_value(payload: Any) -> tuple[MineType, Any]:
     if isinstance(payload, dict):
         mine_type = MineType.JSON
-        value = json.dumps(payload, ensure_ascii=False)
+        value = _truncate(json.dumps(payload, ensure_ascii=False))
     else:
         mine_type = MineType.TEXT
-        if isinstance(payload, (str, int, float, bool)):
+        if isinstance(payload, (int, float, bool)):
             value = payload
         else:
-            value = str(payload)
+            value = _truncate(str(payload))
     return mine_type, value
 
 
+def _truncate(value: str) -> str:
+    """Cap a span attribute value at ``TRACE_MAX_PAYLOAD_LENGTH`` chars."""
+    if 0 < _max_payload_length < len(value):
+        omitted = len(value) - _max_payload_length
+        return f"{value[:_max_payload_length]}...[{omitted} chars truncated]"
+    return value
+
+
+def _get_span_attributes(
+    trace_type: Any,
+    is_root_span: Optional[bool],
+    start_payload: Optional[Dict],
+) -> Dict:
+    """Build the attributes a span is started with.
+
+    Args:
+        trace_type (Any): The span kind.
+        is_root_span (Optional[bool]): Whether the span is the root span.
+        start_payload (Optional[Dict]): The input payload, None if
+            payloads are not recorded.
+
+    Returns:
+        Dict: The span attributes.
+    """
+    span_attributes = {
+        "gen_ai.span.kind": trace_type,
+        "gen_ai.user.query_root_flag": 1 if is_root_span else 0,
+    }
+    if start_payload is not None:
+        span_attributes["input.mine_type"] = MineType.JSON
+        span_attributes["input.value"] = _truncate(
+            json.dumps(start_payload, ensure_ascii=False),
+        )
+    span_attributes.update(TracingUtil.get_common_attributes() or {})
+    return span_attributes
+
+
 def _validate_trace_options(
     trace_type: Union[TraceType, str, None] = None,
     trace_name: Optional[str] = None,
@@ -907,6 +967,16 @@ def _get_tracer() -> Tracer:
 
 _otel_tracer_lock = threading.Lock()
 _otel_tracer = None
+# Whether our own provider exports spans, set when the tracer is created
+_otel_exporting = False
+
+
+def _has_app_tracer_provider() -> bool:
+    """Whether the application installed a global tracer provider."""
+    return not isinstance(
+        ot_trace.get_tracer_provider(),
+        (NoOpTracerProvider, ProxyTracerProvider),
+    )
 
 
 # TODO: support more tracing protocols and platforms
@@ -918,9 +988,15 @@ def _get_ot_tracer() -> ot_trace.Tracer:
     """
 
     def _get_ot_tracer_inner() -> ot_trace.Tracer:
-        existing_provider = ot_trace.get_tracer_provider()
+        global _otel_exporting
+
+        if _has_app_tracer_provider():
+            return ot_trace.get_tracer("agentscope_runtime")
 
-        if not isinstance(existing_provider, NoOpTracerProvider):
+        enable_report = _str_to_bool(os.getenv("TRACE_ENABLE_REPORT", "false"))
+        enable_debug = _str_to_bool(os.getenv("TRACE_ENABLE_DEBUG", "false"))
+        if not enable_report and not enable_debug:
+            # Nothing to export, keep the no-op spans of the global proxy
             return ot_trace.get_tracer("agentscope_runtime")
 
         resource = Resource(
@@ -931,7 +1007,7 @@ def _get_ot_tracer() -> ot_trace.Tracer:
             },
         )
         provider = TracerProvider(resource=resource)
-        if _str_to_bool(os.getenv("TRACE_ENABLE_REPORT", "false")):
+        if enable_report:
             span_exporter = BatchSpanProcessor(
                 OTLPSpanGrpcExporter(
                     endpoint=os.getenv("TRACE_ENDPOINT", ""),
@@ -941,7 +1017,7 @@ def _get_ot_tracer() -> ot_trace.Tracer:
             )
             provider.add_span_processor(span_exporter)
 
-        if _str_to_bool(os.getenv("TRACE_ENABLE_DEBUG", "false")):
+        if enable_debug:
             span_logger = BatchSpanProcessor(ConsoleSpanExporter())
             provider.add_span_processor(span_logger)
 
@@ -949,6 +1025,7 @@ def _get_ot_tracer() -> ot_trace.Tracer:
             "agentscope_runtime",
             tracer_provider=provider,
         )
+        _otel_exporting = True
         return tracer
 
     global _otel_tracer
@@ -961,4 +1038,20 @@ def _get_ot_tracer() -> ot_trace.Tracer:
     return _otel_tracer
 
 
+def _payloads_enabled() -> bool:
+    """Whether span payloads are consumed by an exporter or a handler.
+
+    Without either, serializing arguments and outputs is wasted work, so
+    spans only carry their kind, timings and status.
+
+    Returns:
+        bool: True if payloads should be serialized.
+    """
+    _get_ot_tracer()
+    return (
+        _otel_exporting or bool(_tracer.handlers) or _has_app_tracer_provider()
+    )
+
+
 _tracer = _get_tracer()
+_max_payload_length = int(os.getenv("TRACE_MAX_PAYLOAD_LENGTH", "65536"))
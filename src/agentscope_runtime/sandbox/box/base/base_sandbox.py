@@ -32,20 +32,41 @@ class BaseSandbox(Sandbox):
             sandbox_type,
         )
 
-    def run_ipython_cell(self, code: str):
+    def run_ipython_cell(
+        self,
+        code: str,
+        kernel: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ):
         """
         Run an IPython cell.
 
         Args:
             code (str): IPython code to execute.
+            kernel (str): Name of the kernel to run the cell in; cells in
+                different kernels run in parallel and do not share state.
+            timeout (float): Seconds after which the cell is interrupted.
         """
-        return self.call_tool("run_ipython_cell", {"code": code})
+        arguments = {"code": code}
+        if kernel is not None:
+            arguments["kernel"] = kernel
+        if timeout is not None:
+            arguments["timeout"] = timeout
+        return self.call_tool("run_ipython_cell", arguments)
 
-    def run_shell_command(self, command: str):
+    def run_shell_command(
+        self,
+        command: str,
+        timeout: Optional[float] = None,
+    ):
         """
         Run a shell command.
 
         Args:
             command (str): Shell command to execute.
+            timeout (float): Seconds after which the command is killed.
         """
-        return self.call_tool("run_shell_command", {"command": command})
+        arguments = {"command": command}
+        if timeout is not None:
+            arguments["timeout"] = timeout
+        return self.call_tool("run_shell_command", arguments)
@@ -159,6 +159,21 @@ class Sandbox:
 
         return self.manager_api.call_tool(self.sandbox_id, name, arguments)
 
+    def call_tools_batch(
+        self,
+        calls: list[dict[str, Any]],
+        parallel: bool = True,
+    ) -> list:
+        """
+        Call several tools in one round trip, e.g.
+        ``[{"tool_name": "run_shell_command", "arguments": {...}}]``.
+        """
+        return self.manager_api.call_tools_batch(
+            self.sandbox_id,
+            calls,
+            parallel,
+        )
+
     def add_mcp_servers(
         self,
         server_configs: dict,
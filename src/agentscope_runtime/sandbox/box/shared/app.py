@@ -3,6 +3,7 @@ import logging
 
 from fastapi import FastAPI, Response, Depends
 from routers import (
+    batch_router,
     generic_router,
     mcp_router,
     watcher_router,
@@ -37,6 +38,7 @@ app.include_router(
     workspace_router,
     dependencies=[Depends(verify_secret_token)],
 )
+app.include_router(batch_router, dependencies=[Depends(verify_secret_token)])
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+from .batch import batch_router
 from .generic import generic_router
 from .mcp import mcp_router
 from .runtime_watcher import watcher_router
@@ -9,4 +10,5 @@ __all__ = [
     "generic_router",
     "watcher_router",
     "workspace_router",
+    "batch_router",
 ]
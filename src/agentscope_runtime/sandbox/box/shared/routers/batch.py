@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import inspect
+import json
+import logging
+import traceback
+from typing import List
+
+from fastapi import APIRouter, Body, HTTPException
+from fastapi.params import Body as BodyParam
+from fastapi.responses import StreamingResponse
+
+from .generic import run_ipython_cell, run_shell_command
+from .mcp import call_tool
+
+batch_router = APIRouter()
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_SIZE = 64
+
+_GENERIC_TOOLS = {
+    "run_ipython_cell": run_ipython_cell,
+    "run_shell_command": run_shell_command,
+}
+
+
+def _error_result(text: str) -> dict:
+    return {
+        "isError": True,
+        "content": [{"type": "text", "text": text}],
+    }
+
+
+def _check_arguments(tool_name: str, func, arguments: dict) -> None:
+    """Check ``arguments`` against the parameters of endpoint ``func``.
+
+    Endpoints are called directly here, so a missing required argument
+    would otherwise be passed FastAPI's ``Body(...)`` marker.
+
+    Raises:
+        HTTPException: If an argument is unknown or a required one is
+            missing.
+    """
+    parameters = inspect.signature(func).parameters
+    unknown = sorted(set(arguments) - set(parameters))
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown arguments for {tool_name}: {', '.join(unknown)}",
+        )
+    missing = [
+        name
+        for name, parameter in parameters.items()
+        if name not in arguments
+        and (
+            parameter.default is inspect.Parameter.empty
+            or (
+                isinstance(parameter.default, BodyParam)
+                and parameter.default.is_required()
+            )
+        )
+    ]
+    if missing:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Missing arguments for {tool_name}: {', '.join(missing)}",
+        )
+
+
+async def _dispatch(tool_name: str, arguments: dict) -> dict:
+    """Run one call of a batch, turning failures into error results."""
+    try:
+        if tool_name in _GENERIC_TOOLS:
+            func = _GENERIC_TOOLS[tool_name]
+            _check_arguments(tool_name, func, arguments)
+            return await func(**arguments)
+        return await call_tool(tool_name=tool_name, arguments=arguments)
+    except HTTPException as e:
+        return _error_result(str(e.detail))
+    except Exception as e:
+        return _error_result(f"{str(e)}: {traceback.format_exc()}")
+
+
+async def _iter_results(calls: List[dict], parallel: bool):
+    """Yield ``(index, result)`` pairs, in completion order if parallel."""
+    if not parallel:
+        for index, call in enumerate(calls):
+            result = await _dispatch(
+                call.get("tool_name"),
+                call.get("arguments") or {},
+            )
+            yield index, result
+        return
+
+    async def _run(index, call):
+        result = await _dispatch(
+            call.get("tool_name"),
+            call.get("arguments") or {},
+        )
+        return index, result
+
+    for future in asyncio.as_completed(
+        [_run(index, call) for index, call in enumerate(calls)],
+    ):
+        yield await future
+
+
+@batch_router.post(
+    "/tools/call_tools_batch",
+    summary="Execute several tool calls in one request",
+)
+async def call_tools_batch(
+    calls: List[dict] = Body(
+        ...,
+        example=[
+            {
+                "tool_name": "run_shell_command",
+                "arguments": {"command": "pwd"},
+            },
+        ],
+        embed=True,
+    ),
+    parallel: bool = Body(
+        True,
+        embed=True,
+    ),
+    stream: bool = Body(
+        False,
+        embed=True,
+    ),
+):
+    """
+    Execute a list of ``{"tool_name", "arguments"}`` calls, concurrently or
+    in order. A failing call yields an error result and does not abort the
+    rest of the batch.
+
+    Results are returned as a list in call order, or, with ``stream``, as
+    newline-delimited JSON ``{"index", "result"}`` records emitted as soon
+    as each call finishes.
+    """
+    if not calls:
+        raise HTTPException(status_code=400, detail="calls is required.")
+    if len(calls) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BATCH_SIZE} calls are allowed per batch.",
+        )
+    for call in calls:
+        if not call.get("tool_name"):
+            raise HTTPException(
+                status_code=400,
+                detail="tool_name is required for every call.",
+            )
+
+    if stream:
+
+        async def event_generator():
+            async for index, result in _iter_results(calls, parallel):
+                yield json.dumps({"index": index, "result": result}) + "\n"
+
+        return StreamingResponse(
+            event_generator(),
+            media_type="application/x-ndjson",
+        )
+
+    results = [None] * len(calls)
+    async for index, result in _iter_results(calls, parallel):
+        results[index] = result
+    return results
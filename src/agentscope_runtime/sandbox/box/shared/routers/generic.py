@@ -1,22 +1,28 @@
 # -*- coding: utf-8 -*-
-import io
-import sys
+import json
 import logging
-import subprocess
 import traceback
-from contextlib import redirect_stderr, redirect_stdout
+from typing import Annotated, Optional
 
 from fastapi import APIRouter, Body, HTTPException
-from IPython.core.interactiveshell import InteractiveShell
+from fastapi.responses import StreamingResponse
 from mcp.types import CallToolResult, TextContent
 
+from .kernel_utils import (
+    DEFAULT_KERNEL,
+    KernelBusyError,
+    KernelPool,
+    collect_output,
+)
+from .shell_utils import execute_shell_command, stream_shell_command
+
 SPLIT_OUTPUT_MODE = True
 
 
 generic_router = APIRouter()
 
-# Initialize IPython shell
-ipy = InteractiveShell.instance()
+# IPython kernels, each running in its own process
+_KERNELS = KernelPool()
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -32,41 +38,34 @@ async def run_ipython_cell(
         example="print('Hello World')",
         embed=True,
     ),
+    kernel: Annotated[str, Body(embed=True)] = DEFAULT_KERNEL,
+    timeout: Annotated[Optional[float], Body(embed=True)] = None,
 ):
     """
     Execute code in an IPython kernel and return the results.
+
+    Cells in different named kernels run in parallel and do not share
+    state. The cell is interrupted after ``timeout`` seconds, if given.
     """
     try:
         if not code:
             raise HTTPException(status_code=400, detail="Code is required.")
 
-        # Capture stdout and stderr separately
-        stdout_buf = io.StringIO()
-        stderr_buf = io.StringIO()
-
-        with redirect_stdout(stdout_buf), redirect_stderr(stderr_buf):
-            preprocessing_exc_tuple = None
-            try:
-                transformed_cell = ipy.transform_cell(code)
-            except Exception:
-                transformed_cell = code
-                preprocessing_exc_tuple = sys.exc_info()
-
-            if transformed_cell is None:
-                raise HTTPException(
-                    status_code=500,
-                    detail="IPython cell transformation failed: "
-                    "transformed_cell is None.",
-                )
-
-            await ipy.run_cell_async(
-                code,
-                transformed_cell=transformed_cell,
-                preprocessing_exc_tuple=preprocessing_exc_tuple,
+        result = await collect_output(
+            _KERNELS.execute(code, name=kernel, timeout=timeout),
+        )
+        stdout_content = result["stdout"]
+        stderr_content = result["stderr"]
+        if result["timed_out"]:
+            stderr_content += (
+                f"\nCell timed out after {timeout} seconds and was "
+                f"interrupted."
+            )
+        if result["restarted"]:
+            stderr_content += (
+                "\nThe IPython kernel died and will be restarted, its "
+                "state was lost."
             )
-
-        stdout_content = stdout_buf.getvalue()
-        stderr_content = stderr_buf.getvalue()
 
         content_list = []
 
@@ -103,6 +102,8 @@ async def run_ipython_cell(
             isError=is_error,
         ).model_dump()
 
+    except KernelBusyError as e:
+        raise HTTPException(status_code=429, detail=str(e)) from e
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -110,6 +111,100 @@ async def run_ipython_cell(
         ) from e
 
 
+@generic_router.post(
+    "/tools/run_ipython_cell_stream",
+    summary="Invoke an IPython cell, streaming its output.",
+)
+async def run_ipython_cell_stream(
+    code: str = Body(
+        ...,
+        example="print('Hello World')",
+        embed=True,
+    ),
+    kernel: Annotated[str, Body(embed=True)] = DEFAULT_KERNEL,
+    timeout: Annotated[Optional[float], Body(embed=True)] = None,
+):
+    """
+    Execute code in an IPython kernel, streaming newline-delimited JSON
+    events: ``{"type": "stdout" | "stderr", "text"}`` as output is produced
+    and a final ``{"type": "exit", "timed_out", "restarted"}``.
+
+    The cell is interrupted after ``timeout`` seconds, if given, or when
+    the client disconnects.
+    """
+    if not code:
+        raise HTTPException(status_code=400, detail="Code is required.")
+
+    async def event_generator():
+        try:
+            async for event in _KERNELS.execute(
+                code,
+                name=kernel,
+                timeout=timeout,
+            ):
+                yield json.dumps(event) + "\n"
+        except KernelBusyError as e:
+            event = {"type": "stderr", "text": str(e)}
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="application/x-ndjson",
+    )
+
+
+@generic_router.post(
+    "/tools/interrupt_ipython_kernel",
+    summary="Interrupt the cell running in an IPython kernel",
+)
+async def interrupt_ipython_kernel(
+    kernel: str = Body(
+        DEFAULT_KERNEL,
+        embed=True,
+    ),
+):
+    """
+    Interrupt the running cell of ``kernel``, keeping the kernel's state.
+    """
+    return {"interrupted": _KERNELS.interrupt(kernel)}
+
+
+@generic_router.get(
+    "/tools/list_ipython_kernels",
+    summary="List the IPython kernels",
+)
+async def list_ipython_kernels():
+    return _KERNELS.kernels()
+
+
+@generic_router.post(
+    "/tools/shutdown_ipython_kernel",
+    summary="Shut down an IPython kernel, discarding its state",
+)
+async def shutdown_ipython_kernel(
+    kernel: str = Body(
+        DEFAULT_KERNEL,
+        embed=True,
+    ),
+):
+    await _KERNELS.shutdown(kernel)
+    return {"kernel": kernel}
+
+
+@generic_router.on_event("startup")
+async def start_default_kernel() -> None:
+    """Start the default kernel so the first cell does not wait for it."""
+    try:
+        await _KERNELS.start()
+    except Exception as e:
+        logger.error(f"Failed to start the IPython kernel: {e}")
+
+
+@generic_router.on_event("shutdown")
+async def shutdown_kernels() -> None:
+    await _KERNELS.shutdown()
+
+
 @generic_router.post(
     "/tools/run_shell_command",
     summary="Invoke a shell command.",
@@ -120,24 +215,32 @@ async def run_shell_command(
         example="pwd",
         embed=True,
     ),
+    # Annotated, so that direct calls (e.g. from the batch router) get
+    # plain defaults.
+    timeout: Annotated[Optional[float], Body(embed=True)] = None,
 ):
     """
     Execute a shell command and return the results.
+
+    The command is killed after ``timeout`` seconds, if given.
     """
     try:
         if not command:
             raise HTTPException(status_code=400, detail="Command is required.")
 
-        result = subprocess.run(
-            command,
-            shell=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            check=False,
-        )
-        stdout_content = result.stdout
-        stderr_content = result.stderr
+        result = await execute_shell_command(command, timeout=timeout)
+        stdout_content = result["stdout"]
+        stderr_content = result["stderr"]
+        for name in result["truncated"]:
+            if name == "stdout":
+                stdout_content += "\n[stdout truncated]"
+            else:
+                stderr_content += "\n[stderr truncated]"
+        if result["timed_out"]:
+            stderr_content += (
+                f"\nCommand timed out after {timeout} seconds and was "
+                f"killed."
+            )
 
         content_list = []
 
@@ -161,7 +264,7 @@ async def run_shell_command(
             content_list.append(
                 TextContent(
                     type="text",
-                    text=str(result.returncode),
+                    text=str(result["returncode"]),
                     description="returncode",
                 ),
             )
@@ -173,7 +276,7 @@ async def run_shell_command(
                     + "\n"
                     + stderr_content
                     + "\n"
-                    + str(result.returncode),
+                    + str(result["returncode"]),
                     description="output",
                 ),
             )
@@ -190,3 +293,36 @@ async def run_shell_command(
             status_code=500,
             detail=f"{str(e)}: {traceback.format_exc()}",
         ) from e
+
+
+@generic_router.post(
+    "/tools/run_shell_command_stream",
+    summary="Invoke a shell command, streaming its output.",
+)
+async def run_shell_command_stream(
+    command: str = Body(
+        ...,
+        example="pwd",
+        embed=True,
+    ),
+    timeout: Annotated[Optional[float], Body(embed=True)] = None,
+):
+    """
+    Execute a shell command, streaming newline-delimited JSON events:
+    ``{"type": "stdout" | "stderr", "text"}`` as output is produced and a
+    final ``{"type": "exit", "returncode", "timed_out", "truncated"}``.
+
+    The command is killed after ``timeout`` seconds, if given, or when the
+    client disconnects.
+    """
+    if not command:
+        raise HTTPException(status_code=400, detail="Command is required.")
+
+    async def event_generator():
+        async for event in stream_shell_command(command, timeout=timeout):
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="application/x-ndjson",
+    )
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""IPython kernel process started by :mod:`kernel_utils`.
+
+Reads one JSON request ``{"code": ...}`` per line from stdin, runs it in
+an ``InteractiveShell`` and writes JSON events to stdout: ``{"type":
+"stdout" | "stderr", "text": ...}`` while the cell runs, then ``{"type":
+"done"}``. SIGINT interrupts the running cell and is ignored otherwise.
+"""
+import json
+import os
+import signal
+import sys
+from contextlib import contextmanager
+
+# Output events are split so one line never exceeds the reader's limit.
+_MAX_EVENT_CHARS = 64 * 1024
+
+
+class _Protocol:
+    def __init__(self) -> None:
+        # Keep the real stdin/stdout for requests and events, and point
+        # fds 0 and 1 elsewhere so that user code and child processes
+        # cannot read requests or corrupt events.
+        self._in = os.fdopen(os.dup(0), "r", encoding="utf-8")
+        self._out = os.dup(1)
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        os.close(devnull)
+        os.dup2(2, 1)
+
+        # SIGINT interrupts running cells only
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    @contextmanager
+    def executing(self):
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        try:
+            yield
+        finally:
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    def read(self) -> str:
+        return self._in.readline()
+
+    def send(self, event: dict) -> None:
+        data = (json.dumps(event) + "\n").encode("utf-8")
+        # An interrupt arriving now is raised once the event is written.
+        signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGINT})
+        try:
+            while data:
+                data = data[os.write(self._out, data) :]
+        finally:
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGINT})
+
+
+class _EventStream:
+    """Text stream sending everything written to it as events."""
+
+    encoding = "utf-8"
+    errors = "replace"
+
+    def __init__(self, protocol: _Protocol, name: str) -> None:
+        self._protocol = protocol
+        self._name = name
+
+    def write(self, text: str) -> int:
+        for start in range(0, len(text), _MAX_EVENT_CHARS):
+            self._protocol.send(
+                {
+                    "type": self._name,
+                    "text": text[start : start + _MAX_EVENT_CHARS],
+                },
+            )
+        return len(text)
+
+    def writelines(self, lines) -> None:
+        for line in lines:
+            self.write(line)
+
+    def flush(self) -> None:
+        pass
+
+    def isatty(self) -> bool:
+        return False
+
+    def writable(self) -> bool:
+        return True
+
+
+def main() -> None:
+    # Run as a script, this directory is first on sys.path and its
+    # modules would shadow packages imported by user code.
+    if sys.path and sys.path[0] == os.path.dirname(os.path.abspath(__file__)):
+        sys.path.pop(0)
+
+    protocol = _Protocol()
+    sys.stdout = _EventStream(protocol, "stdout")
+    sys.stderr = _EventStream(protocol, "stderr")
+
+    from IPython.core.interactiveshell import InteractiveShell
+
+    shell = InteractiveShell.instance()
+    protocol.send({"type": "ready"})
+
+    while True:
+        line = protocol.read()
+        if not line:
+            break
+        code = json.loads(line)["code"]
+        try:
+            with protocol.executing():
+                shell.run_cell(code)
+        except KeyboardInterrupt:
+            # Interrupted outside of the cell itself, e.g. while IPython
+            # was displaying its result.
+            sys.stderr.write("KeyboardInterrupt\n")
+        protocol.send({"type": "done"})
+
+
+if __name__ == "__main__":
+    main()
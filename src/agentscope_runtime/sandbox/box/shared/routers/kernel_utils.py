@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import logging
+import os
+import signal
+import sys
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+KERNEL_SCRIPT = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "ipython_kernel.py",
+)
+DEFAULT_KERNEL = "default"
+# Kernels kept alive at once; the least recently used idle kernel is
+# shut down to make room for a new one.
+MAX_KERNELS = int(os.getenv("IPYTHON_MAX_KERNELS", "4"))
+# Seconds an interrupted cell gets to stop before its kernel is killed.
+INTERRUPT_GRACE_PERIOD = float(os.getenv("IPYTHON_INTERRUPT_GRACE", "5"))
+
+_READ_LIMIT = 1 << 20
+
+
+class KernelBusyError(RuntimeError):
+    """Raised when a new kernel is needed but every kernel is busy."""
+
+
+class IPythonKernel:
+    """An IPython shell in its own process, running one cell at a time.
+
+    Cells run in a child process, so CPU-bound code does not block the
+    server's event loop, and each cell's output is captured on its own.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._lock = asyncio.Lock()
+        self._releasing: Optional[asyncio.Future] = None
+        # Requests holding the kernel from a KernelPool, which may not have
+        # taken its lock yet
+        self.users = 0
+
+    @property
+    def busy(self) -> bool:
+        """Whether a cell is running or waiting to run."""
+        return self._lock.locked()
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    async def start(self) -> None:
+        """Start the kernel process if it is not running."""
+        async with self._lock:
+            await self._ensure_started()
+
+    async def _ensure_started(self) -> None:
+        if self.alive:
+            return
+        self._process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            KERNEL_SCRIPT,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            limit=_READ_LIMIT,
+            start_new_session=True,
+        )
+        event = await self._read_event()
+        if event is None or event["type"] != "ready":
+            await self._stop()
+            raise RuntimeError(f"IPython kernel {self.name} failed to start")
+        logger.info(f"Started IPython kernel {self.name}")
+
+    async def _read_event(self) -> Optional[Dict[str, Any]]:
+        line = await self._process.stdout.readline()
+        if not line:
+            # The kernel exited, it is restarted by the next cell.
+            await self._process.wait()
+            return None
+        return json.loads(line)
+
+    def interrupt(self) -> bool:
+        """Interrupt the running cell, returning whether one was running."""
+        if not self.busy or not self.alive:
+            return False
+        self._process.send_signal(signal.SIGINT)
+        return True
+
+    def _kill(self) -> None:
+        """Kill the kernel together with every process it started."""
+        if not self.alive:
+            return
+        try:
+            os.killpg(self._process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    async def _stop(self) -> None:
+        if self._process is None:
+            return
+        self._kill()
+        await self._process.wait()
+        self._process = None
+
+    async def shutdown(self) -> None:
+        """Stop the kernel process, ending the running cell if any."""
+        self._kill()
+        async with self._lock:
+            await self._stop()
+
+    async def execute(
+        self,
+        code: str,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Run ``code`` and yield its output as it is produced.
+
+        Yields ``{"type": "stdout" | "stderr", "text": ...}`` events, then
+        one ``{"type": "exit", "timed_out", "restarted"}`` event.
+        ``restarted`` is set when the kernel process died, losing its
+        state, e.g. because a timed out cell ignored the interrupt for
+        ``INTERRUPT_GRACE_PERIOD`` seconds and the kernel was killed.
+
+        Cells past ``timeout`` seconds are interrupted. If the caller stops
+        iterating early, the cell is interrupted as well, and the kernel
+        is released once it has stopped.
+        """
+        loop = asyncio.get_running_loop()
+        timers = []
+        timed_out = False
+        restarted = False
+        finished = False
+
+        def _on_timeout() -> None:
+            nonlocal timed_out
+            timed_out = True
+            self.interrupt()
+            timers.append(loop.call_later(INTERRUPT_GRACE_PERIOD, self._kill))
+
+        await self._lock.acquire()
+        try:
+            await self._ensure_started()
+            request = json.dumps({"code": code}) + "\n"
+            self._process.stdin.write(request.encode("utf-8"))
+            await self._process.stdin.drain()
+            if timeout:
+                timers.append(loop.call_later(timeout, _on_timeout))
+
+            while True:
+                event = await self._read_event()
+                if event is None:
+                    restarted = True
+                    break
+                if event["type"] == "done":
+                    break
+                yield event
+            finished = True
+        finally:
+            for timer in timers:
+                timer.cancel()
+            if finished or not self.alive:
+                self._lock.release()
+            else:
+                self.interrupt()
+                self._releasing = asyncio.ensure_future(
+                    self._release_when_idle(),
+                )
+
+        yield {"type": "exit", "timed_out": timed_out, "restarted": restarted}
+
+    async def _release_when_idle(self) -> None:
+        """Discard the rest of an abandoned cell, then release the kernel."""
+        timer = asyncio.get_running_loop().call_later(
+            INTERRUPT_GRACE_PERIOD,
+            self._kill,
+        )
+        try:
+            while True:
+                event = await self._read_event()
+                if event is None or event["type"] == "done":
+                    break
+        except Exception as e:
+            logger.error(f"Failed to stop IPython kernel {self.name}: {e}")
+            self._kill()
+        finally:
+            timer.cancel()
+            self._lock.release()
+
+
+class KernelPool:
+    """Named IPython kernels, at most ``max_kernels`` alive at once.
+
+    Each kernel keeps its own state and runs one cell at a time; cells in
+    different kernels run in parallel.
+    """
+
+    def __init__(self, max_kernels: int = MAX_KERNELS) -> None:
+        self.max_kernels = max_kernels
+        # Least recently used first
+        self._kernels: "OrderedDict[str, IPythonKernel]" = OrderedDict()
+
+    def get(self, name: str) -> Optional[IPythonKernel]:
+        return self._kernels.get(name)
+
+    def kernels(self) -> List[Dict[str, Any]]:
+        """Return the name and state of every kernel."""
+        return [
+            {"name": kernel.name, "busy": kernel.busy}
+            for kernel in self._kernels.values()
+        ]
+
+    async def _get_or_create(self, name: str) -> IPythonKernel:
+        """Return kernel ``name`` with its ``users`` count incremented.
+
+        Kernels with users are not evicted, even before they take their
+        lock; the caller decrements the count once done with the kernel.
+        """
+        kernel = self._kernels.get(name)
+        if kernel is None:
+            evicted = None
+            if len(self._kernels) >= self.max_kernels:
+                evicted = next(
+                    (
+                        k
+                        for k in self._kernels.values()
+                        if not k.busy and not k.users
+                    ),
+                    None,
+                )
+                if evicted is None:
+                    raise KernelBusyError(
+                        f"All {self.max_kernels} IPython kernels are busy",
+                    )
+                del self._kernels[evicted.name]
+            kernel = self._kernels[name] = IPythonKernel(name)
+            kernel.users += 1
+            if evicted is not None:
+                logger.info(
+                    f"Shutting down idle IPython kernel {evicted.name}",
+                )
+                try:
+                    await evicted.shutdown()
+                except BaseException:
+                    kernel.users -= 1
+                    raise
+        else:
+            kernel.users += 1
+        self._kernels.move_to_end(name)
+        return kernel
+
+    async def start(self, name: str = DEFAULT_KERNEL) -> None:
+        """Start kernel ``name`` ahead of its first cell."""
+        kernel = await self._get_or_create(name)
+        try:
+            await kernel.start()
+        finally:
+            kernel.users -= 1
+
+    async def execute(
+        self,
+        code: str,
+        name: str = DEFAULT_KERNEL,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Run ``code`` in kernel ``name``, see :meth:`IPythonKernel.execute`.
+
+        Raises:
+            KernelBusyError: If kernel ``name`` does not exist and cannot
+                be started because every kernel is busy.
+        """
+        kernel = await self._get_or_create(name)
+        try:
+            async for event in kernel.execute(code, timeout=timeout):
+                yield event
+        finally:
+            kernel.users -= 1
+
+    def interrupt(self, name: str = DEFAULT_KERNEL) -> bool:
+        """Interrupt the cell running in kernel ``name``, if any."""
+        kernel = self._kernels.get(name)
+        return kernel is not None and kernel.interrupt()
+
+    async def shutdown(self, name: Optional[str] = None) -> None:
+        """Shut down kernel ``name``, or every kernel if not given."""
+        names = list(self._kernels) if name is None else [name]
+        for kernel_name in names:
+            kernel = self._kernels.pop(kernel_name, None)
+            if kernel is not None:
+                await kernel.shutdown()
+
+
+async def collect_output(
+    events: AsyncIterator[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Collect the events of a cell into one ``stdout``/``stderr`` result.
+
+    Returns:
+        The exit event with the joined ``stdout`` and ``stderr`` text.
+    """
+    output = {"stdout": [], "stderr": []}
+    async for event in events:
+        if event["type"] == "exit":
+            result = event
+        else:
+            output[event["type"]].append(event["text"])
+    for name, texts in output.items():
+        result[name] = "".join(texts)
+    return result
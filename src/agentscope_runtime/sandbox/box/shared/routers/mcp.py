@@ -1,10 +1,13 @@
 # -*- coding: utf-8 -*-
-import copy
+import asyncio
 import json
 import logging
 import os
+import time
 import traceback
 
+from typing import Optional
+
 from fastapi import APIRouter, Body, HTTPException, Response
 
 from .mcp_utils import MCPSessionHandler
@@ -12,6 +15,18 @@ from .mcp_utils import MCPSessionHandler
 mcp_router = APIRouter()
 
 _MCP_SERVERS = {}
+# Server name -> (fetched at, {tool name: tool schema})
+_MCP_TOOLS_CACHE = {}
+# Tool name -> name of the server providing it
+_MCP_TOOL_ROUTES = {}
+# Seconds before cached tool lists are fetched again, in case a server
+# does not send ``notifications/tools/list_changed``.
+MCP_TOOLS_CACHE_TTL = float(os.getenv("MCP_TOOLS_CACHE_TTL", "300"))
+# Servers initialized at once by add_servers, and the seconds each may
+# take to start.
+MCP_INIT_CONCURRENCY = int(os.getenv("MCP_INIT_CONCURRENCY", "8"))
+MCP_INIT_TIMEOUT = float(os.getenv("MCP_INIT_TIMEOUT", "120"))
+
 current_directory = os.path.dirname(os.path.abspath(__file__))
 mcp_server_configs_path = os.path.abspath(
     os.path.join(current_directory, "../mcp_server_configs.json"),
@@ -21,6 +36,109 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _build_server_tools(tools) -> dict:
+    server_tools = {}
+    for tool in tools:
+        name = tool.name
+        if name in server_tools:
+            logging.warning(
+                f"Service function `{name}` already exists, "
+                f"skip adding it.",
+            )
+        else:
+            json_schema = {
+                "type": "function",
+                "function": {
+                    "name": tool.name,
+                    "description": tool.description,
+                    "parameters": {
+                        "type": "object",
+                        "properties": tool.inputSchema.get(
+                            "properties",
+                            {},
+                        ),
+                        "required": tool.inputSchema.get(
+                            "required",
+                            [],
+                        ),
+                    },
+                },
+            }
+            server_tools[tool.name] = {
+                "name": tool.name,
+                "json_schema": json_schema,
+            }
+    return server_tools
+
+
+def _rebuild_tool_routes() -> None:
+    """Map each tool to the first server, in add order, providing it."""
+    global _MCP_TOOL_ROUTES
+
+    routes = {}
+    for server_name in _MCP_SERVERS:
+        cached = _MCP_TOOLS_CACHE.get(server_name)
+        if cached is None:
+            continue
+        for tool_name in cached[1]:
+            routes.setdefault(tool_name, server_name)
+    _MCP_TOOL_ROUTES = routes
+
+
+def _forget_server_tools(server_name: str) -> None:
+    if _MCP_TOOLS_CACHE.pop(server_name, None) is not None:
+        _rebuild_tool_routes()
+
+
+async def _refresh_tools(force: bool = False) -> None:
+    """Fetch the tool lists that are missing, expired or changed."""
+    now = time.monotonic()
+    stale = []
+    for server_name, server in _MCP_SERVERS.items():
+        cached = _MCP_TOOLS_CACHE.get(server_name)
+        if (
+            force
+            or cached is None
+            or server.tools_changed
+            or now - cached[0] >= MCP_TOOLS_CACHE_TTL
+        ):
+            # Cleared first so a notification during the fetch is kept.
+            server.tools_changed = False
+            stale.append(server)
+    if not stale:
+        return
+    results = await asyncio.gather(
+        *(server.list_tools() for server in stale),
+        return_exceptions=True,
+    )
+    for server, tools in zip(stale, results):
+        if not isinstance(tools, BaseException):
+            _MCP_TOOLS_CACHE[server.name] = (now, _build_server_tools(tools))
+    _rebuild_tool_routes()
+    for server, tools in zip(stale, results):
+        if isinstance(tools, BaseException):
+            server.tools_changed = True
+            raise tools
+
+
+async def _initialize_server(
+    server: MCPSessionHandler,
+    semaphore: asyncio.Semaphore,
+) -> Optional[str]:
+    """Initialize ``server``, returning the error message on failure."""
+    async with semaphore:
+        try:
+            await asyncio.wait_for(server.initialize(), MCP_INIT_TIMEOUT)
+        except asyncio.TimeoutError:
+            error = f"Timed out after {MCP_INIT_TIMEOUT} seconds"
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        else:
+            return None
+    logging.error(f"Failed to initialize server {server.name}: {error}")
+    return error
+
+
 # NOTE: DO NOT use API-KEY Server in release version due to security issues
 @mcp_router.post(
     "/mcp/add_servers",
@@ -50,32 +168,54 @@ async def add_servers(
             for name, config in server_configs["mcpServers"].items()
         ]
 
-        fail_servers = []
-
-        # Initialize the servers
+        pending = []
         for server in new_servers:
             if server.name in _MCP_SERVERS:
                 if not overwrite:
                     continue
                 # Cleanup old server
+                _forget_server_tools(server.name)
                 await _MCP_SERVERS.pop(server.name).cleanup()
-            try:
-                await server.initialize()
+            pending.append(server)
+
+        # Initialize the servers concurrently, so readiness is bounded by
+        # the slowest server rather than the sum of all of them
+        semaphore = asyncio.Semaphore(MCP_INIT_CONCURRENCY)
+        errors = await asyncio.gather(
+            *(_initialize_server(server, semaphore) for server in pending),
+        )
+
+        fail_servers = {}
+        for server, error in zip(pending, errors):
+            if error is None:
                 _MCP_SERVERS[server.name] = server
-            except Exception as e:
-                logging.error(f"Failed to initialize server: {e}")
-                fail_servers.append(server)
-                continue
+            else:
+                fail_servers[server.name] = error
+                await server.cleanup()
+
+        try:
+            await _refresh_tools()
+        except Exception as e:
+            # Retried on the next list_tools or call_tool.
+            logging.warning(f"Failed to list tools of MCP servers: {e}")
 
         if fail_servers:
-            for server in fail_servers:
-                await server.cleanup()
             raise HTTPException(
                 status_code=500,
-                detail=f"Failed to initialize server: "
-                f"{[server.name for server in fail_servers]}",
+                detail={
+                    "message": f"Failed to initialize server: "
+                    f"{list(fail_servers)}",
+                    "initialized": [
+                        server.name
+                        for server in pending
+                        if server.name not in fail_servers
+                    ],
+                    "failed": fail_servers,
+                },
             )
         return Response(content="OK", status_code=200)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -89,43 +229,11 @@ async def add_servers(
 )
 async def list_tools():
     try:
-        mcp_tools = {}
-
-        for server_name, server in _MCP_SERVERS.items():
-            tools = await server.list_tools()
-            server_tools = {}
-            for tool in tools:
-                name = tool.name
-                if name in server_tools:
-                    logging.warning(
-                        f"Service function `{name}` already exists, "
-                        f"skip adding it.",
-                    )
-                else:
-                    json_schema = {
-                        "type": "function",
-                        "function": {
-                            "name": tool.name,
-                            "description": tool.description,
-                            "parameters": {
-                                "type": "object",
-                                "properties": tool.inputSchema.get(
-                                    "properties",
-                                    {},
-                                ),
-                                "required": tool.inputSchema.get(
-                                    "required",
-                                    [],
-                                ),
-                            },
-                        },
-                    }
-                    server_tools[tool.name] = {
-                        "name": tool.name,
-                        "json_schema": json_schema,
-                    }
-            mcp_tools[server_name] = copy.deepcopy(server_tools)
-        return mcp_tools
+        await _refresh_tools()
+        return {
+            server_name: _MCP_TOOLS_CACHE[server_name][1]
+            for server_name in _MCP_SERVERS
+        }
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -154,14 +262,19 @@ async def call_tool(
                 detail="tool_name is required.",
             )
 
-        tools = await list_tools()
-        for server_name, server_tools in tools.items():
-            if tool_name not in server_tools:
-                continue
-            server = _MCP_SERVERS[server_name]
-            result = await server.call_tool(tool_name, arguments)
-            return result.model_dump()
-        raise ModuleNotFoundError(f"Tool '{tool_name}' not found.")
+        await _refresh_tools()
+        server_name = _MCP_TOOL_ROUTES.get(tool_name)
+        if server_name is None:
+            # The tool may have been added without a notification.
+            await _refresh_tools(force=True)
+            server_name = _MCP_TOOL_ROUTES.get(tool_name)
+        if server_name is None:
+            raise ModuleNotFoundError(f"Tool '{tool_name}' not found.")
+        result = await _MCP_SERVERS[server_name].call_tool(
+            tool_name,
+            arguments,
+        )
+        return result.model_dump()
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -172,7 +285,7 @@ async def call_tool(
 @mcp_router.on_event("shutdown")
 async def cleanup_servers() -> None:
     """Clean up all servers properly."""
-    global _MCP_SERVERS
+    global _MCP_SERVERS, _MCP_TOOLS_CACHE, _MCP_TOOL_ROUTES
 
     for server in reversed(list(_MCP_SERVERS.values())):
         try:
@@ -181,6 +294,8 @@ async def cleanup_servers() -> None:
             logging.error(f"Failed to cleanup server: {e}")
 
     _MCP_SERVERS = {}
+    _MCP_TOOLS_CACHE = {}
+    _MCP_TOOL_ROUTES = {}
 
 
 @mcp_router.on_event("startup")
@@ -8,7 +8,7 @@ from contextlib import AsyncExitStack
 from datetime import timedelta
 from typing import Any
 
-from mcp import ClientSession, StdioServerParameters
+from mcp import ClientSession, StdioServerParameters, types
 from mcp.client.sse import sse_client
 from mcp.client.stdio import stdio_client
 from mcp.client.streamable_http import streamablehttp_client
@@ -39,6 +39,8 @@ class MCPSessionHandler:
         self.session: ClientSession | None = None
         self._cleanup_lock: asyncio.Lock = asyncio.Lock()
         self._exit_stack: AsyncExitStack = AsyncExitStack()
+        # Set when the server announces its tool list changed.
+        self.tools_changed: bool = False
 
     async def initialize(self) -> None:
         """Initialize the server connection."""
@@ -94,7 +96,10 @@ class MCPSessionHandler:
                         ),
                     )
             session = await self._exit_stack.enter_async_context(
-                ClientSession(*streams),
+                ClientSession(
+                    *streams,
+                    message_handler=self._handle_message,
+                ),
             )
             await session.initialize()
             self.session = session
@@ -103,6 +108,14 @@ class MCPSessionHandler:
             await self.cleanup()
             raise
 
+    async def _handle_message(self, message: Any) -> None:
+        """Track ``notifications/tools/list_changed`` from the server."""
+        if isinstance(message, types.ServerNotification) and isinstance(
+            message.root,
+            types.ToolListChangedNotification,
+        ):
+            self.tools_changed = True
+
     async def list_tools(self) -> list[Any]:
         """List available tools from the server.
 
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import codecs
+import os
+import signal
+from typing import Any, AsyncIterator, Dict, Optional
+
+# Bytes of stdout and of stderr kept per command, the rest is discarded.
+MAX_OUTPUT_BYTES = int(os.getenv("SHELL_MAX_OUTPUT_BYTES", str(1 << 20)))
+
+_READ_SIZE = 64 * 1024
+_STREAMS = ("stdout", "stderr")
+
+
+def _kill(process: asyncio.subprocess.Process) -> None:
+    """Kill the command together with every process it started."""
+    if process.returncode is not None:
+        return
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+async def _pump(
+    name: str,
+    stream: asyncio.StreamReader,
+    queue: asyncio.Queue,
+) -> None:
+    while True:
+        chunk = await stream.read(_READ_SIZE)
+        if not chunk:
+            break
+        await queue.put((name, chunk))
+    await queue.put((name, None))
+
+
+async def stream_shell_command(
+    command: str,
+    timeout: Optional[float] = None,
+    max_output_bytes: int = MAX_OUTPUT_BYTES,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Run ``command`` in a shell and yield its output as it is produced.
+
+    Yields ``{"type": "stdout" | "stderr", "text": ...}`` chunks, then one
+    ``{"type": "exit", "returncode", "timed_out", "truncated"}`` event,
+    where ``truncated`` lists the streams that exceeded
+    ``max_output_bytes``. Output past that limit is read and discarded so
+    the command never blocks on a full pipe.
+
+    The command's process group is killed once it runs longer than
+    ``timeout`` seconds, or when the caller stops iterating early.
+    """
+    process = await asyncio.create_subprocess_shell(
+        command,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=True,
+    )
+    timed_out = False
+
+    def _on_timeout() -> None:
+        nonlocal timed_out
+        timed_out = True
+        _kill(process)
+
+    timer = (
+        asyncio.get_running_loop().call_later(timeout, _on_timeout)
+        if timeout
+        else None
+    )
+    # Bounded, so a slow consumer pauses the command instead of
+    # buffering its output here.
+    queue: asyncio.Queue = asyncio.Queue(maxsize=16)
+    pumps = [
+        asyncio.create_task(_pump(name, getattr(process, name), queue))
+        for name in _STREAMS
+    ]
+    decoders = {
+        name: codecs.getincrementaldecoder("utf-8")(errors="replace")
+        for name in _STREAMS
+    }
+    remaining = dict.fromkeys(_STREAMS, max_output_bytes)
+    truncated = []
+
+    try:
+        open_streams = len(_STREAMS)
+        while open_streams:
+            name, chunk = await queue.get()
+            if chunk is None:
+                open_streams -= 1
+                text = decoders[name].decode(b"", final=True)
+            else:
+                if len(chunk) > remaining[name]:
+                    chunk = chunk[: remaining[name]]
+                    if name not in truncated:
+                        truncated.append(name)
+                if not chunk:
+                    continue
+                remaining[name] -= len(chunk)
+                text = decoders[name].decode(chunk)
+            if text:
+                yield {"type": name, "text": text}
+        returncode = await process.wait()
+    finally:
+        if timer is not None:
+            timer.cancel()
+        _kill(process)
+        for pump in pumps:
+            pump.cancel()
+
+    yield {
+        "type": "exit",
+        "returncode": returncode,
+        "timed_out": timed_out,
+        "truncated": truncated,
+    }
+
+
+async def execute_shell_command(
+    command: str,
+    timeout: Optional[float] = None,
+    max_output_bytes: int = MAX_OUTPUT_BYTES,
+) -> Dict[str, Any]:
+    """Run ``command`` in a shell and wait for it to finish.
+
+    Returns:
+        The exit event of :func:`stream_shell_command` with the collected
+        ``stdout`` and ``stderr`` text added.
+    """
+    output = {name: [] for name in _STREAMS}
+    async for event in stream_shell_command(
+        command,
+        timeout=timeout,
+        max_output_bytes=max_output_bytes,
+    ):
+        if event["type"] == "exit":
+            result = event
+        else:
+            output[event["type"]].append(event["text"])
+    for name, texts in output.items():
+        result[name] = "".join(texts)
+    return result
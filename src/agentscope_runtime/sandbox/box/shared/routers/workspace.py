@@ -1,21 +1,71 @@
 # -*- coding: utf-8 -*-
+import asyncio
 import shutil
 import os
 import logging
 import traceback
+from collections import OrderedDict
+from typing import List, Optional, Sequence
 
 import aiofiles
 
 from fastapi import APIRouter, HTTPException, Query, Body
 from fastapi.responses import FileResponse
 
+from .workspace_utils import (
+    DEFAULT_JOURNAL_EXCLUDE,
+    ChangeJournal,
+    decode_cursor,
+    list_page,
+)
+
 workspace_router = APIRouter()
 
+MAX_LIST_LIMIT = 10000
+# Page size when a listing is continued from a cursor without a limit
+DEFAULT_LIST_LIMIT = 1000
+
+# Comma-separated glob patterns the change journal skips unless a request
+# passes its own ``exclude``.
+JOURNAL_EXCLUDE = tuple(
+    pattern.strip()
+    for pattern in os.getenv(
+        "WORKSPACE_JOURNAL_EXCLUDE",
+        ",".join(DEFAULT_JOURNAL_EXCLUDE),
+    ).split(",")
+    if pattern.strip()
+)
+# Change journals kept at once, one per directory and filters; the least
+# recently used one is dropped, and its tokens reset.
+MAX_JOURNALS = int(os.getenv("WORKSPACE_MAX_JOURNALS", "4"))
+
+# Journals scan their directory only when changes are requested
+_JOURNALS: "OrderedDict[tuple, ChangeJournal]" = OrderedDict()
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _get_journal(
+    root: str,
+    exclude: Sequence[str],
+    max_depth: Optional[int],
+) -> ChangeJournal:
+    key = (root, tuple(exclude), max_depth)
+    journal = _JOURNALS.get(key)
+    if journal is None:
+        journal = _JOURNALS[key] = ChangeJournal(
+            root,
+            exclude=exclude,
+            max_depth=max_depth,
+        )
+        if len(_JOURNALS) > MAX_JOURNALS:
+            _JOURNALS.popitem(last=False)
+    _JOURNALS.move_to_end(key)
+    return journal
+
+
 def ensure_within_workspace(
     path: str,
     base_directory: str = "/workspace",
@@ -116,11 +166,59 @@ async def list_workspace_files(
         description="Directory to list files and directories from, default "
         "is /workspace.",
     ),
+    cursor: Optional[str] = Query(
+        None,
+        description="next_cursor of the previous page, to continue listing.",
+    ),
+    limit: Optional[int] = Query(
+        None,
+        ge=1,
+        le=MAX_LIST_LIMIT,
+        description="Maximum number of items to return, to list the "
+        "directory in pages. Without limit and cursor, every item is "
+        "returned.",
+    ),
+    max_depth: Optional[int] = Query(
+        None,
+        ge=1,
+        description="Deepest level to list, 1 lists only direct children.",
+    ),
+    include: Optional[List[str]] = Query(
+        None,
+        description="Glob patterns, matched against the name or relative "
+        "path, of the items to return.",
+    ),
+    exclude: Optional[List[str]] = Query(
+        None,
+        description="Glob patterns of items to skip along with their "
+        "contents, e.g. node_modules.",
+    ),
+    with_stats: bool = Query(
+        False,
+        description="Include the size and mtime of every item.",
+    ),
 ):
     """
-    List all files and directories in the specified directory, including
+    List the files and directories in the specified directory, including
     nested items, with type indication and statistics.
+
+    Without ``limit`` and ``cursor`` every item is returned. Otherwise
+    items are returned in pages of at most ``limit`` items, in a stable
+    depth-first order. ``next_cursor`` is passed as ``cursor`` to get the
+    next page, of ``DEFAULT_LIST_LIMIT`` items unless ``limit`` is given,
+    and is ``None`` on the last page. ``statistics`` counts the items of
+    the page in ``page_directories`` and ``page_files``;
+    ``total_directories`` and ``total_files`` are only known, and set,
+    when the page holds the whole listing, and are ``None`` otherwise.
     """
+    if limit is None and cursor:
+        limit = DEFAULT_LIST_LIMIT
+    try:
+        if cursor:
+            decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
     try:
         target_directory = ensure_within_workspace(directory)
 
@@ -128,37 +226,31 @@ async def list_workspace_files(
         if not os.path.isdir(target_directory):
             raise HTTPException(status_code=404, detail="Directory not found.")
 
-        nested_items = []
-        file_count = 0
-        directory_count = 0
-
-        for root, dirs, files in os.walk(target_directory):
-            for d in dirs:
-                dir_path = os.path.join(root, d)
-                nested_items.append(
-                    {
-                        "type": "directory",
-                        "path": os.path.relpath(dir_path, target_directory),
-                    },
-                )
-                directory_count += 1
-
-            for f in files:
-                file_path = os.path.join(root, f)
-                nested_items.append(
-                    {
-                        "type": "file",
-                        "path": os.path.relpath(file_path, target_directory),
-                    },
-                )
-                file_count += 1
+        nested_items, next_cursor = await asyncio.to_thread(
+            list_page,
+            target_directory,
+            cursor=cursor,
+            limit=limit,
+            max_depth=max_depth,
+            include=include or (),
+            exclude=exclude or (),
+            with_stats=with_stats,
+        )
+        directory_count = sum(
+            item["type"] == "directory" for item in nested_items
+        )
+        file_count = len(nested_items) - directory_count
+        complete = cursor is None and next_cursor is None
 
         return {
             "items": nested_items,
             "statistics": {
-                "total_directories": directory_count,
-                "total_files": file_count,
+                "total_directories": directory_count if complete else None,
+                "total_files": file_count if complete else None,
+                "page_directories": directory_count,
+                "page_files": file_count,
             },
+            "next_cursor": next_cursor,
         }
 
     except Exception as e:
@@ -171,6 +263,63 @@ async def list_workspace_files(
         ) from e
 
 
+@workspace_router.get(
+    "/workspace/changes",
+    summary="List the changes in the /workspace directory since a token",
+)
+async def get_workspace_changes(
+    since: Optional[str] = Query(
+        None,
+        description="token of a previous call; omit to get a first token.",
+    ),
+    directory: str = Query(
+        "/workspace",
+        description="Only report changes within this directory.",
+    ),
+    exclude: Optional[List[str]] = Query(
+        None,
+        description="Glob patterns of items to skip along with their "
+        "contents; defaults to version control, dependency and cache "
+        "directories such as .git and node_modules.",
+    ),
+    max_depth: Optional[int] = Query(
+        None,
+        ge=1,
+        description="Deepest level to watch, 1 watches only direct children.",
+    ),
+):
+    """
+    Return the files and directories created, modified or deleted since
+    ``since``, as ``{"type", "path", "kind"}`` with paths relative to
+    ``directory``, and the ``token`` to pass to the next call.
+
+    Changes are found by rescanning ``directory``, at most once a second,
+    so narrowing it, ``exclude`` and ``max_depth`` keep polls cheap. A
+    token only applies to the same ``directory``, ``exclude`` and
+    ``max_depth``.
+
+    ``reset`` is set when the changes since ``since`` are no longer known,
+    the directory should then be listed again.
+    """
+    try:
+        target_directory = ensure_within_workspace(directory)
+        journal = _get_journal(
+            target_directory,
+            JOURNAL_EXCLUDE if exclude is None else exclude,
+            max_depth,
+        )
+        return await journal.changes_since(since)
+
+    except Exception as e:
+        logger.error(
+            f"Error listing changes: {str(e)}:\n{traceback.format_exc()}",
+        )
+        raise HTTPException(
+            status_code=500,
+            detail=f"An error occurred while listing changes: {str(e)}",
+        ) from e
+
+
 @workspace_router.post(
     "/workspace/directories",
     summary="Create a directory within the /workspace directory",
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import base64
+import binascii
+import fnmatch
+import os
+import time
+import uuid
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Directories the change journal skips by default: version control
+# metadata, dependency trees and caches, which can hold most of a
+# workspace's entries.
+DEFAULT_JOURNAL_EXCLUDE = (
+    ".git",
+    ".hg",
+    ".svn",
+    "node_modules",
+    ".venv",
+    "venv",
+    "__pycache__",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".tox",
+    ".cache",
+)
+
+
+def encode_cursor(path: str) -> str:
+    return base64.urlsafe_b64encode(path.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, ...]:
+    """Return the path parts of the last item of the previous page.
+
+    Raises:
+        ValueError: If ``cursor`` was not returned by a listing.
+    """
+    try:
+        path = base64.urlsafe_b64decode(cursor.encode("ascii")).decode()
+    except (binascii.Error, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    return tuple(path.split("/"))
+
+
+def _matches(name: str, path: str, patterns: Sequence[str]) -> bool:
+    return any(
+        fnmatch.fnmatchcase(name, pattern)
+        or fnmatch.fnmatchcase(path, pattern)
+        for pattern in patterns
+    )
+
+
+def iter_entries(
+    root: str,
+    after: Tuple[str, ...] = (),
+    max_depth: Optional[int] = None,
+    include: Sequence[str] = (),
+    exclude: Sequence[str] = (),
+    with_stats: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """Yield the files and directories below ``root`` in a stable order.
+
+    Entries are yielded depth-first with the children of each directory
+    sorted by name, which orders them by their path parts. Listing can
+    thus resume after any ``after`` path without rescanning the entries
+    before it.
+
+    Args:
+        root: Directory to list.
+        after: Path parts, relative to ``root``, of the entry to resume
+            after.
+        max_depth: Deepest level to list, ``1`` lists only the children
+            of ``root``.
+        include: Glob patterns, matched against the name or the relative
+            path, an entry must match to be yielded. Directories are
+            searched either way.
+        exclude: Glob patterns of entries skipped along with everything
+            below them.
+        with_stats: Add ``size`` and ``mtime`` to every entry.
+    """
+
+    def _walk(directory: str, parts: Tuple[str, ...], depth: int):
+        try:
+            with os.scandir(directory) as scan:
+                entries = sorted(scan, key=lambda entry: entry.name)
+        except OSError:
+            return
+        for entry in entries:
+            entry_parts = parts + (entry.name,)
+            if entry_parts < after[: len(entry_parts)]:
+                # Listed on a previous page, along with its descendants
+                continue
+            path = "/".join(entry_parts)
+            if _matches(entry.name, path, exclude):
+                continue
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if entry_parts > after and (
+                not include or _matches(entry.name, path, include)
+            ):
+                item = {
+                    "type": "directory" if is_dir else "file",
+                    "path": path,
+                }
+                if with_stats:
+                    try:
+                        stat = entry.stat()
+                        item["size"] = stat.st_size
+                        item["mtime"] = stat.st_mtime
+                    except OSError:
+                        item["size"] = item["mtime"] = None
+                yield item
+            if (
+                is_dir
+                and not entry.is_symlink()
+                and (max_depth is None or depth < max_depth)
+            ):
+                yield from _walk(entry.path, entry_parts, depth + 1)
+
+    yield from _walk(root, (), 1)
+
+
+def list_page(
+    root: str,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    **kwargs: Any,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Return up to ``limit`` entries of :func:`iter_entries` after
+    ``cursor``, all of them if ``limit`` is ``None``, and the cursor of the
+    next page or ``None`` if this is the last one.
+    """
+    after = decode_cursor(cursor) if cursor else ()
+    entries = iter_entries(root, after=after, **kwargs)
+    items = []
+    for item in entries:
+        if len(items) == limit:
+            return items, encode_cursor(items[-1]["path"])
+        items.append(item)
+    return items, None
+
+
+class ChangeJournal:
+    """Files and directories created, modified or deleted below ``root``.
+
+    Changes are detected by comparing snapshots of the tree, taken at
+    most every ``min_interval`` seconds when changes are requested, so
+    an idle journal costs nothing. The last ``max_changes`` changes are
+    kept; tokens older than that, or from before a restart, ask the
+    caller to list the tree again.
+
+    Every snapshot stats the whole tree and is kept in memory, so large
+    directories that are not of interest should be left out with
+    ``exclude`` or ``max_depth``, as :func:`iter_entries` does.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        max_changes: int = 10000,
+        min_interval: float = 1.0,
+        exclude: Sequence[str] = DEFAULT_JOURNAL_EXCLUDE,
+        max_depth: Optional[int] = None,
+    ) -> None:
+        self.root = root
+        self.min_interval = min_interval
+        self.exclude = tuple(exclude)
+        self.max_depth = max_depth
+        # Tokens of another journal instance are stale
+        self._epoch = uuid.uuid4().hex[:8]
+        self._seq = 0
+        self._changes: deque = deque(maxlen=max_changes)
+        self._snapshot: Optional[Dict[str, Tuple[bool, int, int]]] = None
+        self._polled_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _scan(self) -> Dict[str, Tuple[bool, int, int]]:
+        snapshot = {}
+        for item in iter_entries(
+            self.root,
+            max_depth=self.max_depth,
+            exclude=self.exclude,
+            with_stats=True,
+        ):
+            snapshot[item["path"]] = (
+                item["type"] == "directory",
+                item["size"],
+                item["mtime"],
+            )
+        return snapshot
+
+    def _record(self, change_type: str, path: str, is_dir: bool) -> None:
+        self._seq += 1
+        self._changes.append(
+            (
+                self._seq,
+                {
+                    "type": change_type,
+                    "path": path,
+                    "kind": "directory" if is_dir else "file",
+                },
+            ),
+        )
+
+    async def poll(self) -> None:
+        """Record the changes since the last snapshot."""
+        async with self._lock:
+            now = time.monotonic()
+            if (
+                self._snapshot is not None
+                and now - self._polled_at < self.min_interval
+            ):
+                return
+            snapshot = await asyncio.to_thread(self._scan)
+            previous = self._snapshot
+            self._snapshot = snapshot
+            self._polled_at = time.monotonic()
+            if previous is None:
+                return
+
+            for path in sorted(previous.keys() - snapshot.keys()):
+                self._record("deleted", path, previous[path][0])
+            for path, state in sorted(snapshot.items()):
+                old = previous.get(path)
+                if old is None:
+                    self._record("created", path, state[0])
+                elif old[0] != state[0]:
+                    self._record("deleted", path, old[0])
+                    self._record("created", path, state[0])
+                elif not state[0] and old != state:
+                    # Directory mtimes only reflect their entries' changes
+                    self._record("modified", path, False)
+
+    def _token(self) -> str:
+        return f"{self._epoch}-{self._seq}"
+
+    async def changes_since(
+        self,
+        token: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Return the changes recorded after ``token``.
+
+        Returns:
+            ``{"token", "changes", "reset"}``, where ``token`` is passed
+            to the next call. Without ``token``, only a token is returned.
+            ``reset`` is set when the changes after ``token`` are no
+            longer known and the tree should be listed again.
+        """
+        await self.poll()
+        result = {"token": self._token(), "changes": [], "reset": False}
+        if token is None:
+            return result
+
+        epoch, _, seq = token.partition("-")
+        try:
+            seq = int(seq)
+        except ValueError:
+            seq = -1
+        oldest = self._changes[0][0] if self._changes else self._seq + 1
+        if (
+            epoch != self._epoch
+            or not 0 <= seq <= self._seq
+            # Changes right after the token were already dropped
+            or seq + 1 < oldest
+        ):
+            result["reset"] = True
+            return result
+
+        result["changes"] = [
+            change for change_seq, change in self._changes if change_seq > seq
+        ]
+        return result
@@ -1,5 +1,10 @@
 # -*- coding: utf-8 -*-
 from .http_client import SandboxHttpClient
+from .async_http_client import AsyncSandboxHttpClient
 from .training_client import TrainingSandboxClient
 
-__all__ = ["SandboxHttpClient", "TrainingSandboxClient"]
+__all__ = [
+    "SandboxHttpClient",
+    "AsyncSandboxHttpClient",
+    "TrainingSandboxClient",
+]
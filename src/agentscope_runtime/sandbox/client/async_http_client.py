@@ -0,0 +1,536 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Optional
+from urllib.parse import urljoin
+
+import httpx
+
+from .http_client import DEFAULT_TIMEOUT, SandboxHttpClient
+from ..model import ContainerModel
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSandboxHttpClient:  # pylint: disable=too-many-public-methods
+    """
+    An asyncio client for interacting with the runtime API. Connect with
+    container directly.
+
+    Mirrors :class:`SandboxHttpClient`, but every request is awaited on the
+    event loop, so many sandboxes can be driven concurrently without a
+    thread per in-flight call.
+    """
+
+    def __init__(
+        self,
+        model: Optional[ContainerModel] = None,
+        timeout: int = 60,
+        domain: str = "localhost",
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        """
+        Initialize the Python client.
+
+        Args:
+            model (ContainerModel): The pydantic model representing the
+            runtime sandbox.
+            client (httpx.AsyncClient): Optional shared client, owned by the
+            caller, whose connection pool is reused.
+        """
+        self.session_id = model.session_id
+        self.base_url = urljoin(
+            model.url.replace("localhost", domain),
+            "fastapi",
+        )
+
+        self.start_timeout = timeout
+        self.timeout = model.timeout or DEFAULT_TIMEOUT
+        self.secret = model.runtime_token
+
+        # Update headers with secret if provided
+        self.headers = {
+            "Content-Type": "application/json",
+            "x-agentrun-session-id": "s" + self.session_id,
+            "x-agentscope-runtime-session-id": "s" + self.session_id,
+        }
+        if self.secret:
+            self.headers["Authorization"] = f"Bearer {self.secret}"
+
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient()
+
+    async def __aenter__(self):
+        # Wait for the runtime api server to be healthy
+        await self.wait_until_healthy()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        if self._owns_client:
+            await self.client.aclose()
+
+    async def _request(self, method: str, url: str, **kwargs):
+        if "timeout" not in kwargs:
+            kwargs["timeout"] = self.timeout
+        return await self.client.request(
+            method,
+            url,
+            headers=self.headers,
+            **kwargs,
+        )
+
+    async def _request_json(self, method: str, path: str, action: str, **kw):
+        try:
+            response = await self._request(
+                method,
+                f"{self.base_url}{path}",
+                **kw,
+            )
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPError as e:
+            logger.error(f"An error occurred while {action}: {e}")
+            return {
+                "isError": True,
+                "content": [{"type": "text", "text": str(e)}],
+            }
+
+    async def check_health(self) -> bool:
+        """
+        Checks if the runtime service is running by verifying the health
+        endpoint.
+
+        Returns:
+            bool: True if the service is reachable, False otherwise
+        """
+        endpoint = f"{self.base_url}/healthz"
+        try:
+            response_api = await self.client.get(
+                endpoint,
+                headers=self.headers,
+            )
+            return response_api.status_code == 200
+        except httpx.HTTPError:
+            return False
+
+    async def wait_until_healthy(self) -> None:
+        """
+        Waits until the runtime service is running for a specified timeout.
+        """
+        start_time = time.time()
+        while time.time() - start_time < self.start_timeout:
+            if await self.check_health():
+                return
+            await asyncio.sleep(1)
+        raise TimeoutError(
+            "Runtime service did not start within the specified timeout.",
+        )
+
+    async def add_mcp_servers(self, server_configs, overwrite=False):
+        """
+        Add MCP servers to runtime.
+        """
+        try:
+            response = await self._request(
+                "post",
+                f"{self.base_url}/mcp/add_servers",
+                json={
+                    "server_configs": server_configs,
+                    "overwrite": overwrite,
+                },
+            )
+            response.raise_for_status()
+            return response.text
+        except httpx.HTTPError as e:
+            logger.error(f"An error occurred while adding MCP servers: {e}")
+            return {
+                "isError": True,
+                "content": [{"type": "text", "text": str(e)}],
+            }
+
+    async def list_tools(
+        self,
+        tool_type=None,
+        **kwargs,  # pylint: disable=unused-argument
+    ) -> dict:
+        mcp_tools = await self._request_json(
+            "get",
+            "/mcp/list_tools",
+            "listing tools",
+        )
+        if mcp_tools.get("isError"):
+            return mcp_tools
+        mcp_tools["generic"] = self.generic_tools
+        if tool_type:
+            return {tool_type: mcp_tools.get(tool_type, {})}
+        return mcp_tools
+
+    async def call_tool(
+        self,
+        name: str,
+        arguments: Optional[dict[str, Any]] = None,
+    ) -> dict:
+        if arguments is None:
+            arguments = {}
+
+        if name in self.generic_tools:
+            if name == "run_ipython_cell":
+                return await self.run_ipython_cell(**arguments)
+            elif name == "run_shell_command":
+                return await self.run_shell_command(**arguments)
+
+        return await self._request_json(
+            "post",
+            "/mcp/call_tool",
+            "calling tool",
+            json={
+                "tool_name": name,
+                "arguments": arguments,
+            },
+        )
+
+    async def call_tools_batch(
+        self,
+        calls: list[dict[str, Any]],
+        parallel: bool = True,
+    ) -> list:
+        """
+        Execute several tool calls in one request, see
+        :meth:`SandboxHttpClient.call_tools_batch`.
+        """
+        try:
+            response = await self._request(
+                "post",
+                f"{self.base_url}/tools/call_tools_batch",
+                json={"calls": calls, "parallel": parallel},
+            )
+            if response.status_code == 404:
+                # The sandbox image predates the batch endpoint
+                return [
+                    await self.call_tool(
+                        call["tool_name"],
+                        call.get("arguments"),
+                    )
+                    for call in calls
+                ]
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPError as e:
+            logger.error(f"An error occurred while calling tools: {e}")
+            return [
+                {
+                    "isError": True,
+                    "content": [{"type": "text", "text": str(e)}],
+                }
+                for _ in calls
+            ]
+
+    async def stream_tools_batch(
+        self,
+        calls: list[dict[str, Any]],
+        parallel: bool = True,
+    ) -> AsyncIterator[dict]:
+        """
+        Execute several tool calls in one request, yielding
+        ``{"index": ..., "result": ...}`` as soon as each call finishes.
+        """
+        async with self.client.stream(
+            "post",
+            f"{self.base_url}/tools/call_tools_batch",
+            headers=self.headers,
+            json={"calls": calls, "parallel": parallel, "stream": True},
+            timeout=self.timeout,
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line:
+                    yield json.loads(line)
+
+    @staticmethod
+    def _cell_payload(code: str, kernel: Optional[str]) -> dict:
+        payload = {"code": code}
+        if kernel is not None:
+            payload["kernel"] = kernel
+        return payload
+
+    def _execution_request(self, payload: dict, timeout: Optional[float]):
+        kwargs = {"json": payload}
+        if timeout is not None:
+            payload["timeout"] = timeout
+            # Leave the sandbox time to stop the execution and reply.
+            kwargs["timeout"] = max(self.timeout, timeout + 10)
+        return kwargs
+
+    async def run_ipython_cell(
+        self,
+        code: str,
+        kernel: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> dict:
+        """
+        Run an IPython cell in the named ``kernel``, interrupting it after
+        ``timeout`` seconds.
+        """
+        return await self._request_json(
+            "post",
+            "/tools/run_ipython_cell",
+            "running IPython cell",
+            **self._execution_request(
+                self._cell_payload(code, kernel),
+                timeout,
+            ),
+        )
+
+    async def stream_ipython_cell(
+        self,
+        code: str,
+        kernel: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Run an IPython cell, yielding its output events as they are
+        produced, see :meth:`SandboxHttpClient.stream_ipython_cell`.
+        """
+        kwargs = self._execution_request(
+            self._cell_payload(code, kernel),
+            timeout,
+        )
+        if timeout is None:
+            # The cell may stay quiet for longer than self.timeout.
+            kwargs["timeout"] = httpx.Timeout(self.timeout, read=None)
+        async with self.client.stream(
+            "post",
+            f"{self.base_url}/tools/run_ipython_cell_stream",
+            headers=self.headers,
+            **kwargs,
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line:
+                    yield json.loads(line)
+
+    async def interrupt_ipython_kernel(
+        self,
+        kernel: Optional[str] = None,
+    ) -> dict:
+        """Interrupt the cell running in ``kernel``, keeping its state."""
+        return await self._request_json(
+            "post",
+            "/tools/interrupt_ipython_kernel",
+            "interrupting IPython kernel",
+            json={} if kernel is None else {"kernel": kernel},
+        )
+
+    async def run_shell_command(
+        self,
+        command: str,
+        timeout: Optional[float] = None,
+    ) -> dict:
+        """Run a shell command, killing it after ``timeout`` seconds."""
+        return await self._request_json(
+            "post",
+            "/tools/run_shell_command",
+            "running shell command",
+            **self._execution_request({"command": command}, timeout),
+        )
+
+    async def stream_shell_command(
+        self,
+        command: str,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Run a shell command, yielding its output events as they are
+        produced, see :meth:`SandboxHttpClient.stream_shell_command`.
+        """
+        kwargs = self._execution_request({"command": command}, timeout)
+        if timeout is None:
+            # The command may stay quiet for longer than self.timeout.
+            kwargs["timeout"] = httpx.Timeout(self.timeout, read=None)
+        async with self.client.stream(
+            "post",
+            f"{self.base_url}/tools/run_shell_command_stream",
+            headers=self.headers,
+            **kwargs,
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line:
+                    yield json.loads(line)
+
+    @property
+    def generic_tools(self) -> dict:
+        # pylint: disable=protected-access
+        return SandboxHttpClient._generic_tools
+
+    async def get_workspace_file(self, file_path: str) -> dict:
+        """
+        Retrieve a file from the /workspace directory.
+        """
+        try:
+            response = await self._request(
+                "get",
+                f"{self.base_url}/workspace/files",
+                params={"file_path": file_path},
+            )
+            response.raise_for_status()
+            return {"data": response.content}
+        except httpx.HTTPError as e:
+            logger.error(f"An error occurred while retrieving the file: {e}")
+            return {
+                "isError": True,
+                "content": [{"type": "text", "text": str(e)}],
+            }
+
+    async def create_or_edit_workspace_file(
+        self,
+        file_path: str,
+        content: str,
+    ) -> dict:
+        """
+        Create or edit a file within the /workspace directory.
+        """
+        return await self._request_json(
+            "post",
+            "/workspace/files",
+            "creating or editing a workspace file",
+            params={"file_path": file_path},
+            json={"content": content},
+        )
+
+    async def list_workspace_directories(
+        self,
+        directory: str = "/workspace",
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        include: Optional[list[str]] = None,
+        exclude: Optional[list[str]] = None,
+        with_stats: bool = False,
+    ) -> dict:
+        """
+        List files in the specified directory within the /workspace, in
+        pages of at most ``limit`` items if given, see
+        :meth:`SandboxHttpClient.list_workspace_directories`.
+        """
+        params = {
+            "directory": directory,
+            "cursor": cursor,
+            "limit": limit,
+            "max_depth": max_depth,
+            "include": include,
+            "exclude": exclude,
+            "with_stats": with_stats or None,
+        }
+        return await self._request_json(
+            "get",
+            "/workspace/list-directories",
+            "listing files",
+            params={k: v for k, v in params.items() if v is not None},
+        )
+
+    async def get_workspace_changes(
+        self,
+        since: Optional[str] = None,
+        directory: str = "/workspace",
+        exclude: Optional[list[str]] = None,
+        max_depth: Optional[int] = None,
+    ) -> dict:
+        """
+        List the changes within the directory since the ``token`` of a
+        previous call, see :meth:`SandboxHttpClient.get_workspace_changes`.
+        """
+        params = {
+            "directory": directory,
+            "since": since,
+            "exclude": exclude,
+            "max_depth": max_depth,
+        }
+        return await self._request_json(
+            "get",
+            "/workspace/changes",
+            "listing changes",
+            params={k: v for k, v in params.items() if v is not None},
+        )
+
+    async def create_workspace_directory(self, directory_path: str) -> dict:
+        """
+        Create a directory within the /workspace directory.
+        """
+        return await self._request_json(
+            "post",
+            "/workspace/directories",
+            "creating a workspace directory",
+            params={"directory_path": directory_path},
+        )
+
+    async def delete_workspace_file(self, file_path: str) -> dict:
+        """
+        Delete a file within the /workspace directory.
+        """
+        return await self._request_json(
+            "delete",
+            "/workspace/files",
+            "deleting a workspace file",
+            params={"file_path": file_path},
+        )
+
+    async def delete_workspace_directory(
+        self,
+        directory_path: str,
+        recursive: bool = False,
+    ) -> dict:
+        """
+        Delete a directory within the /workspace directory.
+        """
+        return await self._request_json(
+            "delete",
+            "/workspace/directories",
+            "deleting a workspace directory",
+            params={
+                "directory_path": directory_path,
+                "recursive": recursive,
+            },
+        )
+
+    async def move_or_rename_workspace_item(
+        self,
+        source_path: str,
+        destination_path: str,
+    ) -> dict:
+        """
+        Move or rename a file or directory within the /workspace directory.
+        """
+        return await self._request_json(
+            "put",
+            "/workspace/move",
+            "moving or renaming a workspace item",
+            params={
+                "source_path": source_path,
+                "destination_path": destination_path,
+            },
+        )
+
+    async def copy_workspace_item(
+        self,
+        source_path: str,
+        destination_path: str,
+    ) -> dict:
+        """
+        Copy a file or directory within the /workspace directory.
+        """
+        return await self._request_json(
+            "post",
+            "/workspace/copy",
+            "copying a workspace item",
+            params={
+                "source_path": source_path,
+                "destination_path": destination_path,
+            },
+        )
@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 # pylint: disable=unused-argument
+import json
 import logging
 import time
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 from urllib.parse import urljoin
 
 import requests
@@ -18,7 +19,7 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-class SandboxHttpClient:
+class SandboxHttpClient:  # pylint: disable=too-many-public-methods
     """
     A Python client for interacting with the runtime API. Connect with
     container directly.
@@ -39,6 +40,16 @@ class SandboxHttpClient:
                                 "type": "string",
                                 "description": "IPython code to execute",
                             },
+                            "kernel": {
+                                "type": "string",
+                                "description": "Name of the kernel to run "
+                                "the cell in, kernels do not share state",
+                            },
+                            "timeout": {
+                                "type": "number",
+                                "description": "Seconds after which the "
+                                "cell is interrupted",
+                            },
                         },
                         "required": ["code"],
                     },
@@ -59,6 +70,11 @@ class SandboxHttpClient:
                                 "type": "string",
                                 "description": "Shell command to execute",
                             },
+                            "timeout": {
+                                "type": "number",
+                                "description": "Seconds after which the "
+                                "command is killed",
+                            },
                         },
                         "required": ["command"],
                     },
@@ -110,6 +126,10 @@ class SandboxHttpClient:
     def __exit__(self, exc_type, exc_value, traceback):
         pass
 
+    def close(self):
+        """Close the underlying keep-alive connections."""
+        self.session.close()
+
     def _request(self, method: str, url: str, **kwargs):
         if "timeout" not in kwargs:
             kwargs["timeout"] = self.timeout
@@ -220,19 +240,96 @@ class SandboxHttpClient:
                 "content": [{"type": "text", "text": str(e)}],
             }
 
+    def call_tools_batch(
+        self,
+        calls: list[dict[str, Any]],
+        parallel: bool = True,
+    ) -> list:
+        """
+        Execute several tool calls in one request.
+
+        Args:
+            calls: List of ``{"tool_name": ..., "arguments": ...}`` dicts.
+            parallel: Run the calls concurrently instead of in order.
+
+        Returns:
+            list: One result per call, in call order.
+        """
+        try:
+            endpoint = f"{self.base_url}/tools/call_tools_batch"
+            response = self._request(
+                "post",
+                endpoint,
+                json={"calls": calls, "parallel": parallel},
+            )
+            if response.status_code == 404:
+                # The sandbox image predates the batch endpoint
+                return [
+                    self.call_tool(call["tool_name"], call.get("arguments"))
+                    for call in calls
+                ]
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            logger.error(f"An error occurred: {e}")
+            return [
+                {
+                    "isError": True,
+                    "content": [{"type": "text", "text": str(e)}],
+                }
+                for _ in calls
+            ]
+
+    def stream_tools_batch(
+        self,
+        calls: list[dict[str, Any]],
+        parallel: bool = True,
+    ) -> Iterator[dict]:
+        """
+        Execute several tool calls in one request, yielding
+        ``{"index": ..., "result": ...}`` as soon as each call finishes.
+        """
+        endpoint = f"{self.base_url}/tools/call_tools_batch"
+        with self._request(
+            "post",
+            endpoint,
+            json={"calls": calls, "parallel": parallel, "stream": True},
+            stream=True,
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+
+    def _execution_request(self, payload: dict, timeout: Optional[float]):
+        kwargs = {"json": payload}
+        if timeout is not None:
+            payload["timeout"] = timeout
+            # Leave the sandbox time to stop the execution and reply.
+            kwargs["timeout"] = max(self.timeout, timeout + 10)
+        return kwargs
+
     def run_ipython_cell(
         self,
         code: str = Field(
             description="IPython code to execute",
         ),
+        kernel: Optional[str] = None,
+        timeout: Optional[float] = None,
     ) -> dict:
-        """Run an IPython cell."""
+        """
+        Run an IPython cell in the named ``kernel``, interrupting it after
+        ``timeout`` seconds.
+        """
         try:
             endpoint = f"{self.base_url}/tools/run_ipython_cell"
             response = self._request(
                 "post",
                 endpoint,
-                json={"code": code},
+                **self._execution_request(
+                    self._cell_payload(code, kernel),
+                    timeout,
+                ),
             )
             response.raise_for_status()
             return response.json()
@@ -248,14 +345,99 @@ class SandboxHttpClient:
         command: str = Field(
             description="Shell command to execute",
         ),
+        timeout: Optional[float] = None,
     ) -> dict:
-        """Run a shell command."""
+        """Run a shell command, killing it after ``timeout`` seconds."""
         try:
             endpoint = f"{self.base_url}/tools/run_shell_command"
             response = self._request(
                 "post",
                 endpoint,
-                json={"command": command},
+                **self._execution_request({"command": command}, timeout),
+            )
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            logger.error(f"An error occurred: {e}")
+            return {
+                "isError": True,
+                "content": [{"type": "text", "text": str(e)}],
+            }
+
+    def stream_shell_command(
+        self,
+        command: str,
+        timeout: Optional[float] = None,
+    ) -> Iterator[dict]:
+        """
+        Run a shell command, yielding ``{"type": "stdout" | "stderr",
+        "text": ...}`` events as output is produced and a final
+        ``{"type": "exit", "returncode": ..., "timed_out": ...,
+        "truncated": ...}`` event. Closing the iterator early kills the
+        command.
+        """
+        endpoint = f"{self.base_url}/tools/run_shell_command_stream"
+        kwargs = self._execution_request({"command": command}, timeout)
+        if timeout is None:
+            # The command may stay quiet for longer than self.timeout.
+            kwargs["timeout"] = (self.timeout, None)
+        with self._request(
+            "post",
+            endpoint,
+            stream=True,
+            **kwargs,
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+
+    @staticmethod
+    def _cell_payload(code: str, kernel: Optional[str]) -> dict:
+        payload = {"code": code}
+        if kernel is not None:
+            payload["kernel"] = kernel
+        return payload
+
+    def stream_ipython_cell(
+        self,
+        code: str,
+        kernel: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> Iterator[dict]:
+        """
+        Run an IPython cell, yielding ``{"type": "stdout" | "stderr",
+        "text": ...}`` events as output is produced and a final
+        ``{"type": "exit", "timed_out": ..., "restarted": ...}`` event.
+        Closing the iterator early interrupts the cell.
+        """
+        endpoint = f"{self.base_url}/tools/run_ipython_cell_stream"
+        kwargs = self._execution_request(
+            self._cell_payload(code, kernel),
+            timeout,
+        )
+        if timeout is None:
+            # The cell may stay quiet for longer than self.timeout.
+            kwargs["timeout"] = (self.timeout, None)
+        with self._request(
+            "post",
+            endpoint,
+            stream=True,
+            **kwargs,
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+
+    def interrupt_ipython_kernel(self, kernel: Optional[str] = None) -> dict:
+        """Interrupt the cell running in ``kernel``, keeping its state."""
+        try:
+            endpoint = f"{self.base_url}/tools/interrupt_ipython_kernel"
+            response = self._request(
+                "post",
+                endpoint,
+                json={} if kernel is None else {"kernel": kernel},
             )
             response.raise_for_status()
             return response.json()
@@ -400,13 +582,37 @@ class SandboxHttpClient:
     def list_workspace_directories(
         self,
         directory: str = "/workspace",
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        include: Optional[list[str]] = None,
+        exclude: Optional[list[str]] = None,
+        with_stats: bool = False,
     ) -> dict:
         """
         List files in the specified directory within the /workspace.
+
+        Returns every item unless ``limit`` is given, in which case one
+        page of at most ``limit`` items is returned: pass ``next_cursor``
+        as ``cursor`` until it is ``None`` to get the others.
+        ``statistics`` holds the ``page_directories`` and ``page_files``
+        counts of the page; ``total_directories`` and ``total_files`` are
+        ``None`` unless the page holds the whole listing. ``include`` and
+        ``exclude`` are glob patterns, and excluded directories are not
+        searched.
         """
         try:
             endpoint = f"{self.base_url}/workspace/list-directories"
-            params = {"directory": directory}
+            params = {
+                "directory": directory,
+                "cursor": cursor,
+                "limit": limit,
+                "max_depth": max_depth,
+                "include": include,
+                "exclude": exclude,
+                "with_stats": with_stats or None,
+            }
+            params = {k: v for k, v in params.items() if v is not None}
             response = self._request(
                 "get",
                 endpoint,
@@ -421,6 +627,46 @@ class SandboxHttpClient:
                 "content": [{"type": "text", "text": str(e)}],
             }
 
+    def get_workspace_changes(
+        self,
+        since: Optional[str] = None,
+        directory: str = "/workspace",
+        exclude: Optional[list[str]] = None,
+        max_depth: Optional[int] = None,
+    ) -> dict:
+        """
+        List the changes within the directory since the ``token`` of a
+        previous call. A ``reset`` result means the changes are no longer
+        known and the directory should be listed again.
+
+        ``exclude`` glob patterns replace the default ones (``.git``,
+        ``node_modules``, caches, ...), and ``max_depth`` limits how deep
+        changes are watched; a token only applies to the same
+        ``directory``, ``exclude`` and ``max_depth``.
+        """
+        try:
+            endpoint = f"{self.base_url}/workspace/changes"
+            params = {
+                "directory": directory,
+                "since": since,
+                "exclude": exclude,
+                "max_depth": max_depth,
+            }
+            params = {k: v for k, v in params.items() if v is not None}
+            response = self._request(
+                "get",
+                endpoint,
+                params=params,
+            )
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            logger.error(f"An error occurred while listing changes: {e}")
+            return {
+                "isError": True,
+                "content": [{"type": "text", "text": str(e)}],
+            }
+
     def create_workspace_directory(self, directory_path: str) -> dict:
         """
         Create a directory within the /workspace directory.
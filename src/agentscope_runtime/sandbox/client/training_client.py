@@ -28,6 +28,10 @@ class TrainingSandboxClient:
     def __exit__(self, exc_type, exc_value, traceback):
         pass
 
+    def close(self):
+        """Close the underlying keep-alive connections."""
+        self.session.close()
+
     def wait_until_healthy(self) -> None:
         """
         Waits until the runtime service is running for a specified timeout.
@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
 from .sandbox_manager import SandboxManager
+from .async_sandbox_manager import AsyncSandboxManager
 
-__all__ = ["SandboxManager"]
+__all__ = ["SandboxManager", "AsyncSandboxManager"]
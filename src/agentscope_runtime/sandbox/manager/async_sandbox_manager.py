@@ -0,0 +1,993 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=protected-access, too-many-branches, too-many-statements
+import asyncio
+import inspect
+import logging
+import os
+import secrets
+import time
+import traceback
+import weakref
+from functools import wraps
+from typing import Optional, Dict, Union, List
+
+import httpx
+import shortuuid
+
+from ..client import AsyncSandboxHttpClient, TrainingSandboxClient
+from ..enums import SandboxType
+from ..manager.storage import (
+    LocalStorage,
+    OSSStorage,
+)
+from ..model import (
+    ContainerModel,
+    SandboxManagerEnvConfig,
+)
+from ..registry import SandboxRegistry
+from ...common.collections import (
+    RedisMapping,
+    RedisQueue,
+    InMemoryMapping,
+    InMemoryQueue,
+)
+from ...common.container_clients.async_base_client import (
+    ThreadedAsyncClient,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def async_remote_wrapper(
+    method: str = "POST",
+    success_key: str = "data",
+):
+    """
+    Async counterpart of ``remote_wrapper``: execute locally, or forward
+    the call to a remote sandbox manager server.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            if not self.http_session:
+                # Execute the original function locally
+                return await func(self, *args, **kwargs)
+
+            endpoint = "/" + func.__name__
+
+            # Prepare data for remote call
+            sig = inspect.signature(func)
+            param_names = list(sig.parameters.keys())[1:]  # Skip 'self'
+            data = dict(zip(param_names, args))
+            data.update(kwargs)
+
+            # Make the remote HTTP request
+            response = await self._make_request(method, endpoint, data)
+
+            # Process response
+            if success_key:
+                return response.get(success_key)
+            return response
+
+        wrapper._is_remote_wrapper = True
+        wrapper._http_method = method
+        wrapper._path = "/" + func.__name__
+
+        return wrapper
+
+    return decorator
+
+
+class AsyncSandboxManager:
+    """
+    asyncio version of :class:`SandboxManager`.
+
+    Container lifecycle operations and tool calls are awaited on the event
+    loop, so ``create``/``release``/``call_tool`` for many sessions overlap
+    without holding a thread each. Docker is driven natively through the
+    Docker Engine API; other backends go through a bounded thread adapter.
+
+    Call :meth:`startup` (or use ``async with``) before use to warm up the
+    container pool.
+    """
+
+    def __init__(
+        self,
+        config: Optional[SandboxManagerEnvConfig] = None,
+        base_url=None,
+        bearer_token=None,
+        default_type: Union[
+            SandboxType,
+            str,
+            List[Union[SandboxType, str]],
+        ] = SandboxType.BASE,
+        max_concurrency: int = 64,
+    ):
+        if base_url:
+            # Initialize HTTP session for remote mode with bearer token
+            # authentication
+            headers = {}
+            if bearer_token:
+                headers["Authorization"] = f"Bearer {bearer_token}"
+            self.http_session = httpx.AsyncClient(
+                headers=headers,
+                timeout=30,
+            )
+            self.base_url = base_url.rstrip("/")
+            # Remote mode, return directly
+            return
+        else:
+            self.http_session = None
+            self.base_url = None
+
+        if not config:
+            config = SandboxManagerEnvConfig(
+                file_system="local",
+                redis_enabled=False,
+                container_deployment="docker",
+                pool_size=0,
+                default_mount_dir="sessions_mount_dir",
+            )
+
+        # Support multi sandbox pool
+        if isinstance(default_type, (SandboxType, str)):
+            self.default_type = [SandboxType(default_type)]
+        else:
+            self.default_type = [SandboxType(x) for x in list(default_type)]
+
+        self.workdir = "/workspace"
+
+        self.config = config
+        self.pool_size = self.config.pool_size
+        self.prefix = self.config.container_prefix_key
+        self.default_mount_dir = self.config.default_mount_dir
+        self.readonly_mounts = self.config.readonly_mounts
+        self.storage_folder = (
+            self.config.storage_folder or self.default_mount_dir
+        )
+
+        self.pool_queues = {}
+        self.pool_watermarks = {
+            t: self.config.get_pool_watermarks(t.value)
+            for t in self.default_type
+        }
+        self._refill_event = asyncio.Event()
+        self._refill_task = None
+
+        # container_name -> [client, known healthy until (monotonic)]
+        self._connections = {}
+        # session_ctx_id -> lock serializing read-modify-write updates of
+        # its ``session_mapping`` entry, dropped once no update holds it
+        self._session_locks = weakref.WeakValueDictionary()
+
+        if self.config.redis_enabled:
+            import redis
+
+            redis_client = redis.Redis(
+                host=self.config.redis_server,
+                port=self.config.redis_port,
+                db=self.config.redis_db,
+                username=self.config.redis_user,
+                password=self.config.redis_password,
+                decode_responses=True,
+            )
+            try:
+                redis_client.ping()
+            except ConnectionError as e:
+                raise RuntimeError(
+                    "Unable to connect to the Redis server.",
+                ) from e
+
+            self.container_mapping = RedisMapping(redis_client)
+            self.session_mapping = RedisMapping(
+                redis_client,
+                prefix="session_mapping",
+            )
+
+            # Init multi sand box pool
+            for t in self.default_type:
+                queue_key = f"{self.config.redis_container_pool_key}:{t.value}"
+                self.pool_queues[t] = RedisQueue(redis_client, queue_key)
+            self._store_blocking = True
+        else:
+            self.container_mapping = InMemoryMapping()
+            self.session_mapping = InMemoryMapping()
+
+            # Init multi sand box pool
+            for t in self.default_type:
+                self.pool_queues[t] = InMemoryQueue()
+            self._store_blocking = False
+
+        self.container_deployment = self.config.container_deployment
+
+        if self.container_deployment == "docker":
+            from ...common.container_clients.async_docker_client import (
+                AsyncDockerClient,
+            )
+
+            self.client = AsyncDockerClient(config=self.config)
+        elif self.container_deployment == "k8s":
+            from ...common.container_clients.kubernetes_client import (
+                KubernetesClient,
+            )
+
+            self.client = ThreadedAsyncClient(
+                KubernetesClient(config=self.config),
+                max_concurrency=max_concurrency,
+            )
+        elif self.container_deployment == "agentrun":
+            from ...common.container_clients.agentrun_client import (
+                AgentRunClient,
+            )
+
+            self.client = ThreadedAsyncClient(
+                AgentRunClient(config=self.config),
+                max_concurrency=max_concurrency,
+            )
+        elif self.container_deployment == "fc":
+            from ...common.container_clients.fc_client import FCClient
+
+            self.client = ThreadedAsyncClient(
+                FCClient(config=self.config),
+                max_concurrency=max_concurrency,
+            )
+        else:
+            raise NotImplementedError("Not implemented")
+
+        self.file_system = self.config.file_system
+        if self.file_system == "oss":
+            self.storage = OSSStorage(
+                self.config.oss_access_key_id,
+                self.config.oss_access_key_secret,
+                self.config.oss_endpoint,
+                self.config.oss_bucket_name,
+            )
+        else:
+            self.storage = LocalStorage()
+
+        # Shared connection pool for all sandbox containers
+        self.sandbox_session = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_concurrency),
+        )
+
+        logger.debug(str(config))
+
+    async def __aenter__(self):
+        logger.debug(
+            "Entering AsyncSandboxManager context. "
+            "Cleanup will be performed automatically on exit.",
+        )
+        await self.startup()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, exc_tb):
+        logger.debug(
+            "Exiting AsyncSandboxManager context. Cleaning up resources.",
+        )
+        await self.cleanup()
+        await self.close()
+
+    async def startup(self):
+        """Warm up the container pools and start the refill task."""
+        if self.http_session:
+            return
+        if any(high > 0 for _, high in self.pool_watermarks.values()):
+            await self._init_container_pool()
+            if self._refill_task is None:
+                self._refill_task = asyncio.create_task(self._refill_worker())
+
+    async def close(self):
+        """Close the HTTP clients held by the manager."""
+        if self.http_session:
+            await self.http_session.aclose()
+            return
+        await self.sandbox_session.aclose()
+        await self.client.close()
+
+    async def _store(self, func, *args):
+        """
+        Call a ``container_mapping``/``session_mapping``/pool queue method.
+
+        Redis-backed collections use a sync client, so their calls run in a
+        worker thread instead of blocking the event loop on the round trip.
+        """
+        if self._store_blocking:
+            return await asyncio.to_thread(func, *args)
+        return func(*args)
+
+    def _generate_container_key(self, session_id):
+        return f"{self.prefix}{session_id}"
+
+    async def _make_request(self, method: str, endpoint: str, data: dict):
+        """
+        Make an HTTP request to the specified endpoint.
+        """
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        if method.upper() == "GET":
+            response = await self.http_session.get(url, params=data)
+        else:
+            response = await self.http_session.request(
+                method,
+                url,
+                json=data,
+            )
+
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            error_components = [
+                f"HTTP {response.status_code} Error: {str(e)}",
+            ]
+
+            try:
+                server_response = response.json()
+                if "detail" in server_response:
+                    error_components.append(
+                        f"Server Detail: {server_response['detail']}",
+                    )
+                elif "error" in server_response:
+                    error_components.append(
+                        f"Server Error: {server_response['error']}",
+                    )
+                else:
+                    error_components.append(
+                        f"Server Response: {server_response}",
+                    )
+            except ValueError:
+                if response.text:
+                    error_components.append(
+                        f"Server Response: {response.text}",
+                    )
+
+            error = " | ".join(error_components)
+
+            logger.error(f"Error making request: {error}")
+
+            return {"data": f"Error: {error}"}
+
+        return response.json()
+
+    async def _init_container_pool(self):
+        """
+        Init runtime pool, creating the containers of all pools concurrently
+        """
+        await asyncio.gather(
+            *(self._fill_pool(t) for t in self.default_type),
+        )
+
+    async def _fill_pool(self, sandbox_type: SandboxType):
+        queue = self.pool_queues[sandbox_type]
+        _, high = self.pool_watermarks[sandbox_type]
+
+        missing = high - await self._store(queue.size)
+        if missing <= 0:
+            return
+
+        container_names = await asyncio.gather(
+            *(
+                self.create(sandbox_type=sandbox_type.value)
+                for _ in range(missing)
+            ),
+            return_exceptions=True,
+        )
+        for container_name in container_names:
+            if isinstance(container_name, Exception) or not container_name:
+                logger.error(
+                    f"Failed to create container for pool: {container_name}",
+                )
+                continue
+            container_model = await self._store(
+                self.container_mapping.get,
+                container_name,
+            )
+            # Check the pool size again to avoid race condition
+            if container_model and await self._store(queue.size) < high:
+                await self._store(queue.enqueue, container_model)
+            else:
+                await self.release(container_name)
+
+    async def _refill_worker(self):
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._refill_event.wait(),
+                    timeout=self.config.pool_refill_interval,
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._refill_event.clear()
+
+            for t in self.default_type:
+                low, _ = self.pool_watermarks[t]
+                try:
+                    if await self._store(self.pool_queues[t].size) <= low:
+                        await self._fill_pool(t)
+                except Exception as e:
+                    logger.error(f"Error refilling runtime pool {t}: {e}")
+
+    async def _stop_refill_worker(self):
+        if self._refill_task is None:
+            return
+        self._refill_task.cancel()
+        try:
+            await self._refill_task
+        except asyncio.CancelledError:
+            pass
+        self._refill_task = None
+
+    @async_remote_wrapper()
+    async def cleanup(self):
+        logger.debug(
+            "Cleaning up resources.",
+        )
+
+        # Stop refilling before draining the pool
+        await self._stop_refill_worker()
+
+        identities = []
+        for queue in self.pool_queues.values():
+            try:
+                while await self._store(queue.size) > 0:
+                    container_json = await self._store(queue.dequeue)
+                    if container_json:
+                        identities.append(
+                            ContainerModel(**container_json).session_id,
+                        )
+            except Exception as e:
+                logger.error(f"Error cleaning up runtime pool: {e}")
+
+        keys = await self._store(
+            lambda: list(self.container_mapping.scan(self.prefix)),
+        )
+        for key in keys:
+            container_json = await self._store(self.container_mapping.get, key)
+            if container_json:
+                identities.append(ContainerModel(**container_json).session_id)
+
+        # Release all containers concurrently
+        await asyncio.gather(
+            *(self.release(identity) for identity in set(identities)),
+        )
+
+    @async_remote_wrapper()
+    async def create_from_pool(
+        self,
+        sandbox_type=None,
+        meta: Optional[Dict] = None,
+    ):
+        """Try to get a container from runtime pool"""
+        # If not specified, use the first one
+        sandbox_type = SandboxType(sandbox_type or self.default_type[0])
+
+        if (
+            sandbox_type not in self.pool_queues
+            or self.pool_watermarks[sandbox_type][1] <= 0
+        ):
+            return await self.create(
+                sandbox_type=sandbox_type.value,
+                meta=meta,
+            )
+
+        queue = self.pool_queues[sandbox_type]
+        _, high = self.pool_watermarks[sandbox_type]
+
+        for _ in range(high + 1):
+            container_json = await self._store(queue.dequeue)
+
+            # Let the background worker top the pool up again
+            self._refill_event.set()
+
+            if not container_json:
+                break
+
+            container_model = ContainerModel(**container_json)
+
+            if container_model.version != SandboxRegistry.get_image_by_type(
+                sandbox_type,
+            ):
+                logger.warning(
+                    f"Container {container_model.session_id} outdated, "
+                    f"trying next one in pool",
+                )
+                await self.release(container_model.session_id)
+                continue
+
+            if (
+                await self.client.get_status(container_model.container_id)
+                != "running"
+            ):
+                logger.error(
+                    f"Container {container_model.container_id} is not "
+                    f"running. Trying next one in pool.",
+                )
+                await self.release(container_model.session_id)
+                continue
+
+            # Add meta field to container
+            if meta and not container_model.meta:
+                container_model.meta = meta
+                await self._store(
+                    self.container_mapping.set,
+                    container_model.container_name,
+                    container_model.model_dump(),
+                )
+                if "session_ctx_id" in meta:
+                    await self._bind_session(
+                        meta["session_ctx_id"],
+                        container_model.container_name,
+                    )
+
+            logger.debug(
+                f"Retrieved container from pool:"
+                f" {container_model.session_id}",
+            )
+            return container_model.container_name
+
+        logger.warning(
+            "No container available in pool, create a new one.",
+        )
+        return await self.create(sandbox_type=sandbox_type.value, meta=meta)
+
+    def _session_lock(self, session_ctx_id):
+        lock = self._session_locks.get(session_ctx_id)
+        if lock is None:
+            lock = self._session_locks[session_ctx_id] = asyncio.Lock()
+        return lock
+
+    async def _bind_session(self, session_ctx_id, container_name):
+        async with self._session_lock(session_ctx_id):
+            env_ids = (
+                await self._store(self.session_mapping.get, session_ctx_id)
+                or []
+            )
+            if container_name not in env_ids:
+                env_ids.append(container_name)
+            await self._store(
+                self.session_mapping.set,
+                session_ctx_id,
+                env_ids,
+            )
+
+    async def _unbind_session(self, session_ctx_id, container_name):
+        async with self._session_lock(session_ctx_id):
+            env_ids = (
+                await self._store(self.session_mapping.get, session_ctx_id)
+                or []
+            )
+            env_ids = [eid for eid in env_ids if eid != container_name]
+            if env_ids:
+                await self._store(
+                    self.session_mapping.set,
+                    session_ctx_id,
+                    env_ids,
+                )
+            else:
+                await self._store(self.session_mapping.delete, session_ctx_id)
+
+    @async_remote_wrapper()
+    async def create(
+        self,
+        sandbox_type=None,
+        mount_dir=None,
+        storage_path=None,
+        environment: Optional[Dict] = None,
+        meta: Optional[Dict] = None,
+    ):
+        if sandbox_type is not None:
+            target_sandbox_type = SandboxType(sandbox_type)
+        else:
+            target_sandbox_type = self.default_type[0]
+
+        config = SandboxRegistry.get_config_by_type(target_sandbox_type)
+
+        if not config:
+            logger.warning(
+                f"Not found sandbox {target_sandbox_type}, using default",
+            )
+            config = SandboxRegistry.get_config_by_type(
+                self.default_type[0],
+            )
+        image = config.image_name
+
+        environment = {
+            **(config.environment if config.environment else {}),
+            **(environment if environment else {}),
+        }
+
+        for key, value in environment.items():
+            if value is None:
+                logger.error(
+                    f"Env variable {key} is None.",
+                )
+                return None
+
+        alphabet = "0123456789abcdefghijklmnopqrstuvwxyz"
+        short_uuid = shortuuid.ShortUUID(alphabet=alphabet).uuid()
+        session_id = str(short_uuid)
+
+        mounts_supported = self.container_deployment not in (
+            "agentrun",
+            "fc",
+        )
+
+        if not mount_dir:
+            if self.default_mount_dir:
+                mount_dir = os.path.join(self.default_mount_dir, session_id)
+                os.makedirs(mount_dir, exist_ok=True)
+
+        if mount_dir and mounts_supported:
+            if not os.path.isabs(mount_dir):
+                mount_dir = os.path.abspath(mount_dir)
+
+        if storage_path is None:
+            if self.storage_folder:
+                storage_path = self.storage.path_join(
+                    self.storage_folder,
+                    session_id,
+                )
+
+        if mount_dir and storage_path and mounts_supported:
+            await asyncio.to_thread(
+                self.storage.download_folder,
+                storage_path,
+                mount_dir,
+            )
+
+        # Check for an existing container with the same name
+        container_name = self._generate_container_key(session_id)
+        try:
+            if await self.client.inspect(container_name):
+                raise ValueError(
+                    f"Container with name {container_name} already exists.",
+                )
+
+            # Generate a random secret token
+            runtime_token = secrets.token_hex(16)
+
+            # Prepare volume bindings if a mount directory is provided
+            if mount_dir and mounts_supported:
+                volume_bindings = {
+                    mount_dir: {
+                        "bind": self.workdir,
+                        "mode": "rw",
+                    },
+                }
+            else:
+                volume_bindings = {}
+
+            if self.readonly_mounts:
+                for host_path, container_path in self.readonly_mounts.items():
+                    if not os.path.isabs(host_path):
+                        host_path = os.path.abspath(host_path)
+                    volume_bindings[host_path] = {
+                        "bind": container_path,
+                        "mode": "ro",
+                    }
+
+            _id, ports, ip, *rest = await self.client.create(
+                image,
+                name=container_name,
+                ports=["80/tcp"],  # Nginx
+                volumes=volume_bindings,
+                environment={
+                    "SECRET_TOKEN": runtime_token,
+                    **environment,
+                },
+                runtime_config=config.runtime_config,
+            )
+
+            http_protocol = "http"
+            if rest and rest[0] == "https":
+                http_protocol = "https"
+
+            if _id is None:
+                return None
+
+            # Check the container status
+            status = await self.client.get_status(container_name)
+            if status != "running":
+                logger.warning(
+                    f"Container {container_name} is not running. Current "
+                    f"status: {status}",
+                )
+                return None
+
+            container_model = ContainerModel(
+                session_id=session_id,
+                container_id=_id,
+                container_name=container_name,
+                url=f"{http_protocol}://{ip}:{ports[0]}",
+                ports=[ports[0]],
+                mount_dir=str(mount_dir),
+                storage_path=storage_path,
+                runtime_token=runtime_token,
+                version=image,
+                meta=meta or {},
+                timeout=config.timeout,
+            )
+
+            # Register in mapping
+            await self._store(
+                self.container_mapping.set,
+                container_model.container_name,
+                container_model.model_dump(),
+            )
+
+            # Build mapping session_ctx_id to container_name
+            if meta and "session_ctx_id" in meta:
+                await self._bind_session(
+                    meta["session_ctx_id"],
+                    container_model.container_name,
+                )
+
+            logger.debug(
+                f"Created container {container_name}"
+                f":{container_model.model_dump()}",
+            )
+            return container_name
+        except Exception as e:
+            logger.warning(
+                f"Failed to create container: {e}",
+            )
+            logger.debug(f"{traceback.format_exc()}")
+            await self.release(identity=container_name)
+            return None
+
+    @async_remote_wrapper()
+    async def release(self, identity):
+        try:
+            container_json = await self.get_info(identity)
+
+            if not container_json:
+                logger.warning(
+                    f"No container found for {identity}.",
+                )
+                return True
+
+            container_info = ContainerModel(**container_json)
+
+            # remove key in mapping before we remove container
+            await self._store(
+                self.container_mapping.delete,
+                container_json.get("container_name"),
+            )
+            await self._evict_connection(container_info.container_name)
+
+            # remove key in mapping
+            session_ctx_id = container_info.meta.get("session_ctx_id")
+            if session_ctx_id:
+                await self._unbind_session(
+                    session_ctx_id,
+                    container_info.container_name,
+                )
+
+            await self.client.stop(container_info.container_id, timeout=1)
+            await self.client.remove(container_info.container_id, force=True)
+
+            logger.debug(f"Container for {identity} destroyed.")
+
+            # Upload to storage
+            if container_info.mount_dir and container_info.storage_path:
+                await asyncio.to_thread(
+                    self.storage.upload_folder,
+                    container_info.mount_dir,
+                    container_info.storage_path,
+                )
+
+            return True
+        except Exception as e:
+            logger.warning(
+                f"Failed to destroy container: {e}",
+            )
+            logger.debug(f"{traceback.format_exc()}")
+            return False
+
+    @async_remote_wrapper()
+    async def start(self, identity):
+        try:
+            container_json = await self.get_info(identity)
+
+            if not container_json:
+                logger.warning(
+                    f"No container found for {identity}.",
+                )
+                return False
+
+            container_info = ContainerModel(**container_json)
+
+            await self.client.start(container_info.container_id)
+            status = await self.client.get_status(container_info.container_id)
+            if status != "running":
+                logger.error(
+                    f"Failed to start container {identity}. "
+                    f"Current status: {status}",
+                )
+                return False
+
+            logger.debug(f"Container {identity} started.")
+            return True
+
+        except Exception as e:
+            logger.error(
+                f"Failed to start container: {e}:"
+                f" {traceback.format_exc()}",
+            )
+            return False
+
+    @async_remote_wrapper()
+    async def stop(self, identity):
+        try:
+            container_json = await self.get_info(identity)
+
+            if not container_json:
+                logger.warning(f"No container found for {identity}.")
+                return True
+
+            container_info = ContainerModel(**container_json)
+
+            await self.client.stop(container_info.container_id, timeout=1)
+            await self._evict_connection(container_info.container_name)
+
+            status = await self.client.get_status(container_info.container_id)
+            if status != "exited":
+                logger.error(
+                    f"Failed to stop container {identity}. "
+                    f"Current status: {status}",
+                )
+                return False
+
+            logger.debug(f"Container {identity} stopped.")
+            return True
+
+        except Exception as e:
+            logger.error(
+                f"Failed to stop container: {e}: {traceback.format_exc()}",
+            )
+            return False
+
+    @async_remote_wrapper()
+    async def get_status(self, identity):
+        """Get container status by container_name or container_id."""
+        return await self.client.get_status(identity)
+
+    @async_remote_wrapper()
+    async def get_info(self, identity):
+        """Get container information by container_name or container_id."""
+        container_model = await self._store(
+            self.container_mapping.get,
+            identity,
+        )
+        if container_model is None:
+            container_model = await self._store(
+                self.container_mapping.get,
+                self._generate_container_key(identity),
+            )
+        if container_model is None:
+            raise RuntimeError(f"No container found with id: {identity}.")
+        if hasattr(container_model, "model_dump_json"):
+            container_model = container_model.model_dump_json()
+
+        return container_model
+
+    async def _get_connection(self, identity):
+        """
+        Get the cached client of a container, creating it on first use.
+        """
+        container_model = ContainerModel(**await self.get_info(identity))
+
+        entry = self._connections.get(container_model.container_name)
+        if entry is None:
+            if (
+                "sandbox-appworld" in container_model.version
+                or "sandbox-bfcl" in container_model.version
+            ):
+                # The training client has no async variant yet
+                client = TrainingSandboxClient(base_url=container_model.url)
+            else:
+                client = AsyncSandboxHttpClient(
+                    container_model,
+                    client=self.sandbox_session,
+                )
+            entry = [client, 0.0]
+            self._connections[container_model.container_name] = entry
+        return entry
+
+    async def _establish_connection(self, identity):
+        entry = await self._get_connection(identity)
+        client, healthy_until = entry
+
+        # Skip the health round trip while the container is known healthy
+        if time.monotonic() >= healthy_until:
+            await self._invoke(client, "wait_until_healthy")
+            entry[1] = time.monotonic() + self.config.connection_health_ttl
+
+        return client
+
+    async def _evict_connection(self, container_name):
+        entry = self._connections.pop(container_name, None)
+        if entry is not None:
+            try:
+                await self._invoke(entry[0], "close")
+            except Exception as e:
+                logger.debug(f"Error closing connection: {e}")
+
+    @staticmethod
+    async def _invoke(client, method_name, *args, **kwargs):
+        method = getattr(client, method_name)
+        if inspect.iscoroutinefunction(method):
+            return await method(*args, **kwargs)
+        return await asyncio.to_thread(method, *args, **kwargs)
+
+    @async_remote_wrapper()
+    async def check_health(self, identity):
+        """Check health"""
+        entry = await self._get_connection(identity)
+        healthy = await self._invoke(entry[0], "check_health")
+        entry[1] = (
+            time.monotonic() + self.config.connection_health_ttl
+            if healthy
+            else 0.0
+        )
+        return healthy
+
+    @async_remote_wrapper()
+    async def list_tools(self, identity, tool_type=None, **kwargs):
+        """List tool"""
+        client = await self._establish_connection(identity)
+        return await self._invoke(
+            client,
+            "list_tools",
+            tool_type=tool_type,
+            **kwargs,
+        )
+
+    @async_remote_wrapper()
+    async def call_tool(self, identity, tool_name=None, arguments=None):
+        """Call tool"""
+        client = await self._establish_connection(identity)
+        return await self._invoke(client, "call_tool", tool_name, arguments)
+
+    @async_remote_wrapper()
+    async def call_tools_batch(self, identity, calls=None, parallel=True):
+        """
+        Call several tools in one round trip. ``calls`` is a list of
+        ``{"tool_name": ..., "arguments": ...}`` dicts.
+        """
+        client = await self._establish_connection(identity)
+        if not hasattr(client, "call_tools_batch"):
+            return [
+                await self._invoke(
+                    client,
+                    "call_tool",
+                    call["tool_name"],
+                    call.get("arguments"),
+                )
+                for call in calls or []
+            ]
+        return await client.call_tools_batch(calls or [], parallel=parallel)
+
+    @async_remote_wrapper()
+    async def add_mcp_servers(self, identity, server_configs, overwrite=False):
+        """
+        Add MCP servers to runtime.
+        """
+        client = await self._establish_connection(identity)
+        return await self._invoke(
+            client,
+            "add_mcp_servers",
+            server_configs=server_configs,
+            overwrite=overwrite,
+        )
+
+    @async_remote_wrapper()
+    async def get_session_mapping(self, session_ctx_id: str) -> list:
+        """Get all container names bound to a session context"""
+        return (
+            await self._store(self.session_mapping.get, session_ctx_id) or []
+        )
+
+    @async_remote_wrapper()
+    async def list_session_keys(self) -> list:
+        """Return all session_ctx_id keys currently in mapping"""
+        return await self._store(lambda: list(self.session_mapping.scan()))
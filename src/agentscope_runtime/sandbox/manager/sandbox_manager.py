@@ -7,6 +7,8 @@ import json
 import logging
 import os
 import secrets
+import threading
+import time
 import traceback
 from functools import wraps
 from typing import Optional, Dict, Union, List
@@ -131,6 +133,18 @@ class SandboxManager:
         )
 
         self.pool_queues = {}
+        self.pool_watermarks = {
+            t: self.config.get_pool_watermarks(t.value)
+            for t in self.default_type
+        }
+        self._refill_event = threading.Event()
+        self._refill_stop = threading.Event()
+        self._refill_thread = None
+
+        # container_name -> [client, known healthy until (monotonic)]
+        self._connections = {}
+        self._connections_lock = threading.Lock()
+
         if self.config.redis_enabled:
             import redis
 
@@ -208,8 +222,9 @@ class SandboxManager:
         else:
             self.storage = LocalStorage()
 
-        if self.pool_size > 0:
+        if any(high > 0 for _, high in self.pool_watermarks.values()):
             self._init_container_pool()
+            self._start_refill_worker()
 
         logger.debug(str(config))
 
@@ -279,27 +294,80 @@ class SandboxManager:
         Init runtime pool
         """
         for t in self.default_type:
-            queue = self.pool_queues[t]
-            while queue.size() < self.pool_size:
-                try:
-                    container_name = self.create(sandbox_type=t.value)
-                    container_model = self.container_mapping.get(
-                        container_name,
-                    )
-                    if container_model:
-                        # Check the pool size again to avoid race condition
-                        if queue.size() < self.pool_size:
-                            queue.enqueue(container_model)
-                        else:
-                            # The pool size has reached the limit
-                            self.release(container_name)
-                            break
+            self._fill_pool(t)
+
+    def _fill_pool(self, sandbox_type: SandboxType):
+        """
+        Create containers until the pool of ``sandbox_type`` reaches its
+        high watermark.
+        """
+        queue = self.pool_queues[sandbox_type]
+        _, high = self.pool_watermarks[sandbox_type]
+        while queue.size() < high and not self._refill_stop.is_set():
+            try:
+                container_name = self.create(sandbox_type=sandbox_type.value)
+                if self._refill_stop.is_set():
+                    # cleanup() gave up waiting for this create and may
+                    # have drained the pool already
+                    if container_name:
+                        self.release(container_name)
+                    break
+                container_model = self.container_mapping.get(
+                    container_name,
+                )
+                if container_model:
+                    # Check the pool size again to avoid race condition
+                    if queue.size() < high:
+                        queue.enqueue(container_model)
                     else:
-                        logger.error("Failed to create container for pool")
+                        # The pool size has reached the limit
+                        self.release(container_name)
                         break
-                except Exception as e:
-                    logger.error(f"Error initializing runtime pool: {e}")
+                else:
+                    logger.error("Failed to create container for pool")
                     break
+            except Exception as e:
+                logger.error(f"Error initializing runtime pool: {e}")
+                break
+
+    def _start_refill_worker(self):
+        """
+        Start the daemon thread that keeps the pools between their low and
+        high watermarks, so acquisitions never wait on container creation.
+        """
+        self._refill_thread = threading.Thread(
+            target=self._refill_worker,
+            name="sandbox-pool-refill",
+            daemon=True,
+        )
+        self._refill_thread.start()
+
+    def _stop_refill_worker(self):
+        if self._refill_thread is None:
+            return
+        self._refill_stop.set()
+        self._refill_event.set()
+        if self._refill_thread is not threading.current_thread():
+            self._refill_thread.join(timeout=30)
+        self._refill_thread = None
+
+    def _refill_worker(self):
+        while not self._refill_stop.is_set():
+            # Wake up on demand (pool consumed) or periodically, so pools
+            # shared through Redis are refilled even if another replica
+            # drained them.
+            self._refill_event.wait(timeout=self.config.pool_refill_interval)
+            self._refill_event.clear()
+
+            for t in self.default_type:
+                if self._refill_stop.is_set():
+                    break
+                low, _ = self.pool_watermarks[t]
+                try:
+                    if self.pool_queues[t].size() <= low:
+                        self._fill_pool(t)
+                except Exception as e:
+                    logger.error(f"Error refilling runtime pool {t}: {e}")
 
     @remote_wrapper()
     def cleanup(self):
@@ -307,6 +375,9 @@ class SandboxManager:
             "Cleaning up resources.",
         )
 
+        # Stop refilling before draining the pool
+        self._stop_refill_worker()
+
         # Clean up pool first
         for queue in self.pool_queues.values():
             try:
@@ -343,33 +414,29 @@ class SandboxManager:
         # If not specified, use the first one
         sandbox_type = SandboxType(sandbox_type or self.default_type[0])
 
-        if sandbox_type not in self.pool_queues:
+        if (
+            sandbox_type not in self.pool_queues
+            or self.pool_watermarks[sandbox_type][1] <= 0
+        ):
             return self.create(sandbox_type=sandbox_type.value, meta=meta)
 
         queue = self.pool_queues[sandbox_type]
+        _, high = self.pool_watermarks[sandbox_type]
 
         cnt = 0
         try:
             while True:
-                if cnt > self.pool_size:
+                if cnt > high:
                     raise RuntimeError(
                         "No container available in pool after check the pool.",
                     )
                 cnt += 1
 
-                # Add a new one to container
-                container_name = self.create(sandbox_type=sandbox_type)
-                new_container_model = self.container_mapping.get(
-                    container_name,
-                )
-
-                if new_container_model:
-                    queue.enqueue(
-                        new_container_model,
-                    )
-
                 container_json = queue.dequeue()
 
+                # Let the background worker top the pool up again
+                self._refill_event.set()
+
                 if not container_json:
                     raise RuntimeError(
                         "No container available in pool.",
@@ -442,7 +509,7 @@ class SandboxManager:
                 "Error getting container from pool, create a new one.",
             )
             logger.debug(f"{e}: {traceback.format_exc()}")
-            return self.create()
+            return self.create(sandbox_type=sandbox_type.value, meta=meta)
 
     @remote_wrapper()
     def create(
@@ -636,6 +703,7 @@ class SandboxManager:
 
             # remove key in mapping before we remove container
             self.container_mapping.delete(container_json.get("container_name"))
+            self._evict_connection(container_info.container_name)
 
             # remove key in mapping
             session_ctx_id = container_info.meta.get("session_ctx_id")
@@ -715,6 +783,7 @@ class SandboxManager:
             container_info = ContainerModel(**container_json)
 
             self.client.stop(container_info.container_id, timeout=1)
+            self._evict_connection(container_info.container_name)
 
             status = self.client.get_status(container_info.container_id)
             if status != "exited":
@@ -753,27 +822,61 @@ class SandboxManager:
 
         return container_model
 
-    def _establish_connection(self, identity):
+    def _get_connection(self, identity):
+        """
+        Get the cached client of a container, creating it on first use.
+        Clients keep their HTTP session alive across calls.
+        """
         container_model = ContainerModel(**self.get_info(identity))
 
-        # TODO: remake docker name
-        if (
-            "sandbox-appworld" in container_model.version
-            or "sandbox-bfcl" in container_model.version
-        ):
-            return TrainingSandboxClient(
-                base_url=container_model.url,
-            ).__enter__()
+        with self._connections_lock:
+            entry = self._connections.get(container_model.container_name)
+            if entry is None:
+                # TODO: remake docker name
+                if (
+                    "sandbox-appworld" in container_model.version
+                    or "sandbox-bfcl" in container_model.version
+                ):
+                    client = TrainingSandboxClient(
+                        base_url=container_model.url,
+                    )
+                else:
+                    client = SandboxHttpClient(container_model)
+                entry = [client, 0.0]
+                self._connections[container_model.container_name] = entry
+        return entry
 
-        return SandboxHttpClient(
-            container_model,
-        ).__enter__()
+    def _establish_connection(self, identity):
+        entry = self._get_connection(identity)
+        client, healthy_until = entry
+
+        # Skip the health round trip while the container is known healthy
+        if time.monotonic() >= healthy_until:
+            client.wait_until_healthy()
+            entry[1] = time.monotonic() + self.config.connection_health_ttl
+
+        return client
+
+    def _evict_connection(self, container_name):
+        with self._connections_lock:
+            entry = self._connections.pop(container_name, None)
+        if entry is not None:
+            try:
+                entry[0].close()
+            except Exception as e:
+                logger.debug(f"Error closing connection: {e}")
 
     @remote_wrapper()
     def check_health(self, identity):
-        """List tool"""
-        client = self._establish_connection(identity)
-        return client.check_health()
+        """Check health"""
+        entry = self._get_connection(identity)
+        healthy = entry[0].check_health()
+        entry[1] = (
+            time.monotonic() + self.config.connection_health_ttl
+            if healthy
+            else 0.0
+        )
+        return healthy
 
     @remote_wrapper()
     def list_tools(self, identity, tool_type=None, **kwargs):
@@ -787,6 +890,20 @@ class SandboxManager:
         client = self._establish_connection(identity)
         return client.call_tool(tool_name, arguments)
 
+    @remote_wrapper()
+    def call_tools_batch(self, identity, calls=None, parallel=True):
+        """
+        Call several tools in one round trip. ``calls`` is a list of
+        ``{"tool_name": ..., "arguments": ...}`` dicts.
+        """
+        client = self._establish_connection(identity)
+        if not hasattr(client, "call_tools_batch"):
+            return [
+                client.call_tool(call["tool_name"], call.get("arguments"))
+                for call in calls or []
+            ]
+        return client.call_tools_batch(calls or [], parallel=parallel)
+
     @remote_wrapper()
     def add_mcp_servers(self, identity, server_configs, overwrite=False):
         """
@@ -4,7 +4,7 @@ import asyncio
 import inspect
 import logging
 
-from typing import Optional
+from typing import Optional, Union
 
 import httpx
 import websockets
@@ -21,6 +21,7 @@ from ...manager.server.models import (
     HealthResponse,
 )
 from ...manager.sandbox_manager import SandboxManager
+from ...manager.async_sandbox_manager import AsyncSandboxManager
 from ...model.manager_config import SandboxManagerEnvConfig
 from ...utils import dynamic_import, http_to_ws
 from ....version import __version__
@@ -49,7 +50,7 @@ app.add_middleware(
 security = HTTPBearer(auto_error=False)
 
 # Global SandboxManager instance
-_sandbox_manager: Optional[SandboxManager] = None
+_sandbox_manager: Optional[Union[SandboxManager, AsyncSandboxManager]] = None
 _config: Optional[SandboxManagerEnvConfig] = None
 
 
@@ -68,6 +69,11 @@ def get_config() -> SandboxManagerEnvConfig:
             storage_folder=settings.STORAGE_FOLDER,
             port_range=settings.PORT_RANGE,
             pool_size=settings.POOL_SIZE,
+            pool_low_watermark=settings.POOL_LOW_WATERMARK,
+            pool_high_watermark=settings.POOL_HIGH_WATERMARK,
+            pool_watermarks=settings.POOL_WATERMARKS,
+            pool_refill_interval=settings.POOL_REFILL_INTERVAL,
+            connection_health_ttl=settings.CONNECTION_HEALTH_TTL,
             oss_endpoint=settings.OSS_ENDPOINT,
             oss_access_key_id=settings.OSS_ACCESS_KEY_ID,
             oss_access_key_secret=settings.OSS_ACCESS_KEY_SECRET,
@@ -145,7 +151,10 @@ def get_sandbox_manager():
     if _sandbox_manager is None:
         settings = get_settings()
         config = get_config()
-        _sandbox_manager = SandboxManager(
+        manager_cls = (
+            AsyncSandboxManager if settings.ASYNC_MANAGER else SandboxManager
+        )
+        _sandbox_manager = manager_cls(
             config=config,
             default_type=settings.DEFAULT_SANDBOX_TYPE,
         )
@@ -206,6 +215,8 @@ def register_routes(_app, instance):
 async def startup_event():
     """Initialize the SandboxManager on startup"""
     get_sandbox_manager()
+    if isinstance(_sandbox_manager, AsyncSandboxManager):
+        await _sandbox_manager.startup()
     register_routes(app, _sandbox_manager)
 
 
@@ -214,7 +225,12 @@ async def shutdown_event():
     """Cleanup resources on shutdown"""
     global _sandbox_manager
     settings = get_settings()
-    if _sandbox_manager and settings.AUTO_CLEANUP:
+    if isinstance(_sandbox_manager, AsyncSandboxManager):
+        if settings.AUTO_CLEANUP:
+            await _sandbox_manager.cleanup()
+        await _sandbox_manager.close()
+        _sandbox_manager = None
+    elif _sandbox_manager and settings.AUTO_CLEANUP:
         _sandbox_manager.cleanup()
         _sandbox_manager = None
 
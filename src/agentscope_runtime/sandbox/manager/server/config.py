@@ -21,7 +21,18 @@ class Settings(BaseSettings):
     # Runtime Manager settings
     DEFAULT_SANDBOX_TYPE: Union[str, List[str]] = "base"
     POOL_SIZE: int = 1
+    # Background refill watermarks, default to (POOL_SIZE // 2, POOL_SIZE)
+    # Per type overrides in .env:
+    # POOL_WATERMARKS={"base": [2, 8], "browser": [1, 2]}
+    POOL_LOW_WATERMARK: Optional[int] = None
+    POOL_HIGH_WATERMARK: Optional[int] = None
+    POOL_WATERMARKS: Optional[Dict[str, Tuple[int, int]]] = None
+    POOL_REFILL_INTERVAL: float = 5.0
+    CONNECTION_HEALTH_TTL: float = 30.0
     AUTO_CLEANUP: bool = True
+    # Serve with AsyncSandboxManager, overlapping container operations and
+    # tool calls on the event loop instead of the default thread pool
+    ASYNC_MANAGER: bool = False
     CONTAINER_PREFIX_KEY: str = "runtime_sandbox_container_"
     CONTAINER_DEPLOYMENT: Literal[
         "docker",
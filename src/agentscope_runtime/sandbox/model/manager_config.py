@@ -60,6 +60,33 @@ class SandboxManagerEnvConfig(BaseModel):
         0,
         description="Number of containers to be kept in the pool.",
     )
+    pool_low_watermark: Optional[int] = Field(
+        None,
+        description="Pool size at or below which the background worker "
+        "starts refilling. Defaults to half of the high watermark.",
+    )
+    pool_high_watermark: Optional[int] = Field(
+        None,
+        description="Pool size the background worker refills up to. "
+        "Defaults to pool_size.",
+    )
+    pool_watermarks: Optional[Dict[str, Tuple[int, int]]] = Field(
+        None,
+        description="Per sandbox type (low, high) watermark overrides. "
+        "Example: { 'base': (2, 8), 'browser': (1, 2) }",
+    )
+    pool_refill_interval: float = Field(
+        5.0,
+        description="Seconds between periodic pool checks made by the "
+        "background refill worker.",
+    )
+
+    connection_health_ttl: float = Field(
+        30.0,
+        description="Seconds a sandbox connection stays known-healthy before "
+        "its health endpoint is checked again. Set 0 to check before every "
+        "call.",
+    )
 
     # OSS settings
     oss_endpoint: Optional[str] = Field(
@@ -237,6 +264,20 @@ class SandboxManagerEnvConfig(BaseModel):
         description="Log store for FC.",
     )
 
+    def get_pool_watermarks(self, sandbox_type: str) -> Tuple[int, int]:
+        """Return the (low, high) refill watermarks for a sandbox type."""
+        if self.pool_watermarks and sandbox_type in self.pool_watermarks:
+            low, high = self.pool_watermarks[sandbox_type]
+            return low, high
+
+        high = self.pool_size
+        if self.pool_high_watermark is not None:
+            high = self.pool_high_watermark
+        low = high // 2
+        if self.pool_low_watermark is not None:
+            low = min(self.pool_low_watermark, high)
+        return low, high
+
     @model_validator(mode="after")
     def check_settings(self):
         if self.default_mount_dir:
@@ -263,6 +304,13 @@ class SandboxManagerEnvConfig(BaseModel):
                         f"{field_name} must be set when file_system is 'oss'",
                     )
 
+        for low, high in (self.pool_watermarks or {}).values():
+            if low < 0 or high < low:
+                raise ValueError(
+                    "Pool watermarks must satisfy 0 <= low <= high, "
+                    f"got ({low}, {high})",
+                )
+
         if self.redis_enabled:
             required_redis_fields = [
                 self.redis_server,
@@ -2,8 +2,10 @@
 """Tests for build cache functionality."""
 # pylint:disable=protected-access, redefined-outer-name
 
+import os
 import tempfile
 from pathlib import Path
+from unittest import mock
 
 import pytest
 
@@ -331,6 +333,57 @@ class TestBuildCache:
         hash3 = cache._hash_directory(test_dir, [])
         assert hash1 != hash3
 
+    def test_directory_hash_ignores_mtime(self, temp_workspace):
+        """Test that touching unchanged files keeps the hash."""
+        cache = BuildCache(workspace=temp_workspace)
+
+        test_dir = temp_workspace / "test_dir"
+        test_dir.mkdir()
+        (test_dir / "file1.txt").write_text("content1")
+
+        hash1 = cache._hash_directory(test_dir, [])
+        os.utime(test_dir / "file1.txt", ns=(0, 10**9))
+        assert cache._hash_directory(test_dir, []) == hash1
+
+        # Rewriting the same content from another cache also matches
+        (test_dir / "file1.txt").write_text("content1")
+        other = BuildCache(workspace=temp_workspace)
+        assert other._hash_directory(test_dir, []) == hash1
+
+    def test_directory_hash_manifest(self, temp_workspace):
+        """Test that unchanged files are not read again."""
+        test_dir = temp_workspace / "test_dir"
+        test_dir.mkdir()
+        for name in ("file1.txt", "file2.txt"):
+            (test_dir / name).write_text(name)
+            # Old enough to be trusted by the manifest
+            os.utime(test_dir / name, ns=(0, 10**9))
+
+        cache = BuildCache(workspace=temp_workspace)
+        hash1 = cache._hash_directory(test_dir, [])
+        assert cache.manifest_file.exists()
+
+        # A new cache instance reuses the persisted manifest
+        cache = BuildCache(workspace=temp_workspace)
+        with mock.patch.object(
+            BuildCache,
+            "_hash_file",
+            wraps=BuildCache._hash_file,
+        ) as hash_file:
+            assert cache._hash_directory(test_dir, []) == hash1
+            assert hash_file.call_count == 0
+
+            (test_dir / "file2.txt").write_text("changed")
+            assert cache._hash_directory(test_dir, []) != hash1
+            assert hash_file.call_count == 1
+
+        # Removed files are dropped from the manifest
+        (test_dir / "file1.txt").unlink()
+        cache._hash_directory(test_dir, [])
+        assert not any(
+            key.endswith("file1.txt") for key in cache._load_manifest()
+        )
+
     def test_should_ignore(self, temp_workspace):
         """Test ignore pattern matching."""
         cache = BuildCache(workspace=temp_workspace)
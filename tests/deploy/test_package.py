@@ -5,6 +5,7 @@ Unit tests for the new project-based packaging system.
 
 import os
 import shutil
+import struct
 from pathlib import Path
 
 import pytest
@@ -16,6 +17,9 @@ from agentscope_runtime.engine.deployers.utils.package import (
     package,
     project_dir_extractor,
     _auto_detect_entrypoint,
+    _merge_zips,
+    _read_raw_member,
+    _write_raw_member,
 )
 
 
@@ -232,6 +236,133 @@ class TestPackageCode:
             assert "app.py" in names
             assert not any(".git" in name for name in names)
 
+    def test_package_parallel_and_large_files(self, tmp_path, monkeypatch):
+        """Test that pooled and streamed files round-trip."""
+        import zipfile
+
+        from agentscope_runtime.engine.deployers.utils import (
+            package as package_module,
+        )
+
+        monkeypatch.setattr(package_module, "PARALLEL_COMPRESS_MAX_SIZE", 64)
+        project_dir = tmp_path / "project"
+        (project_dir / "pkg").mkdir(parents=True)
+        files = {
+            f"pkg/module_{i}.py": f"value = {i}\n" * (i * 10)
+            for i in range(20)
+        }
+        for name, content in files.items():
+            (project_dir / name).write_text(content)
+
+        output_zip = tmp_path / "code.zip"
+        package_code(project_dir, output_zip, max_workers=4)
+
+        with zipfile.ZipFile(output_zip, "r") as zf:
+            assert zf.testzip() is None
+            assert {
+                name: zf.read(name).decode() for name in zf.namelist()
+            } == files
+
+
+class TestMergeZips:
+    """Test cases for merging dependency and code zips."""
+
+    def test_merge_copies_members_raw(self, tmp_path):
+        """Test that members are copied and code shadows dependencies."""
+        import zipfile
+
+        deps_zip = tmp_path / "dependencies.zip"
+        with zipfile.ZipFile(deps_zip, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("lib/module.py", "dependency = True\n" * 100)
+            zf.writestr("app.py", "# dependency app")
+            zf.writestr(
+                "lib/data.bin",
+                os.urandom(1024),
+                compress_type=zipfile.ZIP_STORED,
+            )
+
+        code_zip = tmp_path / "code.zip"
+        with zipfile.ZipFile(code_zip, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("app.py", "# code app")
+
+        output_zip = tmp_path / "deployment.zip"
+        _merge_zips(deps_zip, code_zip, output_zip)
+
+        with zipfile.ZipFile(output_zip, "r") as out, zipfile.ZipFile(
+            deps_zip,
+            "r",
+        ) as deps:
+            assert out.testzip() is None
+            assert sorted(out.namelist()) == [
+                "app.py",
+                "lib/data.bin",
+                "lib/module.py",
+            ]
+            assert out.read("app.py") == b"# code app"
+            for name in ("lib/module.py", "lib/data.bin"):
+                assert out.read(name) == deps.read(name)
+                assert (
+                    out.getinfo(name).compress_type
+                    == deps.getinfo(name).compress_type
+                )
+
+    def test_raw_copy_relies_on_zipfile_internals(self):
+        """Test that the zipfile internals used for raw copies exist."""
+        import zipfile
+
+        # pylint: disable=protected-access
+        for name in (
+            "structFileHeader",
+            "sizeFileHeader",
+            "_FH_FILENAME_LENGTH",
+            "_FH_EXTRA_FIELD_LENGTH",
+        ):
+            assert hasattr(zipfile, name), name
+        assert struct.calcsize(zipfile.structFileHeader) == (
+            zipfile.sizeFileHeader
+        )
+
+        with zipfile.ZipFile(os.devnull, "w") as zf:
+            assert isinstance(zf.filelist, list)
+            assert isinstance(zf.NameToInfo, dict)
+            assert isinstance(zf.start_dir, int)
+            assert isinstance(zf._didModify, bool)
+
+    def test_raw_copy_strips_zip64_extra(self, tmp_path):
+        """Test that a copied zip64 extra field is not written twice."""
+        import zipfile
+
+        other = struct.pack("<HHB", 0x5455, 1, 0)
+        src_zip = tmp_path / "src.zip"
+        with zipfile.ZipFile(src_zip, "w") as zf:
+            zf.writestr("data.txt", b"data")
+
+        out_zip = tmp_path / "out.zip"
+        with zipfile.ZipFile(src_zip, "r") as src, zipfile.ZipFile(
+            out_zip,
+            "w",
+        ) as out:
+            info = src.getinfo("data.txt")
+            copied = zipfile.ZipInfo(info.filename, info.date_time)
+            copied.CRC = info.CRC
+            copied.file_size = info.file_size
+            copied.compress_size = info.compress_size
+            # As carried over by a member over 4 GiB
+            copied.extra = struct.pack("<HHQQ", 1, 16, 0, 0) + other
+            _write_raw_member(out, copied, _read_raw_member(src, info))
+
+        with zipfile.ZipFile(out_zip, "r") as zf:
+            assert zf.testzip() is None
+            assert zf.read("data.txt") == b"data"
+            assert zf.getinfo("data.txt").extra == other
+
+        # The central directory is stripped by ZipFile, check the local one
+        with open(out_zip, "rb") as f:
+            header = f.read(zipfile.sizeFileHeader + len("data.txt") + 64)
+        extra_length = struct.unpack("<H", header[28:30])[0]
+        extra_start = zipfile.sizeFileHeader + len("data.txt")
+        assert header[extra_start : extra_start + extra_length] == other
+
 
 class TestPackageFunction:
     """Test cases for the main package function."""
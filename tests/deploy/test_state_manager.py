@@ -611,14 +611,16 @@ class TestDeploymentStateManagerCorruptionHandling:
         sample_deployment,
     ):
         """Test that partially corrupted file preserves valid deployments."""
-        # Save a valid deployment
-        state_manager.save(sample_deployment)
-
-        # Manually corrupt the file by adding invalid deployment
-        state = json.loads(state_manager.state_file.read_text())
-        state["deployments"]["invalid-deploy"] = {
-            "id": "invalid-deploy",
-            # Missing required fields
+        # Legacy state file with an invalid deployment
+        state = {
+            "version": "1.0",
+            "deployments": {
+                sample_deployment.id: sample_deployment.to_dict(),
+                "invalid-deploy": {
+                    "id": "invalid-deploy",
+                    # Missing required fields
+                },
+            },
         }
         state_manager.state_file.write_text(json.dumps(state))
 
@@ -633,15 +635,17 @@ class TestDeploymentStateManagerCorruptionHandling:
         sample_deployment,
     ):
         """Test that deployments with missing required fields are skipped."""
-        # Save a valid deployment
-        state_manager.save(sample_deployment)
-
-        # Manually add deployment with missing required field
-        state = json.loads(state_manager.state_file.read_text())
-        state["deployments"]["incomplete-deploy"] = {
-            "id": "incomplete-deploy",
-            "platform": "local",
-            # Missing url, agent_source, created_at
+        # Legacy state file with a deployment missing required fields
+        state = {
+            "version": "1.0",
+            "deployments": {
+                sample_deployment.id: sample_deployment.to_dict(),
+                "incomplete-deploy": {
+                    "id": "incomplete-deploy",
+                    "platform": "local",
+                    # Missing url, agent_source, created_at
+                },
+            },
         }
         state_manager.state_file.write_text(json.dumps(state))
 
@@ -650,6 +654,47 @@ class TestDeploymentStateManagerCorruptionHandling:
         assert sample_deployment.id in retrieved_state["deployments"]
         assert "incomplete-deploy" not in retrieved_state["deployments"]
 
+    def test_read_corrupted_row_preserves_others(
+        self,
+        state_manager,
+        sample_deployment,
+        sample_deployment_2,
+    ):
+        """Test that a corrupted database row does not hide the others."""
+        state_manager.save(sample_deployment)
+        state_manager.save(sample_deployment_2)
+
+        with state_manager._connect() as conn:
+            conn.execute(
+                "UPDATE deployments SET data = '{ invalid json' WHERE id = ?",
+                (sample_deployment.id,),
+            )
+
+        assert state_manager.get(sample_deployment.id) is None
+        assert [d.id for d in state_manager.list()] == [
+            sample_deployment_2.id,
+        ]
+
+    def test_corrupted_row_update_and_save(
+        self,
+        state_manager,
+        sample_deployment,
+    ):
+        """Test that a corrupted row raises on update and is overwritten."""
+        state_manager.save(sample_deployment)
+
+        with state_manager._connect() as conn:
+            conn.execute(
+                "UPDATE deployments SET data = '{ invalid json' WHERE id = ?",
+                (sample_deployment.id,),
+            )
+
+        with pytest.raises(KeyError, match="state entry is corrupted"):
+            state_manager.update_status(sample_deployment.id, "stopped")
+
+        state_manager.save(sample_deployment)
+        assert state_manager.get(sample_deployment.id) == sample_deployment
+
 
 class TestDeploymentStateManagerImportExport:
     """Test import/export functionality."""
@@ -812,15 +857,73 @@ class TestDeploymentStateManagerEdgeCases:
         assert state_manager.get(sample_deployment.id) is not None
         assert state_manager.get(sample_deployment_2.id) is not None
 
-    def test_state_file_atomic_write(self, state_manager, sample_deployment):
-        """Test that state file writes are atomic."""
+    def test_state_stored_in_database(self, state_manager, sample_deployment):
+        """Test that deployments are stored as rows, not in the JSON file."""
         state_manager.save(sample_deployment)
 
-        # Check that .tmp file doesn't exist after write
-        temp_file = state_manager.state_file.with_suffix(".tmp")
-        assert not temp_file.exists()
+        assert state_manager.db_file.exists()
+        assert not state_manager.state_file.exists()
+        with state_manager._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, status FROM deployments",
+            ).fetchall()
+        assert rows == [(sample_deployment.id, "running")]
+
+    def test_legacy_state_file_imported_once(
+        self,
+        temp_state_dir,
+        sample_deployment,
+        sample_deployment_2,
+    ):
+        """Test that a legacy JSON state file is imported on first use."""
+        legacy = {
+            "version": "1.0",
+            "deployments": {
+                sample_deployment.id: sample_deployment.to_dict(),
+            },
+        }
+        (temp_state_dir / "deployments.json").write_text(json.dumps(legacy))
+
+        manager = DeploymentStateManager(state_dir=str(temp_state_dir))
+        assert manager.get(sample_deployment.id) is not None
+        manager.remove(sample_deployment.id)
+        manager.save(sample_deployment_2)
+
+        # A new manager does not import the legacy file again
+        manager = DeploymentStateManager(state_dir=str(temp_state_dir))
+        assert [d.id for d in manager.list()] == [sample_deployment_2.id]
+
+    def test_concurrent_processes(self, temp_state_dir):
+        """Test status updates from concurrent managers are not lost."""
+        import threading
+
+        managers = [
+            DeploymentStateManager(state_dir=str(temp_state_dir))
+            for _ in range(4)
+        ]
+        for i in range(20):
+            managers[0].save(
+                Deployment(
+                    id=f"deploy-{i}",
+                    platform="local",
+                    url=f"http://localhost:{8000 + i}",
+                    agent_source="agent.py",
+                    created_at=f"2024-01-01T00:00:{i:02d}",
+                ),
+            )
 
-        # State file should exist and be valid
-        assert state_manager.state_file.exists()
-        data = json.loads(state_manager.state_file.read_text())
-        assert sample_deployment.id in data["deployments"]
+        def stop(manager, offset):
+            for i in range(offset, 20, len(managers)):
+                manager.update_status(f"deploy-{i}", "stopped")
+
+        threads = [
+            threading.Thread(target=stop, args=(manager, offset))
+            for offset, manager in enumerate(managers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(managers[0].list(status="stopped")) == 20
+        assert managers[0].list(status="running") == []
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+# pylint:disable=unused-argument
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from agentscope_runtime.engine import Runner
+from agentscope_runtime.engine.admission import AdmissionController
+from agentscope_runtime.engine.deployers.utils.service_utils import (
+    FastAPIAppFactory,
+)
+from agentscope_runtime.engine.schemas.agent_schemas import (
+    AgentRequest,
+    RunStatus,
+)
+from agentscope_runtime.engine.schemas.exception import (
+    AgentOverloadedException,
+)
+
+
+@pytest.mark.asyncio
+async def test_limits_concurrency_and_queue():
+    controller = AdmissionController(max_concurrency=2, max_queue_size=1)
+    assert await controller.acquire("a") == 0.0
+    assert await controller.acquire("a") == 0.0
+
+    waiter = asyncio.create_task(controller.acquire("b"))
+    await asyncio.sleep(0)
+    assert controller.queued == 1
+    assert controller.is_full()
+
+    with pytest.raises(AgentOverloadedException) as exc_info:
+        await controller.acquire("c")
+    assert exc_info.value.status == 429
+    assert exc_info.value.details["reason"] == "queue_full"
+
+    controller.release()
+    assert await waiter >= 0.0
+    assert controller.in_flight == 2
+    assert controller.queued == 0
+
+    controller.release()
+    controller.release()
+    assert controller.in_flight == 0
+    metrics = controller.metrics()
+    assert metrics["admitted"] == 3
+    assert metrics["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout():
+    controller = AdmissionController(max_concurrency=1, queue_timeout=0.05)
+    await controller.acquire()
+    with pytest.raises(AgentOverloadedException) as exc_info:
+        await controller.acquire()
+    assert exc_info.value.details["reason"] == "queue_timeout"
+    assert controller.queued == 0
+    assert controller.metrics()["timed_out"] == 1
+
+    controller.release()
+    assert controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    controller = AdmissionController(max_concurrency=1)
+    await controller.acquire()
+    waiter = asyncio.create_task(controller.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert controller.queued == 0
+
+    controller.release()
+    assert controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_waiters_admitted_round_robin_across_users():
+    controller = AdmissionController(max_concurrency=1, max_queue_size=10)
+    await controller.acquire("busy")
+    order = []
+
+    async def query(user, n):
+        async with controller.admit(user):
+            order.append(f"{user}{n}")
+
+    tasks = [asyncio.create_task(query("flood", n)) for n in range(3)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(query("light", 0)))
+    await asyncio.sleep(0)
+
+    controller.release()
+    await asyncio.gather(*tasks)
+    assert order == ["flood0", "light0", "flood1", "flood2"]
+    assert controller.in_flight == 0
+
+
+class _SlowRunner(Runner):
+    def __init__(self, admission_controller=None):
+        super().__init__(admission_controller=admission_controller)
+        self.framework_type = "text"
+        self.release = asyncio.Event()
+
+    async def query_handler(self, request: AgentRequest = None, **kwargs):
+        await self.release.wait()
+        yield "done"
+
+
+def _request(user_id):
+    return AgentRequest.model_validate(
+        {
+            "input": [
+                {
+                    "role": "user",
+                    "content": [{"type": "text", "text": "hi"}],
+                },
+            ],
+            "user_id": user_id,
+        },
+    )
+
+
+async def _collect(runner, user_id):
+    return [
+        event.model_copy()
+        async for event in runner.stream_query(request=_request(user_id))
+    ]
+
+
+@pytest.mark.asyncio
+async def test_runner_rejects_with_error_event_when_full():
+    controller = AdmissionController(max_concurrency=1, max_queue_size=0)
+    async with _SlowRunner(controller) as runner:
+        running = asyncio.create_task(_collect(runner, "u1"))
+        await asyncio.sleep(0.05)
+
+        rejected = await _collect(runner, "u2")
+        assert [e.status for e in rejected] == [
+            RunStatus.Created,
+            RunStatus.Failed,
+        ]
+        assert rejected[-1].error.code == "AGENT_OVERLOADED"
+
+        runner.release.set()
+        events = await running
+        assert events[-1].status == RunStatus.Completed
+    assert controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_runner_releases_slot_when_stream_closed():
+    controller = AdmissionController(max_concurrency=1)
+    async with _SlowRunner(controller) as runner:
+        stream = runner.stream_query(request=_request("u1"))
+        await stream.__anext__()  # created
+        await stream.__anext__()  # in progress, slot held
+        assert controller.in_flight == 1
+        await stream.aclose()
+        # The tracing wrapper leaves inner generators to the loop's
+        # async generator finalizer.
+        for _ in range(10):
+            if not controller.in_flight:
+                break
+            await asyncio.sleep(0.01)
+    assert controller.in_flight == 0
+
+
+def test_agent_endpoint_returns_429_when_full():
+    controller = AdmissionController(max_concurrency=1, max_queue_size=0)
+    runner = _SlowRunner(controller)
+    app = FastAPIAppFactory.create_app(runner=runner)
+    with TestClient(app) as client:
+        controller._in_flight = 1  # pylint: disable=protected-access
+        response = client.post("/process", json={"input": []})
+        assert response.status_code == 429
+        assert response.json()["code"] == "AGENT_OVERLOADED"
+        health = client.get("/health").json()
+        assert health["admission"]["in_flight"] == 1
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+# pylint:disable=redefined-outer-name, unused-argument, protected-access
+import multiprocessing
+import os
+import socket
+import time
+from types import SimpleNamespace
+
+import pytest
+import requests
+from fastapi.testclient import TestClient
+
+from agentscope_runtime.engine import AgentApp
+from agentscope_runtime.engine.deployers.utils.service_utils import (
+    FastAPIAppFactory,
+)
+from agentscope_runtime.engine.deployers.utils.service_utils import workers
+from agentscope_runtime.engine.deployers.utils.service_utils.workers import (
+    WorkerStatusBoard,
+    _WorkerPool,
+    find_in_memory_services,
+)
+from agentscope_runtime.engine.runner import Runner
+from agentscope_runtime.engine.services.agent_state import (
+    InMemoryStateService,
+)
+from agentscope_runtime.engine.services.session_history import (
+    InMemorySessionHistoryService,
+)
+
+PORT = 8091
+
+
+def run_app():
+    """Start AgentApp with two workers, each recording its init."""
+    app = AgentApp()
+
+    @app.init
+    async def init_func(self):
+        self.worker_pid = os.getpid()
+
+    @app.endpoint("/pid", methods=["GET"])
+    def pid_handler():
+        return {"pid": os.getpid()}
+
+    app.run(host="127.0.0.1", port=PORT, workers=2)
+
+
+@pytest.fixture(scope="module")
+def start_app():
+    """Launch a two worker AgentApp in a separate process."""
+    proc = multiprocessing.Process(target=run_app)
+    proc.start()
+
+    for _ in range(100):
+        try:
+            health = requests.get(
+                f"http://127.0.0.1:{PORT}/health",
+                timeout=1,
+            ).json()
+            if health["workers"]["ready"] == 2:
+                break
+        except (OSError, requests.RequestException, KeyError):
+            pass
+        time.sleep(0.1)
+    else:
+        proc.terminate()
+        pytest.fail("Workers did not start within timeout")
+
+    yield proc
+    proc.terminate()
+    proc.join(10)
+
+
+def test_workers_share_port(start_app):
+    pids = set()
+    for _ in range(50):
+        pids.add(
+            requests.get(
+                f"http://127.0.0.1:{PORT}/pid",
+                # A fresh connection per request lets both workers accept.
+                headers={"Connection": "close"},
+                timeout=5,
+            ).json()["pid"],
+        )
+        if len(pids) == 2:
+            break
+    assert start_app.pid not in pids
+    assert len(pids) == 2
+
+
+def test_health_reports_every_worker(start_app):
+    health = requests.get(f"http://127.0.0.1:{PORT}/health", timeout=5)
+    workers = health.json()["workers"]
+    assert workers["total"] == 2
+    assert workers["worker"] in (0, 1)
+    assert [w["index"] for w in workers["workers"]] == [0, 1]
+    assert all(w["status"] == "ready" for w in workers["workers"])
+    assert len({w["pid"] for w in workers["workers"]}) == 2
+
+
+def test_worker_pool_stops_on_sigterm(start_app):
+    start_app.terminate()
+    start_app.join(10)
+    assert start_app.exitcode is not None
+    with pytest.raises(OSError):
+        socket.create_connection(("127.0.0.1", PORT), timeout=1)
+
+
+def test_find_in_memory_services():
+    runner = Runner()
+    assert not find_in_memory_services(runner)
+    runner.state_service = InMemoryStateService()
+    runner.session_service = InMemorySessionHistoryService()
+    assert find_in_memory_services(runner) == [
+        "state_service: InMemoryStateService",
+        "session_service: InMemorySessionHistoryService",
+    ]
+
+
+def _worker_app(allow_in_memory_services):
+    runner = Runner()
+
+    async def init_handler():
+        runner.state_service = InMemoryStateService()
+
+    runner.init_handler = init_handler
+    app = FastAPIAppFactory.create_app(runner=runner)
+    app.state.workers = 2
+    app.state.allow_in_memory_services = allow_in_memory_services
+    app.state.worker_board = WorkerStatusBoard(2)
+    app.state.worker_index = 1
+    return app
+
+
+def test_in_memory_services_warn_with_workers(caplog):
+    app = _worker_app(allow_in_memory_services=True)
+    with TestClient(app) as client:
+        workers = client.get("/health").json()["workers"]
+    assert "state_service: InMemoryStateService" in caplog.text
+    assert workers["worker"] == 1
+    assert workers["workers"][1]["status"] == "ready"
+    assert workers["workers"][1]["pid"] == os.getpid()
+    assert workers["workers"][0]["status"] == "starting"
+
+
+def test_in_memory_services_fail_when_not_allowed():
+    app = _worker_app(allow_in_memory_services=False)
+    with pytest.raises(RuntimeError, match="InMemoryStateService"):
+        with TestClient(app):
+            pass
+
+
+def test_in_memory_task_registry_fails_when_not_allowed():
+    def job(request):
+        return request
+
+    app = FastAPIAppFactory.create_app(
+        runner=Runner(),
+        custom_endpoints=[
+            {
+                "path": "/job",
+                "handler": job,
+                "methods": ["POST"],
+                "task_type": True,
+                "queue": "default",
+            },
+        ],
+    )
+    app.state.workers = 2
+    app.state.allow_in_memory_services = False
+    with pytest.raises(RuntimeError, match="BackgroundTaskRegistry"):
+        with TestClient(app):
+            pass
+
+
+class _CrashingServer:
+    """uvicorn.Server stand-in whose worker crashes right away."""
+
+    started = False
+
+    def __init__(self, config):
+        self.config = config
+
+    def run(self, sockets=None):
+        raise RuntimeError("crash")
+
+
+def test_worker_pool_backs_off_crashing_workers(monkeypatch):
+    monkeypatch.setattr(workers.uvicorn, "Server", _CrashingServer)
+    monkeypatch.setattr(workers, "WORKER_RESTART_BACKOFF", 0.05)
+    monkeypatch.setattr(workers, "WORKER_MAX_RESTARTS", 3)
+    spawned = []
+    spawn = _WorkerPool._spawn
+
+    def _spawn(self, index):
+        spawned.append(time.monotonic())
+        spawn(self, index)
+
+    monkeypatch.setattr(_WorkerPool, "_spawn", _spawn)
+    app = SimpleNamespace(
+        state=SimpleNamespace(worker_board=WorkerStatusBoard(1)),
+    )
+    pool = _WorkerPool(
+        app,
+        SimpleNamespace(host="127.0.0.1", port=PORT),
+        sock=None,
+        workers=1,
+    )
+    pool.run()
+
+    # Restarted with delays of 0.05, 0.1 and 0.2s, then given up on
+    assert pool.failed
+    assert len(spawned) == 4
+    delays = [b - a for a, b in zip(spawned, spawned[1:])]
+    assert all(d >= e for d, e in zip(delays, (0.05, 0.1, 0.2)))
@@ -285,3 +285,62 @@ def _check_round_trip_runtime_messages(runtime_messages):
 def test_round_trip_agent_request(request_data):
     request = AgentRequest.model_validate(request_data)
     _check_round_trip_runtime_messages(request.input)
+
+
+def test_repeated_messages_are_converted_from_cache(mocker):
+    request = AgentRequest.model_validate(
+        {
+            "input": [
+                {
+                    "role": "system",
+                    "content": [{"type": "text", "text": "Be concise."}],
+                },
+                {
+                    "role": "user",
+                    "content": [{"type": "text", "text": "Hi"}],
+                },
+            ],
+        },
+    )
+    first = message_to_agentscope_msg(request.input)
+
+    spy = mocker.patch("agentscope_runtime.adapters.agentscope.message.Msg")
+    spy.side_effect = Msg
+    second = message_to_agentscope_msg(request.input)
+    # Only the returned messages are built; conversion came from the cache.
+    assert spy.call_count == len(request.input)
+
+    assert [m.to_dict() | {"timestamp": None} for m in first] == [
+        m.to_dict() | {"timestamp": None} for m in second
+    ]
+    # Cached results are never shared between calls.
+    second[0].content[0]["text"] = "changed"
+    third = message_to_agentscope_msg(request.input)
+    assert third[0].content[0]["text"] == "Be concise."
+
+
+def test_cached_nested_fields_are_not_shared():
+    request = AgentRequest.model_validate(
+        {
+            "input": [
+                {
+                    "type": "function_call",
+                    "content": [
+                        {
+                            "type": "data",
+                            "data": {
+                                "call_id": "call_1",
+                                "name": "add",
+                                "arguments": json.dumps({"a": 1}),
+                            },
+                        },
+                    ],
+                },
+            ],
+        },
+    )
+    first = message_to_agentscope_msg(request.input)
+    first[0].content[0]["input"]["a"] = 999
+
+    second = message_to_agentscope_msg(request.input)
+    assert second[0].content[0]["input"] == {"a": 1}
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests and a benchmark for the AgentScope message stream adapter.
+
+Run this module directly to benchmark streams of 1k and 10k tokens::
+
+    python tests/unit/test_agentscope_stream.py
+"""
+import asyncio
+import copy
+import time
+
+from agentscope.message import Msg
+
+from agentscope_runtime.adapters.agentscope.stream import (
+    adapt_agentscope_message_stream,
+)
+from agentscope_runtime.engine.schemas.agent_schemas import (
+    Message,
+    MessageType,
+    RunStatus,
+    TextContent,
+)
+
+
+def _msg(msg_id, blocks):
+    msg = Msg("assistant", blocks, "assistant")
+    msg.id = msg_id
+    return msg
+
+
+def _cumulative_stream(n_tokens, msg_id="msg", thinking=None):
+    """AgentScope style chunks, each carrying the whole text so far."""
+    text = ""
+    for i in range(n_tokens):
+        text += f"token{i} "
+        blocks = [{"type": "text", "text": text}]
+        if thinking:
+            blocks.insert(0, {"type": "thinking", "thinking": thinking})
+        yield _msg(msg_id, blocks), i == n_tokens - 1
+
+
+async def _collect(chunks):
+    async def source():
+        for chunk in chunks:
+            yield chunk
+
+    return [event async for event in adapt_agentscope_message_stream(source())]
+
+
+def _text_deltas(events, message_type=MessageType.MESSAGE):
+    ids = {
+        event.id
+        for event in events
+        if isinstance(event, Message) and event.type == message_type
+    }
+    return [
+        event
+        for event in events
+        if isinstance(event, TextContent) and event.msg_id in ids
+    ]
+
+
+def test_stream_emits_deltas():
+    events = asyncio.run(_collect(_cumulative_stream(5)))
+
+    deltas = [e for e in _text_deltas(events) if e.delta]
+    assert [e.text for e in deltas] == [f"token{i} " for i in range(5)]
+    completed = [
+        e
+        for e in events
+        if isinstance(e, TextContent) and e.status == RunStatus.Completed
+    ]
+    assert completed[-1].text == "".join(f"token{i} " for i in range(5))
+
+
+def test_stream_does_not_touch_source():
+    chunks = list(_cumulative_stream(5, thinking="plan"))
+    chunks.append(
+        (
+            _msg(
+                "msg",
+                [
+                    {"type": "text", "text": "done"},
+                    {"type": "tool_use", "id": "c", "name": "f", "input": {}},
+                ],
+            ),
+            True,
+        ),
+    )
+    snapshot = [copy.deepcopy(msg.content) for msg, _ in chunks]
+
+    events = asyncio.run(_collect(chunks))
+
+    reasoning = _text_deltas(events, MessageType.REASONING)
+    assert "".join(e.text for e in reasoning if e.delta) == "plan"
+    # The adapter filters and reads the chunks but never modifies them
+    assert [msg.content for msg, _ in chunks] == snapshot
+
+
+def test_stream_restarts_on_rewritten_text():
+    texts = [
+        "Hello",
+        "Hello wor",
+        "HI",
+        "HI there",
+        # Rewritten early on, with the end of the previous text unchanged
+        "HI there. The answer is 42, this is a long answer",
+        "HI there. The answer is 41, this is a long answer. Done",
+    ]
+    chunks = [
+        (_msg("msg", [{"type": "text", "text": text}]), i == len(texts) - 1)
+        for i, text in enumerate(texts)
+    ]
+    events = asyncio.run(_collect(chunks))
+
+    deltas = [e.text for e in _text_deltas(events) if e.delta]
+    # A text that does not extend the previous one is emitted whole
+    assert deltas == [
+        "Hello",
+        " wor",
+        "HI",
+        " there",
+        ". The answer is 42, this is a long answer",
+        "HI there. The answer is 41, this is a long answer. Done",
+    ]
+
+
+def _benchmark(n_tokens):
+    # Chunks are built up front so only the adapter is timed; they hold
+    # n_tokens copies of the growing text, too much for the unit test.
+    chunks = list(_cumulative_stream(n_tokens, thinking="plan"))
+    start = time.perf_counter()
+    asyncio.run(_collect(chunks))
+    return time.perf_counter() - start
+
+
+def test_stream_10k_tokens():
+    # Chunks are generated as the adapter consumes them, so only the
+    # latest one is alive at a time.
+    events = asyncio.run(_collect(_cumulative_stream(10_000, thinking="plan")))
+    text = "".join(f"token{i} " for i in range(10_000))
+
+    deltas = [e.text for e in _text_deltas(events) if e.delta]
+    assert len(deltas) == 10_000
+    # Every character is emitted once, the deltas never repeat the prefix
+    assert sum(len(delta) for delta in deltas) == len(text)
+    assert "".join(deltas) == text
+
+
+if __name__ == "__main__":
+    for tokens in (1_000, 10_000):
+        elapsed = _benchmark(tokens)
+        print(
+            f"{tokens:>6} tokens: {elapsed * 1000:8.1f} ms "
+            f"({elapsed / tokens * 1e6:.1f} us/token)",
+        )
@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name, protected-access, unused-argument
+"""
+Unit tests for AsyncSandboxManager and AsyncDockerClient.
+"""
+import asyncio
+import json
+import time
+from unittest.mock import patch
+
+import fakeredis
+import httpx
+import pytest
+import pytest_asyncio
+
+from agentscope_runtime.common.container_clients.async_docker_client import (
+    AsyncDockerClient,
+)
+from agentscope_runtime.sandbox.enums import SandboxType
+from agentscope_runtime.sandbox.manager import AsyncSandboxManager
+from agentscope_runtime.sandbox.model import SandboxManagerEnvConfig
+
+
+class FakeAsyncContainerClient:
+    """In-process stand-in for AsyncDockerClient."""
+
+    def __init__(self, create_delay: float = 0.0):
+        self.create_delay = create_delay
+        self.containers = {}
+        self.create_calls = 0
+
+    async def create(self, image, name=None, ports=None, **kwargs):
+        await asyncio.sleep(self.create_delay)
+        self.create_calls += 1
+        self.containers[name] = "running"
+        return name, [50000 + self.create_calls], "localhost"
+
+    async def start(self, container_id):
+        self.containers[container_id] = "running"
+        return True
+
+    async def stop(self, container_id, timeout=None):
+        if container_id in self.containers:
+            self.containers[container_id] = "exited"
+        return True
+
+    async def remove(self, container_id, force=False):
+        self.containers.pop(container_id, None)
+        return True
+
+    async def inspect(self, container_id):
+        if container_id in self.containers:
+            return {"State": {"Status": self.containers[container_id]}}
+        return None
+
+    async def get_status(self, container_id):
+        return self.containers.get(container_id)
+
+    async def close(self):
+        pass
+
+
+def _config(tmp_path, **kwargs):
+    kwargs.setdefault("redis_enabled", False)
+    return SandboxManagerEnvConfig(
+        file_system="local",
+        container_deployment="docker",
+        default_mount_dir=str(tmp_path / "mounts"),
+        pool_refill_interval=0.05,
+        **kwargs,
+    )
+
+
+@pytest_asyncio.fixture
+async def manager(tmp_path):
+    fake_client = FakeAsyncContainerClient(create_delay=0.2)
+    with patch(
+        "agentscope_runtime.common.container_clients.async_docker_client."
+        "AsyncDockerClient",
+        return_value=fake_client,
+    ):
+        _manager = AsyncSandboxManager(config=_config(tmp_path))
+
+    async def handler(request: httpx.Request):
+        if request.url.path.endswith("/healthz"):
+            return httpx.Response(200)
+        await asyncio.sleep(0.2)
+        body = json.loads(request.content)
+        return httpx.Response(200, json={"echo": body})
+
+    await _manager.sandbox_session.aclose()
+    _manager.sandbox_session = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler),
+    )
+    async with _manager:
+        yield _manager
+
+
+@pytest.mark.asyncio
+async def test_concurrent_create_and_call_tool(manager):
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    names = await asyncio.gather(*(manager.create() for _ in range(20)))
+    # 20 creations of 0.2s each overlap on the event loop
+    assert loop.time() - start < 1.0
+    assert len(set(names)) == 20
+
+    start = loop.time()
+    results = await asyncio.gather(
+        *(
+            manager.call_tool(
+                name,
+                tool_name="run_shell_command",
+                arguments={"command": "echo hi"},
+            )
+            for name in names
+        ),
+    )
+    assert loop.time() - start < 1.0
+    assert results[0] == {"echo": {"command": "echo hi"}}
+
+    released = await asyncio.gather(*(manager.release(n) for n in names))
+    assert all(released)
+    assert not manager.client.containers
+
+
+@pytest.mark.asyncio
+async def test_connection_health_is_cached(manager):
+    name = await manager.create()
+    health_checks = 0
+
+    async def wait_until_healthy():
+        nonlocal health_checks
+        health_checks += 1
+
+    client = await manager._establish_connection(name)
+    client.wait_until_healthy = wait_until_healthy
+
+    for _ in range(5):
+        await manager.call_tool(name, tool_name="browser_snapshot")
+    assert await manager._establish_connection(name) is client
+    assert health_checks == 0
+
+    await manager.release(name)
+    assert name not in manager._connections
+
+
+@pytest.mark.asyncio
+async def test_session_mapping(manager):
+    name = await manager.create(meta={"session_ctx_id": "ctx"})
+    assert await manager.get_session_mapping("ctx") == [name]
+    assert await manager.list_session_keys() == ["ctx"]
+    await manager.release(name)
+    assert await manager.get_session_mapping("ctx") == []
+
+
+# pylint: disable-next=abstract-method, too-many-ancestors
+class SlowFakeRedis(fakeredis.FakeRedis):
+    """Redis client with a blocking network round trip per command."""
+
+    def execute_command(self, *args, **kwargs):
+        time.sleep(0.02)
+        return super().execute_command(*args, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_redis_calls_do_not_block_event_loop(tmp_path):
+    server = fakeredis.FakeServer()
+    with patch(
+        "agentscope_runtime.common.container_clients.async_docker_client."
+        "AsyncDockerClient",
+        return_value=FakeAsyncContainerClient(),
+    ), patch(
+        "redis.Redis",
+        lambda **kwargs: SlowFakeRedis(server=server, **kwargs),
+    ):
+        _manager = AsyncSandboxManager(
+            config=_config(tmp_path, redis_enabled=True),
+        )
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    names = await asyncio.gather(
+        *(
+            _manager.create(meta={"session_ctx_id": f"ctx-{i}"})
+            for i in range(20)
+        ),
+    )
+    # Three round trips per create, 1.2s if run on the event loop
+    assert loop.time() - start < 0.6
+
+    # Concurrent binds to one session are not lost
+    shared = await asyncio.gather(
+        *(_manager.create(meta={"session_ctx_id": "ctx"}) for _ in range(5)),
+    )
+    assert sorted(await _manager.get_session_mapping("ctx")) == sorted(shared)
+
+    await asyncio.gather(
+        *(_manager.release(name) for name in names + shared),
+    )
+    assert await _manager.get_session_mapping("ctx") == []
+    assert await _manager.list_session_keys() == []
+    await _manager.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_refills_in_background(tmp_path):
+    fake_client = FakeAsyncContainerClient()
+    with patch(
+        "agentscope_runtime.common.container_clients.async_docker_client."
+        "AsyncDockerClient",
+        return_value=fake_client,
+    ):
+        _manager = AsyncSandboxManager(
+            config=_config(tmp_path, pool_size=2),
+        )
+
+    async with _manager:
+        queue = _manager.pool_queues[SandboxType.BASE]
+        assert queue.size() == 2
+
+        await _manager.create_from_pool()
+        await _manager.create_from_pool()
+        for _ in range(100):
+            if queue.size() == 2:
+                break
+            await asyncio.sleep(0.01)
+        assert queue.size() == 2
+
+    assert not fake_client.containers
+
+
+@pytest.mark.asyncio
+async def test_async_docker_client_lifecycle(tmp_path):
+    requests_seen = []
+
+    def handler(request: httpx.Request):
+        requests_seen.append((request.method, request.url.path))
+        path = request.url.path
+        if path == "/version":
+            return httpx.Response(200, json={"ApiVersion": "1.41"})
+        if path.startswith("/v1.41/images/"):
+            return httpx.Response(200, json={})
+        if path == "/v1.41/containers/create":
+            body = json.loads(request.content)
+            assert request.url.params["name"] == "box"
+            assert body["HostConfig"]["PortBindings"]["80/tcp"]
+            assert body["HostConfig"]["Memory"] == 1024**3
+            return httpx.Response(201, json={"Id": "cid"})
+        if path == "/v1.41/containers/cid/json":
+            return httpx.Response(200, json={"State": {"Status": "running"}})
+        return httpx.Response(204)
+
+    client = AsyncDockerClient(
+        config=_config(tmp_path),
+        transport=httpx.MockTransport(handler),
+        base_url="http://docker",
+    )
+    _id, ports, ip = await client.create(
+        "agentscope/runtime-sandbox-base",
+        name="box",
+        ports=["80/tcp"],
+        environment={"A": "1"},
+        runtime_config={"mem_limit": "1g"},
+    )
+    assert (_id, ip) == ("cid", "localhost")
+    assert client.port_allocator.contains(ports[0])
+    assert await client.get_status("cid") == "running"
+
+    assert await client.stop("cid", timeout=1)
+    assert await client.remove("cid", force=True)
+    assert not client.port_allocator.contains(ports[0])
+    assert ("DELETE", "/v1.41/containers/cid") in requests_seen
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_call_tools_batch(manager):
+    name = await manager.create()
+    calls = [
+        {"tool_name": "run_shell_command", "arguments": {"command": "pwd"}},
+        {"tool_name": "browser_snapshot", "arguments": {}},
+    ]
+    seen = []
+
+    async def handler(request: httpx.Request):
+        seen.append(request.url.path)
+        if request.url.path.endswith("/healthz"):
+            return httpx.Response(200)
+        body = json.loads(request.content)
+        if request.url.path.endswith("/tools/call_tools_batch"):
+            return httpx.Response(200, json=body["calls"])
+        return httpx.Response(200, json={"echo": body})
+
+    await manager.sandbox_session.aclose()
+    manager.sandbox_session = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler),
+    )
+    manager._connections.clear()
+
+    assert await manager.call_tools_batch(name, calls=calls) == calls
+    assert sum(p.endswith("/tools/call_tools_batch") for p in seen) == 1
+
+    async def legacy_handler(request: httpx.Request):
+        if request.url.path.endswith("/tools/call_tools_batch"):
+            return httpx.Response(404)
+        return await handler(request)
+
+    await manager.sandbox_session.aclose()
+    manager.sandbox_session = httpx.AsyncClient(
+        transport=httpx.MockTransport(legacy_handler),
+    )
+    manager._connections.clear()
+
+    # Images without the batch endpoint fall back to one call per tool
+    results = await manager.call_tools_batch(name, calls=calls)
+    assert results == [
+        {"echo": {"command": "pwd"}},
+        {"echo": {"tool_name": "browser_snapshot", "arguments": {}}},
+    ]
+    await manager.release(name)
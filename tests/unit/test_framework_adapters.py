@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+# pylint:disable=protected-access
+import pytest
+
+from agentscope_runtime.engine import Runner
+from agentscope_runtime.engine import framework_adapters
+from agentscope_runtime.engine.framework_adapters import (
+    FrameworkAdapter,
+    get_framework_adapter,
+    register_framework_adapter,
+    registered_framework_types,
+)
+from agentscope_runtime.engine.schemas.agent_schemas import (
+    AgentRequest,
+    RunStatus,
+    TextContent,
+)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Restore the adapter registry after each test."""
+    monkeypatch.setattr(
+        framework_adapters,
+        "_registry",
+        dict(framework_adapters._registry),
+    )
+
+
+def _request(text):
+    return AgentRequest.model_validate(
+        {
+            "input": [
+                {
+                    "role": "user",
+                    "content": [{"type": "text", "text": text}],
+                },
+            ],
+        },
+    )
+
+
+async def _upper_stream(source_stream):
+    async for chunk in source_stream:
+        yield TextContent(text=chunk.upper(), delta=True)
+
+
+class _EchoRunner(Runner):
+    # pylint: disable-next=unused-argument
+    async def query_handler(self, request=None, msgs=None, **kwargs):
+        for msg in msgs:
+            yield msg
+
+
+@pytest.mark.usefixtures("registry")
+def test_builtin_adapters_resolved_once():
+    adapter = get_framework_adapter("text")
+    assert isinstance(adapter, FrameworkAdapter)
+    assert get_framework_adapter("text") is adapter
+    assert {"text", "agentscope", "langgraph", "agno", "autogen"} <= set(
+        registered_framework_types(),
+    )
+
+
+@pytest.mark.usefixtures("registry")
+def test_register_requires_adapter_or_loader():
+    with pytest.raises(ValueError):
+        register_framework_adapter("broken")
+    with pytest.raises(ValueError):
+        register_framework_adapter(
+            "broken",
+            FrameworkAdapter(stream_adapter=_upper_stream),
+            loader=lambda: None,
+        )
+
+
+@pytest.mark.usefixtures("registry")
+@pytest.mark.asyncio
+async def test_runner_uses_registered_adapter():
+    calls = []
+
+    def loader():
+        calls.append("load")
+        return FrameworkAdapter(
+            stream_adapter=_upper_stream,
+            message_converter=lambda messages: [
+                m.content[0].text for m in messages
+            ],
+        )
+
+    register_framework_adapter("echo", loader=loader)
+    runner = _EchoRunner()
+    runner.framework_type = "echo"
+    async with runner:
+        assert calls == ["load"]
+        events = [
+            event.model_copy()
+            async for event in runner.stream_query(_request("hello"))
+        ]
+        async for _ in runner.stream_query(_request("again")):
+            pass
+
+    assert calls == ["load"]
+    assert events[-1].status == RunStatus.Completed
+    assert [e.text for e in events if isinstance(e, TextContent)] == [
+        "HELLO",
+    ]
+
+
+@pytest.mark.usefixtures("registry")
+@pytest.mark.asyncio
+async def test_async_message_converter():
+    async def convert(messages):
+        return [m.content[0].text + "!" for m in messages]
+
+    register_framework_adapter(
+        "echo",
+        FrameworkAdapter(
+            stream_adapter=_upper_stream,
+            message_converter=convert,
+        ),
+    )
+    runner = _EchoRunner()
+    runner.framework_type = "echo"
+    async with runner:
+        events = [e async for e in runner.stream_query(_request("hey"))]
+    assert [e.text for e in events if isinstance(e, TextContent)] == [
+        "HEY!",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_unknown_framework_type():
+    runner = _EchoRunner()
+    runner.framework_type = "unknown"
+    async with runner:
+        with pytest.raises(RuntimeError, match="invalid or not set"):
+            async for _ in runner.stream_query(_request("hi")):
+                pass
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+# pylint:disable=protected-access, redefined-outer-name, wrong-import-position
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+# The sandbox routers package imports the dependencies of every router.
+for _module in ("git", "aiofiles"):
+    pytest.importorskip(_module)
+from agentscope_runtime.sandbox.box.shared.routers import (  # noqa: E402
+    mcp,
+)
+
+
+class FakeSessionHandler:
+    tools = {}
+    # Server name -> seconds to start, or the exception it fails with
+    startup = {}
+
+    def __init__(self, name, config):
+        self.name = name
+        self.config = config
+        self.tools_changed = False
+        self.list_calls = 0
+        self.called = []
+
+    async def initialize(self):
+        startup = self.startup.get(self.name, 0)
+        if isinstance(startup, Exception):
+            raise startup
+        await asyncio.sleep(startup)
+
+    async def list_tools(self):
+        self.list_calls += 1
+        return [
+            SimpleNamespace(
+                name=tool_name,
+                description=f"{tool_name} tool",
+                inputSchema={"properties": {}, "required": []},
+            )
+            for tool_name in self.tools[self.name]
+        ]
+
+    async def call_tool(self, tool_name, arguments):
+        self.called.append((tool_name, arguments))
+        return SimpleNamespace(model_dump=lambda: {"server": self.name})
+
+    async def cleanup(self):
+        self.cleaned_up = True
+
+
+@pytest.fixture
+async def servers(monkeypatch):
+    monkeypatch.setattr(mcp, "MCPSessionHandler", FakeSessionHandler)
+    monkeypatch.setattr(
+        FakeSessionHandler,
+        "tools",
+        {"a": ["read", "shared"], "b": ["write", "shared"], "c": []},
+    )
+    monkeypatch.setattr(FakeSessionHandler, "startup", {})
+    await mcp.add_servers(
+        server_configs={"mcpServers": {"a": {}, "b": {}, "c": {}}},
+        overwrite=False,
+    )
+    yield mcp._MCP_SERVERS
+    await mcp.cleanup_servers()
+
+
+@pytest.mark.asyncio
+async def test_call_tool_uses_routing_table(servers):
+    assert all(s.list_calls == 1 for s in servers.values())
+
+    assert await mcp.call_tool(tool_name="write", arguments={}) == {
+        "server": "b",
+    }
+    # Tools provided by several servers go to the first one added.
+    assert await mcp.call_tool(tool_name="shared", arguments={"x": 1}) == {
+        "server": "a",
+    }
+    assert servers["a"].called == [("shared", {"x": 1})]
+    assert all(s.list_calls == 1 for s in servers.values())
+
+    tools = await mcp.list_tools()
+    assert set(tools["a"]) == {"read", "shared"}
+    assert tools["b"]["write"]["json_schema"]["function"]["name"] == "write"
+    assert tools["c"] == {}
+    assert all(s.list_calls == 1 for s in servers.values())
+
+
+@pytest.mark.asyncio
+async def test_tools_list_changed_refreshes_server(servers):
+    FakeSessionHandler.tools["c"] = ["search"]
+    servers["c"].tools_changed = True
+
+    assert await mcp.call_tool(tool_name="search", arguments={}) == {
+        "server": "c",
+    }
+    assert servers["c"].list_calls == 2
+    assert servers["a"].list_calls == 1
+    assert not servers["c"].tools_changed
+
+
+@pytest.mark.asyncio
+async def test_expired_cache_is_refreshed(servers, monkeypatch):
+    monkeypatch.setattr(mcp, "MCP_TOOLS_CACHE_TTL", 0)
+    await mcp.list_tools()
+    assert all(s.list_calls == 2 for s in servers.values())
+
+
+@pytest.mark.asyncio
+async def test_unknown_tool_refreshes_once_then_fails(servers):
+    with pytest.raises(HTTPException, match="Tool 'missing' not found"):
+        await mcp.call_tool(tool_name="missing", arguments={})
+    assert all(s.list_calls == 2 for s in servers.values())
+
+
+@pytest.mark.usefixtures("servers")
+@pytest.mark.asyncio
+async def test_overwrite_replaces_routes():
+    FakeSessionHandler.tools["b"] = ["delete"]
+    await mcp.add_servers(
+        server_configs={"mcpServers": {"b": {}}},
+        overwrite=True,
+    )
+    assert mcp._MCP_TOOL_ROUTES == {
+        "read": "a",
+        "shared": "a",
+        "delete": "b",
+    }
+
+
+@pytest.mark.asyncio
+async def test_session_handler_tracks_tools_list_changed():
+    from mcp import types
+
+    from agentscope_runtime.sandbox.box.shared.routers.mcp_utils import (
+        MCPSessionHandler,
+    )
+
+    handler = MCPSessionHandler("a", {})
+    await handler._handle_message(
+        types.ServerNotification(
+            types.ResourceListChangedNotification(
+                method="notifications/resources/list_changed",
+            ),
+        ),
+    )
+    assert not handler.tools_changed
+    await handler._handle_message(
+        types.ServerNotification(
+            types.ToolListChangedNotification(
+                method="notifications/tools/list_changed",
+            ),
+        ),
+    )
+    assert handler.tools_changed
+
+
+@pytest.mark.asyncio
+async def test_add_servers_initializes_concurrently(servers, monkeypatch):
+    names = [f"slow{i}" for i in range(4)]
+    monkeypatch.setitem(FakeSessionHandler.tools, "slow0", ["slow_tool"])
+    for name in names:
+        FakeSessionHandler.tools.setdefault(name, [])
+        FakeSessionHandler.startup[name] = 0.2
+
+    start = time.monotonic()
+    await mcp.add_servers(
+        server_configs={"mcpServers": {name: {} for name in names}},
+        overwrite=False,
+    )
+    assert time.monotonic() - start < 0.6
+    assert list(servers) == ["a", "b", "c", *names]
+    assert mcp._MCP_TOOL_ROUTES["slow_tool"] == "slow0"
+
+
+@pytest.mark.usefixtures("servers")
+@pytest.mark.asyncio
+async def test_add_servers_limits_concurrency(monkeypatch):
+    monkeypatch.setattr(mcp, "MCP_INIT_CONCURRENCY", 1)
+    for name in ("d", "e"):
+        FakeSessionHandler.tools[name] = []
+        FakeSessionHandler.startup[name] = 0.1
+
+    start = time.monotonic()
+    await mcp.add_servers(
+        server_configs={"mcpServers": {"d": {}, "e": {}}},
+        overwrite=False,
+    )
+    assert time.monotonic() - start >= 0.2
+
+
+@pytest.mark.asyncio
+async def test_add_servers_reports_partial_success(servers, monkeypatch):
+    monkeypatch.setattr(mcp, "MCP_INIT_TIMEOUT", 0.1)
+    FakeSessionHandler.tools["ok"] = ["ok_tool"]
+    FakeSessionHandler.startup.update(
+        {"hang": 10, "broken": RuntimeError("spawn failed")},
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        await mcp.add_servers(
+            server_configs={
+                "mcpServers": {"ok": {}, "hang": {}, "broken": {}},
+            },
+            overwrite=False,
+        )
+    detail = exc_info.value.detail
+    assert exc_info.value.status_code == 500
+    assert detail["initialized"] == ["ok"]
+    assert detail["failed"] == {
+        "hang": "Timed out after 0.1 seconds",
+        "broken": "spawn failed",
+    }
+    assert "ok" in servers and "hang" not in servers
+    assert mcp._MCP_TOOL_ROUTES["ok_tool"] == "ok"
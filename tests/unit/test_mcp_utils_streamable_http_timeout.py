@@ -45,7 +45,11 @@ async def test_streamable_http_timeout_coerces_timedelta() -> None:
         yield (object(), object(), (lambda: None))
 
     class FakeClientSession:
-        def __init__(self, *streams: Any) -> None:  # noqa: ARG002
+        def __init__(
+            self,
+            *streams: Any,
+            **kwargs: Any,
+        ) -> None:  # noqa: ARG002
             pass
 
         async def __aenter__(self) -> "FakeClientSession":
@@ -210,3 +210,57 @@ async def test_operations_on_non_existent_user(
     # Should not raise any error
     await memory_service.delete_memory(user_id)
     await memory_service.delete_memory(user_id, "some_session")
+
+
+@pytest.mark.asyncio
+async def test_search_memory_index(memory_service: InMemoryMemoryService):
+    user_id = "user_index"
+    await memory_service.add_memory(
+        user_id,
+        [
+            create_message(Role.USER, "I like green apple pie"),
+            create_message(Role.USER, "apple apple apple"),
+            create_message(Role.USER, "我喜欢吃苹果"),
+            create_message(Role.USER, "pineapple"),
+        ],
+        "session1",
+    )
+    await memory_service.add_memory(
+        user_id,
+        [create_message(Role.USER, "Apple, banana")],
+        "session2",
+    )
+
+    def texts(msgs):
+        return [m.content[0].text for m in msgs]
+
+    # Whole tokens match, case-insensitively and ignoring punctuation
+    retrieved = await memory_service.search_memory(
+        user_id,
+        [create_message(Role.USER, "apple")],
+    )
+    assert texts(retrieved) == [
+        "I like green apple pie",
+        "apple apple apple",
+        "Apple, banana",
+    ]
+    retrieved = await memory_service.search_memory(
+        user_id,
+        [create_message(Role.USER, "苹果")],
+    )
+    assert texts(retrieved) == ["我喜欢吃苹果"]
+
+    # BM25 ranks the most relevant message first
+    retrieved = await memory_service.search_memory(
+        user_id,
+        [create_message(Role.USER, "apple pie")],
+        filters={"top_k": 2, "scoring": "bm25"},
+    )
+    assert texts(retrieved) == ["I like green apple pie", "apple apple apple"]
+
+    await memory_service.delete_memory(user_id, "session1")
+    retrieved = await memory_service.search_memory(
+        user_id,
+        [create_message(Role.USER, "apple")],
+    )
+    assert texts(retrieved) == ["Apple, banana"]
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name
+"""
+Unit tests for the host port allocators used by the Docker clients.
+"""
+import fakeredis
+import pytest
+
+from agentscope_runtime.common.container_clients.port_allocator import (
+    InMemoryPortAllocator,
+    RedisPortAllocator,
+)
+
+PORT_RANGE = range(49152, 49168)
+
+
+def _always_free(_port):
+    return True
+
+
+@pytest.fixture
+def redis_client():
+    pytest.importorskip("lupa")
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def allocator(request):
+    if request.param == "memory":
+        return InMemoryPortAllocator(PORT_RANGE, probe=_always_free)
+    return RedisPortAllocator(
+        request.getfixturevalue("redis_client"),
+        key="ports",
+        port_range=PORT_RANGE,
+        probe=_always_free,
+    )
+
+
+def test_allocate_and_release(allocator):
+    ports = allocator.allocate(3)
+    assert len(set(ports)) == 3
+    assert all(p in PORT_RANGE and allocator.contains(p) for p in ports)
+
+    allocator.release(ports)
+    assert not any(allocator.contains(p) for p in ports)
+
+
+def test_exhaustion_is_all_or_nothing(allocator):
+    ports = allocator.allocate(len(PORT_RANGE) - 1)
+    with pytest.raises(RuntimeError):
+        allocator.allocate(2)
+    # The single remaining port was not leaked by the failed attempt
+    assert len(allocator.allocate(1)) == 1
+
+    allocator.release(ports[:2])
+    assert sorted(allocator.allocate(2)) == sorted(ports[:2])
+
+
+def test_busy_ports_are_skipped_and_retried(allocator):
+    busy = {PORT_RANGE.start, PORT_RANGE.start + 1}
+    allocator.probe = lambda port: port not in busy
+
+    ports = allocator.allocate(2)
+    assert not busy & set(ports)
+    assert not any(allocator.contains(p) for p in busy)
+
+    busy.clear()
+    allocator.release(ports)
+    assert len(allocator.allocate(len(PORT_RANGE))) == len(PORT_RANGE)
+
+
+def test_release_ignores_unknown_ports(allocator):
+    allocator.release([1, PORT_RANGE.stop, PORT_RANGE.start])
+    assert len(allocator.allocate(len(PORT_RANGE))) == len(PORT_RANGE)
+
+
+def test_redis_allocators_share_the_range(redis_client):
+    first, second = (
+        RedisPortAllocator(
+            redis_client,
+            key="ports",
+            port_range=PORT_RANGE,
+            probe=_always_free,
+        )
+        for _ in range(2)
+    )
+    ports = first.allocate(8) + second.allocate(8)
+    assert sorted(ports) == list(PORT_RANGE)
+
+    first.release(ports[-1:])
+    assert second.contains(ports[0])
+    assert not second.contains(ports[-1])
+
+
+def test_redis_migrates_legacy_port_set(redis_client):
+    redis_client.sadd("ports", PORT_RANGE.start, PORT_RANGE.start + 2)
+    allocator = RedisPortAllocator(
+        redis_client,
+        key="ports",
+        port_range=PORT_RANGE,
+        probe=_always_free,
+    )
+    assert not redis_client.exists("ports")
+    assert allocator.contains(PORT_RANGE.start)
+    assert allocator.contains(PORT_RANGE.start + 2)
+    assert PORT_RANGE.start not in allocator.allocate(len(PORT_RANGE) - 2)
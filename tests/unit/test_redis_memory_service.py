@@ -380,3 +380,107 @@ async def test_ttl_disabled():
 
     finally:
         await service.stop()
+
+
+@pytest.mark.asyncio
+async def test_clear_all_memory(memory_service: RedisMemoryService):
+    for i in range(1500):
+        await memory_service._redis.hset(
+            memory_service._user_key(f"bulk_user{i}"),
+            "default",
+            "[]",
+        )
+    await memory_service._redis.set("unrelated", "1")
+
+    await memory_service.clear_all_memory()
+    assert not await memory_service._redis.keys(memory_service._user_key("*"))
+    assert await memory_service._redis.get("unrelated") == "1"
+
+
+@pytest.mark.asyncio
+async def test_search_memory_index(memory_service: RedisMemoryService):
+    user_id = "user_index"
+    await memory_service.delete_user_memory(user_id)
+    await memory_service.add_memory(
+        user_id,
+        [
+            create_message(Role.USER, "I like green apple pie"),
+            create_message(Role.USER, "apple apple apple"),
+            create_message(Role.USER, "pineapple"),
+        ],
+        "session1",
+    )
+    await memory_service.add_memory(
+        user_id,
+        [create_message(Role.USER, "Apple, banana")],
+        "session2",
+    )
+
+    def texts(msgs):
+        return [m.content[0].text for m in msgs]
+
+    retrieved = await memory_service.search_memory(
+        user_id,
+        [create_message(Role.USER, "apple")],
+    )
+    assert texts(retrieved) == [
+        "I like green apple pie",
+        "apple apple apple",
+        "Apple, banana",
+    ]
+
+    retrieved = await memory_service.search_memory(
+        user_id,
+        [create_message(Role.USER, "apple pie")],
+        filters={"top_k": 2, "scoring": "bm25"},
+    )
+    assert texts(retrieved) == ["I like green apple pie", "apple apple apple"]
+
+    await memory_service.delete_memory(user_id, "session1")
+    retrieved = await memory_service.search_memory(
+        user_id,
+        [create_message(Role.USER, "apple")],
+    )
+    assert texts(retrieved) == ["Apple, banana"]
+    stats = await memory_service._redis.hgetall(
+        memory_service._index_keys(user_id)[-1],
+    )
+    assert stats["n_docs"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_search_memory_index_trim_and_rebuild():
+    fake_redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    service = RedisMemoryService(
+        redis_client=fake_redis,
+        ttl_seconds=None,
+        max_messages_per_session=2,
+    )
+    await service.start()
+    try:
+        user_id = "user_trim"
+        for i in range(4):
+            await service.add_memory(
+                user_id,
+                [create_message(Role.USER, f"topic{i} shared")],
+            )
+        retrieved = await service.search_memory(
+            user_id,
+            [create_message(Role.USER, "shared topic0")],
+        )
+        # Trimmed messages are removed from the index as well
+        assert [m.content[0].text for m in retrieved] == [
+            "topic2 shared",
+            "topic3 shared",
+        ]
+
+        # Data written before the index existed is indexed on first search
+        for key in service._index_keys(user_id):
+            await fake_redis.delete(key)
+        retrieved = await service.search_memory(
+            user_id,
+            [create_message(Role.USER, "topic3")],
+        )
+        assert [m.content[0].text for m in retrieved] == ["topic3 shared"]
+    finally:
+        await service.stop()
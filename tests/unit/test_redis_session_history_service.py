@@ -542,3 +542,161 @@ async def test_max_messages_per_session_disabled():
 
     finally:
         await service.stop()
+
+
+@pytest.mark.asyncio
+async def test_get_session_range(
+    session_history_service: RedisSessionHistoryService,
+    user_id: str,
+) -> None:
+    """Tests that get_session slices the history like a Python list."""
+    session = await session_history_service.create_session(user_id)
+    await session_history_service.append_message(
+        session,
+        [
+            {"role": "user", "content": [TextContent(text=f"message {i}")]}
+            for i in range(10)
+        ],
+    )
+
+    for start, stop in [(0, None), (-3, None), (2, 5), (0, -8), (5, 2)]:
+        ranged = await session_history_service.get_session(
+            user_id,
+            session.id,
+            start=start,
+            stop=stop,
+        )
+        assert [m.content[0].text for m in ranged.messages] == [
+            f"message {i}" for i in range(10)
+        ][start:stop]
+
+
+@pytest.mark.asyncio
+async def test_append_is_incremental(
+    session_history_service: RedisSessionHistoryService,
+    user_id: str,
+) -> None:
+    """Tests that appends push only the new messages to Redis."""
+    session = await session_history_service.create_session(user_id)
+    redis = session_history_service._redis
+    messages_key = session_history_service._messages_key(user_id, session.id)
+
+    for i in range(3):
+        await session_history_service.append_message(
+            session,
+            {"role": "user", "content": [TextContent(text=f"message {i}")]},
+        )
+    assert await redis.llen(messages_key) == 3
+    assert await redis.hgetall(
+        session_history_service._session_key(user_id, session.id),
+    ) == {"id": session.id, "user_id": user_id}
+
+
+@pytest.mark.asyncio
+async def test_migrate_legacy_session(
+    session_history_service: RedisSessionHistoryService,
+    user_id: str,
+) -> None:
+    """Tests that sessions stored as a single JSON string are migrated."""
+    redis = session_history_service._redis
+    legacy = Session(
+        id="legacy",
+        user_id=user_id,
+        messages=[
+            {"role": "user", "content": [TextContent(text="old message")]},
+        ],
+    )
+    key = session_history_service._session_key(user_id, "legacy")
+    await redis.set(key, legacy.model_dump_json())
+
+    session = await session_history_service.get_session(user_id, "legacy")
+    assert [m.content[0].text for m in session.messages] == ["old message"]
+    key_type = await redis.type(key)
+    assert key_type == "hash"
+
+    # Appending to a legacy session keeps the old history in front
+    await redis.set(key, legacy.model_dump_json())
+    await redis.delete(
+        session_history_service._messages_key(user_id, "legacy"),
+    )
+    await session_history_service.append_message(
+        session,
+        {"role": "user", "content": [TextContent(text="new message")]},
+    )
+    stored = await session_history_service.get_session(user_id, "legacy")
+    assert [m.content[0].text for m in stored.messages] == [
+        "old message",
+        "new message",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_list_sessions_uses_index(
+    session_history_service: RedisSessionHistoryService,
+    user_id: str,
+) -> None:
+    """Tests listing through the session index, its rebuild and pruning."""
+    await session_history_service.delete_user_sessions(user_id)
+    redis = session_history_service._redis
+    index_key = session_history_service._index_key(user_id)
+    sessions = [
+        await session_history_service.create_session(user_id, f"s{i}")
+        for i in range(3)
+    ]
+    assert await redis.smembers(index_key) == {"s0", "s1", "s2"}
+
+    # Sessions written before the index existed are found by a scan
+    await redis.delete(index_key)
+    listed = await session_history_service.list_sessions(user_id)
+    assert {s.id for s in listed} == {s.id for s in sessions}
+    assert await redis.smembers(index_key) == {"s0", "s1", "s2"}
+
+    # Expired sessions are pruned from the index
+    await redis.delete(session_history_service._session_key(user_id, "s1"))
+    listed = await session_history_service.list_sessions(user_id)
+    assert [s.id for s in listed] == ["s0", "s2"]
+    assert await redis.smembers(index_key) == {"s0", "s2"}
+
+    await session_history_service.delete_session(user_id, "s0")
+    assert await redis.smembers(index_key) == {"s2"}
+
+
+@pytest.mark.asyncio
+async def test_message_range_primitives(
+    session_history_service: RedisSessionHistoryService,
+    user_id: str,
+) -> None:
+    """Tests counting and deleting messages without reading the history."""
+    session = await session_history_service.create_session(user_id)
+    await session_history_service.append_message(
+        session,
+        [
+            {"role": "user", "content": [TextContent(text=f"message {i}")]}
+            for i in range(5)
+        ],
+    )
+
+    count = session_history_service.count_messages
+    assert await count(user_id, session.id) == 5
+    assert await count(user_id, "missing") == 0
+    recent = await session_history_service.get_messages(
+        user_id,
+        session.id,
+        start=-2,
+    )
+    assert [m.content[0].text for m in recent] == ["message 3", "message 4"]
+
+    await session_history_service.delete_messages(user_id, session.id, [0, 3])
+    remaining = await session_history_service.get_messages(user_id, session.id)
+    assert [m.content[0].text for m in remaining] == [
+        "message 1",
+        "message 2",
+        "message 4",
+    ]
+
+    with pytest.raises(IndexError):
+        await session_history_service.delete_messages(
+            user_id,
+            session.id,
+            [3],
+        )
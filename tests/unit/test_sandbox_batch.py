@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=wrong-import-position, redefined-outer-name
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# The sandbox routers package imports the dependencies of every router.
+for _module in ("git", "aiofiles"):
+    pytest.importorskip(_module)
+from agentscope_runtime.sandbox.box.shared.routers import (  # noqa: E402
+    batch_router,
+)
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(batch_router)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _error_text(result):
+    assert result["isError"]
+    return result["content"][0]["text"]
+
+
+def test_batch_reports_bad_arguments_per_call(client):
+    response = client.post(
+        "/tools/call_tools_batch",
+        json={
+            "calls": [
+                {"tool_name": "run_shell_command", "arguments": {}},
+                {
+                    "tool_name": "run_shell_command",
+                    "arguments": {"command": "echo hi", "cwd": "/"},
+                },
+                {
+                    "tool_name": "run_shell_command",
+                    "arguments": {"command": "echo hi"},
+                },
+            ],
+        },
+    )
+    assert response.status_code == 200
+    missing, unknown, ok = response.json()
+    assert _error_text(missing) == (
+        "Missing arguments for run_shell_command: command"
+    )
+    assert _error_text(unknown) == (
+        "Unknown arguments for run_shell_command: cwd"
+    )
+    assert not ok["isError"]
+    assert ok["content"][0]["text"] == "hi\n"
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+# pylint:disable=redefined-outer-name, wrong-import-position, protected-access
+import asyncio
+import json
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+pytest.importorskip("IPython")
+# The sandbox routers package imports the dependencies of every router.
+for _module in ("git", "aiofiles"):
+    pytest.importorskip(_module)
+from agentscope_runtime.sandbox.box.shared.routers import (  # noqa: E402
+    generic_router,
+    kernel_utils,
+)
+
+KernelPool = kernel_utils.KernelPool
+KernelBusyError = kernel_utils.KernelBusyError
+collect_output = kernel_utils.collect_output
+
+
+@pytest.fixture
+async def pool():
+    kernels = KernelPool(max_kernels=2)
+    yield kernels
+    await kernels.shutdown()
+
+
+async def _run(pool, code, **kwargs):
+    return await collect_output(pool.execute(code, **kwargs))
+
+
+@pytest.mark.asyncio
+async def test_kernel_keeps_state_and_separates_output(pool):
+    result = await _run(pool, "x = 41\nprint('out')\nx + 1")
+    assert result["stdout"] == "out\nOut[1]: 42\n"
+    assert result["stderr"] == ""
+
+    result = await _run(pool, "import sys; print(x, file=sys.stderr)")
+    assert result["stdout"] == ""
+    assert result["stderr"] == "41\n"
+
+
+@pytest.mark.asyncio
+async def test_named_kernels_run_in_parallel(pool):
+    await asyncio.gather(pool.start("a"), pool.start("b"))
+    code = "import time; time.sleep(0.5); print(name)"
+    await _run(pool, "name = 'a'", name="a")
+    await _run(pool, "name = 'b'", name="b")
+
+    start = time.monotonic()
+    results = await asyncio.gather(
+        _run(pool, code, name="a"),
+        _run(pool, code, name="b"),
+    )
+    assert time.monotonic() - start < 0.9
+    assert [r["stdout"] for r in results] == ["a\n", "b\n"]
+
+
+@pytest.mark.asyncio
+async def test_cpu_bound_cell_does_not_block_event_loop(pool):
+    await pool.start()
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(ticker())
+    await _run(
+        pool,
+        "import time\nend = time.time() + 0.3\nwhile time.time() < end: pass",
+    )
+    task.cancel()
+    assert ticks > 10
+
+
+@pytest.mark.asyncio
+async def test_timeout_interrupts_and_keeps_state(pool):
+    await _run(pool, "y = 1")
+    result = await _run(pool, "import time; time.sleep(10)", timeout=0.3)
+    assert result["timed_out"]
+    assert not result["restarted"]
+    assert "KeyboardInterrupt" in result["stdout"]
+
+    assert (await _run(pool, "print(y)"))["stdout"] == "1\n"
+
+
+@pytest.mark.asyncio
+async def test_kernel_ignoring_interrupt_is_restarted(pool, monkeypatch):
+    monkeypatch.setattr(kernel_utils, "INTERRUPT_GRACE_PERIOD", 0.3)
+    await _run(pool, "y = 1")
+    result = await _run(
+        pool,
+        "import signal, time\n"
+        "signal.signal(signal.SIGINT, signal.SIG_IGN)\n"
+        "time.sleep(10)",
+        timeout=0.2,
+    )
+    assert result["timed_out"]
+    assert result["restarted"]
+    assert "NameError" in (await _run(pool, "y"))["stdout"]
+
+
+@pytest.mark.asyncio
+async def test_interrupt_running_cell(pool):
+    await pool.start()
+    assert not pool.interrupt()
+
+    task = asyncio.create_task(_run(pool, "import time; time.sleep(10)"))
+    await asyncio.sleep(0.3)
+    assert pool.interrupt()
+    result = await asyncio.wait_for(task, 5)
+    assert "KeyboardInterrupt" in result["stdout"]
+
+
+@pytest.mark.asyncio
+async def test_abandoned_cell_is_interrupted(pool):
+    events = pool.execute("print('start'); import time; time.sleep(10)")
+    assert (await events.__anext__())["text"] == "start"
+    await events.aclose()
+
+    result = await asyncio.wait_for(_run(pool, "print('next')"), 5)
+    assert result["stdout"] == "next\n"
+
+
+@pytest.mark.asyncio
+async def test_idle_kernels_are_evicted(pool):
+    await _run(pool, "v = 'a'", name="a")
+    await _run(pool, "v = 'b'", name="b")
+    await _run(pool, "v = 'c'", name="c")
+    assert [k["name"] for k in pool.kernels()] == ["b", "c"]
+
+    busy = [
+        asyncio.create_task(_run(pool, "import time; time.sleep(0.5)", name=n))
+        for n in ("b", "c")
+    ]
+    await asyncio.sleep(0.1)
+    with pytest.raises(KernelBusyError):
+        await _run(pool, "1", name="d")
+    await asyncio.gather(*busy)
+
+
+@pytest.mark.asyncio
+async def test_held_kernels_are_not_evicted(pool):
+    await _run(pool, "v = 'a'", name="a")
+    # Held by a request that has not taken the kernel's lock yet
+    held = await pool._get_or_create("a")
+    await _run(pool, "v = 'b'", name="b")
+    await _run(pool, "v = 'c'", name="c")
+    assert [k["name"] for k in pool.kernels()] == ["a", "c"]
+
+    try:
+        result = await collect_output(held.execute("print(v)"))
+    finally:
+        held.users -= 1
+    assert result["stdout"] == "a\n"
+    assert not result["restarted"]
+
+
+def test_ipython_endpoints():
+    app = FastAPI()
+    app.include_router(generic_router)
+    with TestClient(app) as client:
+        response = client.post(
+            "/tools/run_ipython_cell",
+            json={"code": "import time; time.sleep(5)", "timeout": 0.3},
+        )
+        content = {
+            c["description"]: c["text"] for c in response.json()["content"]
+        }
+        assert "timed out after 0.3 seconds" in content["stderr"]
+
+        with client.stream(
+            "POST",
+            "/tools/run_ipython_cell_stream",
+            json={"code": "print('a')", "kernel": "other"},
+        ) as response:
+            events = [json.loads(line) for line in response.iter_lines()]
+        assert events[0] == {"type": "stdout", "text": "a"}
+        assert events[-1] == {
+            "type": "exit",
+            "timed_out": False,
+            "restarted": False,
+        }
+
+        kernels = client.get("/tools/list_ipython_kernels").json()
+        assert {k["name"] for k in kernels} == {"default", "other"}
+        response = client.post(
+            "/tools/interrupt_ipython_kernel",
+            json={"kernel": "other"},
+        )
+        assert response.json() == {"interrupted": False}
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=redefined-outer-name, protected-access, unused-argument
+"""
+Unit tests for SandboxManager: the container pool with its background
+refill worker, and the per-container connection cache.
+"""
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from agentscope_runtime.sandbox.enums import SandboxType
+from agentscope_runtime.sandbox.manager.sandbox_manager import (
+    SandboxManager,
+)
+from agentscope_runtime.sandbox.model import SandboxManagerEnvConfig
+
+
+class FakeContainerClient:
+    """In-process stand-in for DockerClient."""
+
+    def __init__(self, config=None, create_delay: float = 0.0):
+        self.create_delay = create_delay
+        self.containers = {}
+        self.create_calls = 0
+        self._lock = threading.Lock()
+
+    def create(self, image, name=None, ports=None, **kwargs):
+        time.sleep(self.create_delay)
+        with self._lock:
+            self.create_calls += 1
+            port = 50000 + self.create_calls
+        self.containers[name] = "running"
+        return name, [port], "127.0.0.1"
+
+    def inspect(self, identity):
+        return {"name": identity} if identity in self.containers else None
+
+    def get_status(self, identity):
+        return self.containers.get(identity)
+
+    def stop(self, identity, timeout=None):
+        if identity in self.containers:
+            self.containers[identity] = "exited"
+
+    def remove(self, identity, force=False):
+        self.containers.pop(identity, None)
+
+
+def _wait_until(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+@pytest.fixture
+def make_manager(tmp_path):
+    managers = []
+
+    def _make(create_delay=0.0, **config_kwargs):
+        config = SandboxManagerEnvConfig(
+            file_system="local",
+            redis_enabled=False,
+            container_deployment="docker",
+            default_mount_dir=str(tmp_path / "mounts"),
+            pool_refill_interval=0.05,
+            **config_kwargs,
+        )
+        fake_client = FakeContainerClient(create_delay=create_delay)
+        with patch(
+            "agentscope_runtime.common.container_clients.docker_client."
+            "DockerClient",
+            return_value=fake_client,
+        ):
+            manager = SandboxManager(config=config)
+        managers.append(manager)
+        return manager, fake_client
+
+    yield _make
+
+    for manager in managers:
+        manager.cleanup()
+
+
+def test_watermark_defaults():
+    config = SandboxManagerEnvConfig(
+        file_system="local",
+        redis_enabled=False,
+        container_deployment="docker",
+        pool_size=4,
+        pool_watermarks={"browser": (1, 2)},
+    )
+    assert config.get_pool_watermarks("base") == (2, 4)
+    assert config.get_pool_watermarks("browser") == (1, 2)
+
+
+def test_invalid_watermarks():
+    with pytest.raises(ValueError):
+        SandboxManagerEnvConfig(
+            file_system="local",
+            redis_enabled=False,
+            container_deployment="docker",
+            pool_watermarks={"base": (3, 1)},
+        )
+
+
+def test_create_from_pool_does_not_create_synchronously(make_manager):
+    manager, fake_client = make_manager(pool_size=2)
+    queue = manager.pool_queues[SandboxType.BASE]
+    assert queue.size() == 2
+    assert fake_client.create_calls == 2
+
+    # Make container creation slow, acquisition must not wait for it
+    fake_client.create_delay = 0.5
+    start = time.time()
+    container_name = manager.create_from_pool()
+    assert time.time() - start < 0.4
+    assert fake_client.get_status(container_name) == "running"
+    assert queue.size() == 1
+
+
+def test_refill_worker_restores_high_watermark(make_manager):
+    manager, _ = make_manager(pool_low_watermark=1, pool_high_watermark=3)
+    queue = manager.pool_queues[SandboxType.BASE]
+    assert queue.size() == 3
+
+    # Above the low watermark, nothing is refilled
+    manager.create_from_pool()
+    time.sleep(0.2)
+    assert queue.size() == 2
+
+    manager.create_from_pool()
+    assert _wait_until(lambda: queue.size() == 3)
+
+
+def test_empty_pool_falls_back_to_create(make_manager):
+    manager, _ = make_manager(pool_size=0)
+    meta = {"session_ctx_id": "ctx"}
+    container_name = manager.create_from_pool(meta=meta)
+    assert container_name is not None
+    assert manager.get_session_mapping("ctx") == [container_name]
+    assert manager._refill_thread is None
+
+
+def test_cleanup_stops_refill_worker(make_manager):
+    manager, fake_client = make_manager(pool_size=2)
+    refill_thread = manager._refill_thread
+    assert refill_thread.is_alive()
+
+    manager.cleanup()
+    assert not refill_thread.is_alive()
+    assert manager.pool_queues[SandboxType.BASE].size() == 0
+    assert not fake_client.containers
+
+
+def test_cleanup_releases_container_created_after_join_timeout(
+    make_manager,
+):
+    manager, fake_client = make_manager(pool_size=1)
+    refill_thread = manager._refill_thread
+    creating = threading.Event()
+    create = fake_client.create
+
+    def slow_create(*args, **kwargs):
+        creating.set()
+        time.sleep(0.5)
+        return create(*args, **kwargs)
+
+    fake_client.create = slow_create
+    manager.create_from_pool()
+    assert creating.wait(5)
+
+    # Give up waiting for the refill like a slow image pull would
+    refill_thread.join = lambda timeout=None: threading.Thread.join(
+        refill_thread,
+        0.05,
+    )
+    manager.cleanup()
+    assert refill_thread.is_alive()
+
+    threading.Thread.join(refill_thread, 5)
+    assert manager.pool_queues[SandboxType.BASE].size() == 0
+    assert not fake_client.containers
+
+
+def test_connection_is_cached_until_health_ttl(make_manager):
+    manager, _ = make_manager(connection_health_ttl=60)
+    container_name = manager.create()
+
+    with patch(
+        "agentscope_runtime.sandbox.manager.sandbox_manager."
+        "SandboxHttpClient.wait_until_healthy",
+    ) as wait_until_healthy, patch(
+        "agentscope_runtime.sandbox.manager.sandbox_manager."
+        "SandboxHttpClient.call_tool",
+        return_value={"ok": True},
+    ):
+        first = manager._establish_connection(container_name)
+        for _ in range(3):
+            assert manager.call_tool(container_name, "browser_snapshot") == {
+                "ok": True,
+            }
+        assert manager._establish_connection(container_name) is first
+        assert wait_until_healthy.call_count == 1
+
+        # An expired health flag triggers exactly one more check
+        manager._connections[container_name][1] = 0.0
+        manager.call_tool(container_name, "browser_snapshot")
+        assert wait_until_healthy.call_count == 2
+
+
+def test_release_evicts_connection(make_manager):
+    manager, _ = make_manager()
+    container_name = manager.create()
+
+    with patch(
+        "agentscope_runtime.sandbox.manager.sandbox_manager."
+        "SandboxHttpClient.wait_until_healthy",
+    ):
+        client = manager._establish_connection(container_name)
+
+    with patch.object(client, "close") as close:
+        manager.release(container_name)
+        close.assert_called_once()
+    assert container_name not in manager._connections
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=wrong-import-position, redefined-outer-name
+import asyncio
+import json
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# The sandbox routers package imports the dependencies of every router.
+for _module in ("git", "aiofiles"):
+    pytest.importorskip(_module)
+from agentscope_runtime.sandbox.box.shared.routers import (  # noqa: E402
+    generic_router,
+    shell_utils,
+)
+
+execute_shell_command = shell_utils.execute_shell_command
+stream_shell_command = shell_utils.stream_shell_command
+
+
+@pytest.mark.asyncio
+async def test_execute_collects_output_and_returncode():
+    result = await execute_shell_command("echo out; echo err >&2; exit 3")
+    assert result["stdout"] == "out\n"
+    assert result["stderr"] == "err\n"
+    assert result["returncode"] == 3
+    assert not result["timed_out"]
+    assert result["truncated"] == []
+
+
+@pytest.mark.asyncio
+async def test_timeout_kills_process_group():
+    start = time.monotonic()
+    result = await execute_shell_command(
+        "sleep 10 & sleep 10; echo never",
+        timeout=0.2,
+    )
+    assert time.monotonic() - start < 5
+    assert result["timed_out"]
+    assert result["returncode"] < 0
+    assert result["stdout"] == ""
+
+
+@pytest.mark.asyncio
+async def test_output_is_capped():
+    result = await execute_shell_command(
+        "head -c 100000 /dev/zero | tr '\\0' a",
+        max_output_bytes=1000,
+    )
+    assert result["stdout"] == "a" * 1000
+    assert result["truncated"] == ["stdout"]
+    assert result["returncode"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_output_before_exit():
+    stream = stream_shell_command("echo first; sleep 0.5; echo second")
+    start = time.monotonic()
+    event = await stream.__anext__()
+    assert event == {"type": "stdout", "text": "first\n"}
+    assert time.monotonic() - start < 0.4
+    events = [event async for event in stream]
+    assert events[0] == {"type": "stdout", "text": "second\n"}
+    assert events[-1]["type"] == "exit"
+
+
+@pytest.mark.asyncio
+async def test_closing_stream_kills_command(tmp_path):
+    marker = tmp_path / "marker"
+    stream = stream_shell_command(f"echo go; sleep 1; touch {marker}")
+    await stream.__anext__()
+    await stream.aclose()
+    await asyncio.sleep(1.5)
+    assert not marker.exists()
+
+
+@pytest.mark.asyncio
+async def test_command_does_not_block_event_loop():
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(ticker())
+    await execute_shell_command("sleep 0.3")
+    task.cancel()
+    assert ticks > 10
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(generic_router)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_run_shell_command_endpoint_reports_timeout(client):
+    response = client.post(
+        "/tools/run_shell_command",
+        json={"command": "echo hi; sleep 5", "timeout": 0.2},
+    )
+    assert response.status_code == 200
+    content = {c["description"]: c["text"] for c in response.json()["content"]}
+    assert content["stdout"] == "hi\n"
+    assert "timed out after 0.2 seconds" in content["stderr"]
+    assert response.json()["isError"]
+
+
+def test_run_shell_command_stream_endpoint(client):
+    with client.stream(
+        "POST",
+        "/tools/run_shell_command_stream",
+        json={"command": "echo a; echo b >&2; exit 1"},
+    ) as response:
+        assert response.status_code == 200
+        events = [json.loads(line) for line in response.iter_lines() if line]
+    assert {"type": "stdout", "text": "a\n"} in events
+    assert {"type": "stderr", "text": "b\n"} in events
+    assert events[-1] == {
+        "type": "exit",
+        "returncode": 1,
+        "timed_out": False,
+        "truncated": [],
+    }
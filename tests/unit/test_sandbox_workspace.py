@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+# pylint:disable=redefined-outer-name, wrong-import-position, protected-access
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# The sandbox routers package imports the dependencies of every router.
+for _module in ("git", "aiofiles"):
+    pytest.importorskip(_module)
+from agentscope_runtime.sandbox.box.shared.routers import (  # noqa: E402
+    workspace,
+    workspace_router,
+    workspace_utils,
+)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for path in (
+        "a/b/one.py",
+        "a/b/two.txt",
+        "a/three.py",
+        "node_modules/pkg/index.js",
+        "z.py",
+    ):
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(path)
+    return tmp_path
+
+
+def _paths(items):
+    return [item["path"] for item in items]
+
+
+def test_pages_cover_tree_in_stable_order(tree):
+    expected = sorted(
+        os.path.relpath(os.path.join(root, name), tree)
+        for root, dirs, files in os.walk(tree)
+        for name in dirs + files
+    )
+    items, cursor = workspace_utils.list_page(str(tree), limit=100)
+    assert cursor is None
+    assert _paths(items) == expected
+
+    paged = []
+    cursor = None
+    while True:
+        items, cursor = workspace_utils.list_page(
+            str(tree),
+            cursor=cursor,
+            limit=3,
+        )
+        paged += items
+        if cursor is None:
+            break
+    assert _paths(paged) == expected
+
+
+def test_depth_globs_and_stats(tree):
+    items, _ = workspace_utils.list_page(str(tree), max_depth=1)
+    assert _paths(items) == ["a", "node_modules", "z.py"]
+
+    items, _ = workspace_utils.list_page(
+        str(tree),
+        include=["*.py"],
+        exclude=["node_modules"],
+        with_stats=True,
+    )
+    assert _paths(items) == ["a/b/one.py", "a/three.py", "z.py"]
+    assert items[-1]["size"] == len("z.py")
+    assert items[-1]["mtime"] == os.stat(tree / "z.py").st_mtime
+
+
+@pytest.mark.asyncio
+async def test_change_journal(tree):
+    journal = workspace_utils.ChangeJournal(str(tree), min_interval=0)
+    first = await journal.changes_since()
+    assert first["changes"] == [] and not first["reset"]
+
+    (tree / "a/three.py").write_text("changed content")
+    (tree / "z.py").unlink()
+    (tree / "new").mkdir()
+    result = await journal.changes_since(first["token"])
+    assert result["changes"] == [
+        {"type": "deleted", "path": "z.py", "kind": "file"},
+        {"type": "modified", "path": "a/three.py", "kind": "file"},
+        {"type": "created", "path": "new", "kind": "directory"},
+    ]
+
+    again = await journal.changes_since(result["token"])
+    assert again["changes"] == [] and not again["reset"]
+    assert (await journal.changes_since("stale-1"))["reset"]
+
+
+@pytest.mark.asyncio
+async def test_change_journal_resets_after_dropping_changes(tree):
+    journal = workspace_utils.ChangeJournal(
+        str(tree),
+        max_changes=1,
+        min_interval=0,
+    )
+    token = (await journal.changes_since())["token"]
+    (tree / "x").write_text("x")
+    (tree / "y").write_text("y")
+    assert (await journal.changes_since(token))["reset"]
+
+
+def test_list_directories_endpoint(tree, monkeypatch):
+    monkeypatch.setattr(
+        workspace,
+        "ensure_within_workspace",
+        lambda path: str(tree),
+    )
+    monkeypatch.setattr(workspace, "DEFAULT_LIST_LIMIT", 2)
+    app = FastAPI()
+    app.include_router(workspace_router)
+    with TestClient(app) as client:
+        body = client.get(
+            "/workspace/list-directories",
+            params={"limit": 2, "exclude": ["node_modules"]},
+        ).json()
+        assert _paths(body["items"]) == ["a", "a/b"]
+        # Tree totals are unknown from a partial listing
+        assert body["statistics"] == {
+            "total_directories": None,
+            "total_files": None,
+            "page_directories": 2,
+            "page_files": 0,
+        }
+
+        # A cursor without limit continues with pages of the default size
+        body = client.get(
+            "/workspace/list-directories",
+            params={"cursor": body["next_cursor"], "exclude": "node_modules"},
+        ).json()
+        assert _paths(body["items"]) == ["a/b/one.py", "a/b/two.txt"]
+        body = client.get(
+            "/workspace/list-directories",
+            params={
+                "cursor": body["next_cursor"],
+                "limit": 10,
+                "exclude": "node_modules",
+            },
+        ).json()
+        assert _paths(body["items"]) == ["a/three.py", "z.py"]
+        assert body["next_cursor"] is None
+
+        # Without limit and cursor, the whole listing is returned
+        body = client.get(
+            "/workspace/list-directories",
+            params={"exclude": "node_modules"},
+        ).json()
+        assert len(body["items"]) == 6
+        assert body["next_cursor"] is None
+        assert body["statistics"]["total_directories"] == 2
+        assert body["statistics"]["total_files"] == 4
+
+        response = client.get(
+            "/workspace/list-directories",
+            params={"cursor": "not base64!"},
+        )
+        assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_change_journal_skips_dependency_directories(tree):
+    journal = workspace_utils.ChangeJournal(str(tree), min_interval=0)
+    token = (await journal.changes_since())["token"]
+    assert not any("node_modules" in path for path in journal._snapshot)
+
+    (tree / "node_modules/pkg/index.js").write_text("changed content")
+    (tree / "a/b/one.py").write_text("changed content")
+    result = await journal.changes_since(token)
+    assert _paths(result["changes"]) == ["a/b/one.py"]
+
+
+def test_changes_endpoint_filters(tree, monkeypatch):
+    monkeypatch.setattr(
+        workspace,
+        "ensure_within_workspace",
+        lambda path: str(tree / path),
+    )
+    monkeypatch.setattr(workspace, "_JOURNALS", type(workspace._JOURNALS)())
+    app = FastAPI()
+    app.include_router(workspace_router)
+    with TestClient(app) as client:
+        shallow = client.get(
+            "/workspace/changes",
+            params={"directory": "a", "max_depth": 1},
+        ).json()
+        deep = client.get(
+            "/workspace/changes",
+            params={"directory": "a", "exclude": ["*.txt"]},
+        ).json()
+        journals = list(workspace._JOURNALS.values())
+        assert [j.max_depth for j in journals] == [1, None]
+        assert journals[1].exclude == ("*.txt",)
+
+        (tree / "a/b/one.py").write_text("changed content")
+        (tree / "a/b/two.txt").write_text("changed content")
+        (tree / "a/new.py").write_text("new")
+        for journal in journals:
+            journal._polled_at = 0
+
+        body = client.get(
+            "/workspace/changes",
+            params={
+                "directory": "a",
+                "max_depth": 1,
+                "since": shallow["token"],
+            },
+        ).json()
+        assert _paths(body["changes"]) == ["new.py"]
+
+        body = client.get(
+            "/workspace/changes",
+            params={
+                "directory": "a",
+                "exclude": ["*.txt"],
+                "since": deep["token"],
+            },
+        ).json()
+        assert _paths(body["changes"]) == ["b/one.py", "new.py"]
+
+        # Tokens of another journal are not valid here
+        body = client.get(
+            "/workspace/changes",
+            params={"directory": "a", "since": deep["token"]},
+        ).json()
+        assert body["reset"]
@@ -290,3 +290,48 @@ async def test_append_message(
     )  # Empty as it's a newly created session
 
     await session_history_service.stop()
+
+
+@pytest.mark.asyncio
+async def test_message_range_primitives(
+    session_history_service: InMemorySessionHistoryService,
+    user_id: str,
+) -> None:
+    """Tests counting, range reads and deletion by index."""
+    await session_history_service.start()
+    session = await session_history_service.create_session(user_id)
+    await session_history_service.append_message(
+        session,
+        [
+            {"role": "user", "content": [TextContent(text=f"message {i}")]}
+            for i in range(5)
+        ],
+    )
+
+    count = session_history_service.count_messages
+    assert await count(user_id, session.id) == 5
+    assert await count(user_id, "missing") == 0
+
+    recent = await session_history_service.get_messages(
+        user_id,
+        session.id,
+        start=-2,
+    )
+    assert [m.content[0].text for m in recent] == ["message 3", "message 4"]
+
+    await session_history_service.delete_messages(user_id, session.id, [0, 3])
+    remaining = await session_history_service.get_messages(user_id, session.id)
+    assert [m.content[0].text for m in remaining] == [
+        "message 1",
+        "message 2",
+        "message 4",
+    ]
+
+    with pytest.raises(IndexError):
+        await session_history_service.delete_messages(
+            user_id,
+            session.id,
+            [3],
+        )
+
+    await session_history_service.stop()
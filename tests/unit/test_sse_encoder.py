@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+# pylint:disable=protected-access, unused-argument
+"""
+Unit tests and a benchmark for the SSE encoding of the agent endpoint.
+
+Run this module directly to compare events/sec on one core against
+``model_dump_json()``::
+
+    python tests/unit/test_sse_encoder.py
+"""
+import asyncio
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from agentscope_runtime.engine.deployers.utils.service_utils import (
+    FastAPIAppFactory,
+)
+from agentscope_runtime.engine.deployers.utils.service_utils.sse import (
+    SSEEventEncoder,
+    coalesce_sse_frames,
+)
+from agentscope_runtime.engine.schemas.agent_schemas import (
+    AgentResponse,
+    Message,
+    Role,
+    TextContent,
+)
+
+
+def _token_events(n_tokens):
+    message = Message(role=Role.ASSISTANT)
+    events = [AgentResponse(), message.in_progress()]
+    for i in range(n_tokens):
+        events.append(
+            TextContent(
+                text=f"token{i} ",
+                delta=True,
+                msg_id=message.id,
+                index=0,
+            ),
+        )
+    events.append(message.completed())
+    return events
+
+
+def _payloads(body):
+    return [
+        json.loads(frame[len("data: ") :])
+        for frame in body.split("\n\n")
+        if frame
+    ]
+
+
+def test_encoder_matches_model_dump_json():
+    encoder = SSEEventEncoder()
+    message = Message(
+        role=Role.ASSISTANT,
+        content=[TextContent(text="héllo")],
+    )
+    frame = encoder.encode(message)
+    assert frame == f"data: {message.model_dump_json()}\n\n".encode()
+    # Serializers are resolved once per class.
+    encoder.encode(Message(role=Role.USER))
+    assert list(encoder._serializers) == [Message]
+
+
+def test_encoder_skips_none_fields_on_delta_events():
+    encoder = SSEEventEncoder()
+    delta = TextContent(text="hi", delta=True, msg_id="msg_1")
+    assert json.loads(encoder.to_json(delta)) == {
+        "object": "content",
+        "type": "text",
+        "delta": True,
+        "msg_id": "msg_1",
+        "text": "hi",
+    }
+
+    full = TextContent(text="hi", msg_id="msg_1")
+    assert encoder.to_json(full) == full.model_dump_json().encode()
+
+    keep = SSEEventEncoder(skip_none_on_delta=False)
+    assert keep.to_json(delta) == delta.model_dump_json().encode()
+
+
+def test_encoder_plain_values():
+    encoder = SSEEventEncoder()
+    assert encoder.encode({"error": "x"}) == b'data: {"error": "x"}\n\n'
+    assert encoder.encode(3) == b'data: {"text": "3"}\n\n'
+
+
+async def _frames(items, delay=0.0):
+    for item in items:
+        if delay:
+            await asyncio.sleep(delay)
+        yield item
+
+
+@pytest.mark.asyncio
+async def test_coalesce_merges_frames_behind_slow_client():
+    frames = [f"data: {i}\n\n".encode() for i in range(50)]
+    writes = []
+    async for chunk in coalesce_sse_frames(_frames(frames)):
+        writes.append(chunk)
+        # A slow client lets the producer run ahead.
+        await asyncio.sleep(0.01)
+
+    assert b"".join(writes) == b"".join(frames)
+    assert len(writes) < len(frames)
+
+
+@pytest.mark.asyncio
+async def test_coalesce_keeps_fast_client_per_event():
+    frames = [f"data: {i}\n\n".encode() for i in range(5)]
+    writes = [
+        chunk
+        async for chunk in coalesce_sse_frames(_frames(frames, delay=0.01))
+    ]
+    assert writes == frames
+
+
+@pytest.mark.asyncio
+async def test_coalesce_flush_interval_and_max_bytes():
+    frames = [b"x" * 10 for _ in range(10)]
+    writes = [
+        chunk
+        async for chunk in coalesce_sse_frames(
+            _frames(frames),
+            flush_interval=0.05,
+            max_bytes=30,
+        )
+    ]
+    assert b"".join(writes) == b"".join(frames)
+    assert [len(chunk) for chunk in writes] == [30, 30, 30, 10]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_propagates_errors_and_cancels_source():
+    async def failing():
+        yield b"data: 1\n\n"
+        raise ValueError("boom")
+
+    seen = []
+    with pytest.raises(ValueError):
+        async for chunk in coalesce_sse_frames(failing()):
+            seen.append(chunk)
+    assert seen == [b"data: 1\n\n"]
+
+    closed = asyncio.Event()
+
+    async def endless():
+        try:
+            while True:
+                yield b"data: x\n\n"
+                await asyncio.sleep(0)
+        finally:
+            closed.set()
+
+    stream = coalesce_sse_frames(endless())
+    await stream.__anext__()
+    await stream.aclose()
+    assert closed.is_set()
+
+
+class _FakeRunner:
+    def __init__(self, events):
+        self.events = events
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+    async def stream_query(self, request):
+        for event in self.events:
+            yield event
+
+
+@pytest.mark.parametrize("flush_interval", [None, 0.0, 0.01])
+def test_agent_endpoint_streams_encoded_events(flush_interval):
+    events = _token_events(20)
+    app = FastAPIAppFactory.create_app(
+        runner=_FakeRunner(events),
+        sse_flush_interval=flush_interval,
+    )
+    with TestClient(app) as client:
+        response = client.post("/process", json={"input": []})
+
+    assert response.status_code == 200
+    payloads = _payloads(response.text)
+    assert len(payloads) == len(events)
+    assert payloads[0]["object"] == "response"
+    assert "".join(p["text"] for p in payloads[2:-1]) == "".join(
+        f"token{i} " for i in range(20)
+    )
+    assert "sequence_number" not in payloads[2]
+    assert payloads[-1]["status"] == "completed"
+
+
+def _benchmark(n_events):
+    events = _token_events(n_events)
+    encoder = SSEEventEncoder()
+
+    start = time.perf_counter()
+    for event in events:
+        f"data: {event.model_dump_json()}\n\n".encode()
+    baseline = len(events) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    size = sum(len(encoder.encode(event)) for event in events)
+    optimized = len(events) / (time.perf_counter() - start)
+    return baseline, optimized, size
+
+
+def test_benchmark_smoke():
+    baseline, optimized, size = _benchmark(1000)
+    assert baseline > 0 and optimized > 0 and size > 0
+
+
+if __name__ == "__main__":
+    for count in (10_000, 100_000):
+        before, after, total = _benchmark(count)
+        print(
+            f"{count:>7} events: model_dump_json {before:>10,.0f} ev/s, "
+            f"SSEEventEncoder {after:>10,.0f} ev/s "
+            f"({after / before:.2f}x, {total / count:.0f} bytes/event)",
+        )
@@ -7,6 +7,7 @@ import pytest_asyncio
 from tablestore_for_agent_memory.base.base_memory_store import (
     Session as TablestoreSession,
 )
+from tablestore_for_agent_memory.base.common import Order
 
 from agentscope_runtime.engine.schemas.agent_schemas import (
     ContentType,
@@ -310,3 +311,116 @@ async def test_append_message(
         non_existent_session,
         message_dict,
     )
+
+
+def _mock_list_messages(mock_memory_store, tablestore_messages):
+    """Make list_messages honour ``order`` and ``max_count``."""
+
+    async def list_messages(session_id, order=Order.ASC, max_count=None):
+        ordered = list(tablestore_messages)
+        if order == Order.DESC:
+            ordered.reverse()
+        iterator = AsyncMock()
+        iterator.__aiter__.return_value = iter(ordered[:max_count])
+        return iterator
+
+    mock_memory_store.list_messages = AsyncMock(side_effect=list_messages)
+
+
+def _tablestore_messages(user_id, session_id, texts):
+    session = Session(id=session_id, user_id=user_id)
+    return [
+        convert_message_to_tablestore_message(
+            create_message("user", text),
+            session,
+        )
+        for text in texts
+    ]
+
+
+def _texts(messages):
+    return [message.content[0].text for message in messages]
+
+
+@pytest.mark.asyncio
+async def test_message_ranges(
+    tablestore_session_history_service: TablestoreSessionHistoryService,
+    user_id: str,
+    mock_memory_store,
+) -> None:
+    """Tests counting and reading message ranges."""
+    session_id = "test_session_id"
+    texts = ["m0", "m1", "m2", "m3", "m4"]
+    _mock_list_messages(
+        mock_memory_store,
+        _tablestore_messages(user_id, session_id, texts),
+    )
+    service = tablestore_session_history_service
+
+    assert await service.count_messages(user_id, session_id) == 5
+
+    # A negative start reads only the most recent messages, newest first
+    mock_memory_store.list_messages.reset_mock()
+    last = await service.get_messages(user_id, session_id, start=-2)
+    assert _texts(last) == ["m3", "m4"]
+    mock_memory_store.list_messages.assert_called_once_with(
+        session_id=session_id,
+        order=Order.DESC,
+        max_count=2,
+    )
+
+    # A non-negative range stops reading at ``stop``
+    mock_memory_store.list_messages.reset_mock()
+    middle = await service.get_messages(user_id, session_id, 1, 3)
+    assert _texts(middle) == ["m1", "m2"]
+    mock_memory_store.list_messages.assert_called_once_with(
+        session_id=session_id,
+        order=Order.ASC,
+        max_count=3,
+    )
+
+    # Other ranges read the whole history
+    assert _texts(
+        await service.get_messages(user_id, session_id, -3, -1),
+    ) == ["m2", "m3"]
+    assert await service.get_messages(user_id, session_id, 3, 3) == []
+
+
+@pytest.mark.asyncio
+async def test_delete_messages(
+    tablestore_session_history_service: TablestoreSessionHistoryService,
+    user_id: str,
+    mock_memory_store,
+) -> None:
+    """Tests deleting messages by index."""
+    session_id = "test_session_id"
+    tablestore_messages = _tablestore_messages(
+        user_id,
+        session_id,
+        ["m0", "m1", "m2"],
+    )
+    _mock_list_messages(mock_memory_store, tablestore_messages)
+    mock_memory_store.delete_message = AsyncMock()
+
+    await tablestore_session_history_service.delete_messages(
+        user_id,
+        session_id,
+        [2, 0, 2],
+    )
+
+    deleted = {
+        call.kwargs["message_id"]
+        for call in mock_memory_store.delete_message.call_args_list
+    }
+    assert mock_memory_store.delete_message.call_count == 2
+    assert deleted == {
+        tablestore_messages[0].message_id,
+        tablestore_messages[2].message_id,
+    }
+
+    with pytest.raises(IndexError):
+        await tablestore_session_history_service.delete_messages(
+            user_id,
+            session_id,
+            [3],
+        )
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+# pylint:disable=protected-access, unused-argument
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from agentscope_runtime.engine.deployers.utils.service_utils import (
+    BackgroundTaskRegistry,
+    FastAPIAppFactory,
+    TaskQueueFullError,
+)
+
+
+async def _wait_finished(registry, task_id, timeout=5.0):
+    for _ in range(int(timeout / 0.01)):
+        info = registry.get(task_id)
+        if info is not None and info["status"] in ("completed", "failed"):
+            return info
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"task {task_id} did not finish")
+
+
+@pytest.mark.asyncio
+async def test_submit_async_and_sync_tasks():
+    registry = BackgroundTaskRegistry()
+
+    async def async_func(request):
+        return request["value"] * 2
+
+    def sync_func(request):
+        return threading.current_thread().name
+
+    registry.submit("a", async_func, {"value": 21})
+    registry.submit("s", sync_func, {})
+
+    info = await _wait_finished(registry, "a")
+    assert info["status"] == "completed"
+    assert info["result"] == 42
+    assert "request" not in info
+
+    info = await _wait_finished(registry, "s")
+    assert info["result"].startswith("agentscope-task")
+    executor = registry._executor
+    registry.submit("s2", sync_func, {})
+    await _wait_finished(registry, "s2")
+    assert registry._executor is executor
+
+    await registry.shutdown()
+    assert registry._executor is None
+
+
+@pytest.mark.asyncio
+async def test_failed_task_records_error():
+    registry = BackgroundTaskRegistry()
+
+    async def boom(request):
+        raise ValueError("broken")
+
+    registry.submit("t", boom, {})
+    info = await _wait_finished(registry, "t")
+    assert info["status"] == "failed"
+    assert info["error"] == "broken"
+    assert registry.metrics()["queues"]["default"]["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_queue_concurrency_and_backpressure():
+    registry = BackgroundTaskRegistry(
+        queue_concurrency=1,
+        max_pending=2,
+        queue_limits={"wide": 2},
+    )
+    release = asyncio.Event()
+    active = 0
+    peak = 0
+
+    async def blocking(request):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await release.wait()
+        active -= 1
+
+    registry.submit("1", blocking, {})
+    registry.submit("2", blocking, {})
+    with pytest.raises(TaskQueueFullError):
+        registry.submit("3", blocking, {})
+    # Other queues have their own limits.
+    registry.submit("4", blocking, {}, queue="wide")
+    registry.submit("5", blocking, {}, queue="wide")
+    await asyncio.sleep(0.05)
+
+    metrics = registry.metrics()["queues"]
+    assert metrics["default"]["running"] == 1
+    assert metrics["default"]["waiting"] == 1
+    assert metrics["default"]["rejected"] == 1
+    assert metrics["wide"]["running"] == 2
+    assert "3" not in registry
+
+    release.set()
+    for task_id in ("1", "2", "4", "5"):
+        await _wait_finished(registry, task_id)
+    assert peak == 3
+    metrics = registry.metrics()["queues"]["default"]
+    assert metrics["completed"] == 2
+    assert metrics["waiting"] == metrics["running"] == 0
+    assert metrics["max_wait_seconds"] > 0
+
+
+@pytest.mark.asyncio
+async def test_finished_tasks_evicted_by_size_and_ttl():
+    registry = BackgroundTaskRegistry(max_tasks=2, ttl_seconds=0.2)
+
+    async def echo(request):
+        return request
+
+    for task_id in ("1", "2", "3"):
+        registry.submit(task_id, echo, task_id)
+        await _wait_finished(registry, task_id)
+
+    assert len(registry) == 2
+    assert registry.get("1") is None
+    assert registry.get("3")["result"] == "3"
+
+    await asyncio.sleep(0.3)
+    assert registry.get("3") is None
+    assert len(registry) == 0
+
+
+@pytest.mark.asyncio
+async def test_unfinished_tasks_are_not_evicted():
+    registry = BackgroundTaskRegistry(max_tasks=1)
+    release = asyncio.Event()
+
+    async def blocking(request):
+        await release.wait()
+
+    registry.submit("1", blocking, {})
+    registry.submit("2", blocking, {})
+    assert len(registry) == 2
+
+    release.set()
+    await _wait_finished(registry, "2")
+    assert len(registry) == 1
+
+
+def test_task_endpoint_returns_429_when_queue_full():
+    registry = BackgroundTaskRegistry(queue_concurrency=1, max_pending=1)
+    app = FastAPIAppFactory.create_app(task_registry=registry)
+    release = threading.Event()
+
+    def slow(request):
+        release.wait(5)
+        return "done"
+
+    FastAPIAppFactory._register_single_custom_endpoint(
+        app,
+        "/jobs",
+        slow,
+        ["POST"],
+        {"task_type": True, "queue": "jobs"},
+    )
+
+    with TestClient(app) as client:
+        first = client.post("/jobs", json={})
+        assert first.status_code == 200
+        task_id = first.json()["task_id"]
+
+        second = client.post("/jobs", json={})
+        assert second.status_code == 429
+        assert second.json()["status"] == "rejected"
+
+        assert client.get(f"/jobs/{task_id}").json()["status"] == "pending"
+        metrics = client.get("/metrics/tasks").json()
+        assert metrics["queues"]["jobs"]["rejected"] == 1
+
+        release.set()
+        for _ in range(500):
+            status = client.get(f"/jobs/{task_id}").json()
+            if status["status"] != "pending":
+                break
+            threading.Event().wait(0.01)
+        assert status == {"status": "finished", "result": "done"}
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=protected-access, redefined-outer-name
+"""
+Unit tests for payload recording in the ``@trace`` decorator.
+"""
+import pytest
+
+from agentscope_runtime.engine.tracing import trace, wrapper
+
+
+class _Arg:
+    def __init__(self):
+        self.serialized = 0
+
+    def __str__(self):
+        self.serialized += 1
+        return "arg"
+
+
+@pytest.fixture
+def exporting(monkeypatch):
+    def _set(enabled):
+        monkeypatch.setattr(wrapper, "_otel_exporting", enabled)
+        monkeypatch.setattr(wrapper._tracer, "handlers", [])
+
+    return _set
+
+
+def test_get_start_payload_maps_positional_args():
+    class Agent:
+        def run(self, query, *extra, user=None, **kwargs):
+            pass
+
+    names = wrapper._get_param_names(Agent.run)
+    assert names == ["self", "query", None, None, None]
+
+    payload = wrapper._get_start_payload(
+        (Agent(), "hi", "more"),
+        {"user": "u", "trace_event": object()},
+        param_names=names,
+    )
+    assert payload == {"query": "hi", "user": "u"}
+    assert wrapper._get_start_payload(
+        (Agent(), "hi"),
+        {},
+        Agent.run,
+    ) == {"query": "hi"}
+
+
+def test_payloads_skipped_without_exporter(exporting):
+    exporting(False)
+    arg = _Arg()
+
+    @trace(trace_name="call")
+    def call(value):
+        return value
+
+    @trace(trace_name="stream")
+    def stream(value):
+        yield value
+        yield value
+
+    assert call(arg) is arg
+    assert list(stream(arg)) == [arg, arg]
+    assert arg.serialized == 0
+
+    exporting(True)
+    call(arg)
+    # Once for the start payload, once for the output
+    assert arg.serialized == 2
+
+
+def test_payload_attributes_are_capped(monkeypatch):
+    monkeypatch.setattr(wrapper, "_max_payload_length", 8)
+    _, value = wrapper._get_ot_type_and_value({"text": "x" * 20})
+    assert value.startswith('{"text":')
+    assert value.endswith("chars truncated]")
+
+    _, value = wrapper._get_ot_type_and_value("short")
+    assert value == "short"
+    _, value = wrapper._get_ot_type_and_value(12345678901)
+    assert value == 12345678901
+
+    monkeypatch.setattr(wrapper, "_max_payload_length", 0)
+    _, value = wrapper._get_ot_type_and_value("x" * 20)
+    assert value == "x" * 20
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the streaming mergers used by the ``@trace`` decorator.
+"""
+import asyncio
+from copy import deepcopy
+
+import pytest
+from openai.types.chat import ChatCompletionChunk
+from openai.types.completion_usage import CompletionUsage
+
+from agentscope_runtime.engine.schemas.agent_schemas import (
+    AgentResponse,
+    Message,
+    MessageType,
+    Role,
+    RunStatus,
+    TextContent,
+)
+from agentscope_runtime.engine.tracing import trace, wrapper
+from agentscope_runtime.engine.tracing.message_util import (
+    AgentResponseMerger,
+    IncrementalChunkMerger,
+    ListMerger,
+    get_stream_merger,
+    merge_agent_response,
+    merge_incremental_chunk,
+)
+
+
+def _chunk(delta=None, finish_reason=None, usage=None, no_choices=False):
+    choices = []
+    if not no_choices:
+        choices = [
+            {
+                "index": 0,
+                "delta": delta or {},
+                "finish_reason": finish_reason,
+            },
+        ]
+    return ChatCompletionChunk(
+        id="chunk",
+        object="chat.completion.chunk",
+        created=0,
+        model="model",
+        choices=choices,
+        usage=usage,
+    )
+
+
+def _tool_call(index, arguments, call_id=None, name=None):
+    return {
+        "index": index,
+        "id": call_id,
+        "type": "function" if call_id else None,
+        "function": {"name": name, "arguments": arguments},
+    }
+
+
+def _fold(merger, chunks):
+    for chunk in chunks:
+        merger.add(chunk)
+    return merger.result()
+
+
+def _text_stream():
+    return [
+        _chunk({"role": "assistant", "content": ""}),
+        _chunk({"content": "Hello"}),
+        _chunk({"content": ", world"}),
+        _chunk({}, finish_reason="stop"),
+        _chunk(
+            no_choices=True,
+            usage=CompletionUsage(
+                prompt_tokens=3,
+                completion_tokens=2,
+                total_tokens=5,
+            ),
+        ),
+    ]
+
+
+def _tool_stream():
+    return [
+        _chunk(
+            {
+                "role": "assistant",
+                "tool_calls": [
+                    _tool_call(0, "", call_id="call_1", name="search"),
+                ],
+            },
+        ),
+        _chunk({"tool_calls": [_tool_call(0, '{"q": ')]}),
+        _chunk({"tool_calls": [_tool_call(0, '"x"}')]}),
+        _chunk(
+            {"tool_calls": [_tool_call(1, "{}", call_id="call_2", name="f")]},
+        ),
+        _chunk({}, finish_reason="tool_calls"),
+    ]
+
+
+def test_incremental_chunk_merger_matches_list_merge():
+    chunks = _text_stream()
+    before = [chunk.model_dump() for chunk in chunks]
+
+    merged = _fold(IncrementalChunkMerger(), chunks)
+    expected = merge_incremental_chunk(deepcopy(chunks))
+
+    assert merged.model_dump() == expected.model_dump()
+    assert merged.choices[0].delta.content == "Hello, world"
+    assert merged.usage.total_tokens == 5
+    # The chunks already yielded to the caller are left untouched
+    assert [chunk.model_dump() for chunk in chunks] == before
+
+
+def test_incremental_chunk_merger_tool_calls():
+    chunks = _tool_stream()
+    before = [chunk.model_dump() for chunk in chunks]
+
+    merged = _fold(IncrementalChunkMerger(), chunks)
+
+    assert merged.choices[0].finish_reason == "tool_calls"
+    assert [
+        (call.index, call.id, call.function.name, call.function.arguments)
+        for call in merged.choices[0].delta.tool_calls
+    ] == [
+        (0, "call_1", "search", '{"q": "x"}'),
+        (1, "call_2", "f", "{}"),
+    ]
+    assert [chunk.model_dump() for chunk in chunks] == before
+
+
+def test_incremental_chunk_merger_ignores_other_objects():
+    assert _fold(IncrementalChunkMerger(), ["a", "b"]) is None
+    assert IncrementalChunkMerger().result() is None
+
+
+def _response(status, texts=(), delta=True):
+    output = []
+    if texts:
+        output = [
+            Message(
+                id="msg_1",
+                type=MessageType.MESSAGE,
+                role=Role.ASSISTANT,
+                content=[
+                    TextContent(text=text, delta=delta, msg_id="msg_1")
+                    for text in texts
+                ],
+            ),
+        ]
+    return AgentResponse(id="resp_1", status=status, output=output)
+
+
+def test_agent_response_merger_matches_list_merge():
+    chunks = [
+        _response(RunStatus.Created),
+        _response(RunStatus.InProgress, ["Hel"]),
+        _response(RunStatus.InProgress, ["lo"]),
+        _response(RunStatus.Completed, ["Hello"], delta=False),
+        _response(RunStatus.Completed, ["!"]),
+    ]
+    before = [chunk.model_dump() for chunk in chunks]
+
+    merged = _fold(AgentResponseMerger(), chunks)
+    expected = merge_agent_response(deepcopy(chunks))
+
+    assert merged.model_dump() == expected.model_dump()
+    assert merged.output[0].content[0].text == "Hello!"
+    assert [chunk.model_dump() for chunk in chunks] == before
+
+
+def test_agent_response_merger_content_and_mixed_streams():
+    contents = [
+        TextContent(text="a", delta=True, msg_id="m"),
+        TextContent(text="b", delta=True, msg_id="m"),
+    ]
+    merged = _fold(AgentResponseMerger(), contents)
+    expected = merge_agent_response(deepcopy(contents))
+    assert merged.output[0].content[0].text == "ab"
+    assert (
+        merged.output[0].content[0].text == expected.output[0].content[0].text
+    )
+
+    mixed = contents + [_response(RunStatus.Completed, ["ab"], delta=False)]
+    merged = _fold(AgentResponseMerger(), mixed)
+    expected = merge_agent_response(deepcopy(mixed))
+    assert merged.model_dump() == expected.model_dump()
+
+    with pytest.raises(ValueError):
+        AgentResponseMerger().result()
+
+
+def test_get_stream_merger():
+    assert isinstance(
+        get_stream_merger(merge_incremental_chunk),
+        IncrementalChunkMerger,
+    )
+    assert isinstance(
+        get_stream_merger(merge_agent_response),
+        AgentResponseMerger,
+    )
+    assert isinstance(
+        get_stream_merger(AgentResponseMerger),
+        AgentResponseMerger,
+    )
+
+    merger = get_stream_merger(lambda chunks: chunks.append(0) or chunks)
+    assert isinstance(merger, ListMerger)
+    chunks = [1, 2]
+    assert _fold(merger, chunks) == [1, 2, 0]
+    assert chunks == [1, 2]
+
+
+def test_trace_streams_through_merger(monkeypatch):
+    monkeypatch.setattr(wrapper, "_otel_exporting", True)
+    merged = []
+
+    def merge(chunks):
+        merged.append(list(chunks))
+        return "".join(chunks)
+
+    @trace(trace_name="stream", merge_output_func=merge)
+    def stream():
+        yield from ["a", "b", "c"]
+
+    @trace(trace_name="astream", merge_output_func=merge_agent_response)
+    async def astream():
+        for chunk in [_response(RunStatus.Completed, ["x"])]:
+            yield chunk
+
+    assert list(stream()) == ["a", "b", "c"]
+    assert merged == [["a", "b", "c"]]
+
+    async def collect():
+        return [chunk async for chunk in astream()]
+
+    assert len(asyncio.run(collect())) == 1